@@ -0,0 +1,4 @@
+"""
+Benchmarks - Scripts de medición de rendimiento
+Uso: python -m benchmarks.<nombre>
+"""
@@ -0,0 +1,72 @@
+"""
+Benchmark - Overhead de autenticación por request
+
+Mide el costo de @authenticate() sobre una vista vacía, con el principal
+ya cacheado, con y sin la cache de tokens verificados:
+    verify (sin cache)   HMAC + JSON decode en cada request
+    verify (con cache)   digest + lookup en la LRU
+    authenticate (...)   decorador completo (header, verify, principal, g.user)
+
+Uso: python -m benchmarks.auth_overhead [--runs 20000]
+"""
+import argparse
+import os
+import timeit
+from types import SimpleNamespace
+from unittest.mock import patch
+
+os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from flask import Flask
+from src.middlewares.auth_middleware import authenticate
+from src.utils.jwt_util import JWTUtil
+from src.utils.principal_cache_util import principal_cache
+
+
+USER = SimpleNamespace(id='bench-user', email='bench@example.com', name='Bench', role='user', is_active=True)
+PRINCIPAL = {'id': USER.id, 'email': USER.email, 'name': USER.name, 'role': USER.role, 'is_active': True}
+
+
+@authenticate()
+def protected_view():
+    return 'ok'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    token = JWTUtil.generate_access_token(USER)
+    principal_cache.local.set(USER.id, PRINCIPAL, ttl=3600)
+
+    def verify() -> None:
+        JWTUtil.verify_access_token(token)
+
+    def request() -> None:
+        with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+            protected_view()
+
+    results = {}
+
+    for enabled in (False, True):
+        label = 'con cache' if enabled else 'sin cache'
+
+        with patch.object(JWTUtil, 'VERIFY_CACHE_ENABLED', enabled):
+            JWTUtil.clear_verified_tokens()
+            verify()
+
+            results[f'verify ({label})'] = min(timeit.repeat(verify, number=args.runs, repeat=3))
+            results[f'authenticate ({label})'] = min(timeit.repeat(request, number=args.runs // 4, repeat=3)) * 4
+
+    print(f'{args.runs} requests por caso (principal en L1)')
+    for name, elapsed in results.items():
+        print(f'  {name:<26} {elapsed / args.runs * 1e6:8.2f} µs/request')
+
+    print(f"  hit rate: {JWTUtil.get_verify_cache_stats()['hit_ratio']:.2%}")
+
+
+if __name__ == '__main__':
+    main()
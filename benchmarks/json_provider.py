@@ -0,0 +1,100 @@
+"""
+Benchmark - Throughput de endpoints con orjson vs json de stdlib
+
+Corre requests completos con el test client de Flask (routing, rate
+limit, controller, ApiResponse) con FastJSONProvider sobre orjson y
+sobre el fallback stdlib (mismo JSON de salida), en requests por segundo:
+    GET /api/products            página cacheada en L1 (solo encoding)
+    GET /api/products (frío)     ORM + ProductResponseDTO + encoding
+    GET /api/products/<id>       detalle cacheado con creador
+    POST /api/auth/verify-batch  body JSON + validación + encoding
+
+El read model de productos queda fuera (sin Redis): esa página ya va
+pre-serializada y no pasa por el provider.
+
+Uso: python -m benchmarks.json_provider [--products 500] [--limit 100] [--runs 300]
+"""
+import argparse
+import os
+import timeit
+from decimal import Decimal
+from unittest.mock import patch
+
+os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from config.database import db
+from src.app import create_app
+from src.models import Product, User
+from src.services.product_service import product_service
+from src.utils import json_util
+
+
+def seed(total: int) -> Product:
+    user = User(email='bench@example.com', password='x', name='Bench')
+    db.session.add(user)
+    db.session.flush()
+
+    products = [
+        Product(
+            name=f'Producto {i}',
+            description='Descripción de benchmark ' * 4,
+            price=Decimal('19.99'),
+            stock=i % 100,
+            category=f'Categoría {i % 10}',
+            created_by=user.id
+        )
+        for i in range(total)
+    ]
+    db.session.add_all(products)
+    db.session.commit()
+    return products[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--runs', type=int, default=300)
+    args = parser.parse_args()
+
+    app = create_app(env='test')
+    client = app.test_client()
+
+    with app.app_context():
+        db.create_all()
+        product = seed(args.products)
+        list_url = f'/api/products?page=1&limit={args.limit}'
+        tokens = {'tokens': [f'not-a-token-{i}' for i in range(50)]}
+
+        def cold_list():
+            product_service.list_cache.local.clear()
+            return client.get(list_url)
+
+        cases = {
+            'GET /api/products': lambda: client.get(list_url),
+            'GET /api/products (frío)': cold_list,
+            'GET /api/products/<id>': lambda: client.get(f'/api/products/{product.id}'),
+            'POST /api/auth/verify-batch': lambda: client.post('/api/auth/verify-batch', json=tokens)
+        }
+
+        results = {}
+        for name, request in cases.items():
+            assert request().status_code == 200, name
+
+            for label, codec in (('stdlib', None), ('orjson', json_util.orjson)):
+                with patch.object(json_util, 'orjson', codec):
+                    request()  # warm-up
+                    elapsed = min(timeit.repeat(request, number=args.runs, repeat=3)) / args.runs
+                results.setdefault(name, {})[label] = 1 / elapsed
+
+        print(f'{args.products} productos, página de {args.limit}, {args.runs} requests por caso (req/s)')
+        for name, rates in results.items():
+            print(f'  {name:<30} stdlib {rates["stdlib"]:8.0f}  orjson {rates["orjson"]:8.0f}  '
+                  f'({rates["orjson"] / rates["stdlib"]:4.2f}x)')
+
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
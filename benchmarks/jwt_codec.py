@@ -0,0 +1,59 @@
+"""
+Benchmark - Emisión y verificación de tokens HS256
+
+Compara el codec HS256 especializado de JWTUtil con PyJWT genérico
+(JWT_FAST_CODEC_ENABLED=false), en tokens por segundo:
+    generate_token_pair   access + refresh (login / refresh)
+    verify_access_token   sin cache de tokens verificados
+    verify_refresh_token
+
+Uso: python -m benchmarks.jwt_codec [--runs 20000]
+"""
+import argparse
+import os
+import timeit
+from types import SimpleNamespace
+from unittest.mock import patch
+
+os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from src.utils.jwt_util import JWTUtil
+
+
+USER = SimpleNamespace(id='3f1c9a52-8d47-4e1b-9c0a-6b2f7e5d4a10', email='bench@example.com', role='user', token_version=0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20000)
+    args = parser.parse_args()
+
+    results = {}
+
+    for fast in (False, True):
+        label = 'codec' if fast else 'pyjwt'
+
+        with patch.object(JWTUtil, 'FAST_CODEC_ENABLED', fast), \
+                patch.object(JWTUtil, 'VERIFY_CACHE_ENABLED', False), \
+                patch.object(JWTUtil, '_revocation_checks', []):
+            pair = JWTUtil.generate_token_pair(USER)
+
+            cases = {
+                'generate_token_pair': lambda: JWTUtil.generate_token_pair(USER),
+                'verify_access_token': lambda: JWTUtil.verify_access_token(pair['access_token']),
+                'verify_refresh_token': lambda: JWTUtil.verify_refresh_token(pair['refresh_token'])
+            }
+
+            for name, fn in cases.items():
+                elapsed = min(timeit.repeat(fn, number=args.runs, repeat=3))
+                results.setdefault(name, {})[label] = args.runs / elapsed
+
+    print(f'{args.runs} operaciones por caso (ops/s, mejor de 3)')
+    print(f"  {'caso':<22} {'pyjwt':>12} {'codec':>12} {'speedup':>8}")
+    for name, rates in results.items():
+        print(f"  {name:<22} {rates['pyjwt']:>12,.0f} {rates['codec']:>12,.0f} {rates['codec'] / rates['pyjwt']:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark - Throttling de logins durante un credential stuffing
+
+Simula una ráfaga de logins fallidos (muchos emails distintos desde pocas
+IPs) y mide, por intento, el chequeo de bloqueo + registro del fallo:
+    sql    tabla login_attempts (SELECT + INSERT/UPDATE + COMMIT)
+    redis  LoginAttemptsStore (ventanas deslizantes en Lua)
+
+Cuenta además las sentencias SQL que llegan a la base de datos. Usa SQLite
+en memoria y fakeredis, así que mide CPU del worker y no la red; contra
+Postgres real cada COMMIT suma un fsync en el primario.
+
+Uso: python -m benchmarks.login_throttling [--attempts 2000] [--ips 20]
+"""
+import argparse
+import os
+import time
+from unittest.mock import patch
+
+os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import fakeredis
+from sqlalchemy import event
+from config.database import db
+from src.app import create_app
+from src.repositories.login_attempts_repository import login_attempts_repository
+from src.repositories.login_attempts_store import LoginAttemptsStore
+from src.utils.redis_util import RedisUtil
+
+
+def burst(attempts: int, ips: int) -> dict:
+    """Corre la ráfaga y retorna tiempos, sentencias SQL e intentos bloqueados"""
+    statements = [0]
+
+    def count(*args) -> None:
+        statements[0] += 1
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    blocked = 0
+    start = time.perf_counter()
+
+    try:
+        for i in range(attempts):
+            email, ip = f'victim{i % (attempts // 2)}@example.com', f'203.0.113.{i % ips}'
+
+            if login_attempts_repository.is_blocked(email, ip):
+                blocked += 1
+                continue
+
+            login_attempts_repository.increment_attempts(email, ip)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+
+    return {'elapsed': time.perf_counter() - start, 'statements': statements[0], 'blocked': blocked}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--attempts', type=int, default=2000)
+    parser.add_argument('--ips', type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app(env='test')
+    offline = LoginAttemptsStore(RedisUtil(client=fakeredis.FakeRedis(decode_responses=True)))
+    online = LoginAttemptsStore(RedisUtil(client=fakeredis.FakeRedis(decode_responses=True)))
+
+    with app.app_context():
+        db.create_all()
+
+        with patch.object(offline.redis, 'get_client', return_value=None):
+            backends = {'sql': offline, 'redis': online}
+            print(f'{args.attempts} logins fallidos desde {args.ips} IPs')
+
+            for name, store in backends.items():
+                with patch.object(login_attempts_repository, 'store', store):
+                    result = burst(args.attempts, args.ips)
+
+                print(
+                    f"  {name:<6} {result['elapsed'] / args.attempts * 1e6:8.1f} µs/intento"
+                    f"  {result['statements'] / args.attempts:5.2f} SQL/intento"
+                    f"  {result['blocked']:5d} bloqueados"
+                )
+
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
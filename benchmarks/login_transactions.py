@@ -0,0 +1,119 @@
+"""
+Benchmark - COMMITs por login, registro y refresh
+
+Corre cada operación de AuthService con y sin unit of work
+(UNIT_OF_WORK_ENABLED) y cuenta los COMMIT que llegan al engine:
+    register        alta del usuario
+    login fallido   incremento de intentos
+    login ok        reset de intentos + last_login
+    refresh         rotación del refresh token (principal cacheado)
+
+Los intentos de login van por la tabla (sin Redis), el caso con más
+escrituras. Usa SQLite en memoria: mide CPU del worker, no el fsync del
+WAL que cada COMMIT cuesta en un Postgres real.
+
+Uso: python -m benchmarks.login_transactions [--runs 300]
+"""
+import argparse
+import os
+import time
+from unittest.mock import Mock, patch
+
+os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from sqlalchemy import event
+from config.database import db
+from src.app import create_app
+from src.dto.auth_dto import LoginDTO, RefreshTokenDTO, RegisterDTO
+from src.models import LoginAttempt, User
+from src.models.user import UserRole
+from src.repositories.login_attempts_repository import login_attempts_repository
+from src.repositories.unit_of_work import unit_of_work
+from src.services.auth_service import auth_service
+from src.utils.app_error import AppError
+
+
+AUDIT = {'ip': '203.0.113.7'}
+PASSWORD = 'Password123!'
+
+
+def run(runs: int) -> dict:
+    """Corre cada operación `runs` veces; retorna COMMITs y µs por operación"""
+    commits = [0]
+
+    def on_commit(connection) -> None:
+        commits[0] += 1
+
+    def measure(operation) -> tuple:
+        commits[0] = 0
+        start = time.perf_counter()
+
+        for i in range(runs):
+            operation(i)
+
+        return commits[0] / runs, (time.perf_counter() - start) / runs * 1e6
+
+    def register(i: int) -> None:
+        auth_service.register(RegisterDTO(f'bench{i}@example.com', PASSWORD, 'Bench', UserRole.USER), AUDIT)
+
+    def login_ok(i: int) -> None:
+        auth_service.login(LoginDTO(f'bench{i}@example.com', PASSWORD), AUDIT)
+
+    def login_failed(i: int) -> None:
+        try:
+            auth_service.login(LoginDTO(f'bench{i}@example.com', 'wrong-password'), AUDIT)
+        except AppError:
+            pass
+
+    refresh_tokens = {}
+
+    def refresh(i: int) -> None:
+        token = refresh_tokens.get(i) or auth_service.login(LoginDTO(f'bench{i}@example.com', PASSWORD), AUDIT)
+        refresh_tokens[i] = auth_service.refresh_token(RefreshTokenDTO(token.tokens.refresh_token), AUDIT)
+
+    event.listen(db.engine, 'commit', on_commit)
+
+    try:
+        # login ok después de un fallo: resetea un registro existente
+        results = {'register': measure(register), 'login fallido': measure(login_failed),
+                   'login ok': measure(login_ok)}
+        refresh(0)
+        results['refresh'] = measure(lambda i: refresh(0))
+    finally:
+        event.remove(db.engine, 'commit', on_commit)
+
+    LoginAttempt.query.delete()
+    User.query.delete()
+    db.session.commit()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=300)
+    args = parser.parse_args()
+
+    app = create_app(env='test')
+    offline_store = Mock(remaining_block_time=Mock(return_value=None),
+                         record_failure=Mock(return_value=None), reset=Mock(return_value=None))
+
+    with app.app_context(), patch.object(login_attempts_repository, 'store', offline_store):
+        db.create_all()
+        results = {}
+
+        for enabled in (False, True):
+            with patch.object(unit_of_work, 'enabled', enabled):
+                results['unit of work' if enabled else 'commit por repo'] = run(args.runs)
+
+        print(f'{args.runs} operaciones por caso (COMMITs/op, µs/op)')
+        for mode, cases in results.items():
+            print(f'  {mode}')
+            for name, (commits, micros) in cases.items():
+                print(f'    {name:<14} {commits:5.2f} COMMIT/op {micros:9.1f} µs/op')
+
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark - Latencia de requests no-auth durante una tormenta de logins
+
+Simula N threads de login verificando passwords sin pausa y mide, en otro
+thread, la latencia de un handler liviano (serializar un listado chico):
+    inline  hashing en el thread del request (comportamiento anterior)
+    pool    hashing en el pool de procesos de PasswordHasher
+
+Uso: python -m benchmarks.password_hashing [--logins 8] [--workers 2] [--seconds 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from src.utils.app_error import AppError
+from src.utils.password_hasher_util import PasswordHasher
+
+
+PAYLOAD = [{'id': i, 'name': f'Producto {i}', 'price': 19.99, 'stock': i} for i in range(50)]
+
+
+def light_handler() -> None:
+    json.dumps({'success': True, 'data': PAYLOAD})
+
+
+def run(hasher: PasswordHasher, logins: int, seconds: float) -> dict:
+    pwhash = hasher.hash_password('Secret123!')
+    stop = threading.Event()
+    verified = [0]
+
+    def login_storm() -> None:
+        while not stop.is_set():
+            try:
+                hasher.verify_password(pwhash, 'Secret123!')
+                verified[0] += 1
+            except AppError:
+                pass
+
+    threads = [threading.Thread(target=login_storm, daemon=True) for _ in range(logins)]
+    for thread in threads:
+        thread.start()
+
+    latencies = []
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        light_handler()
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(0.005)
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        'p50': statistics.median(latencies),
+        'p99': latencies[int(len(latencies) * 0.99) - 1],
+        'logins_per_s': verified[0] / seconds
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    baseline = run(PasswordHasher(workers=0), 0, args.seconds / 2)
+    print(f'sin carga           p50 {baseline["p50"]:7.3f} ms  p99 {baseline["p99"]:7.3f} ms')
+
+    for name, hasher in (('inline', PasswordHasher(workers=0)), ('pool', PasswordHasher(workers=args.workers))):
+        result = run(hasher, args.logins, args.seconds)
+        hasher.shutdown()
+        print(
+            f'{name:<6} ({args.logins} logins) p50 {result["p50"]:7.3f} ms  p99 {result["p99"]:7.3f} ms'
+            f'  {result["logins_per_s"]:6.1f} logins/s'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark - Listado de productos: camino actual vs read model
+
+Compara, para una página de GET /api/products:
+    orm        ORM + ProductResponseDTO + jsonify (cache frío)
+    redis      envelope cacheado en Redis + json.loads + jsonify (miss de L1)
+    read_model fragmentos pre-serializados concatenados (ApiResponse.success_raw)
+
+Usa SQLite en memoria y fakeredis, así que mide CPU del worker y no la
+red; contra Redis/Postgres reales la diferencia del camino ORM es mayor.
+
+Uso: python -m benchmarks.product_list [--products 2000] [--limit 50] [--runs 500]
+"""
+import argparse
+import os
+import timeit
+from decimal import Decimal
+
+os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import fakeredis
+from config.database import db
+from src.app import create_app
+from src.models import Product, User
+from src.repositories.product_read_model import ProductReadModel
+from src.repositories.product_repository import product_repository
+from src.dto.product_dto import ProductResponseDTO
+from src.utils.redis_util import RedisUtil
+from src.utils.response_util import ApiResponse
+
+
+def seed(total: int) -> None:
+    user = User(email='bench@example.com', password='x', name='Bench')
+    db.session.add(user)
+    db.session.flush()
+
+    db.session.add_all([
+        Product(
+            name=f'Producto {i}',
+            description='Descripción de benchmark ' * 4,
+            price=Decimal('19.99'),
+            stock=i % 100,
+            category=f'Categoría {i % 10}',
+            created_by=user.id
+        )
+        for i in range(total)
+    ])
+    db.session.commit()
+
+
+def load_page(page: int, limit: int) -> dict:
+    result = product_repository.find_with_pagination(page=page, limit=limit, is_active=True)
+    return {
+        'products': [ProductResponseDTO.from_model(p).to_dict() for p in result['rows']],
+        'pagination': {
+            'page': result['page'],
+            'limit': result['limit'],
+            'total': result['count'],
+            'total_pages': result['total_pages']
+        }
+    }
+
+
+def orm_path(page: int, limit: int) -> bytes:
+    response, _ = ApiResponse.success('Productos obtenidos', load_page(page, limit))
+    return response.get_data()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--runs', type=int, default=500)
+    args = parser.parse_args()
+
+    app = create_app(env='test')
+    redis = RedisUtil(client=fakeredis.FakeRedis(decode_responses=True))
+    read_model = ProductReadModel(redis)
+    page = 3
+
+    with app.app_context(), app.test_request_context():
+        db.create_all()
+        seed(args.products)
+        read_model.rebuild(product_repository.iter_active())
+
+        def redis_path() -> bytes:
+            data = redis.get_or_compute('bench:products:list', 3600, lambda: None) or {}
+            response, _ = ApiResponse.success('Productos obtenidos', data)
+            return response.get_data()
+
+        def read_model_path() -> bytes:
+            return ApiResponse.success_raw('Productos obtenidos', read_model.page(page, args.limit)).get_data()
+
+        # Precarga del envelope en Redis con el payload del camino ORM
+        redis.get_or_compute('bench:products:list', 3600, lambda: load_page(page, args.limit))
+
+        paths = {
+            'orm': lambda: orm_path(page, args.limit),
+            'redis': redis_path,
+            'read_model': read_model_path
+        }
+
+        print(f'{args.products} productos, página de {args.limit}, {args.runs} requests por camino')
+        baseline = None
+
+        for name, fn in paths.items():
+            fn()  # warm-up
+            elapsed = min(timeit.repeat(fn, number=args.runs, repeat=3)) / args.runs * 1e6
+            baseline = baseline or elapsed
+            print(f'  {name:<11} {elapsed:9.1f} µs/request  ({baseline / elapsed:5.1f}x)')
+
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,7 @@ def init_db(app):
     
     with app.app_context():
         # Importar modelos para que SQLAlchemy los registre
-        from src.models import User, Product, LoginAttempt  # noqa
+        from src.models import User, Product, LoginAttempt, ApiKey  # noqa
         
-        print(f"✅ Modelos registrados: User, Product, LoginAttempt")
+        print(f"✅ Modelos registrados: User, Product, LoginAttempt, ApiKey")
         print(f"✅ Schema: {app.config.get('DB_SCHEMA', 'public')}")
\ No newline at end of file
@@ -35,6 +35,67 @@ class Config:
         }
     }
     
+    # Cache warm-up (readiness gating en /health?mode=ready)
+    CACHE_WARMUP_ENABLED = os.getenv('CACHE_WARMUP_ENABLED', 'true').lower() == 'true'
+    CACHE_WARMUP_TIMEOUT_SECONDS = int(os.getenv('CACHE_WARMUP_TIMEOUT_SECONDS', 60))
+    CACHE_WARMUP_TOP_CATEGORIES = int(os.getenv('CACHE_WARMUP_TOP_CATEGORIES', 5))
+    CACHE_WARMUP_PAGES = int(os.getenv('CACHE_WARMUP_PAGES', 3))
+    CACHE_WARMUP_PAGE_LIMIT = int(os.getenv('CACHE_WARMUP_PAGE_LIMIT', 10))
+    CACHE_WARMUP_TOP_PRODUCTS = int(os.getenv('CACHE_WARMUP_TOP_PRODUCTS', 50))
+    CACHE_WARMUP_ADMINS = int(os.getenv('CACHE_WARMUP_ADMINS', 50))
+    
+    # Snapshot en disco de las caches L1 (arranque en caliente de workers)
+    L1_SNAPSHOT_ENABLED = os.getenv('L1_SNAPSHOT_ENABLED', 'true').lower() == 'true'
+    L1_SNAPSHOT_PATH = os.getenv('L1_SNAPSHOT_PATH', '/tmp/flask_api_l1.snapshot')
+    L1_SNAPSHOT_INTERVAL_SECONDS = int(os.getenv('L1_SNAPSHOT_INTERVAL_SECONDS', 30))
+    L1_SNAPSHOT_MAX_ENTRIES = int(os.getenv('L1_SNAPSHOT_MAX_ENTRIES', 500))
+    # Edad máxima del snapshot para restaurarlo (las entradas conservan su vencimiento)
+    L1_SNAPSHOT_MAX_AGE_SECONDS = int(os.getenv('L1_SNAPSHOT_MAX_AGE_SECONDS', 30))
+    L1_SNAPSHOT_VERSION = os.getenv('L1_SNAPSHOT_VERSION', os.getenv('APP_VERSION', '1'))
+    
+    # Cache del principal de autenticación (L1 por worker + Redis)
+    # El TTL de L1 acota el lockout de un usuario desactivado si se pierde
+    # la invalidación por pub/sub
+    AUTH_PRINCIPAL_CACHE_ENABLED = os.getenv('AUTH_PRINCIPAL_CACHE_ENABLED', 'true').lower() == 'true'
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv('AUTH_PRINCIPAL_CACHE_TTL_SECONDS', 30))
+    
+    # Pool de procesos para hashing de passwords (0 = inline)
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', 64))
+    PASSWORD_HASH_TIMEOUT_MS = int(os.getenv('PASSWORD_HASH_TIMEOUT_MS', 5000))
+    
+    # Algoritmo de hashing (pbkdf2, scrypt, bcrypt, argon2id) y costos
+    # Calibrar con: flask password-calibrate --scheme <algoritmo> --target-ms 250
+    PASSWORD_HASH_SCHEME = os.getenv('PASSWORD_HASH_SCHEME', 'pbkdf2')
+    PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', 1000000))
+    PASSWORD_SCRYPT_N = int(os.getenv('PASSWORD_SCRYPT_N', 32768))
+    PASSWORD_SCRYPT_R = int(os.getenv('PASSWORD_SCRYPT_R', 8))
+    PASSWORD_SCRYPT_P = int(os.getenv('PASSWORD_SCRYPT_P', 1))
+    PASSWORD_BCRYPT_ROUNDS = int(os.getenv('PASSWORD_BCRYPT_ROUNDS', 12))
+    PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST', 3))
+    PASSWORD_ARGON2_MEMORY_COST = int(os.getenv('PASSWORD_ARGON2_MEMORY_COST', 65536))
+    PASSWORD_ARGON2_PARALLELISM = int(os.getenv('PASSWORD_ARGON2_PARALLELISM', 4))
+    
+    # Rate limiting (token bucket en Redis, fallback en memoria)
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    
+    # Filtro de emails registrados (evita lookups de cuentas inexistentes)
+    EMAIL_FILTER_ENABLED = os.getenv('EMAIL_FILTER_ENABLED', 'true').lower() == 'true'
+    EMAIL_FILTER_LOCAL_ONLY = os.getenv('EMAIL_FILTER_LOCAL_ONLY', 'false').lower() == 'true'
+    
+    # API keys de servicios internos (header X-API-Key)
+    API_KEYS_ENABLED = os.getenv('API_KEYS_ENABLED', 'true').lower() == 'true'
+    
+    # Unit of work: un COMMIT por operación de servicio (login, register, refresh)
+    UNIT_OF_WORK_ENABLED = os.getenv('UNIT_OF_WORK_ENABLED', 'true').lower() == 'true'
+    
+    # Write-behind de last_login / last_seen_at (flush en lote cada ACTIVITY_FLUSH_SECONDS)
+    ACTIVITY_BUFFER_ENABLED = os.getenv('ACTIVITY_BUFFER_ENABLED', 'true').lower() == 'true'
+    
+    # Pre-auth gate de login (reputación IP/subred, proof-of-work)
+    PREAUTH_ENABLED = os.getenv('PREAUTH_ENABLED', 'true').lower() == 'true'
+    PREAUTH_POW_ENABLED = os.getenv('PREAUTH_POW_ENABLED', 'true').lower() == 'true'
+    
     @staticmethod
     def init_app(app):
         pass
@@ -49,7 +110,17 @@ class TestConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     SQLALCHEMY_ECHO = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # SQLite no acepta pool_size/max_overflow
     DB_SCHEMA = 'test'
+    CACHE_WARMUP_ENABLED = False
+    L1_SNAPSHOT_ENABLED = False
+    PASSWORD_HASH_WORKERS = 0
+    RATE_LIMIT_ENABLED = False
+    EMAIL_FILTER_ENABLED = False
+    API_KEYS_ENABLED = False
+    PREAUTH_ENABLED = False
+    ACTIVITY_BUFFER_ENABLED = False
+    PASSWORD_PBKDF2_ITERATIONS = 1000  # Tests rápidos
 
 
 class ProductionConfig(Config):
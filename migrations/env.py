@@ -24,7 +24,7 @@ if config.config_file_name is not None:
 
 # Metadata de los modelos (para autogenerate)
 # IMPORTANTE: Importar todos los modelos aquí
-from src.models import User, Product, LoginAttempt
+from src.models import User, Product, LoginAttempt, ApiKey
 
 target_metadata = db.metadata
 
@@ -0,0 +1,30 @@
+"""add users token_version
+
+Revision ID: 7c1e4b9d2f30
+Revises: 02a2347d330f
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b9d2f30'
+down_revision: Union[str, Sequence[str], None] = '02a2347d330f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Versión de tokens por usuario (revocación de todas las sesiones)
+    op.add_column('users',
+        sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'),
+        schema='flask_schema'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version', schema='flask_schema')
@@ -0,0 +1,45 @@
+"""create api_keys
+
+Revision ID: 9d4a6f1b8e52
+Revises: 7c1e4b9d2f30
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4a6f1b8e52'
+down_revision: Union[str, Sequence[str], None] = '7c1e4b9d2f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # API keys de servicios internos (solo se guarda el hash)
+    op.create_table('api_keys',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('prefix', sa.String(length=16), nullable=False),
+        sa.Column('key_hash', sa.String(length=64), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default='true'),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['flask_schema.users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        schema='flask_schema'
+    )
+    op.create_index(op.f('ix_api_keys_prefix'), 'api_keys', ['prefix'], unique=True, schema='flask_schema')
+    op.create_index(op.f('ix_api_keys_user_id'), 'api_keys', ['user_id'], unique=False, schema='flask_schema')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_api_keys_user_id'), table_name='api_keys', schema='flask_schema')
+    op.drop_index(op.f('ix_api_keys_prefix'), table_name='api_keys', schema='flask_schema')
+    op.drop_table('api_keys', schema='flask_schema')
@@ -0,0 +1,30 @@
+"""add users last_seen_at
+
+Revision ID: b5f2d8a3c619
+Revises: 9d4a6f1b8e52
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f2d8a3c619'
+down_revision: Union[str, Sequence[str], None] = '9d4a6f1b8e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Último request autenticado (escrito en lote por el buffer de actividad)
+    op.add_column('users',
+        sa.Column('last_seen_at', sa.DateTime(), nullable=True),
+        schema='flask_schema'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'last_seen_at', schema='flask_schema')
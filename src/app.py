@@ -7,7 +7,20 @@ from config.database import db, init_db
 from config.settings import config
 from src.middlewares.cors_middleware import setup_cors
 from src.middlewares.error_middleware import register_error_handlers
+from src.middlewares.rate_limit_middleware import register_rate_limit
+from src.repositories.activity_buffer import activity_buffer
+from src.repositories.api_key_repository import api_key_repository
+from src.repositories.unit_of_work import unit_of_work
+from src.repositories.user_repository import user_repository
 from src.routes import register_blueprints
+from src.commands import register_commands
+from src.services.warmup_service import warmup_service
+from src.utils.cache_util import cache_snapshot
+from src.utils.json_util import FastJSONProvider
+from src.utils.password_hasher_util import password_hasher
+from src.utils.preauth_gate_util import preauth_gate
+from src.utils.principal_cache_util import principal_cache
+from src.utils.token_blacklist_util import token_blacklist
 from src.utils.logger_util import logger
 import os
 
@@ -33,6 +46,9 @@ def create_app(env=None):
     # Cargar configuración
     app.config.from_object(config[env])
     
+    # JSON con orjson (jsonify y request.get_json; fallback a stdlib)
+    app.json = FastJSONProvider(app)
+    
     logger.info(f'🚀 Starting Flask API in {env} mode')
     
     # Inicializar base de datos
@@ -47,6 +63,42 @@ def create_app(env=None):
     # Registrar error handlers
     register_error_handlers(app)
     
+    # Rate limiting (headers RateLimit-* en las respuestas)
+    register_rate_limit(app)
+    
+    # Pre-auth gate de login
+    preauth_gate.init_app(app)
+    
+    # Transacción por operación de servicio
+    unit_of_work.init_app(app)
+    
+    # Registrar comandos CLI (flask <comando>)
+    register_commands(app)
+    
+    # Pool de hashing de passwords (antes de levantar threads de background)
+    password_hasher.start(app)
+    
+    # Cache del principal de autenticación (suscripción a invalidaciones)
+    principal_cache.start(app)
+    
+    # Blacklist de tokens revocados (Bloom filter sincronizado desde Redis)
+    token_blacklist.start(app)
+    
+    # Filtro de emails registrados (se arma desde users en background)
+    user_repository.email_filter.start(app, user_repository.iter_emails)
+    
+    # Índice en memoria de API keys (sincronizado vía Redis)
+    api_key_repository.index.start(app, api_key_repository.load_index)
+    
+    # Write-behind de timestamps de actividad (flush periódico y al terminar)
+    activity_buffer.start(app)
+    
+    # Restaurar caches L1 desde el snapshot en disco y programar nuevos snapshots
+    cache_snapshot.start(app)
+    
+    # Warm-up de caches en background (readiness en /health?mode=ready)
+    warmup_service.start(app)
+    
     # Request logging middleware
     @app.before_request
     def log_request():
@@ -0,0 +1,24 @@
+"""
+Commands package - Register all CLI commands
+Equivalente a scripts de npm en Node.js
+"""
+from .cache_commands import cache_warmup
+from .product_commands import products_rebuild_read_model
+from .password_commands import password_calibrate
+from .jwt_commands import jwt_keys
+from .api_key_commands import api_keys
+
+
+def register_commands(app):
+    """
+    Registra todos los comandos CLI en la aplicación
+    Uso: flask <comando>
+    """
+    app.cli.add_command(cache_warmup)
+    app.cli.add_command(products_rebuild_read_model)
+    app.cli.add_command(password_calibrate)
+    app.cli.add_command(jwt_keys)
+    app.cli.add_command(api_keys)
+
+
+__all__ = ['register_commands']
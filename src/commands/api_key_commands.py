@@ -0,0 +1,63 @@
+"""
+API Key Commands - CLI (keys de servicios internos)
+"""
+import click
+from datetime import datetime, timedelta
+from src.repositories.api_key_repository import api_key_repository
+from src.repositories.user_repository import user_repository
+
+
+@click.group('api-keys')
+def api_keys():
+    """Administra las API keys de servicios internos"""
+
+
+@api_keys.command('create')
+@click.option('--email', required=True, help='Usuario (cuenta de servicio) dueño de la key')
+@click.option('--name', required=True, help='Nombre descriptivo (p. ej. batch-facturacion)')
+@click.option('--expires-days', type=int, default=None, help='Días de validez (sin valor = no expira)')
+def create(email, name, expires_days):
+    """Crea una key; se muestra una sola vez"""
+    user = user_repository.find_active_by_email(email.lower().strip())
+    
+    if not user:
+        click.echo(f'❌ Usuario activo {email} no encontrado')
+        return
+    
+    expires_at = datetime.utcnow() + timedelta(days=expires_days) if expires_days else None
+    api_key, key = api_key_repository.create_key(user.id, name, expires_at)
+    
+    click.echo(f'✅ API key {api_key.prefix} creada para {user.email} ({user.role.value})')
+    click.echo(f'   {key}')
+    click.echo('   Guardala ahora: no se puede volver a mostrar')
+
+
+@api_keys.command('list')
+@click.option('--email', required=True, help='Usuario dueño de las keys')
+def list_keys(email):
+    """Lista las keys de un usuario"""
+    user = user_repository.find_by_email(email.lower().strip())
+    
+    if not user:
+        click.echo(f'❌ Usuario {email} no encontrado')
+        return
+    
+    keys = api_key_repository.find_by_user(user.id)
+    
+    if not keys:
+        click.echo('Sin API keys')
+    
+    for api_key in keys:
+        status = 'active' if api_key.is_active else 'revoked'
+        expires = api_key.expires_at.isoformat(timespec='seconds') if api_key.expires_at else 'nunca'
+        click.echo(f'{status:<8} {api_key.prefix}  {api_key.name}  (expira {expires})')
+
+
+@api_keys.command('revoke')
+@click.argument('prefix')
+def revoke(prefix):
+    """Revoca una key por prefix en todos los workers"""
+    if api_key_repository.revoke(prefix):
+        click.echo(f'✅ API key {prefix} revocada')
+    else:
+        click.echo(f'❌ API key activa {prefix} no encontrada')
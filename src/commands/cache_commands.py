@@ -0,0 +1,19 @@
+"""
+Cache Commands - CLI
+"""
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from src.services.warmup_service import warmup_service
+
+
+@click.command('cache-warmup')
+@with_appcontext
+def cache_warmup():
+    """Precarga los caches (catálogo, más vistos, admins)"""
+    status = warmup_service.run(current_app._get_current_object())
+    
+    if status['state'] == 'ready':
+        click.echo(f"✅ Warm-up completado: {status['warmed']}")
+    else:
+        click.echo(f"❌ Warm-up falló: {status.get('error')}")
@@ -0,0 +1,52 @@
+"""
+JWT Commands - CLI (rotación de claves de firma)
+"""
+import click
+from datetime import datetime
+from src.utils.jwt_keys_util import ALGORITHMS, key_ring
+from src.utils.jwt_util import JWTUtil
+
+
+@click.group('jwt-keys')
+def jwt_keys():
+    """Administra las claves de firma de access tokens (JWT_KEYS_DIR)"""
+
+
+@jwt_keys.command('list')
+def list_keys():
+    """Lista las claves y su estado (active, next, retired)"""
+    try:
+        keys = key_ring.list_keys()
+    except RuntimeError as e:
+        click.echo(f'❌ {e}')
+        return
+    
+    if not keys:
+        click.echo('Sin claves: los access tokens se firman con HS256')
+    
+    for key in keys:
+        created_at = datetime.fromtimestamp(key['created_at']).isoformat(timespec='seconds')
+        click.echo(f"{key['status']:<8} {key['alg']:<6} {key['kid']}  (creada {created_at})")
+
+
+@jwt_keys.command('rotate')
+@click.option('--now', is_flag=True, help='Genera y activa una clave sin esperar (clave comprometida)')
+@click.option('--alg', type=click.Choice(sorted(ALGORITHMS)), default=None, help='Algoritmo de la clave nueva')
+def rotate(now, alg):
+    """Avanza un paso de la rotación con solapamiento y borra claves vencidas"""
+    try:
+        result = key_ring.rotate(now=now, alg=alg)
+        removed = key_ring.prune(JWTUtil.ACCESS_TOKEN_EXPIRY.total_seconds())
+    except RuntimeError as e:
+        click.echo(f'❌ {e}')
+        return
+    
+    if result['action'] == 'generated':
+        click.echo(f"✅ Clave {result['kid']} publicada; se activará en el próximo rotate pasados {key_ring.JWKS_MAX_AGE}s")
+    elif result['action'] == 'activated':
+        click.echo(f"✅ Clave {result['kid']} activa")
+    else:
+        click.echo(f"⏳ Clave {result['kid']} publicada, esperando a que venza la cache del JWKS")
+    
+    for kid in removed:
+        click.echo(f'🗑️  Clave retirada {kid} eliminada')
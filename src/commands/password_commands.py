@@ -0,0 +1,25 @@
+"""
+Password Commands - CLI
+"""
+import click
+from src.utils.password_schemes_util import SCHEMES, calibrate
+
+
+@click.command('password-calibrate')
+@click.option('--scheme', type=click.Choice(sorted(SCHEMES)), default='pbkdf2', help='Algoritmo a calibrar')
+@click.option('--target-ms', type=float, default=250, help='Tiempo objetivo de verificación (ms)')
+def password_calibrate(scheme, target_ms):
+    """Calcula costos de hashing que tardan ~target-ms en este hardware"""
+    click.echo(f'⏱️  Calibrando {scheme} (objetivo {target_ms:g} ms)...')
+    
+    try:
+        result = calibrate(scheme, target_ms)
+    except RuntimeError as e:
+        click.echo(f'❌ {e}')
+        return
+    
+    click.echo(f"✅ verify: {result['verify_ms']} ms con {result['params']}")
+    click.echo('')
+    click.echo(f'PASSWORD_HASH_SCHEME={scheme}')
+    for key, value in result['config'].items():
+        click.echo(f'{key}={value}')
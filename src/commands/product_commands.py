@@ -0,0 +1,18 @@
+"""
+Product Commands - CLI
+"""
+import click
+from flask.cli import with_appcontext
+from src.repositories.product_repository import product_repository
+
+
+@click.command('products-rebuild-read-model')
+@with_appcontext
+def products_rebuild_read_model():
+    """Reconstruye el read model de productos en Redis"""
+    if not product_repository.read_model.redis.get_client():
+        click.echo('❌ Redis no disponible')
+        return
+    
+    loaded = product_repository.rebuild_read_model()
+    click.echo(f'✅ Read model reconstruido: {loaded} productos')
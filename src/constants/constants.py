@@ -26,6 +26,7 @@ class HttpStatus:
     UNPROCESSABLE_ENTITY = 422
     TOO_MANY_REQUESTS = 429
     INTERNAL_SERVER_ERROR = 500
+    SERVICE_UNAVAILABLE = 503
 
 
 # Mensajes de error comunes
@@ -74,6 +75,11 @@ class LoginAttempts:
     BLOCK_DURATION_MINUTES = 15
 
 
+# Verificación batch de tokens (POST /api/auth/verify-batch)
+class VerifyBatch:
+    MAX_TOKENS = 100
+
+
 # JWT Configuration
 class JWTConfig:
     ACCESS_TOKEN_EXPIRY_MINUTES = 15
@@ -86,6 +92,24 @@ class RedisKeys:
     REFRESH_TOKEN = 'token:refresh:'
     RATE_LIMIT = 'rate:limit:'
     IDEMPOTENCY = 'idempotency:'
+    SINGLEFLIGHT_LOCK = 'singleflight:lock:'
+    CACHE_LOCK = 'cache:lock:'
+    PRODUCT_LIST = 'cache:products:list:'
+    PRODUCT_DETAIL = 'cache:products:detail:'
+    PRODUCT_VIEWS = 'stats:products:views'
+    USER_PROFILE = 'cache:users:'
+    SINGLEFLIGHT_RESULT = 'singleflight:result:'
+    PRODUCT_READ_MODEL = 'readmodel:{products}:'
+    AUTH_PRINCIPAL = 'auth:principal:'
+    AUTH_PRINCIPAL_INVALIDATION = 'auth:principal-invalidation'
+    LOGIN_ATTEMPTS = 'auth:login:'
+    EMAIL_FILTER = 'auth:emails:bloom:'
+    API_KEYS = 'auth:apikeys:'
+    PREAUTH = 'auth:preauth:'
+    
+    @classmethod
+    def all(cls):
+        return [value for name, value in vars(cls).items() if name.isupper()]
 
 
 __all__ = [
@@ -4,6 +4,7 @@ Controllers package
 from .auth_controller import AuthController, auth_controller
 from .user_controller import UserController, user_controller
 from .product_controller import ProductController, product_controller
+from .metrics_controller import MetricsController, metrics_controller
 
 __all__ = [
     'AuthController',
@@ -11,5 +12,7 @@ __all__ = [
     'UserController',
     'user_controller',
     'ProductController',
-    'product_controller'
+    'product_controller',
+    'MetricsController',
+    'metrics_controller'
 ]
@@ -92,7 +92,9 @@ class AuthController:
                 'user_agent': request.headers.get('User-Agent')
             }
             
-            result = auth_service.logout(user['id'], token, audit_context)
+            data = request.get_json(silent=True) or {}
+            
+            result = auth_service.logout(user['id'], token, audit_context, data.get('refresh_token'))
             
             return ApiResponse.success('Logout exitoso', result)
             
@@ -101,6 +103,26 @@ class AuthController:
         except Exception as e:
             return ApiResponse.internal_error(str(e))
     
+    def logout_all(self):
+        """
+        POST /api/auth/logout-all
+        Cierra todas las sesiones del usuario (requiere autenticación)
+        """
+        try:
+            audit_context = {
+                'ip': request.remote_addr,
+                'user_agent': request.headers.get('User-Agent')
+            }
+            
+            result = auth_service.logout_all(g.user['id'], audit_context)
+            
+            return ApiResponse.success('Sesiones cerradas', result)
+            
+        except AppError as e:
+            return ApiResponse.error(e.message, e.code, e.details, e.status_code)
+        except Exception as e:
+            return ApiResponse.internal_error(str(e))
+    
     def refresh_token(self):
         """
         POST /api/auth/refresh
@@ -133,7 +155,7 @@ class AuthController:
         Obtiene el usuario actual (requiere autenticación)
         """
         try:
-            user = g.user
+            user = g.user.to_dict()
             return ApiResponse.success('Usuario obtenido', user)
             
         except Exception as e:
@@ -158,6 +180,25 @@ class AuthController:
             
         except Exception as e:
             return ApiResponse.internal_error(str(e))
+    
+    def verify_batch(self):
+        """
+        POST /api/auth/verify-batch
+        Verifica varios tokens en un request; cacheable hasta la primera
+        expiración de los tokens válidos
+        """
+        try:
+            tokens = request.validated_data['tokens']
+            
+            results = auth_service.verify_tokens(tokens)
+            
+            response, status_code = ApiResponse.success('Token verification', {'results': results})
+            response.headers['Cache-Control'] = f'private, max-age={auth_service.verify_cache_seconds(results)}'
+            
+            return response, status_code
+            
+        except Exception as e:
+            return ApiResponse.internal_error(str(e))
 
 
 # Singleton instance
@@ -0,0 +1,98 @@
+"""
+Metrics Controller
+Expone métricas internas de rendimiento (solo admin)
+"""
+from src.repositories.activity_buffer import activity_buffer
+from src.repositories.unit_of_work import unit_of_work
+from src.repositories.user_repository import user_repository
+from src.utils.api_key_util import api_key_index
+from src.utils.cache_util import cache_snapshot, get_local_cache_stats
+from src.utils.jwt_util import jwt_util
+from src.utils.password_hasher_util import password_hasher
+from src.utils.preauth_gate_util import preauth_gate
+from src.utils.principal_cache_util import principal_cache
+from src.utils.rate_limit_util import rate_limiter
+from src.utils.redis_metrics_util import redis_metrics
+from src.utils.response_util import ApiResponse
+from src.utils.singleflight_util import request_coalescer
+from src.utils.token_blacklist_util import token_blacklist
+
+
+class MetricsController:
+    """Metrics controller"""
+    
+    def coalescing(self):
+        """GET /api/metrics/coalescing - Métricas de single-flight"""
+        try:
+            return ApiResponse.success('Métricas de coalescing', request_coalescer.get_stats())
+            
+        except Exception as e:
+            return ApiResponse.internal_error(str(e))
+    
+    def cache(self):
+        """GET /api/metrics/cache - Hit ratio de caches L1 y estado del snapshot"""
+        try:
+            data = {
+                'local_caches': get_local_cache_stats(),
+                'snapshot': cache_snapshot.get_stats()
+            }
+            return ApiResponse.success('Métricas de cache', data)
+            
+        except Exception as e:
+            return ApiResponse.internal_error(str(e))
+    
+    def redis(self):
+        """GET /api/metrics/redis - Latencia, hit/miss por prefijo y hot keys"""
+        try:
+            return ApiResponse.success('Métricas de Redis', redis_metrics.get_stats())
+            
+        except Exception as e:
+            return ApiResponse.internal_error(str(e))
+    
+    def password_hashing(self):
+        """GET /api/metrics/password-hashing - Pool de hashing de passwords"""
+        try:
+            return ApiResponse.success('Métricas de hashing', password_hasher.get_stats())
+            
+        except Exception as e:
+            return ApiResponse.internal_error(str(e))
+    
+    def auth(self):
+        """GET /api/metrics/auth - Hit rate de tokens verificados, principals, blacklist, filtro de emails y pre-auth gate"""
+        try:
+            data = {
+                'verified_tokens': jwt_util.get_verify_cache_stats(),
+                'principals': principal_cache.local.get_stats(),
+                'revocations': token_blacklist.get_stats(),
+                'email_filter': user_repository.email_filter.get_stats(),
+                'api_keys': api_key_index.get_stats(),
+                'preauth': preauth_gate.get_stats(password_hasher.get_stats()['duration']['avg_ms'])
+            }
+            return ApiResponse.success('Métricas de autenticación', data)
+            
+        except Exception as e:
+            return ApiResponse.internal_error(str(e))
+    
+    def database(self):
+        """GET /api/metrics/database - Transacciones, COMMITs evitados y write-behind de actividad"""
+        try:
+            data = {
+                'transactions': unit_of_work.get_stats(),
+                'activity_buffer': activity_buffer.get_stats()
+            }
+            return ApiResponse.success('Métricas de base de datos', data)
+            
+        except Exception as e:
+            return ApiResponse.internal_error(str(e))
+    
+    def rate_limit(self):
+        """GET /api/metrics/rate-limit - Chequeos, rechazos y round-trips a Redis"""
+        try:
+            return ApiResponse.success('Métricas de rate limit', rate_limiter.get_stats())
+            
+        except Exception as e:
+            return ApiResponse.internal_error(str(e))
+
+
+# Singleton instance
+metrics_controller = MetricsController()
@@ -4,6 +4,8 @@ Equivalente a src/controllers/product.controller.js
 """
 from flask import request, g
 from src.repositories.product_repository import product_repository
+from src.repositories.product_read_model import product_read_model
+from src.services.product_service import product_service
 from src.dto.product_dto import CreateProductDTO, UpdateProductDTO, ProductResponseDTO
 from src.utils.response_util import ApiResponse
 from src.utils.app_error import AppError
@@ -19,24 +21,13 @@ class ProductController:
             limit = int(request.args.get('limit', 10))
             category = request.args.get('category')
             
-            # Filtros
-            filters = {'is_active': True}
-            if category:
-                filters['category'] = category
+            # Read model: fragmentos JSON pre-serializados
+            data_json = product_read_model.page(page, limit, category)
             
-            result = product_repository.find_with_pagination(page=page, limit=limit, **filters)
+            if data_json is not None:
+                return ApiResponse.success_raw('Productos obtenidos', data_json)
             
-            products_dto = [ProductResponseDTO.from_model(p).to_dict() for p in result['rows']]
-            
-            response_data = {
-                'products': products_dto,
-                'pagination': {
-                    'page': result['page'],
-                    'limit': result['limit'],
-                    'total': result['count'],
-                    'total_pages': result['total_pages']
-                }
-            }
+            response_data = product_service.list_products(page, limit, category)
             
             return ApiResponse.success('Productos obtenidos', response_data)
             
@@ -46,12 +37,12 @@ class ProductController:
     def get_by_id(self, product_id: str):
         """GET /api/products/:id"""
         try:
-            product = product_repository.find_by_id(product_id)
+            product_dto = product_service.get_product(product_id)
             
-            if not product:
+            if not product_dto:
                 return ApiResponse.not_found('Producto no encontrado')
             
-            product_dto = ProductResponseDTO.from_model(product, include_creator=True).to_dict()
+            product_service.record_view(product_id)
             
             return ApiResponse.success('Producto obtenido', product_dto)
             
@@ -67,6 +58,7 @@ class ProductController:
             dto = CreateProductDTO.from_request(data, user['id'])
             
             product = product_repository.create(dto.to_dict())
+            product_service.invalidate()
             product_dto = ProductResponseDTO.from_model(product).to_dict()
             
             return ApiResponse.created('Producto creado', product_dto)
@@ -93,6 +85,7 @@ class ProductController:
             dto = UpdateProductDTO.from_request(data)
             
             updated_product = product_repository.update(product_id, dto.to_dict())
+            product_service.invalidate(product_id)
             product_dto = ProductResponseDTO.from_model(updated_product).to_dict()
             
             return ApiResponse.success('Producto actualizado', product_dto)
@@ -117,6 +110,7 @@ class ProductController:
             
             # Soft delete
             product_repository.soft_delete(product_id)
+            product_service.invalidate(product_id)
             
             return ApiResponse.success('Producto eliminado')
             
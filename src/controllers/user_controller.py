@@ -4,6 +4,7 @@ Equivalente a src/controllers/user.controller.js
 """
 from flask import request, g
 from src.repositories.user_repository import user_repository
+from src.services.user_service import user_service
 from src.dto.user_dto import UpdateUserDTO
 from src.dto.auth_dto import UserResponseDTO
 from src.utils.response_util import ApiResponse
@@ -50,13 +51,11 @@ class UserController:
         Obtiene un usuario por ID
         """
         try:
-            user = user_repository.find_by_id(user_id)
+            user_dto = user_service.get_user(user_id)
             
-            if not user:
+            if not user_dto:
                 return ApiResponse.not_found('Usuario no encontrado')
             
-            user_dto = UserResponseDTO.from_model(user).to_dict()
-            
             return ApiResponse.success('Usuario obtenido', user_dto)
             
         except Exception as e:
@@ -77,18 +76,14 @@ class UserController:
             data = request.get_json()
             dto = UpdateUserDTO.from_request(data)
             
-            # Si hay password, hashearlo
+            # Actualizar (el repositorio hashea el password si viene)
             update_data = dto.to_dict()
-            if 'password' in update_data and update_data['password']:
-                # El model se encargará del hash
-                pass
-            
-            # Actualizar
             updated_user = user_repository.update(user_id, update_data)
             
             if not updated_user:
                 return ApiResponse.not_found('Usuario no encontrado')
             
+            user_service.invalidate(user_id)
             user_dto = UserResponseDTO.from_model(updated_user).to_dict()
             
             return ApiResponse.success('Usuario actualizado', user_dto)
@@ -115,11 +110,28 @@ class UserController:
             if not success:
                 return ApiResponse.not_found('Usuario no encontrado')
             
+            user_service.invalidate(user_id)
+            
             return ApiResponse.success('Usuario eliminado')
             
         except Exception as e:
             return ApiResponse.internal_error(str(e))
 
+    
+    def revoke_sessions(self, user_id: str):
+        """
+        POST /api/users/:id/revoke-sessions
+        Invalida todos los tokens del usuario (solo admin)
+        """
+        try:
+            if not user_repository.revoke_sessions(user_id):
+                return ApiResponse.not_found('Usuario no encontrado')
+            
+            return ApiResponse.success('Sesiones del usuario revocadas')
+            
+        except Exception as e:
+            return ApiResponse.internal_error(str(e))
+
 
 # Singleton instance
 user_controller = UserController()
@@ -3,7 +3,8 @@ Auth DTOs - Data Transfer Objects
 Equivalente a src/dto/auth.dto.js
 """
 from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Optional, Dict, Any, Union
 
 
 # ========================================
@@ -101,15 +102,18 @@ class UserResponseDTO:
     name: str
     role: str
     is_active: bool
-    last_login: Optional[str] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    # datetime desde from_model; str ISO 8601 desde el perfil cacheado
+    # (from_profile). El JSON de salida es el mismo
+    last_login: Optional[Union[datetime, str]] = None
+    created_at: Optional[Union[datetime, str]] = None
+    updated_at: Optional[Union[datetime, str]] = None
     
     @classmethod
     def from_model(cls, user) -> 'UserResponseDTO':
         """
         Crea DTO desde modelo User
-        Excluye password automáticamente
+        Excluye password automáticamente; las fechas quedan como datetime
+        (las serializa json_util)
         """
         return cls(
             id=user.id,
@@ -117,9 +121,9 @@ class UserResponseDTO:
             name=user.name,
             role=user.role.value if hasattr(user.role, 'value') else user.role,
             is_active=user.is_active,
-            last_login=user.last_login.isoformat() if user.last_login else None,
-            created_at=user.created_at.isoformat() if user.created_at else None,
-            updated_at=user.updated_at.isoformat() if user.updated_at else None
+            last_login=user.last_login,
+            created_at=user.created_at,
+            updated_at=user.updated_at
         )
     
     def to_dict(self) -> dict:
@@ -171,6 +175,19 @@ class AuthResponseDTO:
             )
         )
     
+    @classmethod
+    def from_profile(cls, profile: dict, tokens: dict) -> 'AuthResponseDTO':
+        """
+        Crea DTO desde el perfil cacheado (UserResponseDTO.to_dict) y tokens
+        """
+        return cls(
+            user=UserResponseDTO(**profile),
+            tokens=TokensDTO(
+                access_token=tokens['access_token'],
+                refresh_token=tokens['refresh_token']
+            )
+        )
+    
     def to_dict(self) -> dict:
         """Convierte a diccionario nested"""
         return {
@@ -3,7 +3,8 @@ Product DTOs - Data Transfer Objects
 Equivalente a src/dto/product.dto.js
 """
 from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Optional, Dict, Any, Union
 from decimal import Decimal
 
 
@@ -70,17 +71,23 @@ class UpdateProductDTO:
 
 @dataclass
 class ProductResponseDTO:
-    """DTO para respuesta de producto"""
+    """
+    DTO para respuesta de producto
+    
+    from_model deja price (Decimal) y fechas (datetime) nativos y los
+    serializa json_util; los valores leídos de cache (TieredCache, read
+    model) ya vienen como float e ISO 8601. El JSON de salida es el mismo.
+    """
     id: str
     name: str
     description: Optional[str]
-    price: float
+    price: Union[Decimal, float]
     stock: int
     category: Optional[str]
     is_active: bool
     created_by: str
-    created_at: str
-    updated_at: str
+    created_at: Union[datetime, str]
+    updated_at: Union[datetime, str]
     creator: Optional[Dict[str, str]] = None
     
     @classmethod
@@ -90,13 +97,13 @@ class ProductResponseDTO:
             'id': product.id,
             'name': product.name,
             'description': product.description,
-            'price': float(product.price),
+            'price': product.price,
             'stock': product.stock,
             'category': product.category,
             'is_active': product.is_active,
             'created_by': product.created_by,
-            'created_at': product.created_at.isoformat(),
-            'updated_at': product.updated_at.isoformat()
+            'created_at': product.created_at,
+            'updated_at': product.updated_at
         }
         
         if include_creator and product.creator:
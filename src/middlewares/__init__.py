@@ -4,11 +4,13 @@ Middlewares package
 from .auth_middleware import authenticate, authorize, optional_auth
 from .error_middleware import register_error_handlers
 from .cors_middleware import setup_cors
+from .coalesce_middleware import coalesce_requests
 
 __all__ = [
     'authenticate',
     'authorize',
     'optional_auth',
     'register_error_handlers',
-    'setup_cors'
+    'setup_cors',
+    'coalesce_requests'
 ]
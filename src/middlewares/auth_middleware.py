@@ -3,24 +3,132 @@ Auth Middleware - Authentication and Authorization
 Equivalente a src/middlewares/auth.middleware.js
 """
 from functools import wraps
+from typing import Optional
 from flask import request, g
 import jwt as pyjwt
+from src.utils.api_key_util import api_key_index
+from src.utils.app_error import AppError
 from src.utils.jwt_util import jwt_util
 from src.utils.response_util import ApiResponse
 from src.repositories.user_repository import user_repository
+from src.utils.principal_cache_util import LazyPrincipal, principal_cache, principal_from_user
 
 
-def authenticate():
+def _load_principal(user_id: str):
+    """Loader del principal cache (solo en miss)"""
+    user = user_repository.find_by_id(user_id)
+    return principal_from_user(user) if user else None
+
+
+def _status_error(principal: Optional[dict], payload: dict) -> Optional[str]:
+    """Motivo de rechazo del principal para este token, o None si es válido"""
+    if not principal or not principal['is_active']:
+        return 'Usuario no encontrado o inactivo'
+    
+    # Sesiones revocadas en bloque (token_version del principal cacheado)
+    if jwt_util.is_outdated(payload, principal.get('token_version')):
+        return 'Sesión revocada'
+    
+    return None
+
+
+def _request_principal(payload: dict, fresh: bool = False) -> dict:
+    """
+    Principal validado para un access token verificado
+    
+    El estado (is_active, token_version) y el rol se validan siempre
+    contra el principal, nunca contra los claims: una desactivación,
+    degradación o logout-all invalida el principal y el siguiente acceso
+    lo recarga.
+    
+    - por defecto: principal cache (L1, Redis y base de datos solo en miss)
+    - fresh: fila de users, sin caches (la ventana de un mensaje de
+      invalidación perdido no aplica en rutas de sesión y admin)
+    
+    Raises:
+        AppError: 401 si el usuario no existe, está inactivo o revocó sesiones
+    """
+    if fresh:
+        principal = _load_principal(payload['id'])
+    else:
+        principal = principal_cache.get(payload['id'], _load_principal)
+    
+    error = _status_error(principal, payload)
+    
+    if error:
+        raise AppError.unauthorized(error)
+    
+    return principal
+
+
+# Métodos sin efectos: el principal se resuelve recién cuando la vista lo usa
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+API_KEY_HEADER = 'X-API-Key'
+
+
+def _authenticate_api_key(api_key: str, fresh: bool = False):
+    """
+    Autentica con API key (servicios internos): índice en memoria +
+    principal cacheado del usuario dueño, sin base de datos en el caso común
+    
+    Args:
+        fresh: True para leer la fila de users del dueño, como con JWT
+    
+    Returns:
+        Respuesta de error o None si g.user quedó cargado
+    """
+    entry = api_key_index.verify(api_key)
+    
+    if not entry:
+        return ApiResponse.unauthorized('API key inválida')
+    
+    if fresh:
+        principal = _load_principal(entry['user_id'])
+    else:
+        principal = principal_cache.get(entry['user_id'], _load_principal)
+    
+    if not principal or not principal['is_active']:
+        return ApiResponse.unauthorized('Usuario no encontrado o inactivo')
+    
+    g.user = LazyPrincipal.from_principal(principal)
+    g.token = None
+    g.api_key_id = entry['id']
+    g.auth_method = 'api_key'
+    user_repository.touch(principal['id'])
+    return None
+
+
+def authenticate(allow_api_key: bool = True, fresh: bool = False):
     """
     Middleware de autenticación
     Equivalente a authenticate() en Node.js
     
-    Verifica el token JWT y agrega el usuario a g.user
+    Verifica el token JWT (o la API key del header X-API-Key) y agrega el
+    usuario a g.user; g.auth_method indica cuál se usó
+    
+    g.user es un LazyPrincipal: id y email salen de los claims del token
+    verificado, y el principal cacheado (is_active, token_version, role,
+    name) se carga y valida al primer acceso a otro campo. Las vistas GET
+    que solo usan el id no consultan ningún cache; escrituras (POST, PUT,
+    DELETE, ...) validan el principal antes de la vista
+    
+    Args:
+        allow_api_key: False en rutas de sesión (logout) que requieren JWT
+        fresh: True para validar usuario activo, rol y token_version con la
+            fila de users antes de la vista (rutas de sesión y administración)
     """
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             try:
+                api_key = request.headers.get(API_KEY_HEADER)
+                
+                if api_key and allow_api_key:
+                    error = _authenticate_api_key(api_key, fresh)
+                    return error if error else f(*args, **kwargs)
+                
                 # Obtener token del header Authorization
                 auth_header = request.headers.get('Authorization', '')
                 
@@ -38,24 +146,33 @@ def authenticate():
                 except pyjwt.InvalidTokenError:
                     return ApiResponse.unauthorized('Token inválido')
                 
-                # Verificar que el usuario existe y está activo
-                user = user_repository.find_by_id(payload['id'])
+                # Usuario del token: id/email de los claims; el principal
+                # (estado, rol, name) se valida al primer acceso que lo
+                # necesite, o antes de la vista en rutas fresh y escrituras
+                user = LazyPrincipal(payload, loader=lambda: _request_principal(payload))
                 
-                if not user or not user.is_active:
-                    return ApiResponse.unauthorized('Usuario no encontrado o inactivo')
+                try:
+                    if fresh:
+                        user = LazyPrincipal.from_principal(_request_principal(payload, fresh=True))
+                    elif request.method not in SAFE_METHODS:
+                        user.load()
+                except AppError as e:
+                    return ApiResponse.unauthorized(e.message)
                 
                 # Agregar usuario a g (Flask's application context)
-                g.user = {
-                    'id': user.id,
-                    'email': user.email,
-                    'name': user.name,
-                    'role': user.role.value if hasattr(user.role, 'value') else user.role
-                }
+                g.user = user
                 g.token = token
+                g.auth_method = 'jwt'
+                
+                # last_seen_at (write-behind, sin escritura en el request)
+                user_repository.touch(payload['id'])
                 
                 # Continuar con la request
                 return f(*args, **kwargs)
                 
+            except AppError as e:
+                # p.ej. 401 del principal que la vista cargó (LazyPrincipal)
+                return ApiResponse.error(e.message, e.code, e.details, e.status_code)
             except Exception as e:
                 return ApiResponse.internal_error(f'Error en autenticación: {str(e)}')
         
@@ -69,7 +186,8 @@ def authorize(allowed_roles: list):
     Equivalente a authorize() en Node.js
     
     Verifica que el usuario tenga uno de los roles permitidos
-    Debe usarse DESPUÉS de authenticate()
+    Debe usarse DESPUÉS de authenticate(); con API key aplica el rol del
+    usuario dueño de la key
     
     Usage:
         @authenticate()
@@ -97,6 +215,9 @@ def authorize(allowed_roles: list):
                 
                 return f(*args, **kwargs)
                 
+            except AppError as e:
+                # El rol carga el principal: usuario inactivo o sesión revocada
+                return ApiResponse.error(e.message, e.code, e.details, e.status_code)
             except Exception as e:
                 return ApiResponse.internal_error(f'Error en autorización: {str(e)}')
         
@@ -121,15 +242,7 @@ def optional_auth():
                     
                     try:
                         payload = jwt_util.verify_access_token(token)
-                        user = user_repository.find_by_id(payload['id'])
-                        
-                        if user and user.is_active:
-                            g.user = {
-                                'id': user.id,
-                                'email': user.email,
-                                'name': user.name,
-                                'role': user.role.value if hasattr(user.role, 'value') else user.role
-                            }
+                        g.user = LazyPrincipal.from_principal(_request_principal(payload))
                     except:
                         pass  # Ignorar errores, es autenticación opcional
                 
@@ -0,0 +1,82 @@
+"""
+Coalesce Middleware - Single-flight para requests de lectura
+Agrupa requests GET idénticas concurrentes en una sola computación
+"""
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+from flask import request, make_response, Response
+from src.utils.jwt_util import jwt_util
+from src.utils.singleflight_util import request_coalescer
+
+
+def _visibility_class() -> str:
+    """
+    Clase de visibilidad de la request
+    Requests con distinto nivel de acceso nunca comparten respuesta
+    """
+    auth_header = request.headers.get('Authorization', '')
+
+    if not auth_header.startswith('Bearer '):
+        return 'anonymous'
+
+    try:
+        payload = jwt_util.verify_access_token(auth_header.replace('Bearer ', ''))
+        return f"role:{payload.get('role')}"
+    except Exception:
+        return 'anonymous'
+
+
+def _request_key() -> str:
+    """
+    Key normalizada: ruta + query string ordenado + clase de visibilidad
+    """
+    query = urlencode(sorted(request.args.items(multi=True)))
+    raw = f'{request.endpoint}|{request.path}?{query}|{_visibility_class()}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _serialize(rv) -> dict:
+    """Serializa la respuesta de la vista para compartirla (con todos sus headers)"""
+    response = make_response(rv)
+    return {
+        'status': response.status_code,
+        'body': response.get_data(as_text=True),
+        'headers': list(response.headers.items())
+    }
+
+
+def coalesce_requests():
+    """
+    Middleware de single-flight para lecturas
+
+    Requests GET concurrentes con la misma ruta, query string normalizado
+    y clase de visibilidad esperan a un único líder y comparten su
+    respuesta serializada (por proceso y entre workers vía Redis).
+
+    Usage:
+        @product_bp.route('', methods=['GET'])
+        @coalesce_requests()
+        def get_all():
+            pass
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != 'GET':
+                return f(*args, **kwargs)
+
+            payload = request_coalescer.execute(
+                _request_key(),
+                lambda: _serialize(f(*args, **kwargs))
+            )
+
+            # Headers como pares: en Redis quedan como listas JSON
+            return Response(
+                payload['body'],
+                status=payload['status'],
+                headers=[tuple(header) for header in payload['headers']]
+            )
+
+        return decorated_function
+    return decorator
@@ -0,0 +1,81 @@
+"""
+Pre-Auth Middleware - Gate delante de POST /api/auth/login
+Corta intentos de IPs/subredes con mala reputación antes de validar el
+body, consultar users o correr el hash del password
+"""
+from functools import wraps
+from flask import request
+from src.utils.preauth_gate_util import preauth_gate
+from src.utils.response_util import ApiResponse
+
+
+POW_CHALLENGE_HEADER = 'X-PoW-Challenge'
+POW_NONCE_HEADER = 'X-PoW-Nonce'
+
+
+def _rejection(decision):
+    """Respuesta para un intento que no pasa el gate"""
+    if decision.action == 'challenge':
+        return ApiResponse.error(
+            'Resuelve el desafío de proof-of-work para continuar',
+            'POW_REQUIRED',
+            {
+                'challenge': decision.challenge,
+                'difficulty': decision.difficulty,
+                'algorithm': 'sha256(challenge:nonce) con difficulty bits iniciales en cero'
+            },
+            428
+        )
+
+    response, status = ApiResponse.error(
+        'Demasiados intentos fallidos, intenta más tarde',
+        'LOGIN_THROTTLED',
+        {'reason': decision.reason, 'retry_after': decision.retry_after},
+        429
+    )
+    response.headers['Retry-After'] = str(decision.retry_after)
+    return response, status
+
+
+def preauth_gate_required():
+    """
+    Middleware de pre-autenticación
+
+    Un 401 de la vista (credenciales inválidas) suma a la reputación de la
+    IP, su subred y al presupuesto global de fallos.
+
+    Usage:
+        @auth_bp.route('/login', methods=['POST'])
+        @rate_limit('auth:login', limit=20, period=60)
+        @preauth_gate_required()
+        @validate_login()
+        def login():
+            pass
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not preauth_gate.enabled:
+                return f(*args, **kwargs)
+
+            ip_address = request.remote_addr
+            decision = preauth_gate.check(
+                ip_address,
+                request.headers.get(POW_CHALLENGE_HEADER),
+                request.headers.get(POW_NONCE_HEADER)
+            )
+
+            if not decision.allowed:
+                return _rejection(decision)
+
+            result = f(*args, **kwargs)
+
+            status = result[1] if isinstance(result, tuple) else getattr(result, 'status_code', 200)
+            if status == 401:
+                preauth_gate.record_failure(ip_address)
+
+            return result
+
+        return decorated_function
+    return decorator
+
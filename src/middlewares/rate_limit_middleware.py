@@ -0,0 +1,111 @@
+"""
+Rate Limit Middleware - Políticas por ruta, usuario e IP
+Headers RateLimit-* (draft IETF) en todas las respuestas limitadas
+"""
+import os
+from functools import wraps
+from flask import g, request
+from src.utils.rate_limit_util import RateLimitPolicy, RateLimitResult, rate_limiter
+from src.utils.response_util import ApiResponse
+
+
+# Política por defecto de los blueprints (RATE_LIMIT_MAX_REQUESTS por ventana)
+DEFAULT_LIMIT = int(os.getenv('RATE_LIMIT_MAX_REQUESTS', 100))
+DEFAULT_PERIOD = int(os.getenv('RATE_LIMIT_WINDOW_MS', 900000)) / 1000
+
+
+def _identity(policy: RateLimitPolicy) -> str:
+    """Identidad del bucket según el scope de la política"""
+    if policy.scope == 'route':
+        return '*'
+
+    if policy.scope == 'user' and getattr(g, 'user', None):
+        return f"user:{g.user['id']}"
+
+    return f'ip:{request.remote_addr or "unknown"}'
+
+
+def _apply(policy: RateLimitPolicy):
+    """Consume un token; retorna la respuesta 429 si se excedió el límite"""
+    if not rate_limiter.enabled:
+        return None
+
+    result = rate_limiter.check(policy, _identity(policy))
+
+    # Los headers reflejan la política más restrictiva de la request
+    current = g.get('rate_limit')
+    if current is None or not result.allowed or (current.allowed and result.remaining < current.remaining):
+        g.rate_limit = result
+
+    if not result.allowed:
+        return ApiResponse.error(
+            'Demasiadas solicitudes, intenta más tarde',
+            'TOO_MANY_REQUESTS',
+            {'policy': result.policy, 'retry_after': result.retry_after},
+            429
+        )
+
+    return None
+
+
+def rate_limit(name: str, limit: int, period: float, scope: str = 'ip', lease: int = 1):
+    """
+    Middleware de rate limit por ruta
+
+    scope='user' usa g.user: debe ir debajo de @authenticate()
+    (sin usuario autenticado cae a la IP)
+
+    Usage:
+        @auth_bp.route('/login', methods=['POST'])
+        @rate_limit('auth:login', limit=10, period=60)
+        def login():
+            pass
+    """
+    policy = RateLimitPolicy(name, limit, period, scope, lease)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            rejected = _apply(policy)
+            if rejected is not None:
+                return rejected
+
+            return f(*args, **kwargs)
+
+        return decorated_function
+    return decorator
+
+
+def limit_blueprint(bp, name: str, limit: int = DEFAULT_LIMIT, period: float = DEFAULT_PERIOD,
+                    scope: str = 'ip', lease: int = 1) -> None:
+    """
+    Política para todas las rutas del blueprint (before_request)
+    Corre antes de @authenticate(), así que scope='user' no aplica acá
+    """
+    policy = RateLimitPolicy(name, limit, period, scope, lease)
+
+    @bp.before_request
+    def check_rate_limit():
+        return _apply(policy)
+
+
+def _add_headers(response):
+    result: RateLimitResult = g.get('rate_limit')
+
+    if result is not None:
+        response.headers['RateLimit-Limit'] = str(result.limit)
+        response.headers['RateLimit-Remaining'] = str(result.remaining)
+        response.headers['RateLimit-Reset'] = str(result.reset)
+
+        if not result.allowed:
+            response.headers['Retry-After'] = str(result.retry_after)
+
+    return response
+
+
+def register_rate_limit(app):
+    """
+    Configura el rate limiter y agrega los headers RateLimit-* a las respuestas
+    """
+    rate_limiter.init_app(app)
+    app.after_request(_add_headers)
@@ -6,10 +6,12 @@ from config.database import db
 from .user import User as UserClass
 from .product import Product as ProductClass
 from .login_attempt import LoginAttempt as LoginAttemptClass
+from .api_key import ApiKey as ApiKeyClass
 
 # Definir modelos con db
 User = UserClass.define_model(db)
 Product = ProductClass.define_model(db)
 LoginAttempt = LoginAttemptClass.define_model(db)
+ApiKey = ApiKeyClass.define_model(db)
 
-__all__ = ['User', 'Product', 'LoginAttempt']
+__all__ = ['User', 'Product', 'LoginAttempt', 'ApiKey']
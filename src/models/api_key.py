@@ -0,0 +1,50 @@
+"""
+ApiKey model - SQLAlchemy
+API keys de servicios internos (se autentican como el usuario dueño)
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+import uuid
+
+
+class ApiKey:
+    """ApiKey model definition"""
+    
+    @staticmethod
+    def define_model(db):
+        """Define ApiKey model with SQLAlchemy"""
+        
+        class ApiKeyModel(db.Model):
+            __tablename__ = 'api_keys'
+            
+            # Columns
+            id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+            user_id = Column(String(36), ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+            name = Column(String(100), nullable=False)
+            # Parte pública de la key: índice de búsqueda (la key nunca se guarda)
+            prefix = Column(String(16), unique=True, nullable=False, index=True)
+            # SHA-256 hex de la key completa
+            key_hash = Column(String(64), nullable=False)
+            is_active = Column(Boolean, default=True, nullable=False)
+            expires_at = Column(DateTime, nullable=True)
+            revoked_at = Column(DateTime, nullable=True)
+            created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+            updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+            
+            def to_dict(self) -> dict:
+                """Convierte el modelo a diccionario (sin key_hash)"""
+                return {
+                    'id': self.id,
+                    'user_id': self.user_id,
+                    'name': self.name,
+                    'prefix': self.prefix,
+                    'is_active': self.is_active,
+                    'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+                    'revoked_at': self.revoked_at.isoformat() if self.revoked_at else None,
+                    'created_at': self.created_at.isoformat() if self.created_at else None
+                }
+            
+            def __repr__(self):
+                return f'<ApiKey {self.prefix} ({self.name})>'
+        
+        return ApiKeyModel
@@ -31,7 +31,7 @@ class Product:
             updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
             
             # Relationships
-            creator = relationship('User', back_populates='products')
+            creator = relationship('UserModel', back_populates='products')
             
             # Constraints
             __table_args__ = (
@@ -3,9 +3,9 @@ User model - SQLAlchemy
 Equivalente a src/models/User.js
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from werkzeug.security import generate_password_hash, check_password_hash
+from src.utils.password_hasher_util import password_hasher
 import uuid
 import enum
 
@@ -44,11 +44,15 @@ class User:
             role = Column(SQLEnum(UserRole), default=UserRole.USER, nullable=False)
             is_active = Column(Boolean, default=True, nullable=False)
             last_login = Column(DateTime, nullable=True)
+            # Último request autenticado (write-behind, ver ActivityBuffer)
+            last_seen_at = Column(DateTime, nullable=True)
+            # Se incrementa para invalidar todos los tokens emitidos al usuario
+            token_version = Column(Integer, default=0, server_default='0', nullable=False)
             created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
             updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
             
             # Relationships
-            products = relationship('Product', back_populates='creator', lazy='dynamic')
+            products = relationship('ProductModel', back_populates='creator', lazy='dynamic')
             
             def __init__(self, **kwargs):
                 """Constructor - hashea password automáticamente"""
@@ -60,15 +64,26 @@ class User:
                 """
                 Hashea y establece la contraseña
                 Equivalente al hook beforeCreate/beforeUpdate en Sequelize
+                El hash corre en el pool de procesos de password_hasher
                 """
-                self.password = generate_password_hash(password, method='pbkdf2:sha256')
+                self.password = password_hasher.hash_password(password)
             
             def check_password(self, password: str) -> bool:
                 """
                 Verifica si la contraseña es correcta
                 Equivalente a comparePassword en Node
+                
+                Si el hash usa un algoritmo/costo desactualizado se re-hashea
+                con la configuración actual; el cambio queda en la sesión y se
+                persiste con el commit de la transacción del login
                 """
-                return check_password_hash(self.password, password)
+                if not password_hasher.verify_password(self.password, password):
+                    return False
+                
+                if password_hasher.needs_rehash(self.password):
+                    self.set_password(password)
+                
+                return True
             
             def to_dict(self, exclude_password: bool = True) -> dict:
                 """
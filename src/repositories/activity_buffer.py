@@ -0,0 +1,209 @@
+"""
+Activity Buffer - Write-behind de timestamps de actividad de usuarios
+last_login y last_seen_at se acumulan por worker y se escriben en lote,
+fuera del request
+"""
+import atexit
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from config.database import db
+from src.models import User
+from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import LatencyHistogram
+
+
+class ActivityBuffer:
+    """
+    Buffer write-behind de columnas de actividad de users
+
+    - record(field, user_id) guarda el timestamp más reciente por usuario
+      (varios logins del mismo usuario entre flushes son una sola fila)
+    - Un thread escribe cada FLUSH_SECONDS, o antes si hay MAX_PENDING
+      usuarios pendientes: staleness máxima ~FLUSH_SECONDS por worker
+    - Un UPDATE por columna y lote, en su propia transacción:
+        UPDATE users AS u SET last_login = v.at
+        FROM (VALUES (:id_0, :at_0), ...) AS v(id, at)
+        WHERE u.id = v.id AND (u.last_login IS NULL OR u.last_login < v.at)
+      La condición evita reescribir filas con un valor más nuevo (flushes
+      de otros workers fuera de orden) y no toca updated_at ni columnas
+      indexadas, así Postgres puede hacer HOT updates
+    - Flush final al terminar el worker (atexit); si un flush falla las
+      filas vuelven al buffer para el siguiente
+
+    Deshabilitado (o sin start) record() devuelve False y el repositorio
+    escribe de forma síncrona como antes.
+    """
+
+    ENABLED = os.getenv('ACTIVITY_BUFFER_ENABLED', 'true').lower() == 'true'
+    FLUSH_SECONDS = float(os.getenv('ACTIVITY_FLUSH_SECONDS', 10))
+    MAX_PENDING = int(os.getenv('ACTIVITY_MAX_PENDING', 5000))
+    BATCH_SIZE = int(os.getenv('ACTIVITY_BATCH_SIZE', 1000))
+    FIELDS = ('last_login', 'last_seen_at')
+
+    def __init__(self):
+        self.enabled = False
+        self._app = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._pending: Dict[str, Dict[str, datetime]] = {field: {} for field in self.FIELDS}
+        self._flush_duration = LatencyHistogram()
+        self._stats = {'recorded': 0, 'coalesced': 0, 'flushes': 0, 'rows_flushed': 0, 'statements': 0, 'errors': 0}
+
+    def start(self, app) -> None:
+        """Arranca el flush periódico según la configuración de la app"""
+        self.enabled = app.config.get('ACTIVITY_BUFFER_ENABLED', self.ENABLED)
+        self._app = app
+
+        if not self.enabled or self._flusher is not None:
+            return
+
+        self._flusher = threading.Thread(target=self._run, name='activity-flush', daemon=True)
+        self._flusher.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Detiene el thread y escribe lo pendiente"""
+        self._stop.set()
+        self._wake.set()
+        self.flush()
+
+    def record(self, field: str, user_id: str, at: Optional[datetime] = None) -> bool:
+        """
+        Registra actividad del usuario para el próximo flush
+
+        Returns:
+            False si el buffer no está activo (el caller escribe síncrono)
+        """
+        if not self.enabled or self._flusher is None:
+            return False
+
+        at = at or datetime.utcnow()
+
+        with self._lock:
+            pending = self._pending[field]
+            previous = pending.get(user_id)
+            self._stats['recorded'] += 1
+
+            if previous is not None:
+                self._stats['coalesced'] += 1
+                if previous >= at:
+                    return True
+
+            pending[user_id] = at
+            size = sum(len(rows) for rows in self._pending.values())
+
+        if size >= self.MAX_PENDING:
+            self._wake.set()
+
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.FLUSH_SECONDS)
+            self._wake.clear()
+
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f'Activity buffer flush error: {e}')
+
+    # ========================================
+    # FLUSH
+    # ========================================
+
+    def flush(self) -> int:
+        """
+        Escribe lo pendiente (un UPDATE por columna y lote)
+
+        Returns:
+            Filas enviadas a la base de datos
+        """
+        with self._flush_lock:
+            with self._lock:
+                batches = {field: rows for field, rows in self._pending.items() if rows}
+                self._pending = {field: {} for field in self.FIELDS}
+
+            if not batches or self._app is None:
+                return 0
+
+            started_at = time.perf_counter()
+            written = 0
+
+            try:
+                with self._app.app_context():
+                    with db.engine.begin() as connection:
+                        for field, rows in batches.items():
+                            written += self._write(connection, field, list(rows.items()))
+            except Exception as e:
+                self._restore(batches)
+                self._stats['errors'] += 1
+                logger.error(f'Activity buffer flush failed, will retry: {e}')
+                return 0
+
+            self._stats['flushes'] += 1
+            self._stats['rows_flushed'] += written
+            self._flush_duration.observe((time.perf_counter() - started_at) * 1000)
+            return written
+
+    def _write(self, connection, field: str, rows: List[Tuple[str, datetime]]) -> int:
+        table = connection.dialect.identifier_preparer.format_table(User.__table__)
+        column = connection.dialect.identifier_preparer.quote(field)
+
+        for start in range(0, len(rows), self.BATCH_SIZE):
+            chunk = rows[start:start + self.BATCH_SIZE]
+
+            if connection.dialect.name == 'postgresql':
+                values = ', '.join(f'(:id_{i}, :at_{i})' for i in range(len(chunk)))
+                params: Dict[str, Any] = {}
+                for i, (user_id, at) in enumerate(chunk):
+                    params[f'id_{i}'] = user_id
+                    params[f'at_{i}'] = at
+
+                connection.execute(text(
+                    f'UPDATE {table} AS u SET {column} = v.at '
+                    f'FROM (VALUES {values}) AS v(id, at) '
+                    f'WHERE u.id = v.id AND (u.{column} IS NULL OR u.{column} < v.at)'
+                ), params)
+            else:
+                # Sin VALUES con alias de columnas (SQLite): executemany en la misma transacción
+                connection.execute(text(
+                    f'UPDATE {table} SET {column} = :at '
+                    f'WHERE id = :id AND ({column} IS NULL OR {column} < :at)'
+                ), [{'id': user_id, 'at': at} for user_id, at in chunk])
+
+            self._stats['statements'] += 1
+
+        return len(rows)
+
+    def _restore(self, batches: Dict[str, Dict[str, datetime]]) -> None:
+        """Devuelve filas no escritas al buffer (sin pisar timestamps más nuevos)"""
+        with self._lock:
+            for field, rows in batches.items():
+                pending = self._pending[field]
+                for user_id, at in rows.items():
+                    if pending.get(user_id) is None or pending[user_id] < at:
+                        pending[user_id] = at
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Registros, filas escritas por flush y pendientes"""
+        with self._lock:
+            pending = {field: len(rows) for field, rows in self._pending.items()}
+
+        return dict(
+            self._stats,
+            enabled=self.enabled,
+            flush_seconds=self.FLUSH_SECONDS,
+            pending=pending,
+            flush_duration=self._flush_duration.to_dict()
+        )
+
+
+# Singleton instance
+activity_buffer = ActivityBuffer()
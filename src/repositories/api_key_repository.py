@@ -0,0 +1,80 @@
+"""
+ApiKey Repository
+Altas y revocaciones de API keys; cada cambio invalida el índice en memoria
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from src.models import ApiKey
+from src.repositories.base_repository import BaseRepository
+from src.repositories.unit_of_work import unit_of_work
+from src.utils.api_key_util import api_key_index, generate_api_key
+
+
+class ApiKeyRepository(BaseRepository[ApiKey]):
+    """
+    ApiKey repository
+    La key completa solo existe en el valor que devuelve create_key
+    """
+    
+    def __init__(self):
+        super().__init__(ApiKey)
+        self.index = api_key_index
+    
+    def create_key(self, user_id: str, name: str, expires_at: Optional[datetime] = None) -> Tuple[ApiKey, str]:
+        """
+        Crea una API key para el usuario
+        
+        Returns:
+            (registro, key completa para entregar una sola vez)
+        """
+        key, prefix, key_hash = generate_api_key()
+        
+        api_key = self.create({
+            'user_id': user_id,
+            'name': name,
+            'prefix': prefix,
+            'key_hash': key_hash,
+            'expires_at': expires_at
+        })
+        
+        unit_of_work.after_commit(self.index.invalidate)
+        return api_key, key
+    
+    def revoke(self, prefix: str) -> bool:
+        """Revoca una key por prefix (deja de valer en todos los workers)"""
+        updated = ApiKey.query.filter_by(prefix=prefix, is_active=True).update(
+            {ApiKey.is_active: False, ApiKey.revoked_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+        unit_of_work.commit()
+        
+        if updated:
+            unit_of_work.after_commit(self.index.invalidate)
+        
+        return bool(updated)
+    
+    def find_by_user(self, user_id: str) -> List[ApiKey]:
+        """Keys de un usuario (activas y revocadas)"""
+        return ApiKey.query.filter_by(user_id=user_id).order_by(ApiKey.created_at).all()
+    
+    def load_index(self) -> List[Dict[str, Any]]:
+        """Entradas del índice en memoria: keys activas sin el resto de columnas"""
+        rows = ApiKey.query.with_entities(
+            ApiKey.id, ApiKey.prefix, ApiKey.key_hash, ApiKey.user_id, ApiKey.expires_at
+        ).filter_by(is_active=True).all()
+        
+        return [
+            {
+                'id': row.id,
+                'prefix': row.prefix,
+                'key_hash': row.key_hash,
+                'user_id': row.user_id,
+                # expires_at se guarda en UTC naive (datetime.utcnow)
+                'expires_at': (row.expires_at - datetime(1970, 1, 1)).total_seconds() if row.expires_at else None
+            }
+            for row in rows
+        ]
+
+
+# Singleton instance
+api_key_repository = ApiKeyRepository()
@@ -5,6 +5,7 @@ Equivalente a src/repository/base.repository.js
 from typing import TypeVar, Generic, List, Optional, Dict, Any
 from sqlalchemy.exc import SQLAlchemyError
 from config.database import db
+from src.repositories.unit_of_work import unit_of_work
 from src.utils.logger_util import logger
 
 T = TypeVar('T')
@@ -95,10 +96,10 @@ class BaseRepository(Generic[T]):
         try:
             instance = self.model(**data)
             db.session.add(instance)
-            db.session.commit()
+            unit_of_work.commit()
             return instance
         except SQLAlchemyError as e:
-            db.session.rollback()
+            unit_of_work.rollback()
             logger.error(f'Error creating {self.model.__name__}', error=str(e))
             raise
     
@@ -117,10 +118,10 @@ class BaseRepository(Generic[T]):
                 if hasattr(instance, key):
                     setattr(instance, key, value)
             
-            db.session.commit()
+            unit_of_work.commit()
             return instance
         except SQLAlchemyError as e:
-            db.session.rollback()
+            unit_of_work.rollback()
             logger.error(f'Error updating {self.model.__name__}', id=id, error=str(e))
             raise
     
@@ -136,10 +137,10 @@ class BaseRepository(Generic[T]):
                 return False
             
             db.session.delete(instance)
-            db.session.commit()
+            unit_of_work.commit()
             return True
         except SQLAlchemyError as e:
-            db.session.rollback()
+            unit_of_work.rollback()
             logger.error(f'Error deleting {self.model.__name__}', id=id, error=str(e))
             raise
     
@@ -162,9 +163,9 @@ class BaseRepository(Generic[T]):
         try:
             instances = [self.model(**data) for data in data_list]
             db.session.add_all(instances)
-            db.session.commit()
+            unit_of_work.commit()
             return instances
         except SQLAlchemyError as e:
-            db.session.rollback()
+            unit_of_work.rollback()
             logger.error(f'Error bulk creating {self.model.__name__}', error=str(e))
             raise
@@ -0,0 +1,281 @@
+"""
+Email Filter - Emails registrados en un counting Bloom filter
+Un miss definitivo evita consultar la tabla users (typos, listas de
+credential stuffing, registros de emails nuevos)
+"""
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, Optional
+from src.constants.constants import RedisKeys
+from src.utils.bloom_util import CountingBloomFilter, dimensions, positions
+from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import redis_metrics
+from src.utils.redis_util import RedisUtil, redis_util
+
+
+class EmailFilter:
+    """
+    Filtro de pertenencia de emails registrados
+
+    - Cada worker arma un CountingBloomFilter desde users al arrancar (en
+      background) y lo mantiene en create/update/delete de UserRepository
+    - Los emails registrados en otros workers después del build se ven a
+      través de un bitmap compartido en Redis con las mismas posiciones:
+        auth:emails:bloom:<size>:<hashes>         bitmap (SETBIT por alta)
+        auth:emails:bloom:<size>:<hashes>:ready   marcador de bitmap completo
+
+    might_exist(email) devuelve False solo si el email no está en el filtro
+    local ni en el bitmap de Redis. Sin Redis, sin bitmap listo (o sin la
+    key del bitmap, p. ej. desalojada) o sin filtro construido devuelve
+    True y se consulta la base de datos. Si un SETBIT de alta falla se
+    borra el marcador :ready (el bitmap deja de usarse hasta el próximo
+    build) y, si tampoco se puede, falla el alta: ningún worker puede
+    descartar un email registrado. EMAIL_FILTER_LOCAL_ONLY confía en el
+    filtro local (solo para un único proceso).
+
+    Las bajas se restan del filtro local; en Redis quedan como falsos
+    positivos hasta que se borre el bitmap.
+    """
+
+    ENABLED = os.getenv('EMAIL_FILTER_ENABLED', 'true').lower() == 'true'
+    CAPACITY = int(os.getenv('EMAIL_FILTER_CAPACITY', 1000000))
+    ERROR_RATE = float(os.getenv('EMAIL_FILTER_ERROR_RATE', 0.01))
+    MAX_BYTES = int(os.getenv('EMAIL_FILTER_MAX_BYTES', 16 * 1024 * 1024))
+    LOCAL_ONLY = os.getenv('EMAIL_FILTER_LOCAL_ONLY', 'false').lower() == 'true'
+
+    def __init__(self, redis: Optional[RedisUtil] = None):
+        self.redis = redis or redis_util
+        self.enabled = self.ENABLED
+        self.local_only = self.LOCAL_ONLY
+        self.size, self.hashes = dimensions(self.CAPACITY, self.ERROR_RATE, max_size=self.MAX_BYTES)
+        # Size y hashes en la key: workers con otra configuración no comparten bits
+        self.key = f'{RedisKeys.EMAIL_FILTER}{self.size}:{self.hashes}'
+        self._lock = threading.Lock()
+        self._filter: Optional[CountingBloomFilter] = None
+        self._pending: Optional[list] = None
+        self._stats = {'checks': 0, 'definite_misses': 0, 'redis_checks': 0, 'shared_hits': 0, 'false_positives': 0}
+
+    def start(self, app, loader: Callable[[], Iterable[str]]) -> None:
+        """
+        Construye el filtro en background según la configuración de la app
+
+        Args:
+            app: Flask app (el loader corre dentro de su app context)
+            loader: Función que itera los emails de users
+        """
+        self.enabled = app.config.get('EMAIL_FILTER_ENABLED', self.enabled)
+        self.local_only = app.config.get('EMAIL_FILTER_LOCAL_ONLY', self.local_only)
+
+        if not self.enabled:
+            return
+
+        thread = threading.Thread(target=self.build, args=(app, loader), name='email-filter-build', daemon=True)
+        thread.start()
+
+    def build(self, app, loader: Callable[[], Iterable[str]]) -> int:
+        """Arma el filtro desde la base de datos y lo publica en Redis"""
+        fresh = self._new_filter()
+
+        with self._lock:
+            self._pending = []
+
+        try:
+            with app.app_context():
+                for email in loader():
+                    fresh.add(self._normalize(email))
+        except Exception as e:
+            with self._lock:
+                self._pending = None
+            logger.error(f'Email filter build failed: {e}')
+            return 0
+
+        # Altas que llegaron mientras se leía la tabla
+        with self._lock:
+            for email in self._pending:
+                fresh.add(email)
+            self._pending = None
+            self._filter = fresh
+
+        self._publish(fresh)
+        logger.info('Email filter ready', emails=len(fresh), memory_bytes=fresh.memory_bytes)
+        return len(fresh)
+
+    def _new_filter(self) -> CountingBloomFilter:
+        return CountingBloomFilter(self.CAPACITY, self.ERROR_RATE, max_bytes=self.MAX_BYTES)
+
+    @staticmethod
+    def _normalize(email: str) -> str:
+        return email.strip().lower()
+
+    # ========================================
+    # CONSULTA
+    # ========================================
+
+    def might_exist(self, email: str) -> bool:
+        """
+        False solo si el email seguro no está registrado (miss definitivo)
+        """
+        bloom = self._filter
+        if not self.enabled or bloom is None:
+            return True
+
+        email = self._normalize(email)
+        self._stats['checks'] += 1
+
+        if email in bloom or (not self.local_only and self._in_shared(email)):
+            return True
+
+        self._stats['definite_misses'] += 1
+        return False
+
+    def _in_shared(self, email: str) -> bool:
+        """Consulta el bitmap de Redis (un round-trip); ante cualquier duda True"""
+        client = self.redis.get_client()
+        if not client:
+            return True
+
+        self._stats['redis_checks'] += 1
+
+        with redis_metrics.track('email_filter', self.key) as tracked:
+            try:
+                bitfield = client.bitfield(self.key)
+                for position in positions(email, self.size, self.hashes):
+                    bitfield.get('u1', position)
+
+                pipe = client.pipeline(transaction=False)
+                pipe.exists(f'{self.key}:ready', self.key)
+                pipe.execute_command(*bitfield.command)
+                existing, bits = pipe.execute()
+            except Exception as e:
+                tracked.error = True
+                logger.warning(f'Email filter Redis check error: {e}')
+                return True
+
+            # Listo solo si están el marcador y el bitmap (BITFIELD GET sobre una key desalojada da ceros)
+            ready = existing == 2
+            found = not ready or all(bits)
+            tracked.hit = bool(ready) and found
+
+        if ready and found:
+            self._stats['shared_hits'] += 1
+
+        return found
+
+    def observe(self, email: str, found: bool) -> None:
+        """
+        Resultado de la consulta a la base de datos tras un might_exist True
+        Los emails encontrados se agregan al filtro local (vistos en Redis)
+        """
+        bloom = self._filter
+        if bloom is None:
+            return
+
+        email = self._normalize(email)
+
+        if not found:
+            self._stats['false_positives'] += 1
+        elif email not in bloom:
+            with self._lock:
+                bloom.add(email)
+
+    # ========================================
+    # ESCRITURA (UserRepository)
+    # ========================================
+
+    def add(self, email: str) -> None:
+        """Registra un email nuevo en el filtro local y en el bitmap de Redis"""
+        if not self.enabled:
+            return
+
+        email = self._normalize(email)
+
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(email)
+            if self._filter is not None:
+                self._filter.add(email)
+
+        self._set_bits(email)
+
+    def remove(self, email: str) -> None:
+        """
+        Quita un email del filtro local (usuario borrado o email cambiado)
+        Si el email nunca entró a este filtro (alta en otro worker) puede
+        restar contadores ajenos: el miss local resultante se confirma
+        contra Redis, que no se decrementa
+        """
+        with self._lock:
+            if self._filter is not None:
+                self._filter.remove(self._normalize(email))
+
+    def _set_bits(self, email: str) -> None:
+        """
+        SETBIT del alta en el bitmap compartido
+
+        Raises:
+            Exception: no se pudo escribir el bitmap ni retirar :ready (el
+                alta se aborta antes del commit)
+        """
+        client = self.redis.get_client()
+        if not client or self.local_only:
+            return
+
+        with redis_metrics.track('email_filter_add', self.key) as tracked:
+            try:
+                bitfield = client.bitfield(self.key)
+                for position in positions(email, self.size, self.hashes):
+                    bitfield.set('u1', position, 1)
+                bitfield.execute()
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Email filter Redis add error, disabling shared bitmap: {e}')
+                # Sin este alta el bitmap daría falsos negativos en otros workers
+                client.delete(f'{self.key}:ready')
+
+    def _publish(self, bloom: CountingBloomFilter) -> None:
+        """
+        Sube el filtro a Redis si el bitmap compartido todavía no está listo
+        OR con lo existente: no pisa bits de altas hechas en otros workers
+        """
+        client = self.redis.get_client()
+        if not client or self.local_only:
+            return
+
+        key = self.key
+        tmp_key = f'{key}:tmp:{uuid.uuid4().hex}'
+
+        with redis_metrics.track('email_filter_publish', key) as tracked:
+            try:
+                if client.exists(f'{key}:ready'):
+                    return
+
+                pipe = client.pipeline()
+                pipe.set(tmp_key, bloom.to_bitmap())
+                pipe.bitop('OR', key, key, tmp_key)
+                pipe.delete(tmp_key)
+                pipe.set(f'{key}:ready', 1)
+                pipe.execute()
+            except Exception as e:
+                tracked.error = True
+                logger.warning(f'Email filter publish error: {e}')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lookups evitados (definite_misses), falsos positivos y tamaño del filtro"""
+        bloom = self._filter
+        stats: Dict[str, Any] = dict(self._stats, enabled=self.enabled, ready=bloom is not None)
+
+        if bloom is not None:
+            stats.update(
+                emails=len(bloom),
+                size=bloom.size,
+                hashes=bloom.hashes,
+                memory_bytes=bloom.memory_bytes,
+                expected_error_rate=round(bloom.expected_error_rate(), 6)
+            )
+
+        return stats
+
+
+# Singleton instance
+email_filter = EmailFilter()
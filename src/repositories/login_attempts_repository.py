@@ -6,24 +6,35 @@ from typing import Optional
 from datetime import datetime, timedelta
 from src.models import LoginAttempt
 from src.repositories.base_repository import BaseRepository
-from config.database import db
+from src.repositories.login_attempts_store import login_attempts_store
+from src.repositories.unit_of_work import unit_of_work
 
 
 class LoginAttemptsRepository(BaseRepository[LoginAttempt]):
-    """LoginAttempts repository"""
+    """
+    LoginAttempts repository
+    
+    Usa Redis (LoginAttemptsStore: ventanas deslizantes por email e IP)
+    y cae a la tabla login_attempts si Redis no está disponible
+    """
     
     MAX_ATTEMPTS = 5
     BLOCK_DURATION_MINUTES = 15
     
     def __init__(self):
         super().__init__(LoginAttempt)
+        self.store = login_attempts_store
     
     def find_by_email(self, email: str) -> Optional[LoginAttempt]:
         """Encuentra record por email"""
         return self.find_one(email=email)
     
-    def is_blocked(self, email: str) -> bool:
-        """Verifica si el email está bloqueado"""
+    def is_blocked(self, email: str, ip_address: Optional[str] = None) -> bool:
+        """Verifica si el email (o la IP) está bloqueado"""
+        remaining = self.store.remaining_block_time(email, ip_address)
+        if remaining is not None:
+            return remaining > 0
+        
         record = self.find_by_email(email)
         
         if not record or not record.blocked_until:
@@ -31,8 +42,12 @@ class LoginAttemptsRepository(BaseRepository[LoginAttempt]):
         
         return datetime.utcnow() < record.blocked_until
     
-    def get_remaining_block_time(self, email: str) -> int:
+    def get_remaining_block_time(self, email: str, ip_address: Optional[str] = None) -> int:
         """Retorna segundos restantes de bloqueo"""
+        remaining = self.store.remaining_block_time(email, ip_address)
+        if remaining is not None:
+            return remaining
+        
         record = self.find_by_email(email)
         
         if not record or not record.blocked_until:
@@ -41,8 +56,14 @@ class LoginAttemptsRepository(BaseRepository[LoginAttempt]):
         remaining = (record.blocked_until - datetime.utcnow()).total_seconds()
         return max(0, int(remaining))
     
-    def increment_attempts(self, email: str, ip_address: str) -> LoginAttempt:
-        """Incrementa intentos de login"""
+    def increment_attempts(self, email: str, ip_address: str) -> Optional[LoginAttempt]:
+        """
+        Incrementa intentos de login
+        Retorna el record de la tabla solo en el fallback SQL
+        """
+        if self.store.record_failure(email, ip_address) is not None:
+            return None
+        
         record = self.find_by_email(email)
         
         if not record:
@@ -61,12 +82,16 @@ class LoginAttemptsRepository(BaseRepository[LoginAttempt]):
             if record.attempts >= self.MAX_ATTEMPTS:
                 record.blocked_until = datetime.utcnow() + timedelta(minutes=self.BLOCK_DURATION_MINUTES)
             
-            db.session.commit()
+            unit_of_work.commit()
         
         return record
     
     def reset_attempts(self, email: str) -> bool:
         """Resetea intentos después de login exitoso"""
+        reset = self.store.reset(email)
+        if reset is not None:
+            return reset
+        
         record = self.find_by_email(email)
         
         if not record:
@@ -74,7 +99,7 @@ class LoginAttemptsRepository(BaseRepository[LoginAttempt]):
         
         record.attempts = 0
         record.blocked_until = None
-        db.session.commit()
+        unit_of_work.commit()
         return True
 
 
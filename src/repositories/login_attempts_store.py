@@ -0,0 +1,145 @@
+"""
+Login Attempts Store - Throttling de logins en Redis
+Contadores de ventana deslizante por email y por IP, y bloqueos con TTL
+"""
+import os
+import time
+from typing import Optional
+from src.constants.constants import LoginAttempts, RedisKeys
+from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import redis_metrics
+from src.utils.redis_util import RedisUtil, redis_util
+
+
+# Registra un fallo en la ventana deslizante y bloquea al llegar al límite.
+# Contador aproximado: fallos de la ventana anterior ponderados por la
+# fracción que todavía se solapa + fallos de la ventana actual
+FAIL_SCRIPT = """
+local current = redis.call('incr', KEYS[1])
+if current == 1 then
+    redis.call('expire', KEYS[1], ARGV[1] * 2)
+end
+local previous = tonumber(redis.call('get', KEYS[2]) or '0')
+local estimate = previous * (1 - tonumber(ARGV[2])) + current
+if estimate >= tonumber(ARGV[3]) then
+    redis.call('set', KEYS[3], 1, 'EX', ARGV[4])
+    return 1
+end
+return 0
+"""
+
+
+class LoginAttemptsStore:
+    """
+    Throttling de logins fallidos
+
+    Keys (hash tag por sujeto: contadores y bloqueo en el mismo shard):
+        auth:login:{email:<email>}:<ventana>   fallos en la ventana
+        auth:login:{email:<email>}:blocked     bloqueo (TTL = tiempo restante)
+        auth:login:{ip:<ip>}:...               ídem por IP
+
+    El límite por email frena la fuerza bruta sobre una cuenta; el límite
+    por IP (más alto) frena el credential stuffing contra muchas cuentas.
+    Un login exitoso resetea solo el email, nunca la IP.
+
+    Todos los métodos devuelven None si Redis no está disponible para que
+    LoginAttemptsRepository use la tabla login_attempts.
+    """
+
+    WINDOW_SECONDS = int(os.getenv('LOGIN_ATTEMPTS_WINDOW_SECONDS', LoginAttempts.BLOCK_DURATION_MINUTES * 60))
+    BLOCK_SECONDS = int(os.getenv('LOGIN_ATTEMPTS_BLOCK_SECONDS', LoginAttempts.BLOCK_DURATION_MINUTES * 60))
+    MAX_PER_EMAIL = int(os.getenv('LOGIN_ATTEMPTS_MAX_PER_EMAIL', LoginAttempts.MAX_ATTEMPTS))
+    MAX_PER_IP = int(os.getenv('LOGIN_ATTEMPTS_MAX_PER_IP', 50))
+
+    def __init__(self, redis: Optional[RedisUtil] = None):
+        self.redis = redis or redis_util
+
+    def _prefix(self, kind: str, value: str) -> str:
+        return f'{RedisKeys.LOGIN_ATTEMPTS}{{{kind}:{value.lower()}}}:'
+
+    def _subjects(self, email: str, ip_address: Optional[str]):
+        subjects = [(self._prefix('email', email), self.MAX_PER_EMAIL)]
+        # Sin IP real ('unknown') no se agrupa: bloquearía a todos juntos
+        if ip_address and ip_address != 'unknown':
+            subjects.append((self._prefix('ip', ip_address), self.MAX_PER_IP))
+        return subjects
+
+    def remaining_block_time(self, email: str, ip_address: Optional[str] = None) -> Optional[int]:
+        """
+        Segundos de bloqueo restantes (máximo entre email e IP)
+
+        Returns:
+            0 si no está bloqueado, None si Redis no está disponible
+        """
+        client = self.redis.get_client()
+        if not client:
+            return None
+
+        with redis_metrics.track('login_check', RedisKeys.LOGIN_ATTEMPTS) as tracked:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for prefix, _ in self._subjects(email, ip_address):
+                    pipe.ttl(f'{prefix}blocked')
+                ttls = pipe.execute()
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Login attempts check error: {e}')
+                return None
+
+            remaining = max(max(ttls), 0)
+            tracked.hit = remaining > 0
+
+        return remaining
+
+    def record_failure(self, email: str, ip_address: Optional[str] = None) -> Optional[bool]:
+        """
+        Registra un login fallido para el email y la IP
+
+        Returns:
+            True si alguno quedó bloqueado, None si Redis no está disponible
+        """
+        client = self.redis.get_client()
+        if not client:
+            return None
+
+        now = time.time()
+        window = int(now // self.WINDOW_SECONDS)
+        elapsed = (now % self.WINDOW_SECONDS) / self.WINDOW_SECONDS
+
+        with redis_metrics.track('login_failure', RedisKeys.LOGIN_ATTEMPTS) as tracked:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for prefix, limit in self._subjects(email, ip_address):
+                    pipe.eval(
+                        FAIL_SCRIPT, 3,
+                        f'{prefix}{window}', f'{prefix}{window - 1}', f'{prefix}blocked',
+                        self.WINDOW_SECONDS, elapsed, limit, self.BLOCK_SECONDS
+                    )
+                blocked = pipe.execute()
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Login attempts record error: {e}')
+                return None
+
+        return any(blocked)
+
+    def reset(self, email: str) -> Optional[bool]:
+        """Resetea contadores y bloqueo del email (login exitoso)"""
+        client = self.redis.get_client()
+        if not client:
+            return None
+
+        prefix = self._prefix('email', email)
+        window = int(time.time() // self.WINDOW_SECONDS)
+
+        with redis_metrics.track('login_reset', RedisKeys.LOGIN_ATTEMPTS) as tracked:
+            try:
+                return bool(client.delete(f'{prefix}{window}', f'{prefix}{window - 1}', f'{prefix}blocked'))
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Login attempts reset error: {e}')
+                return None
+
+
+# Singleton instance
+login_attempts_store = LoginAttemptsStore()
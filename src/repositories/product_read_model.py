@@ -0,0 +1,226 @@
+"""
+Product Read Model - JSON pre-serializado de productos activos en Redis (CQRS)
+Los listados se arman concatenando fragmentos, sin ORM ni re-encoding
+"""
+import math
+import time
+from typing import Any, Iterable, Optional
+from src.constants.constants import RedisKeys
+from src.dto.product_dto import ProductResponseDTO
+from src.utils import json_util
+from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import redis_metrics
+from src.utils.redis_util import RedisUtil, redis_util
+
+
+# Una sola ida y vuelta: marcador ready + total + ids de la página + fragmentos
+PAGE_SCRIPT = """
+if redis.call('exists', KEYS[3]) == 0 then
+    return false
+end
+local total = redis.call('zcard', KEYS[2])
+local ids = redis.call('zrange', KEYS[2], ARGV[1], ARGV[2])
+if #ids == 0 then
+    return {total}
+end
+local fragments = redis.call('hmget', KEYS[1], unpack(ids))
+table.insert(fragments, 1, total)
+return fragments
+"""
+
+
+def encode_product(product) -> str:
+    """JSON compacto del producto (mismo formato que ProductResponseDTO)"""
+    return json_util.dumps(ProductResponseDTO.from_model(product).to_dict(), sort_keys=True)
+
+
+class ProductReadModel:
+    """
+    Read model de productos activos
+
+    Keys (mismo hash tag para que convivan en un shard):
+        readmodel:{products}:data             hash  id -> JSON del producto
+        readmodel:{products}:index:*          zset  todos (score = created_at)
+        readmodel:{products}:index:<category> zset  por categoría
+        readmodel:{products}:ready            marcador de read model completo
+
+    Se mantiene en cada escritura de ProductRepository. Si una escritura
+    falla se borra el marcador y los listados vuelven al camino normal
+    hasta el próximo rebuild.
+    """
+
+    ALL = '*'
+    REBUILD_LOCK_TTL_MS = 60000
+
+    def __init__(self, redis: Optional[RedisUtil] = None):
+        self.redis = redis or redis_util
+        self.data_key = f'{RedisKeys.PRODUCT_READ_MODEL}data'
+        self.ready_key = f'{RedisKeys.PRODUCT_READ_MODEL}ready'
+
+    def index_key(self, category: Optional[str] = None) -> str:
+        return f'{RedisKeys.PRODUCT_READ_MODEL}index:{category or self.ALL}'
+
+    def is_ready(self) -> bool:
+        """Verifica si el read model está completo"""
+        return self.redis.exists(self.ready_key)
+
+    def upsert(self, product) -> None:
+        """Agrega o actualiza un producto (lo quita si quedó inactivo)"""
+        if not product.is_active:
+            self.remove(product.id)
+            return
+
+        client = self.redis.get_client()
+        if not client:
+            return
+
+        try:
+            pipe = client.pipeline()
+            self._unindex_category(client, pipe, product.id, keep=product.category)
+            self._add(pipe, product)
+            pipe.execute()
+        except Exception as e:
+            self._mark_stale(e, product.id)
+
+    def remove(self, product_id: str) -> None:
+        """Quita un producto del read model"""
+        client = self.redis.get_client()
+        if not client:
+            return
+
+        try:
+            pipe = client.pipeline()
+            self._unindex_category(client, pipe, product_id)
+            pipe.hdel(self.data_key, product_id)
+            pipe.zrem(self.index_key(), product_id)
+            pipe.execute()
+        except Exception as e:
+            self._mark_stale(e, product_id)
+
+    def page(self, page: int, limit: int, category: Optional[str] = None) -> Optional[str]:
+        """
+        Página de productos como JSON ya codificado
+
+        Returns:
+            '{"pagination":{...},"products":[...]}' o None si el read model
+            no está disponible (el caller usa el camino normal)
+        """
+        client = self.redis.get_client()
+        if not client or page < 1 or limit < 1:
+            return None
+
+        index_key = self.index_key(category)
+        start = (page - 1) * limit
+
+        with redis_metrics.track('readmodel_page', index_key) as tracked:
+            try:
+                result = client.eval(
+                    PAGE_SCRIPT, 3, self.data_key, index_key, self.ready_key,
+                    start, start + limit - 1
+                )
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Product read model page error: {e}', key=index_key)
+                return None
+
+            tracked.hit = result is not None
+
+        if result is None:
+            return None
+
+        total, fragments = int(result[0]), result[1:]
+
+        if any(fragment is None for fragment in fragments):
+            self._mark_stale('missing fragment', index_key)
+            return None
+
+        pagination = json_util.dumps({
+            'limit': limit,
+            'page': page,
+            'total': total,
+            'total_pages': math.ceil(total / limit)
+        }, sort_keys=True)
+
+        return f'{{"pagination":{pagination},"products":[{",".join(fragments)}]}}'
+
+    def rebuild(self, products: Iterable[Any], batch_size: int = 500) -> int:
+        """
+        Reconstruye el read model completo desde los productos activos
+
+        Args:
+            products: Productos activos (idealmente un query con yield_per)
+            batch_size: Productos por pipeline
+
+        Returns:
+            Cantidad de productos cargados
+        """
+        client = self.redis.get_client()
+        if not client:
+            return 0
+
+        client.delete(self.ready_key)
+        self.redis.delete_pattern(f'{RedisKeys.PRODUCT_READ_MODEL}*')
+
+        loaded = 0
+        pipe = client.pipeline(transaction=False)
+
+        for product in products:
+            self._add(pipe, product)
+            loaded += 1
+
+            if loaded % batch_size == 0:
+                pipe.execute()
+
+        pipe.set(self.ready_key, time.time())
+        pipe.execute()
+
+        logger.info('Product read model rebuilt', products=loaded)
+        return loaded
+
+    def ensure_ready(self, load_products) -> int:
+        """
+        Reconstruye el read model si no está completo
+        Un lock evita que varios workers lo reconstruyan a la vez
+
+        Args:
+            load_products: Función que retorna los productos activos
+        """
+        if self.is_ready():
+            return 0
+
+        lock_key = f'{RedisKeys.CACHE_LOCK}{self.ready_key}'
+        token = self.redis.acquire_lock(lock_key, self.REBUILD_LOCK_TTL_MS)
+
+        if not token:
+            return 0
+
+        try:
+            return self.rebuild(load_products())
+        finally:
+            self.redis.release_lock(lock_key, token)
+
+    def _add(self, pipe, product) -> None:
+        score = product.created_at.timestamp()
+        pipe.hset(self.data_key, product.id, encode_product(product))
+        pipe.zadd(self.index_key(), {product.id: score})
+
+        if product.category:
+            pipe.zadd(self.index_key(product.category), {product.id: score})
+
+    def _unindex_category(self, client, pipe, product_id: str, keep: Optional[str] = None) -> None:
+        """Saca el producto del índice de su categoría anterior"""
+        current = client.hget(self.data_key, product_id)
+        if current is None:
+            return
+
+        category = json_util.loads(current).get('category')
+        if category and category != keep:
+            pipe.zrem(self.index_key(category), product_id)
+
+    def _mark_stale(self, error: Any, key: str) -> None:
+        logger.error(f'Product read model write failed: {error}', key=key)
+        self.redis.delete(self.ready_key)
+
+
+# Singleton instance
+product_read_model = ProductReadModel()
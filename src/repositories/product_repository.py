@@ -2,16 +2,45 @@
 Product Repository
 Equivalente a src/repository/product.repository.js
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from sqlalchemy import func
 from src.models import Product
 from src.repositories.base_repository import BaseRepository
+from src.repositories.product_read_model import product_read_model
 
 
 class ProductRepository(BaseRepository[Product]):
-    """Product repository"""
+    """
+    Product repository
+    Cada escritura se refleja en el read model de productos (Redis)
+    """
     
     def __init__(self):
         super().__init__(Product)
+        self.read_model = product_read_model
+    
+    def create(self, data: Dict[str, Any]) -> Product:
+        product = super().create(data)
+        self.read_model.upsert(product)
+        return product
+    
+    def bulk_create(self, data_list: List[Dict[str, Any]]) -> List[Product]:
+        products = super().bulk_create(data_list)
+        for product in products:
+            self.read_model.upsert(product)
+        return products
+    
+    def update(self, id: str, data: Dict[str, Any]) -> Optional[Product]:
+        product = super().update(id, data)
+        if product is not None:
+            self.read_model.upsert(product)
+        return product
+    
+    def delete(self, id: str) -> bool:
+        deleted = super().delete(id)
+        if deleted:
+            self.read_model.remove(id)
+        return deleted
     
     def find_by_category(self, category: str) -> List[Product]:
         """Encuentra productos por categoría"""
@@ -25,6 +54,16 @@ class ProductRepository(BaseRepository[Product]):
         """Encuentra productos activos"""
         return self.find_all(is_active=True)
     
+    def iter_active(self, batch_size: int = 500):
+        """Itera productos activos por lotes (para rebuild del read model)"""
+        return Product.query.filter_by(is_active=True).order_by(
+            Product.created_at
+        ).yield_per(batch_size)
+    
+    def rebuild_read_model(self) -> int:
+        """Reconstruye el read model desde la base de datos"""
+        return self.read_model.rebuild(self.iter_active())
+    
     def soft_delete(self, product_id: str) -> bool:
         """Soft delete (marca como inactivo)"""
         return self.update(product_id, {'is_active': False}) is not None
@@ -35,6 +74,22 @@ class ProductRepository(BaseRepository[Product]):
             Product.name.ilike(f'%{search_term}%'),
             Product.is_active == True
         ).all()
+    
+    def find_top_categories(self, limit: int = 5) -> List[str]:
+        """Categorías con más productos activos"""
+        rows = Product.query.with_entities(
+            Product.category,
+            func.count(Product.id).label('total')
+        ).filter(
+            Product.is_active == True,
+            Product.category.isnot(None)
+        ).group_by(
+            Product.category
+        ).order_by(
+            func.count(Product.id).desc()
+        ).limit(limit).all()
+        
+        return [row.category for row in rows]
 
 
 # Singleton instance
@@ -0,0 +1,158 @@
+"""
+Refresh Token Store - Familias de refresh tokens en Redis
+Rotación atómica (Lua) con detección de reutilización
+"""
+import os
+import time
+from typing import Any, Dict, Optional
+from src.constants.constants import RedisKeys
+from src.utils.jwt_util import JWTUtil
+from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import redis_metrics
+from src.utils.redis_util import RedisUtil, redis_util
+
+
+# Rota current -> nuevo jti si el token presentado es el vigente.
+# Un jti viejo revoca la familia, salvo el inmediatamente anterior dentro
+# del período de gracia (dos requests concurrentes del mismo cliente).
+# La familia revocada queda como tombstone hasta su TTL: sus tokens no
+# pueden volver a entrar como familia desconocida (missing)
+ROTATE_SCRIPT = """
+local family = redis.call('hmget', KEYS[1], 'current', 'previous', 'rotated_at', 'user_id', 'revoked')
+if family[5] then
+    return {'revoked', family[4]}
+end
+if not family[1] then
+    return {'missing'}
+end
+if family[1] == ARGV[1] then
+    redis.call('hset', KEYS[1], 'current', ARGV[2], 'previous', ARGV[1], 'rotated_at', ARGV[4])
+    redis.call('expire', KEYS[1], ARGV[3])
+    return {'rotated', family[4]}
+end
+if family[2] == ARGV[1] and tonumber(ARGV[4]) - tonumber(family[3]) < tonumber(ARGV[5]) then
+    return {'concurrent', family[4]}
+end
+redis.call('del', KEYS[1])
+redis.call('hset', KEYS[1], 'revoked', 1, 'user_id', family[4])
+redis.call('expire', KEYS[1], ARGV[3])
+return {'reused', family[4]}
+"""
+
+
+class RefreshTokenStore:
+    """
+    Familias de refresh tokens (una por login)
+
+    Keys:
+        token:refresh:<fid>   hash current, previous, rotated_at, user_id
+                              TTL = vida del refresh token (se renueva al rotar)
+
+    Solo el refresh token vigente de la familia (current) puede usarse, y
+    una sola vez. Presentar uno ya rotado es señal de robo: la familia
+    queda revocada (tombstone con el mismo TTL) y el dueño legítimo
+    también debe volver a loguearse.
+
+    Sin Redis rotate() devuelve None; missing es una familia que Redis no
+    conoce (start_family falló, flush o failover). En ambos casos el
+    caller decide (fallback stateless).
+    """
+
+    TTL_SECONDS = int(JWTUtil.REFRESH_TOKEN_EXPIRY.total_seconds())
+    GRACE_SECONDS = float(os.getenv('REFRESH_TOKEN_REUSE_GRACE_SECONDS', 5))
+
+    ROTATED = 'rotated'
+    CONCURRENT = 'concurrent'
+    REUSED = 'reused'
+    REVOKED = 'revoked'
+    MISSING = 'missing'
+
+    def __init__(self, redis: Optional[RedisUtil] = None):
+        self.redis = redis or redis_util
+
+    def _key(self, family_id: str) -> str:
+        return f'{RedisKeys.REFRESH_TOKEN}{family_id}'
+
+    def start_family(self, payload: Optional[Dict[str, Any]]) -> bool:
+        """
+        Registra la familia de un refresh token recién emitido (login/register)
+
+        Args:
+            payload: Payload del refresh token (fid, jti, id)
+        """
+        client = self.redis.get_client()
+        if not client or not payload or not payload.get('fid'):
+            return False
+
+        key = self._key(payload['fid'])
+
+        with redis_metrics.track('refresh_start', key) as tracked:
+            try:
+                pipe = client.pipeline()
+                pipe.hset(key, mapping={'current': payload['jti'], 'user_id': payload['id'], 'rotated_at': time.time()})
+                pipe.expire(key, self.TTL_SECONDS)
+                pipe.execute()
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Refresh family start error: {e}', family_id=payload['fid'])
+                return False
+
+        return True
+
+    def rotate(self, family_id: str, presented_jti: str, new_jti: str) -> Optional[str]:
+        """
+        Rota la familia al nuevo jti si presented_jti es el vigente
+
+        Returns:
+            rotated | concurrent | reused | revoked | missing, o None si
+            Redis no está disponible
+        """
+        client = self.redis.get_client()
+        if not client:
+            return None
+
+        key = self._key(family_id)
+
+        with redis_metrics.track('refresh_rotate', key) as tracked:
+            try:
+                result = client.eval(
+                    ROTATE_SCRIPT, 1, key,
+                    presented_jti, new_jti, self.TTL_SECONDS, time.time(), self.GRACE_SECONDS
+                )
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Refresh rotate error: {e}', family_id=family_id)
+                return None
+
+            tracked.hit = result[0] == self.ROTATED
+
+        if result[0] == self.REUSED:
+            logger.warning('Refresh token reuse detected, family revoked', family_id=family_id, user_id=result[1])
+
+        return result[0]
+
+    def revoke_family(self, family_id: str) -> bool:
+        """Revoca la familia (logout): ningún refresh token suyo vuelve a valer"""
+        client = self.redis.get_client()
+        if not client:
+            return False
+
+        key = self._key(family_id)
+
+        with redis_metrics.track('refresh_revoke', key) as tracked:
+            try:
+                pipe = client.pipeline()
+                pipe.delete(key)
+                pipe.hset(key, 'revoked', 1)
+                pipe.expire(key, self.TTL_SECONDS)
+                pipe.execute()
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Refresh family revoke error: {e}', family_id=family_id)
+                return False
+
+        return True
+
+
+# Singleton instance
+refresh_token_store = RefreshTokenStore()
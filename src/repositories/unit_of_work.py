@@ -0,0 +1,165 @@
+"""
+Unit of Work - Una transacción por operación de servicio
+Los repositorios se suman a la transacción ambiente en vez de hacer
+commit por su cuenta
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+from flask import g, has_app_context
+from config.database import db
+from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import LatencyHistogram
+
+
+class UnitOfWork:
+    """
+    Scope transaccional de servicios
+
+    Usage:
+        with unit_of_work.transaction():
+            login_attempts_repository.reset_attempts(email)
+            user_repository.update_last_login(user.id)
+        # un solo COMMIT (ninguno si no hubo escrituras)
+
+    - Los repositorios llaman a commit(): fuera de un scope hace COMMIT
+      como siempre; dentro solo hace flush y marca la transacción como
+      escrita
+    - Los scopes anidados se suman al exterior; el COMMIT lo hace el más
+      externo al salir sin excepción; con excepción, ROLLBACK
+    - after_commit(callback) difiere efectos externos (invalidar caches,
+      avisar a otros workers) hasta que el COMMIT haya ocurrido; con
+      rollback se descartan
+
+    El estado vive en flask.g: un scope por app context (request), igual
+    que la sesión de Flask-SQLAlchemy.
+    """
+
+    ENABLED = os.getenv('UNIT_OF_WORK_ENABLED', 'true').lower() == 'true'
+
+    def __init__(self):
+        self.enabled = self.ENABLED
+        self._lock = threading.Lock()
+        self._commit_duration = LatencyHistogram()
+        self._stats = {'transactions': 0, 'commits': 0, 'read_only': 0, 'rollbacks': 0, 'joined_commits': 0}
+
+    def init_app(self, app) -> None:
+        """Aplica la configuración de la app"""
+        self.enabled = app.config.get('UNIT_OF_WORK_ENABLED', self.enabled)
+
+    def _state(self) -> Dict[str, Any]:
+        state = g.get('unit_of_work')
+        if state is None:
+            state = g.unit_of_work = {'depth': 0, 'writes': False, 'callbacks': []}
+        return state
+
+    @property
+    def active(self) -> bool:
+        """True si hay un scope abierto en este app context"""
+        return self.enabled and has_app_context() and g.get('unit_of_work', {}).get('depth', 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """Abre (o se suma a) la transacción ambiente"""
+        if not self.enabled or not has_app_context():
+            yield
+            return
+
+        state = self._state()
+        state['depth'] += 1
+
+        try:
+            yield
+        except BaseException:
+            state['depth'] -= 1
+            if state['depth'] == 0:
+                self._finish(state, commit=False)
+            raise
+
+        state['depth'] -= 1
+        if state['depth'] == 0:
+            self._finish(state, commit=True)
+
+    def _finish(self, state: Dict[str, Any], commit: bool) -> None:
+        callbacks, state['callbacks'] = state['callbacks'], []
+        writes, state['writes'] = state['writes'], False
+        writes = writes or bool(db.session.new or db.session.dirty or db.session.deleted)
+
+        with self._lock:
+            self._stats['transactions'] += 1
+
+        if not commit:
+            db.session.rollback()
+            with self._lock:
+                self._stats['rollbacks'] += 1
+            return
+
+        if not writes:
+            with self._lock:
+                self._stats['read_only'] += 1
+            return
+
+        self._commit()
+
+        for callback in callbacks:
+            self._run(callback)
+
+    def _commit(self) -> None:
+        started_at = time.perf_counter()
+
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            with self._lock:
+                self._stats['rollbacks'] += 1
+            raise
+
+        with self._lock:
+            self._stats['commits'] += 1
+            self._commit_duration.observe((time.perf_counter() - started_at) * 1000)
+
+    @staticmethod
+    def _run(callback: Callable[[], Any]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f'Unit of work after-commit callback failed: {e}')
+
+    # ========================================
+    # API DE REPOSITORIOS
+    # ========================================
+
+    def commit(self) -> None:
+        """COMMIT, o flush si hay una transacción ambiente"""
+        if self.active:
+            db.session.flush()
+            self._state()['writes'] = True
+            with self._lock:
+                self._stats['joined_commits'] += 1
+            return
+
+        self._commit()
+
+    def rollback(self) -> None:
+        """ROLLBACK salvo dentro de un scope (lo resuelve el scope externo)"""
+        if not self.active:
+            db.session.rollback()
+
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        """Ejecuta callback tras el COMMIT del scope (o ya, si no hay scope)"""
+        if self.active:
+            self._state()['callbacks'].append(callback)
+        else:
+            callback()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Transacciones, COMMITs evitados (joined_commits) y latencia de COMMIT"""
+        with self._lock:
+            return dict(self._stats, enabled=self.enabled, commit_duration=self._commit_duration.to_dict())
+
+
+# Singleton instance
+unit_of_work = UnitOfWork()
@@ -2,10 +2,17 @@
 User Repository
 Equivalente a src/repository/user.repository.js
 """
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from config.database import db
 from src.models import User
+from src.models.user import UserRole
+from src.repositories.activity_buffer import activity_buffer
 from src.repositories.base_repository import BaseRepository
+from src.repositories.email_filter import email_filter
+from src.repositories.unit_of_work import unit_of_work
+from src.utils.password_hasher_util import password_hasher
+from src.utils.principal_cache_util import principal_cache
 
 
 class UserRepository(BaseRepository[User]):
@@ -16,35 +23,148 @@ class UserRepository(BaseRepository[User]):
     
     def __init__(self):
         super().__init__(User)
+        self.email_filter = email_filter
+    
+    def create(self, data: Dict[str, Any]) -> User:
+        """
+        Crea un usuario
+        El email entra al filtro antes del commit: ningún worker puede
+        descartarlo como inexistente una vez visible en la base
+        """
+        self.email_filter.add(data['email'])
+        return super().create(data)
+    
+    def update(self, id: str, data: Dict[str, Any]) -> Optional[User]:
+        """
+        Actualiza un usuario
+        Si viene password se guarda hasheado (nunca en texto plano) y se
+        revocan todas las sesiones del usuario (token_version + 1)
+        Invalida el principal cacheado de autenticación en todos los workers
+        """
+        if data.get('password'):
+            data = dict(
+                data,
+                password=password_hasher.hash_password(data['password']),
+                token_version=User.token_version + 1
+            )
+        
+        previous_email = None
+        if data.get('email'):
+            current = self.find_by_id(id)
+            previous_email = current.email if current else None
+            self.email_filter.add(data['email'])
+        
+        user = super().update(id, data)
+        
+        if user is not None:
+            unit_of_work.after_commit(lambda: principal_cache.invalidate(id))
+            
+            if previous_email and previous_email != user.email:
+                unit_of_work.after_commit(lambda: self.email_filter.remove(previous_email))
+        
+        return user
+    
+    def delete(self, id: str) -> bool:
+        """Elimina un usuario e invalida su principal cacheado"""
+        user = self.find_by_id(id)
+        email = user.email if user else None
+        
+        deleted = super().delete(id)
+        
+        if deleted:
+            unit_of_work.after_commit(lambda: principal_cache.invalidate(id))
+            unit_of_work.after_commit(lambda: self.email_filter.remove(email))
+        
+        return deleted
     
     def find_by_email(self, email: str) -> Optional[User]:
         """
         Encuentra usuario por email
         Equivalente a findByEmail() en Node.js
+        
+        Un miss definitivo del filtro de emails no consulta la base
         """
-        return self.find_one(email=email)
+        if not self.email_filter.might_exist(email):
+            return None
+        
+        user = self.find_one(email=email)
+        self.email_filter.observe(email, user is not None)
+        return user
     
     def find_active_by_email(self, email: str) -> Optional[User]:
         """
         Encuentra usuario activo por email
         Equivalente a findActiveByEmail() en Node.js
+        
+        Un miss definitivo del filtro de emails no consulta la base
         """
-        return self.find_one(email=email, is_active=True)
+        if not self.email_filter.might_exist(email):
+            return None
+        
+        user = self.find_one(email=email, is_active=True)
+        
+        # Sin fila activa puede existir un usuario inactivo: no es falso positivo
+        if user is not None:
+            self.email_filter.observe(email, True)
+        
+        return user
+    
+    def iter_emails(self, batch_size: int = 5000):
+        """Itera los emails de users por lotes (para construir el filtro)"""
+        return (row.email for row in User.query.with_entities(User.email).yield_per(batch_size))
+    
+    def find_by_ids(self, ids: List[str]) -> List[User]:
+        """Encuentra varios usuarios en una sola query (WHERE id IN ...)"""
+        if not ids:
+            return []
+        return User.query.filter(User.id.in_(ids)).all()
     
     def update_last_login(self, user_id: str) -> bool:
         """
         Actualiza last_login del usuario
         Equivalente a updateLastLogin() en Node.js
+        
+        Con el buffer de actividad activo last_login se escribe en el
+        próximo flush; el COMMIT solo ocurre si el login dejó cambios en la
+        sesión (re-hash del password en check_password)
         """
+        if activity_buffer.record('last_login', user_id):
+            if db.session.dirty:
+                unit_of_work.commit()
+            return True
+        
         user = self.find_by_id(user_id)
         if not user:
             return False
         
         user.last_login = datetime.utcnow()
-        from config.database import db
-        db.session.commit()
+        unit_of_work.commit()
         return True
     
+    def touch(self, user_id: str) -> bool:
+        """Registra actividad del usuario (last_seen_at, solo vía buffer)"""
+        return activity_buffer.record('last_seen_at', user_id)
+    
+    def revoke_sessions(self, user_id: str) -> bool:
+        """
+        Invalida todos los tokens emitidos al usuario ("logout everywhere")
+        Incremento atómico de token_version + invalidación del principal
+        """
+        updated = User.query.filter_by(id=user_id).update(
+            {User.token_version: User.token_version + 1},
+            synchronize_session=False
+        )
+        unit_of_work.commit()
+        
+        if updated:
+            unit_of_work.after_commit(lambda: principal_cache.invalidate(user_id))
+        
+        return bool(updated)
+    
+    def find_active_admins(self, limit: int = 50) -> List[User]:
+        """Encuentra administradores activos"""
+        return User.query.filter_by(role=UserRole.ADMIN, is_active=True).limit(limit).all()
+    
     def deactivate(self, user_id: str) -> bool:
         """Desactiva un usuario (soft delete)"""
         return self.update(user_id, {'is_active': False}) is not None
@@ -5,6 +5,10 @@ Equivalente a combinar todas las routes en Express
 from .auth_routes import auth_bp
 from .user_routes import user_bp
 from .product_routes import product_bp
+from .metrics_routes import metrics_bp
+from .jwks_routes import jwks_bp
+from flask import request
+from src.services.warmup_service import warmup_service
 
 
 def register_blueprints(app):
@@ -15,11 +19,25 @@ def register_blueprints(app):
     app.register_blueprint(auth_bp)
     app.register_blueprint(user_bp)
     app.register_blueprint(product_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(jwks_bp)
     
     # Health check endpoint
     @app.route('/health', methods=['GET'])
     def health_check():
+        """
+        GET /health - Liveness
+        GET /health?mode=ready - Readiness (503 hasta que termine el warm-up)
+        """
+        if request.args.get('mode') == 'ready':
+            warmup = warmup_service.get_status()
+            
+            if not warmup['ready']:
+                return {'status': 'warming_up', 'message': 'Cache warm-up in progress', 'warmup': warmup}, 503
+            
+            return {'status': 'ok', 'message': 'API is ready', 'warmup': warmup}, 200
+        
         return {'status': 'ok', 'message': 'API is running'}, 200
 
 
-__all__ = ['register_blueprints', 'auth_bp', 'user_bp', 'product_bp']
+__all__ = ['register_blueprints', 'auth_bp', 'user_bp', 'product_bp', 'metrics_bp', 'jwks_bp']
@@ -5,13 +5,18 @@ Equivalente a src/routes/auth.routes.js
 from flask import Blueprint
 from src.controllers.auth_controller import auth_controller
 from src.middlewares.auth_middleware import authenticate
-from src.validators.auth_validator import validate_register, validate_login, validate_refresh_token
+from src.middlewares.preauth_middleware import preauth_gate_required
+from src.middlewares.rate_limit_middleware import rate_limit
+from src.validators.auth_validator import validate_register, validate_login, validate_refresh_token, validate_verify_batch
 
 # Crear blueprint
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+# Sin política de blueprint: /verify la llama el gateway en cada request
+
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limit('auth:register', limit=10, period=3600)
 @validate_register()
 def register():
     """POST /api/auth/register - Registrar usuario"""
@@ -19,6 +24,8 @@ def register():
 
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit('auth:login', limit=20, period=60)
+@preauth_gate_required()
 @validate_login()
 def login():
     """POST /api/auth/login - Login"""
@@ -26,13 +33,23 @@ def login():
 
 
 @auth_bp.route('/logout', methods=['POST'])
-@authenticate()
+@authenticate(allow_api_key=False, fresh=True)
+@rate_limit('auth:session', limit=30, period=60, scope='user')
 def logout():
     """POST /api/auth/logout - Logout (requiere auth)"""
     return auth_controller.logout()
 
 
+@auth_bp.route('/logout-all', methods=['POST'])
+@authenticate(allow_api_key=False, fresh=True)
+@rate_limit('auth:session', limit=30, period=60, scope='user')
+def logout_all():
+    """POST /api/auth/logout-all - Cerrar sesión en todos los dispositivos (requiere auth)"""
+    return auth_controller.logout_all()
+
+
 @auth_bp.route('/refresh', methods=['POST'])
+@rate_limit('auth:refresh', limit=60, period=60)
 @validate_refresh_token()
 def refresh():
     """POST /api/auth/refresh - Refresh token"""
@@ -40,13 +57,23 @@ def refresh():
 
 
 @auth_bp.route('/me', methods=['GET'])
-@authenticate()
+@authenticate(fresh=True)
+@rate_limit('auth:me', limit=120, period=60, scope='user')
 def me():
     """GET /api/auth/me - Usuario actual (requiere auth)"""
     return auth_controller.me()
 
 
 @auth_bp.route('/verify', methods=['GET'])
+@rate_limit('auth:verify', limit=6000, period=60, lease=20)
 def verify():
     """GET /api/auth/verify - Verificar token"""
     return auth_controller.verify_token()
+
+
+@auth_bp.route('/verify-batch', methods=['POST'])
+@rate_limit('auth:verify', limit=6000, period=60, lease=20)
+@validate_verify_batch()
+def verify_batch():
+    """POST /api/auth/verify-batch - Verificar varios tokens (gateways / sidecars)"""
+    return auth_controller.verify_batch()
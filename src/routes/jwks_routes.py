@@ -0,0 +1,24 @@
+"""
+JWKS Routes - Flask Blueprint
+Claves públicas de firma para verificar access tokens sin llamar a /api/auth/verify
+"""
+from flask import Blueprint, Response, request
+from src.utils.jwt_keys_util import key_ring
+
+# Crear blueprint
+jwks_bp = Blueprint('jwks', __name__, url_prefix='/.well-known')
+
+
+@jwks_bp.route('/jwks.json', methods=['GET'])
+def jwks():
+    """
+    GET /.well-known/jwks.json - Claves públicas (JWK Set)
+    Cacheable por JWKS_MAX_AGE; con If-None-Match responde 304
+    """
+    body, etag = key_ring.jwks()
+    
+    response = Response(body, mimetype='application/jwk-set+json')
+    response.headers['Cache-Control'] = f'public, max-age={key_ring.JWKS_MAX_AGE}'
+    response.set_etag(etag)
+    
+    return response.make_conditional(request)
@@ -0,0 +1,66 @@
+"""
+Metrics Routes - Flask Blueprint
+Métricas internas de rendimiento (solo admin)
+"""
+from flask import Blueprint
+from src.controllers.metrics_controller import metrics_controller
+from src.middlewares.auth_middleware import authenticate, authorize
+
+# Crear blueprint
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/api/metrics')
+
+
+@metrics_bp.route('/coalescing', methods=['GET'])
+@authenticate(fresh=True)
+@authorize(['admin'])
+def coalescing():
+    """GET /api/metrics/coalescing - Requests coalescidas por single-flight (solo admin)"""
+    return metrics_controller.coalescing()
+
+
+@metrics_bp.route('/cache', methods=['GET'])
+@authenticate(fresh=True)
+@authorize(['admin'])
+def cache():
+    """GET /api/metrics/cache - Hit ratio de caches L1 y snapshot en disco (solo admin)"""
+    return metrics_controller.cache()
+
+
+@metrics_bp.route('/redis', methods=['GET'])
+@authenticate(fresh=True)
+@authorize(['admin'])
+def redis():
+    """GET /api/metrics/redis - Latencia por operación, hit/miss por prefijo y hot keys (solo admin)"""
+    return metrics_controller.redis()
+
+
+@metrics_bp.route('/password-hashing', methods=['GET'])
+@authenticate(fresh=True)
+@authorize(['admin'])
+def password_hashing():
+    """GET /api/metrics/password-hashing - Tamaño del pool, ocupación y espera en cola (solo admin)"""
+    return metrics_controller.password_hashing()
+
+
+@metrics_bp.route('/auth', methods=['GET'])
+@authenticate(fresh=True)
+@authorize(['admin'])
+def auth():
+    """GET /api/metrics/auth - Hit rate de tokens verificados, principals y blacklist de tokens (solo admin)"""
+    return metrics_controller.auth()
+
+
+@metrics_bp.route('/database', methods=['GET'])
+@authenticate(fresh=True)
+@authorize(['admin'])
+def database():
+    """GET /api/metrics/database - COMMITs por transacción de servicio y su latencia (solo admin)"""
+    return metrics_controller.database()
+
+
+@metrics_bp.route('/rate-limit', methods=['GET'])
+@authenticate(fresh=True)
+@authorize(['admin'])
+def rate_limit():
+    """GET /api/metrics/rate-limit - Rechazos, leases y fallback local del rate limiter (solo admin)"""
+    return metrics_controller.rate_limit()
@@ -5,19 +5,24 @@ Equivalente a src/routes/product.routes.js
 from flask import Blueprint
 from src.controllers.product_controller import product_controller
 from src.middlewares.auth_middleware import authenticate
+from src.middlewares.coalesce_middleware import coalesce_requests
+from src.middlewares.rate_limit_middleware import limit_blueprint, rate_limit
 from src.validators.product_validator import validate_create_product, validate_update_product
 
 # Crear blueprint
 product_bp = Blueprint('products', __name__, url_prefix='/api/products')
+limit_blueprint(product_bp, 'products', lease=5)
 
 
 @product_bp.route('', methods=['GET'])
+@coalesce_requests()
 def get_all():
     """GET /api/products - Obtener todos los productos (público)"""
     return product_controller.get_all()
 
 
 @product_bp.route('/<string:product_id>', methods=['GET'])
+@coalesce_requests()
 def get_by_id(product_id):
     """GET /api/products/:id - Obtener producto por ID (público)"""
     return product_controller.get_by_id(product_id)
@@ -25,6 +30,7 @@ def get_by_id(product_id):
 
 @product_bp.route('', methods=['POST'])
 @authenticate()
+@rate_limit('products:write', limit=60, period=60, scope='user')
 @validate_create_product()
 def create():
     """POST /api/products - Crear producto (requiere auth)"""
@@ -33,6 +39,7 @@ def create():
 
 @product_bp.route('/<string:product_id>', methods=['PUT'])
 @authenticate()
+@rate_limit('products:write', limit=60, period=60, scope='user')
 @validate_update_product()
 def update(product_id):
     """PUT /api/products/:id - Actualizar producto (requiere auth)"""
@@ -41,6 +48,7 @@ def update(product_id):
 
 @product_bp.route('/<string:product_id>', methods=['DELETE'])
 @authenticate()
+@rate_limit('products:write', limit=60, period=60, scope='user')
 def delete(product_id):
     """DELETE /api/products/:id - Eliminar producto (requiere auth)"""
     return product_controller.delete(product_id)
@@ -5,9 +5,11 @@ Equivalente a src/routes/user.routes.js
 from flask import Blueprint
 from src.controllers.user_controller import user_controller
 from src.middlewares.auth_middleware import authenticate, authorize
+from src.middlewares.rate_limit_middleware import limit_blueprint, rate_limit
 
 # Crear blueprint
 user_bp = Blueprint('users', __name__, url_prefix='/api/users')
+limit_blueprint(user_bp, 'users')
 
 
 @user_bp.route('', methods=['GET'])
@@ -25,15 +27,24 @@ def get_by_id(user_id):
 
 
 @user_bp.route('/<string:user_id>', methods=['PUT'])
-@authenticate()
+@authenticate(fresh=True)
+@rate_limit('users:update', limit=30, period=60, scope='user')
 def update(user_id):
     """PUT /api/users/:id - Actualizar usuario"""
     return user_controller.update(user_id)
 
 
 @user_bp.route('/<string:user_id>', methods=['DELETE'])
-@authenticate()
+@authenticate(fresh=True)
 @authorize(['admin'])
 def delete(user_id):
     """DELETE /api/users/:id - Eliminar usuario (solo admin)"""
     return user_controller.delete(user_id)
+
+
+@user_bp.route('/<string:user_id>/revoke-sessions', methods=['POST'])
+@authenticate(fresh=True)
+@authorize(['admin'])
+def revoke_sessions(user_id):
+    """POST /api/users/:id/revoke-sessions - Cerrar todas las sesiones del usuario (solo admin)"""
+    return user_controller.revoke_sessions(user_id)
@@ -2,14 +2,22 @@
 Auth Service - Authentication business logic
 Equivalente a src/services/auth.service.js
 """
-from typing import Dict
+import os
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
 import jwt as pyjwt
 from src.dto.auth_dto import RegisterDTO, LoginDTO, RefreshTokenDTO, AuthResponseDTO
 from src.repositories.user_repository import user_repository
 from src.repositories.login_attempts_repository import login_attempts_repository
+from src.repositories.refresh_token_store import refresh_token_store
+from src.repositories.unit_of_work import unit_of_work
+from src.services.user_service import user_service
 from src.utils.app_error import AppError
 from src.utils.jwt_util import jwt_util
 from src.utils.logger_util import logger
+from src.utils.principal_cache_util import principal_cache, principal_from_user
+from src.utils.token_blacklist_util import token_blacklist
 
 
 class AuthService:
@@ -18,31 +26,39 @@ class AuthService:
     Equivalente a AuthService en Node.js
     """
     
+    # Cache máximo de un resultado de verify-batch (revocaciones e
+    # inactivaciones pueden tardar hasta esto en verse en el gateway)
+    VERIFY_BATCH_CACHE_SECONDS = int(os.getenv('AUTH_VERIFY_BATCH_CACHE_SECONDS', 30))
+    
     def __init__(self):
         self.user_repo = user_repository
         self.login_attempts_repo = login_attempts_repository
+        self.refresh_store = refresh_token_store
     
     def register(self, dto: RegisterDTO, audit_context: Dict) -> AuthResponseDTO:
         """
         Registra un nuevo usuario
         Equivalente a register() en Node.js
         """
-        # Verificar si el email ya existe
-        existing_user = self.user_repo.find_by_email(dto.email)
-        
-        if existing_user:
-            raise AppError.conflict('Email ya registrado')
-        
-        # Crear usuario (el password se hashea automáticamente en el model)
-        user = self.user_repo.create({
-            'email': dto.email,
-            'password': dto.password,
-            'name': dto.name,
-            'role': dto.role
-        })
+        # Una transacción: un solo COMMIT
+        with unit_of_work.transaction():
+            # Verificar si el email ya existe
+            existing_user = self.user_repo.find_by_email(dto.email)
+            
+            if existing_user:
+                raise AppError.conflict('Email ya registrado')
+            
+            # Crear usuario (el password se hashea automáticamente en el model)
+            user = self.user_repo.create({
+                'email': dto.email,
+                'password': dto.password,
+                'name': dto.name,
+                'role': dto.role
+            })
         
-        # Generar tokens
+        # Generar tokens (nueva familia de refresh tokens)
         tokens = jwt_util.generate_token_pair(user)
+        self.refresh_store.start_family(jwt_util.decode_token(tokens['refresh_token']))
         
         logger.info('User registered', user_id=user.id, email=user.email)
         
@@ -55,84 +71,160 @@ class AuthService:
         """
         ip_address = audit_context.get('ip', 'unknown')
         
-        # Verificar si está bloqueado
-        if self.login_attempts_repo.is_blocked(dto.email):
-            remaining = self.login_attempts_repo.get_remaining_block_time(dto.email)
-            minutes = remaining // 60
-            raise AppError.too_many_requests(
-                f'Cuenta bloqueada por {minutes} minutos debido a múltiples intentos fallidos'
-            )
-        
-        # Buscar usuario activo
-        user = self.user_repo.find_active_by_email(dto.email)
-        
-        if not user:
-            # Incrementar intentos
-            self.login_attempts_repo.increment_attempts(dto.email, ip_address)
-            raise AppError.unauthorized('Credenciales inválidas')
+        # Una transacción: un solo COMMIT por login (exitoso o fallido).
+        # El intento fallido se registra dentro del scope y el error se
+        # lanza después, para que no haga rollback del contador
+        with unit_of_work.transaction():
+            # Verificar si está bloqueado
+            if self.login_attempts_repo.is_blocked(dto.email, ip_address):
+                remaining = self.login_attempts_repo.get_remaining_block_time(dto.email, ip_address)
+                minutes = remaining // 60
+                raise AppError.too_many_requests(
+                    f'Cuenta bloqueada por {minutes} minutos debido a múltiples intentos fallidos'
+                )
+            
+            # Buscar usuario activo y verificar password (si el hash está
+            # desactualizado se re-hashea y se persiste en el mismo COMMIT)
+            user = self.user_repo.find_active_by_email(dto.email)
+            authenticated = user is not None and user.check_password(dto.password)
+            
+            if authenticated:
+                # Resetear intentos y actualizar last_login
+                self.login_attempts_repo.reset_attempts(dto.email)
+                self.user_repo.update_last_login(user.id)
+            else:
+                # Incrementar intentos
+                self.login_attempts_repo.increment_attempts(dto.email, ip_address)
         
-        # Verificar password
-        if not user.check_password(dto.password):
-            # Incrementar intentos
-            self.login_attempts_repo.increment_attempts(dto.email, ip_address)
+        if not authenticated:
             raise AppError.unauthorized('Credenciales inválidas')
         
-        # Resetear intentos
-        self.login_attempts_repo.reset_attempts(dto.email)
-        
-        # Actualizar last_login
-        self.user_repo.update_last_login(user.id)
-        
-        # Generar tokens
+        # Generar tokens (nueva familia de refresh tokens)
         tokens = jwt_util.generate_token_pair(user)
+        self.refresh_store.start_family(jwt_util.decode_token(tokens['refresh_token']))
         
         logger.info('User logged in', user_id=user.id, email=user.email)
         
         return AuthResponseDTO.from_data(user, tokens)
     
-    def logout(self, user_id: str, token: str, audit_context: Dict) -> Dict:
+    def logout(self, user_id: str, token: str, audit_context: Dict, refresh_token: Optional[str] = None) -> Dict:
         """
         Logout de usuario
         Equivalente a logout() en Node.js
         
-        Note: En Flask no hay blacklist de tokens por defecto.
-        Deberías implementarlo con Redis si lo necesitas.
+        Revoca el access token (ya verificado por el middleware) y, si se
+        envía, el refresh token del mismo usuario hasta su expiración
         """
+        token_blacklist.revoke(jwt_util.decode_token(token) or {})
+        
+        if refresh_token:
+            try:
+                refresh_payload = jwt_util.verify_refresh_token(refresh_token)
+                
+                if refresh_payload.get('id') == user_id:
+                    token_blacklist.revoke(refresh_payload)
+                    
+                    if refresh_payload.get('fid'):
+                        self.refresh_store.revoke_family(refresh_payload['fid'])
+            except pyjwt.InvalidTokenError:
+                pass
+        
         logger.info('User logged out', user_id=user_id)
         
         return {'message': 'Logout exitoso'}
     
+    def logout_all(self, user_id: str, audit_context: Dict) -> Dict:
+        """
+        Cierra todas las sesiones del usuario (todos los dispositivos)
+        Incrementa token_version: todos los tokens emitidos dejan de valer
+        """
+        self.user_repo.revoke_sessions(user_id)
+        
+        logger.info('User logged out everywhere', user_id=user_id)
+        
+        return {'message': 'Sesiones cerradas en todos los dispositivos'}
+    
     def refresh_token(self, dto: RefreshTokenDTO, audit_context: Dict) -> AuthResponseDTO:
         """
         Refresca el access token
         Equivalente a refreshToken() en Node.js
+        
+        El refresh token se rota dentro de su familia en Redis (un uso por
+        token; reutilizar uno viejo revoca la familia). El estado del
+        usuario sale del principal y el perfil cacheados, sin ir a la DB.
         """
         try:
             # Verificar refresh token
             payload = jwt_util.verify_refresh_token(dto.refresh_token)
             user_id = payload.get('id')
             
-            # Buscar usuario
-            user = self.user_repo.find_by_id(user_id)
+            # Una transacción: lecturas en miss de cache y, como máximo, un COMMIT
+            with unit_of_work.transaction():
+                # Estado del usuario (principal cacheado)
+                principal = principal_cache.get(user_id, self._load_principal)
+                
+                if not principal:
+                    raise AppError.unauthorized('Usuario no encontrado')
+                
+                if not principal['is_active']:
+                    raise AppError.unauthorized('Usuario inactivo')
+                
+                if jwt_util.is_outdated(payload, principal.get('token_version')):
+                    raise AppError.unauthorized('Sesión revocada')
+                
+                # Perfil antes de rotar: un 401 acá no consume el refresh token
+                profile = user_service.get_user(user_id)
+                
+                if not profile:
+                    raise AppError.unauthorized('Usuario no encontrado')
+                
+                # Generar nuevos tokens en la misma familia y rotar
+                tokens = jwt_util.generate_token_pair(SimpleNamespace(**principal), family_id=payload.get('fid'))
+                self._rotate_refresh_token(payload, tokens['refresh_token'])
             
-            if not user:
-                raise AppError.unauthorized('Usuario no encontrado')
+            logger.info('Token refreshed', user_id=user_id)
             
-            if not user.is_active:
-                raise AppError.unauthorized('Usuario inactivo')
-            
-            # Generar nuevos tokens
-            tokens = jwt_util.generate_token_pair(user)
-            
-            logger.info('Token refreshed', user_id=user.id)
-            
-            return AuthResponseDTO.from_data(user, tokens)
+            return AuthResponseDTO.from_profile(profile, tokens)
             
         except pyjwt.ExpiredSignatureError:
             raise AppError.unauthorized('Refresh token expirado')
         except pyjwt.InvalidTokenError:
             raise AppError.unauthorized('Refresh token inválido')
     
+    def _rotate_refresh_token(self, payload: Dict[str, Any], new_refresh_token: str) -> None:
+        """
+        Marca el refresh token presentado como usado y registra el nuevo
+        Sin Redis (rotate -> None) se acepta sin rotación con estado
+        """
+        new_payload = jwt_util.decode_token(new_refresh_token)
+        
+        result = self.refresh_store.rotate(payload['fid'], payload['jti'], new_payload['jti']) if payload.get('fid') else None
+        
+        if result == self.refresh_store.REUSED:
+            raise AppError.unauthorized('Refresh token reutilizado: sesión revocada')
+        
+        if result == self.refresh_store.REVOKED:
+            raise AppError.unauthorized('Sesión revocada')
+        
+        if result == self.refresh_store.CONCURRENT:
+            raise AppError.unauthorized('Refresh token inválido')
+        
+        # Tokens emitidos antes de las familias, o familia que Redis no
+        # conoce (start_family falló, flush o failover): un solo uso vía
+        # blacklist y se registra la familia desde acá
+        if not payload.get('fid') or result == self.refresh_store.MISSING:
+            token_blacklist.revoke(payload)
+            self.refresh_store.start_family(new_payload)
+    
+    def _load_principal(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Loader del principal cache (solo en miss)"""
+        user = self.user_repo.find_by_id(user_id)
+        return principal_from_user(user) if user else None
+    
+    def _load_principals(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Loader batch del principal cache: una sola query IN para los misses"""
+        return {user.id: principal_from_user(user) for user in self.user_repo.find_by_ids(user_ids)}
+    
     def verify_token(self, token: str) -> Dict:
         """
         Verifica un token
@@ -150,6 +242,12 @@ class AuthService:
                     'reason': 'User not found or inactive'
                 }
             
+            if jwt_util.is_outdated(payload, user.token_version):
+                return {
+                    'valid': False,
+                    'reason': 'Session revoked'
+                }
+            
             return {
                 'valid': True,
                 'user': user.to_dict()
@@ -165,6 +263,61 @@ class AuthService:
                 'valid': False,
                 'reason': f'Invalid token: {str(e)}'
             }
+    
+    def verify_tokens(self, tokens: List[str]) -> List[Dict]:
+        """
+        Verifica varios tokens en un request (gateways / sidecars)
+        
+        Firmas y claims se validan localmente como en verify_token; los
+        usuarios referenciados se resuelven juntos desde el principal cache
+        con un solo MGET a Redis y una sola query IN para los misses.
+        
+        Returns:
+            Un resultado por token, en el mismo orden: {'valid', 'reason'}
+            o {'valid', 'claims', 'user'}
+        """
+        results: List[Dict] = []
+        payloads: Dict[int, Dict[str, Any]] = {}
+        
+        for index, token in enumerate(tokens):
+            try:
+                payloads[index] = jwt_util.verify_access_token(token)
+                results.append(None)
+            except pyjwt.ExpiredSignatureError:
+                results.append({'valid': False, 'reason': 'Token expired'})
+            except pyjwt.InvalidTokenError as e:
+                results.append({'valid': False, 'reason': f'Invalid token: {str(e)}'})
+        
+        principals = principal_cache.get_many(
+            (payload.get('id') for payload in payloads.values()),
+            self._load_principals
+        )
+        
+        for index, payload in payloads.items():
+            principal = principals.get(payload.get('id'))
+            
+            if not principal or not principal['is_active']:
+                results[index] = {'valid': False, 'reason': 'User not found or inactive'}
+            elif jwt_util.is_outdated(payload, principal.get('token_version')):
+                results[index] = {'valid': False, 'reason': 'Session revoked'}
+            else:
+                results[index] = {
+                    'valid': True,
+                    'claims': payload,
+                    'user': {field: principal[field] for field in ('id', 'email', 'name', 'role')}
+                }
+        
+        return results
+    
+    def verify_cache_seconds(self, results: List[Dict]) -> int:
+        """
+        Segundos que el caller puede cachear un resultado de verify_tokens:
+        hasta la primera expiración entre los tokens válidos, con tope
+        VERIFY_BATCH_CACHE_SECONDS
+        """
+        now = time.time()
+        expirations = [result['claims']['exp'] - now for result in results if result['valid']]
+        return max(0, int(min(expirations + [self.VERIFY_BATCH_CACHE_SECONDS])))
 
 
 # Singleton instance
@@ -0,0 +1,85 @@
+"""
+Product Service - Lecturas de catálogo con cache
+"""
+import os
+from typing import Dict, List, Optional
+from src.constants.constants import RedisKeys
+from src.dto.product_dto import ProductResponseDTO
+from src.repositories.product_repository import product_repository
+from src.utils.cache_util import TieredCache
+from src.utils.redis_util import redis_util
+
+
+class ProductService:
+    """
+    Product service
+    Lecturas cacheadas (L1 + Redis) e invalidación en escrituras
+    """
+
+    LIST_TTL = int(os.getenv('PRODUCT_LIST_CACHE_TTL_SECONDS', 60))
+    DETAIL_TTL = int(os.getenv('PRODUCT_DETAIL_CACHE_TTL_SECONDS', 300))
+
+    def __init__(self):
+        self.product_repo = product_repository
+        self.list_cache = TieredCache(RedisKeys.PRODUCT_LIST, self.LIST_TTL)
+        self.detail_cache = TieredCache(RedisKeys.PRODUCT_DETAIL, self.DETAIL_TTL)
+
+    def list_products(self, page: int, limit: int, category: Optional[str] = None) -> Dict:
+        """
+        Página de productos activos (opcionalmente por categoría)
+
+        Returns:
+            {'products': [...], 'pagination': {...}}
+        """
+        def load():
+            filters = {'is_active': True}
+            if category:
+                filters['category'] = category
+
+            result = self.product_repo.find_with_pagination(page=page, limit=limit, **filters)
+
+            return {
+                'products': [ProductResponseDTO.from_model(p).to_dict() for p in result['rows']],
+                'pagination': {
+                    'page': result['page'],
+                    'limit': result['limit'],
+                    'total': result['count'],
+                    'total_pages': result['total_pages']
+                }
+            }
+
+        return self.list_cache.get_or_load(f'{category or "*"}:{page}:{limit}', load)
+
+    def get_product(self, product_id: str) -> Optional[Dict]:
+        """Detalle de producto (con creador) o None si no existe"""
+        def load():
+            product = self.product_repo.find_by_id(product_id)
+
+            if not product:
+                return None
+
+            return ProductResponseDTO.from_model(product, include_creator=True).to_dict()
+
+        return self.detail_cache.get_or_load(product_id, load)
+
+    def record_view(self, product_id: str) -> None:
+        """Cuenta una vista del producto (ranking de más vistos)"""
+        redis_util.zincrby(RedisKeys.PRODUCT_VIEWS, product_id)
+
+    def get_most_viewed_ids(self, limit: int) -> List[str]:
+        """IDs de los productos más vistos"""
+        return redis_util.zrevrange(RedisKeys.PRODUCT_VIEWS, 0, limit - 1)
+
+    def invalidate(self, product_id: Optional[str] = None) -> None:
+        """
+        Invalida el cache tras una escritura
+        Las páginas de listado siempre se invalidan completas
+        """
+        if product_id:
+            self.detail_cache.invalidate(product_id)
+
+        self.list_cache.clear()
+
+
+# Singleton instance
+product_service = ProductService()
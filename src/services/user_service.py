@@ -0,0 +1,39 @@
+"""
+User Service - Lecturas de usuarios con cache
+"""
+import os
+from typing import Dict, Optional
+from src.constants.constants import RedisKeys
+from src.dto.auth_dto import UserResponseDTO
+from src.repositories.user_repository import user_repository
+from src.utils.cache_util import TieredCache
+
+
+class UserService:
+    """
+    User service
+    Perfiles cacheados (L1 + Redis) e invalidación en escrituras
+    """
+
+    PROFILE_TTL = int(os.getenv('USER_PROFILE_CACHE_TTL_SECONDS', 300))
+
+    def __init__(self):
+        self.user_repo = user_repository
+        # Emails, nombres y roles: fuera del snapshot de L1 en disco
+        self.profile_cache = TieredCache(RedisKeys.USER_PROFILE, self.PROFILE_TTL, persist=False)
+
+    def get_user(self, user_id: str) -> Optional[Dict]:
+        """Perfil público del usuario (sin password) o None si no existe"""
+        def load():
+            user = self.user_repo.find_by_id(user_id)
+            return UserResponseDTO.from_model(user).to_dict() if user else None
+
+        return self.profile_cache.get_or_load(user_id, load)
+
+    def invalidate(self, user_id: str) -> None:
+        """Invalida el perfil cacheado tras una escritura"""
+        self.profile_cache.invalidate(user_id)
+
+
+# Singleton instance
+user_service = UserService()
@@ -0,0 +1,158 @@
+"""
+Warmup Service - Precarga de caches al arrancar
+Evita que un task recién desplegado mande todo el tráfico frío a Postgres
+"""
+import threading
+import time
+from typing import Dict, Optional
+from src.repositories.product_repository import product_repository
+from src.repositories.user_repository import user_repository
+from src.services.product_service import product_service
+from src.services.user_service import user_service
+from src.utils.logger_util import logger
+
+
+class WarmupService:
+    """
+    Warm-up de caches con gating de readiness
+
+    Estados: pending -> running -> ready | failed
+    La instancia se considera lista cuando el warm-up termina (con o sin
+    errores) o cuando supera el timeout configurado.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = 'pending'
+        self._enabled = False
+        self._timeout = 0
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._warmed = {'read_model_products': 0, 'list_pages': 0, 'products': 0, 'users': 0}
+        self._error: Optional[str] = None
+
+    def start(self, app) -> None:
+        """
+        Lanza el warm-up en background según la configuración de la app
+        Si está deshabilitado la instancia queda lista inmediatamente
+        """
+        self._enabled = app.config.get('CACHE_WARMUP_ENABLED', False)
+        self._timeout = app.config.get('CACHE_WARMUP_TIMEOUT_SECONDS', 60)
+
+        if not self._enabled:
+            self._state = 'ready'
+            return
+
+        thread = threading.Thread(target=self.run, args=(app,), name='cache-warmup', daemon=True)
+        thread.start()
+
+    def run(self, app) -> Dict:
+        """Ejecuta el warm-up (bloqueante) dentro de un app context"""
+        with self._lock:
+            self._state = 'running'
+            self._started_at = time.monotonic()
+            self._warmed = {'read_model_products': 0, 'list_pages': 0, 'products': 0, 'users': 0}
+            self._error = None
+
+        logger.info('🔥 Cache warm-up started')
+
+        try:
+            with app.app_context():
+                self._warm_read_model()
+                self._warm_catalog(app.config)
+                self._warm_most_viewed(app.config)
+                self._warm_admins(app.config)
+
+            with self._lock:
+                self._state = 'ready'
+
+            logger.info('✅ Cache warm-up finished', **self._warmed)
+        except Exception as e:
+            with self._lock:
+                self._state = 'failed'
+                self._error = str(e)
+
+            logger.error(f'Cache warm-up failed: {e}', **self._warmed)
+        finally:
+            self._finished_at = time.monotonic()
+
+        return self.get_status()
+
+    def _warm_read_model(self) -> None:
+        """Reconstruye el read model de productos si no está completo"""
+        loaded = product_repository.read_model.ensure_ready(product_repository.iter_active)
+        
+        with self._lock:
+            self._warmed['read_model_products'] = loaded
+
+    def _warm_catalog(self, config) -> None:
+        """Primeras N páginas del listado general y de las categorías top"""
+        pages = config.get('CACHE_WARMUP_PAGES', 3)
+        limit = config.get('CACHE_WARMUP_PAGE_LIMIT', 10)
+        categories = [None] + product_repository.find_top_categories(
+            config.get('CACHE_WARMUP_TOP_CATEGORIES', 5)
+        )
+
+        for category in categories:
+            for page in range(1, pages + 1):
+                data = product_service.list_products(page, limit, category)
+                self._count('list_pages')
+
+                if page >= data['pagination']['total_pages']:
+                    break
+
+    def _warm_most_viewed(self, config) -> None:
+        """Detalle de los productos más vistos"""
+        for product_id in product_service.get_most_viewed_ids(config.get('CACHE_WARMUP_TOP_PRODUCTS', 50)):
+            if product_service.get_product(product_id):
+                self._count('products')
+
+    def _warm_admins(self, config) -> None:
+        """Perfiles de administradores activos"""
+        for admin in user_repository.find_active_admins(config.get('CACHE_WARMUP_ADMINS', 50)):
+            user_service.get_user(admin.id)
+            self._count('users')
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._warmed[name] += 1
+
+    def is_ready(self) -> bool:
+        """Lista si el warm-up terminó o superó el timeout"""
+        with self._lock:
+            if self._state in ('ready', 'failed'):
+                return True
+
+            if self._started_at is None:
+                return False
+
+            return time.monotonic() - self._started_at >= self._timeout
+
+    def get_status(self) -> Dict:
+        """Estado del warm-up para /health"""
+        ready = self.is_ready()
+
+        with self._lock:
+            started, finished = self._started_at, self._finished_at
+            status = {
+                'state': self._state,
+                'enabled': self._enabled,
+                'ready': ready,
+                'warmed': dict(self._warmed)
+            }
+
+            if self._state == 'running' and ready:
+                status['state'] = 'timed_out'
+
+            if self._error:
+                status['error'] = self._error
+
+        if started is not None:
+            end = finished if finished is not None else time.monotonic()
+            status['elapsed_seconds'] = round(end - started, 3)
+
+        return status
+
+
+# Singleton instance
+warmup_service = WarmupService()
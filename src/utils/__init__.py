@@ -5,19 +5,31 @@ Exporta todas las utilidades
 from .app_error import AppError
 from .response_util import ApiResponse
 from .jwt_util import JWTUtil, jwt_util
+from .jwt_keys_util import KeyRing, key_ring
+from .jwks_client_util import JWKSVerifier
 from .logger_util import logger, log_info, log_error, log_warning, log_debug
 from .redis_util import RedisUtil, redis_util
+from .redis_metrics_util import RedisMetrics, redis_metrics
+from .singleflight_util import SingleFlight, RequestCoalescer, request_coalescer
 
 __all__ = [
     'AppError',
     'ApiResponse',
     'JWTUtil',
     'jwt_util',
+    'KeyRing',
+    'key_ring',
+    'JWKSVerifier',
     'logger',
     'log_info',
     'log_error',
     'log_warning',
     'log_debug',
     'RedisUtil',
-    'redis_util'
+    'redis_util',
+    'RedisMetrics',
+    'redis_metrics',
+    'SingleFlight',
+    'RequestCoalescer',
+    'request_coalescer'
 ]
@@ -0,0 +1,207 @@
+"""
+API Key Utility - Autenticación de servicios internos con API keys
+Índice en memoria por prefijo: verificar una key no toca la base de datos
+ni corre hashing de passwords (las keys tienen 256 bits de entropía)
+"""
+import contextlib
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.constants.constants import RedisKeys
+from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import redis_metrics
+from src.utils.redis_util import RedisUtil, redis_util
+
+
+KEY_SCHEME = 'sk'
+
+
+def generate_api_key() -> Tuple[str, str, str]:
+    """
+    Genera una API key nueva
+
+    Returns:
+        (key completa para entregar una sola vez, prefix, key_hash)
+    """
+    prefix = secrets.token_hex(6)
+    key = f'{KEY_SCHEME}_{prefix}_{secrets.token_urlsafe(32)}'
+    return key, prefix, hash_api_key(key)
+
+
+def hash_api_key(key: str) -> str:
+    """SHA-256 de la key (suficiente: es aleatoria, no una contraseña)"""
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def parse_prefix(key: str) -> Optional[str]:
+    """Prefix de una key con formato sk_<prefix>_<secreto>, o None"""
+    parts = key.split('_', 2)
+    if len(parts) != 3 or parts[0] != KEY_SCHEME or not parts[1] or not parts[2]:
+        return None
+    return parts[1]
+
+
+class ApiKeyIndex:
+    """
+    Índice de API keys activas por prefix (por worker)
+
+    Cada entrada: {id, prefix, key_hash, user_id, expires_at (epoch o None)}
+    verify() busca por prefix y compara el SHA-256 en tiempo constante;
+    el estado del usuario dueño lo resuelve el principal cache.
+
+    Invalidación: crear o revocar una key incrementa auth:apikeys:version
+    en Redis; cada worker la consulta cada SYNC_SECONDS y recarga el
+    índice (una query) si cambió. Sin Redis recarga cada RELOAD_SECONDS.
+    """
+
+    ENABLED = os.getenv('API_KEYS_ENABLED', 'true').lower() == 'true'
+    SYNC_SECONDS = float(os.getenv('API_KEYS_SYNC_SECONDS', 1))
+    RELOAD_SECONDS = float(os.getenv('API_KEYS_RELOAD_SECONDS', 60))
+
+    def __init__(self, redis: Optional[RedisUtil] = None):
+        self.redis = redis or redis_util
+        self.version_key = f'{RedisKeys.API_KEYS}version'
+        self.enabled = self.ENABLED
+        self._app = None
+        self._loader: Optional[Callable[[], List[Dict[str, Any]]]] = None
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._version: Optional[str] = None
+        self._synced = False
+        self._loaded_at = 0.0
+        self._stop = threading.Event()
+        self._syncer: Optional[threading.Thread] = None
+        self._stats = {'checks': 0, 'valid': 0, 'unknown_prefix': 0, 'invalid': 0, 'expired': 0, 'reloads': 0}
+
+    def start(self, app, loader: Callable[[], List[Dict[str, Any]]]) -> None:
+        """
+        Carga el índice y arranca la sincronización
+
+        Args:
+            app: Flask app (el loader corre dentro de su app context)
+            loader: Función que devuelve las keys activas (entradas del índice)
+        """
+        self.enabled = app.config.get('API_KEYS_ENABLED', self.enabled)
+        self._app = app
+        self._loader = loader
+
+        if not self.enabled:
+            return
+
+        try:
+            self.sync()
+        except Exception as e:
+            logger.warning(f'API key index load failed: {e}')
+
+        if self._syncer is None:
+            self._syncer = threading.Thread(target=self._run, name='api-key-sync', daemon=True)
+            self._syncer.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def reload(self) -> int:
+        """Recarga el índice desde la base de datos"""
+        if self._loader is None:
+            return 0
+
+        context = self._app.app_context() if self._app is not None else contextlib.nullcontext()
+        with context:
+            entries = self._loader()
+
+        self._keys = {entry['prefix']: entry for entry in entries}
+        self._loaded_at = time.monotonic()
+        self._stats['reloads'] += 1
+        return len(self._keys)
+
+    def verify(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Verifica una API key presentada
+
+        Returns:
+            Entrada del índice (id, user_id, ...) o None si no es válida
+        """
+        if not self.enabled:
+            return None
+
+        self._stats['checks'] += 1
+        prefix = parse_prefix(key)
+        entry = self._keys.get(prefix) if prefix else None
+
+        if entry is None:
+            self._stats['unknown_prefix'] += 1
+            return None
+
+        if not hmac.compare_digest(hash_api_key(key), entry['key_hash']):
+            self._stats['invalid'] += 1
+            return None
+
+        if entry['expires_at'] is not None and entry['expires_at'] <= time.time():
+            self._stats['expired'] += 1
+            return None
+
+        self._stats['valid'] += 1
+        return entry
+
+    def invalidate(self) -> None:
+        """Avisa a todos los workers que las keys cambiaron (y recarga este)"""
+        client = self.redis.get_client()
+
+        if client:
+            with redis_metrics.track('api_keys_invalidate', self.version_key) as tracked:
+                try:
+                    client.incr(self.version_key)
+                except Exception as e:
+                    tracked.error = True
+                    logger.error(f'API key invalidation error: {e}')
+        else:
+            logger.warning('API keys changed only in this worker: Redis unavailable')
+
+        self.reload()
+
+    def sync(self) -> bool:
+        """
+        Recarga si cambió la versión en Redis (o sin Redis, si pasó RELOAD_SECONDS)
+
+        Returns:
+            True si se recargó
+        """
+        client = self.redis.get_client()
+        version = None
+
+        if client:
+            try:
+                version = client.get(self.version_key)
+            except Exception as e:
+                logger.warning(f'API key version check error: {e}')
+                client = None
+
+        if client:
+            if self._synced and version == self._version:
+                return False
+        elif self._synced and time.monotonic() - self._loaded_at < self.RELOAD_SECONDS:
+            return False
+
+        # La versión se lee antes de recargar: un cambio concurrente fuerza otra recarga
+        self.reload()
+        self._version = version
+        self._synced = True
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.SYNC_SECONDS):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f'API key index sync error: {e}')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verificaciones por resultado y tamaño del índice"""
+        return dict(self._stats, keys=len(self._keys))
+
+
+# Singleton instance
+api_key_index = ApiKeyIndex()
@@ -81,6 +81,11 @@ class AppError(Exception):
         """500 Internal Server Error"""
         return AppError(message, 500, 'INTERNAL_ERROR', details)
     
+    @staticmethod
+    def service_unavailable(message: str = 'Service unavailable', details: Any = None) -> 'AppError':
+        """503 Service Unavailable"""
+        return AppError(message, 503, 'SERVICE_UNAVAILABLE', details)
+    
     def __str__(self):
         return f'{self.code}: {self.message}'
     
@@ -0,0 +1,122 @@
+"""
+Bloom Filter Utility - Pertenencia aproximada en memoria acotada
+Sin falsos negativos: un "no está" es definitivo; un "está" puede ser un
+falso positivo (con probabilidad ~error_rate) y se confirma en otro lado
+"""
+import hashlib
+import math
+from typing import List, Tuple
+
+
+def dimensions(capacity: int, error_rate: float, max_size: int = 0) -> Tuple[int, int]:
+    """(posiciones, hashes) para `capacity` elementos a `error_rate`, con tope opcional"""
+    capacity = max(1, capacity)
+    size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+
+    if max_size and size > max_size:
+        size = max(8, max_size)
+
+    return size, max(1, round(size / capacity * math.log(2)))
+
+
+def positions(item: str, size: int, hashes: int) -> List[int]:
+    """Posiciones de un elemento (double hashing sobre blake2b)"""
+    digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1
+    return [(h1 + i * h2) % size for i in range(hashes)]
+
+
+class BloomFilter:
+    """
+    Bloom filter de bits (bytearray) con double hashing sobre blake2b
+    Dimensionado para `capacity` elementos con tasa de falsos positivos
+    `error_rate`
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size, self.hashes = dimensions(self.capacity, error_rate)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> List[int]:
+        return positions(item, self.size, self.hashes)
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+# Tabla de translate: contador 0 -> '0', cualquier otro -> '1'
+_OCCUPIED = b'0' + b'1' * 255
+
+
+class CountingBloomFilter(BloomFilter):
+    """
+    Bloom filter con contadores de 8 bits (saturan en 255) en lugar de bits:
+    admite remove() sin reconstruir. Ocupa un byte por posición (8x un
+    BloomFilter); con max_bytes se recorta el tamaño y sube la tasa real de
+    falsos positivos (ver expected_error_rate)
+    """
+
+    MAX_COUNT = 255
+
+    def __init__(self, capacity: int, error_rate: float = 0.01, max_bytes: int = 0):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size, self.hashes = dimensions(self.capacity, error_rate, max_size=max_bytes)
+        self.count = 0
+        self._bits = bytearray(self.size)
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            if self._bits[position] < self.MAX_COUNT:
+                self._bits[position] += 1
+        self.count += 1
+
+    def remove(self, item: str) -> bool:
+        """
+        Quita un elemento agregado antes (no remover lo que no se agregó:
+        generaría falsos negativos)
+
+        Returns:
+            False si el elemento no estaba en el filtro
+        """
+        positions = self._positions(item)
+
+        if not all(self._bits[position] for position in positions):
+            return False
+
+        # Un contador saturado ya no sabe cuántos elementos lo comparten
+        for position in positions:
+            if self._bits[position] < self.MAX_COUNT:
+                self._bits[position] -= 1
+
+        self.count = max(0, self.count - 1)
+        return True
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position] for position in self._positions(item))
+
+    def to_bitmap(self) -> bytes:
+        """Bits ocupados en el orden de bits de Redis (bit 0 = MSB del primer byte)"""
+        # contador -> '0'/'1' y se empaqueta como un entero binario (todo en C)
+        digits = bytes(self._bits).translate(_OCCUPIED) + b'0' * (-self.size % 8)
+        return int(digits, 2).to_bytes(len(digits) // 8, 'big')
+
+    def expected_error_rate(self) -> float:
+        """Tasa de falsos positivos esperada con los elementos actuales"""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
@@ -0,0 +1,371 @@
+"""
+Cache Utility - Cache en proceso (L1) y cache en dos niveles (L1 + Redis)
+"""
+import atexit
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import msgpack
+from src.utils import json_util
+from src.utils.json_util import to_primitive
+from src.utils.logger_util import logger
+from src.utils.redis_util import redis_util
+
+
+_MISSING = object()
+
+# Caches L1 registradas por nombre (para snapshot y métricas)
+_local_caches: Dict[str, 'LocalCache'] = {}
+
+
+class LocalCache:
+    """
+    Cache LRU en proceso con TTL por entrada (thread-safe)
+
+    Cada worker tiene su propia copia; se usa como L1 delante de Redis.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: int = 5, persist: bool = True):
+        """
+        Args:
+            persist: Incluir en el snapshot en disco (False para datos sensibles)
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.persist = persist
+        self._lock = threading.Lock()
+        self._data: 'OrderedDict[str, list]' = OrderedDict()  # key -> [value, expires_at, hits]
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        _local_caches[name] = self
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Obtiene un valor vigente (None/default si no existe o expiró)"""
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._data[key]
+                self._stats['misses'] += 1
+                return default
+
+            entry[2] += 1
+            self._data.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Guarda un valor con TTL en segundos (default: ttl de la cache)"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            entry = self._data.get(key)
+            hits = entry[2] if entry is not None else 0
+            self._data[key] = [value, expires_at, hits]
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def delete(self, key: str) -> None:
+        """Elimina una key"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Vacía la cache"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def hottest(self, limit: int) -> List[Tuple[str, Any, float, int]]:
+        """
+        Entradas vigentes más usadas
+
+        Returns:
+            Lista de (key, value, expires_at, hits) ordenada por hits
+        """
+        now = time.time()
+
+        with self._lock:
+            entries = [
+                (key, entry[0], entry[1], entry[2])
+                for key, entry in self._data.items()
+                if entry[1] > now
+            ]
+
+        entries.sort(key=lambda entry: entry[3], reverse=True)
+        return entries[:limit]
+
+    def restore(self, key: str, value: Any, expires_at: float, hits: int = 0) -> bool:
+        """Restaura una entrada de un snapshot (sin pisar valores más nuevos)"""
+        if expires_at <= time.time():
+            return False
+
+        with self._lock:
+            if key in self._data or len(self._data) >= self.maxsize:
+                return False
+
+            self._data[key] = [value, expires_at, hits]
+            self._data.move_to_end(key, last=False)
+
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas de hit ratio"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._data)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+class TieredCache:
+    """
+    Cache en dos niveles: L1 en proceso + Redis con protección anti-stampede
+
+    El TTL corto de L1 acota cuánto tarda un worker en ver la invalidación
+    hecha por otro worker.
+    """
+
+    LOCAL_TTL = int(os.getenv('CACHE_LOCAL_TTL_SECONDS', 5))
+    LOCAL_MAXSIZE = int(os.getenv('CACHE_LOCAL_MAXSIZE', 2048))
+
+    def __init__(self, namespace: str, ttl: int, persist: bool = True):
+        """
+        Args:
+            namespace: Prefijo de las keys en Redis (ver RedisKeys)
+            ttl: TTL en segundos del nivel Redis
+            persist: Incluir L1 en el snapshot en disco (False para datos personales)
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local = LocalCache(
+            namespace, maxsize=self.LOCAL_MAXSIZE, ttl=min(self.LOCAL_TTL, ttl), persist=persist
+        )
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Obtiene un valor de L1, luego Redis, y como último recurso loader()
+
+        El valor se normaliza a tipos JSON al cargarlo (datetime -> str,
+        Decimal -> float): L1, Redis y el loader devuelven lo mismo.
+
+        Args:
+            key: Key (sin namespace)
+            loader: Función que carga el valor (debe ser serializable a JSON)
+        """
+        value = self.local.get(key, _MISSING)
+
+        if value is not _MISSING:
+            return value
+
+        def load() -> Any:
+            return json_util.loads(json_util.dumpb(loader()))
+
+        value = redis_util.get_or_compute(f'{self.namespace}{key}', self.ttl, load)
+        self.local.set(key, value)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        """Invalida una key en ambos niveles"""
+        self.local.delete(key)
+        redis_util.delete(f'{self.namespace}{key}')
+
+    def clear(self) -> None:
+        """Invalida todo el namespace en ambos niveles"""
+        self.local.clear()
+        redis_util.delete_pattern(f'{self.namespace}*')
+
+
+class CacheSnapshot:
+    """
+    Snapshot en disco de las entradas más calientes de las caches L1
+
+    Formato (big-endian):
+        MAGIC(6) | format_version(u16) | header_len(u32) | header msgpack
+        record_len(u32) | record msgpack [cache, key, value, expires_at, hits]
+        ...
+
+    Se escribe a un archivo temporal y se reemplaza atómicamente; al leer
+    se recorre con mmap sin cargar el archivo completo en memoria.
+
+    Cada entrada vuelve con su vencimiento original (nunca más que el TTL
+    de su cache): un worker recién arrancado no sirve nada más viejo que
+    lo que habría servido sin reiniciar. max_age descarta además el
+    archivo completo si quedó abandonado.
+    """
+
+    MAGIC = b'L1SNAP'
+    FORMAT_VERSION = 1
+    _PREFIX = struct.Struct('>6sHI')
+    _LENGTH = struct.Struct('>I')
+
+    def __init__(self):
+        self.path = None
+        self.version = None
+        self.max_entries = 0
+        self.max_age = 30
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stats = {'saves': 0, 'saved_entries': 0, 'loaded_entries': 0, 'last_save_at': None}
+
+    def start(self, app) -> None:
+        """
+        Carga el snapshot existente y programa snapshots periódicos
+        (y uno final al terminar el worker)
+        """
+        if not app.config.get('L1_SNAPSHOT_ENABLED', False):
+            return
+
+        self.path = app.config['L1_SNAPSHOT_PATH']
+        self.version = str(app.config.get('L1_SNAPSHOT_VERSION', '1'))
+        self.max_entries = app.config.get('L1_SNAPSHOT_MAX_ENTRIES', 500)
+        self.max_age = app.config.get('L1_SNAPSHOT_MAX_AGE_SECONDS', self.max_age)
+        interval = app.config.get('L1_SNAPSHOT_INTERVAL_SECONDS', 30)
+
+        self.load()
+
+        thread = threading.Thread(target=self._run, args=(interval,), name='l1-snapshot', daemon=True)
+        thread.start()
+        atexit.register(self.save)
+
+    def _run(self, interval: int) -> None:
+        while not self._stop.wait(interval):
+            self.save()
+
+    def save(self) -> int:
+        """
+        Escribe el snapshot de las entradas más calientes de cada cache
+
+        Returns:
+            Cantidad de entradas escritas
+        """
+        if not self.path:
+            return 0
+
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        header = msgpack.packb({'version': self.version, 'created_at': time.time()})
+        written = 0
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+            # Solo el usuario del proceso: el directorio puede ser compartido (/tmp)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+            with self._lock, os.fdopen(fd, 'wb') as f:
+                f.write(self._PREFIX.pack(self.MAGIC, self.FORMAT_VERSION, len(header)))
+                f.write(header)
+
+                for name, cache in list(_local_caches.items()):
+                    if not cache.persist:
+                        continue
+                    
+                    for key, value, expires_at, hits in cache.hottest(self.max_entries):
+                        record = msgpack.packb([name, key, value, expires_at, hits], default=to_primitive)
+                        f.write(self._LENGTH.pack(len(record)))
+                        f.write(record)
+                        written += 1
+
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f'L1 snapshot save failed: {e}', path=self.path)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return 0
+
+        self._stats['saves'] += 1
+        self._stats['saved_entries'] = written
+        self._stats['last_save_at'] = time.time()
+        return written
+
+    def load(self) -> int:
+        """
+        Restaura el snapshot en las caches L1 registradas
+        Descarta el archivo si el formato o la versión no coinciden o si
+        tiene más de max_age segundos; cada entrada conserva su vencimiento
+        original y las ya vencidas no se restauran
+
+        Returns:
+            Cantidad de entradas restauradas
+        """
+        if not self.path or not os.path.exists(self.path) or os.path.getsize(self.path) < self._PREFIX.size:
+            return 0
+
+        loaded = 0
+
+        try:
+            with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, format_version, header_len = self._PREFIX.unpack_from(mm, 0)
+
+                if magic != self.MAGIC or format_version != self.FORMAT_VERSION:
+                    logger.warning('L1 snapshot ignored: unknown format', path=self.path)
+                    return 0
+
+                offset = self._PREFIX.size
+                header = msgpack.unpackb(mm[offset:offset + header_len])
+                offset += header_len
+
+                if str(header.get('version')) != self.version:
+                    logger.info('L1 snapshot ignored: version mismatch', path=self.path)
+                    return 0
+
+                now = time.time()
+
+                if now - header.get('created_at', 0) > self.max_age:
+                    logger.info('L1 snapshot ignored: older than max age', path=self.path, max_age=self.max_age)
+                    return 0
+
+                size = len(mm)
+
+                while offset + self._LENGTH.size <= size:
+                    (length,) = self._LENGTH.unpack_from(mm, offset)
+                    offset += self._LENGTH.size
+
+                    if offset + length > size:
+                        break  # registro truncado
+
+                    name, key, value, expires_at, hits = msgpack.unpackb(mm[offset:offset + length])
+                    offset += length
+
+                    cache = _local_caches.get(name)
+                    if cache is None or not cache.persist:
+                        continue
+
+                    # Sin invalidación entre workers: nunca más allá del vencimiento
+                    # original (restore descarta lo ya vencido)
+                    if cache.restore(key, value, min(expires_at, now + cache.ttl), hits):
+                        loaded += 1
+        except Exception as e:
+            logger.warning(f'L1 snapshot load failed: {e}', path=self.path)
+
+        self._stats['loaded_entries'] = loaded
+        logger.info('L1 snapshot loaded', entries=loaded)
+        return loaded
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas de snapshot"""
+        stats = dict(self._stats)
+        stats['path'] = self.path
+        stats['version'] = self.version
+        return stats
+
+
+def get_local_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Estadísticas de todas las caches L1 registradas"""
+    return {name: cache.get_stats() for name, cache in list(_local_caches.items())}
+
+
+# Singleton instance
+cache_snapshot = CacheSnapshot()
@@ -0,0 +1,91 @@
+"""
+JSON Utility - Encoding/decoding JSON con orjson (fallback a stdlib)
+Mismo formato para respuestas HTTP, request bodies y valores cacheados
+"""
+import dataclasses
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Union
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+
+def to_primitive(obj: Any) -> Any:
+    """
+    Equivalente JSON de los tipos que los DTOs devuelven sin convertir
+
+    datetime/date/time -> ISO 8601, Decimal -> float (como el float()
+    de antes), UUID -> str. Es el default de orjson (solo le llegan
+    Decimal) y del fallback stdlib, y también lo usa el snapshot msgpack
+    de L1.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def dumpb(obj: Any, sort_keys: bool = False) -> bytes:
+    """Serializa a JSON compacto (bytes UTF-8)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=to_primitive, option=option)
+
+    return json.dumps(
+        obj, default=to_primitive, sort_keys=sort_keys, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Serializa a JSON compacto (str)"""
+    return dumpb(obj, sort_keys=sort_keys).decode('utf-8')
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Parsea JSON
+
+    Raises:
+        ValueError: JSON inválido (orjson.JSONDecodeError hereda de
+            json.JSONDecodeError)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    JSON provider de Flask sobre dumps/loads de este módulo
+
+    Lo usan jsonify (ApiResponse, error handlers) y request.get_json().
+    Mantiene las keys ordenadas como el provider por defecto de Flask;
+    la respuesta se arma con los bytes de orjson sin pasar por str.
+    """
+
+    sort_keys = True
+    mimetype = 'application/json'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys))
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumpb(obj, sort_keys=self.sort_keys), mimetype=self.mimetype)
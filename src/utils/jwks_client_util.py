@@ -0,0 +1,51 @@
+"""
+JWKS Client Utility - Verificación local de access tokens
+Para servicios internos: verifican con la clave pública publicada en
+/.well-known/jwks.json en lugar de llamar a /api/auth/verify
+"""
+import os
+import jwt
+from typing import Any, Dict, Optional
+
+
+class JWKSVerifier:
+    """
+    Verificador de access tokens con cache de claves en proceso
+
+    Las claves se cachean por kid; el JWKS solo se vuelve a pedir al
+    vencer CACHE_SECONDS o ante un kid desconocido (clave recién rotada),
+    con un cooldown para que tokens con kids inventados no generen
+    un request por token.
+    """
+
+    URL = os.getenv('JWKS_URL', 'http://localhost:5000/.well-known/jwks.json')
+    CACHE_SECONDS = int(os.getenv('JWKS_CACHE_SECONDS', 3600))
+    TIMEOUT_SECONDS = float(os.getenv('JWKS_TIMEOUT_SECONDS', 5))
+
+    def __init__(self, url: Optional[str] = None, cache_seconds: Optional[int] = None):
+        self.client = jwt.PyJWKClient(
+            url or self.URL,
+            cache_keys=True,
+            lifespan=cache_seconds or self.CACHE_SECONDS,
+            timeout=self.TIMEOUT_SECONDS
+        )
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verifica firma, expiración y tipo del access token
+
+        Raises:
+            jwt.ExpiredSignatureError: Token expirado
+            jwt.InvalidTokenError: Token inválido o kid desconocido
+        """
+        try:
+            signing_key = self.client.get_signing_key_from_jwt(token)
+        except jwt.PyJWKClientError as e:
+            raise jwt.InvalidTokenError(str(e)) from e
+
+        payload = jwt.decode(token, signing_key.key, algorithms=[signing_key.algorithm_name])
+
+        if payload.get('type') != 'access':
+            raise jwt.InvalidTokenError('Not an access token')
+
+        return payload
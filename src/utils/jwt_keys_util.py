@@ -0,0 +1,279 @@
+"""
+JWT Keys Utility - Key ring de firma asimétrica (EdDSA/RS256) y JWKS
+Permite que otros servicios verifiquen access tokens localmente con la
+clave pública publicada en /.well-known/jwks.json
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+from src.utils.logger_util import logger
+
+
+# Algoritmo JWT -> clase de PyJWT que serializa la clave pública a JWK
+ALGORITHMS = {'EdDSA': OKPAlgorithm, 'RS256': RSAAlgorithm}
+
+# Miembros requeridos por tipo de clave para el thumbprint (RFC 7638)
+THUMBPRINT_MEMBERS = {'OKP': ('crv', 'kty', 'x'), 'RSA': ('e', 'kty', 'n')}
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def generate_private_key(alg: str):
+    """Genera una clave privada nueva para el algoritmo JWT dado"""
+    if alg == 'EdDSA':
+        return ed25519.Ed25519PrivateKey.generate()
+    if alg == 'RS256':
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    raise ValueError(f'Algoritmo de firma no soportado: {alg}')
+
+
+def public_jwk(public_key, alg: str) -> Dict[str, Any]:
+    """JWK público con kid = thumbprint SHA-256 (RFC 7638)"""
+    jwk = ALGORITHMS[alg].to_jwk(public_key, as_dict=True)
+    canonical = json.dumps({member: jwk[member] for member in THUMBPRINT_MEMBERS[jwk['kty']]}, separators=(',', ':'), sort_keys=True)
+    jwk.update(kid=_b64url(hashlib.sha256(canonical.encode('utf-8')).digest()), alg=alg, use='sig')
+    return jwk
+
+
+class KeyRing:
+    """
+    Key ring de firma de access tokens
+
+    Layout de JWT_KEYS_DIR (compartido entre workers/hosts):
+        keys.json   {"active": kid, "keys": {kid: {alg, created_at, retired_at}}}
+        <kid>.pem   clave privada PKCS8
+
+    Rotación con solapamiento (flask jwt-keys rotate):
+        1. Se genera una clave "next": se publica en el JWKS pero no firma
+        2. Pasado JWKS_MAX_AGE (los verificadores ya la tienen en cache)
+           pasa a ser la activa; la anterior queda retirada, sigue
+           publicada y verificando los tokens que ya firmó
+        3. prune borra las retiradas una vez expirados esos tokens
+
+    Sin claves configuradas no hay clave activa y JWTUtil firma con HS256.
+    Los workers releen el manifest cada RELOAD_SECONDS (solo un stat).
+    """
+
+    KEYS_DIR = os.getenv('JWT_KEYS_DIR', '')
+    SIGNING_ALG = os.getenv('JWT_SIGNING_ALG', 'EdDSA')
+    RELOAD_SECONDS = int(os.getenv('JWT_KEYS_RELOAD_SECONDS', 30))
+    JWKS_MAX_AGE = int(os.getenv('JWKS_MAX_AGE_SECONDS', 3600))
+    MANIFEST = 'keys.json'
+
+    def __init__(self, keys_dir: Optional[str] = None):
+        self.keys_dir = self.KEYS_DIR if keys_dir is None else keys_dir
+        self.active_kid: Optional[str] = None
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._private: Dict[str, Any] = {}
+        self._public: Dict[str, Tuple[str, Any]] = {}
+        self._set_jwks([])
+
+    # ========================================
+    # LECTURA (workers)
+    # ========================================
+
+    def refresh(self, force: bool = False) -> None:
+        """Recarga el key ring si el manifest cambió (como mucho cada RELOAD_SECONDS)"""
+        if not self.keys_dir:
+            return
+
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.RELOAD_SECONDS:
+            return
+
+        with self._lock:
+            self._checked_at = now
+
+            try:
+                mtime = os.stat(self._path(self.MANIFEST)).st_mtime
+            except OSError:
+                mtime = None
+
+            if mtime == self._mtime and not force:
+                return
+
+            try:
+                self._load(self._read_manifest())
+                self._mtime = mtime
+            except Exception as e:
+                logger.warning(f'JWT key ring reload failed: {e}', keys_dir=self.keys_dir)
+
+    def signing_key(self) -> Optional[Tuple[str, str, Any]]:
+        """(kid, alg, clave privada) de la clave activa, o None (HS256)"""
+        self.refresh()
+        kid = self.active_kid
+
+        if kid is None or kid not in self._private:
+            return None
+
+        return kid, self._public[kid][0], self._private[kid]
+
+    def verification_key(self, kid: Optional[str]) -> Optional[Tuple[str, Any]]:
+        """(alg, clave pública) del kid publicado, o None si no existe"""
+        self.refresh()
+        return self._public.get(kid) if kid else None
+
+    def jwks(self) -> Tuple[bytes, str]:
+        """JWKS serializado (precalculado en cada recarga) y su ETag"""
+        self.refresh()
+        return self._jwks, self._etag
+
+    def _load(self, manifest: Dict[str, Any]) -> None:
+        private, public, jwks = {}, {}, []
+
+        for kid, meta in manifest['keys'].items():
+            with open(self._path(f'{kid}.pem'), 'rb') as f:
+                key = serialization.load_pem_private_key(f.read(), password=None)
+
+            jwk = public_jwk(key.public_key(), meta['alg'])
+            if jwk['kid'] != kid:
+                raise ValueError(f'kid {kid} no coincide con su clave')
+
+            private[kid] = key
+            public[kid] = (meta['alg'], key.public_key())
+            jwks.append(jwk)
+
+        self._private, self._public = private, public
+        self.active_kid = manifest.get('active')
+        self._set_jwks(jwks)
+
+    def _set_jwks(self, keys: List[Dict[str, Any]]) -> None:
+        self._jwks = json.dumps({'keys': keys}, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        self._etag = hashlib.sha256(self._jwks).hexdigest()[:32]
+
+    # ========================================
+    # ADMINISTRACIÓN (CLI)
+    # ========================================
+
+    def list_keys(self) -> List[Dict[str, Any]]:
+        """Claves del manifest con su estado (active, next, retired)"""
+        manifest = self._read_manifest()
+        return [
+            dict(meta, kid=kid, status=self._status(manifest, kid))
+            for kid, meta in sorted(manifest['keys'].items(), key=lambda item: item[1]['created_at'])
+        ]
+
+    def rotate(self, now: bool = False, alg: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Avanza un paso de la rotación (idempotente, apto para cron)
+
+        Args:
+            now: Genera y activa una clave en el acto (p. ej. clave comprometida)
+            alg: Algoritmo de la clave nueva (default JWT_SIGNING_ALG)
+
+        Returns:
+            {'action': generated | activated | waiting, 'kid': ...}
+        """
+        manifest = self._read_manifest()
+        pending = [kid for kid in manifest['keys'] if self._status(manifest, kid) == 'next']
+
+        if now or manifest.get('active') is None:
+            kid = self._generate(manifest, alg or self.SIGNING_ALG)
+            self._activate(manifest, kid)
+            action = 'activated'
+        elif pending:
+            kid = max(pending, key=lambda k: manifest['keys'][k]['created_at'])
+
+            if time.time() - manifest['keys'][kid]['created_at'] < self.JWKS_MAX_AGE:
+                return {'action': 'waiting', 'kid': kid}
+
+            self._activate(manifest, kid)
+            action = 'activated'
+        else:
+            kid = self._generate(manifest, alg or self.SIGNING_ALG)
+            action = 'generated'
+
+        self._write_manifest(manifest)
+        logger.info('JWT signing key rotated', action=action, kid=kid)
+        return {'action': action, 'kid': kid}
+
+    def prune(self, max_token_age: float) -> List[str]:
+        """
+        Borra las claves retiradas cuyos tokens ya expiraron
+
+        Args:
+            max_token_age: Vida máxima de un access token (segundos)
+        """
+        manifest = self._read_manifest()
+        cutoff = time.time() - max_token_age - self.RELOAD_SECONDS
+        removed = [
+            kid for kid, meta in manifest['keys'].items()
+            if meta.get('retired_at') is not None and meta['retired_at'] < cutoff
+        ]
+
+        for kid in removed:
+            del manifest['keys'][kid]
+
+        if removed:
+            self._write_manifest(manifest)
+
+        for kid in removed:
+            os.remove(self._path(f'{kid}.pem'))
+
+        return removed
+
+    def _generate(self, manifest: Dict[str, Any], alg: str) -> str:
+        key = generate_private_key(alg)
+        kid = public_jwk(key.public_key(), alg)['kid']
+        pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        )
+
+        os.makedirs(self.keys_dir, mode=0o700, exist_ok=True)
+        fd = os.open(self._path(f'{kid}.pem'), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(pem)
+
+        manifest['keys'][kid] = {'alg': alg, 'created_at': time.time(), 'retired_at': None}
+        return kid
+
+    def _activate(self, manifest: Dict[str, Any], kid: str) -> None:
+        previous = manifest.get('active')
+        if previous and previous != kid:
+            manifest['keys'][previous]['retired_at'] = time.time()
+        manifest['active'] = kid
+
+    @staticmethod
+    def _status(manifest: Dict[str, Any], kid: str) -> str:
+        if kid == manifest.get('active'):
+            return 'active'
+        return 'retired' if manifest['keys'][kid].get('retired_at') is not None else 'next'
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.keys_dir, name)
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        if not self.keys_dir:
+            raise RuntimeError('JWT_KEYS_DIR no está configurado')
+
+        try:
+            with open(self._path(self.MANIFEST), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'active': None, 'keys': {}}
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp_path = self._path(f'{self.MANIFEST}.{os.getpid()}.tmp')
+
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+        os.replace(tmp_path, self._path(self.MANIFEST))
+        self.refresh(force=True)
+
+
+# Singleton instance
+key_ring = KeyRing()
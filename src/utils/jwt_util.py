@@ -3,9 +3,164 @@ JWT Utility - Token generation and verification
 Equivalente a src/utils/jwt.js
 """
 import jwt
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import re
+import time
+import uuid
+from datetime import timedelta
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import os
+from src.utils.cache_util import LocalCache
+from src.utils.jwt_keys_util import key_ring
+
+
+# Mismo formato que PyJWT: JSON compacto, ensure_ascii
+_claims_encoder = json.JSONEncoder(separators=(',', ':'))
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+_BASE64URL = re.compile(r'[A-Za-z0-9_-]*')
+
+
+def _b64decode(segment: str) -> bytes:
+    """
+    Decodifica un segmento base64url canónico (mismas reglas que PyJWT:
+    hasta dos '=' finales, sin caracteres fuera del alfabeto ni bits sobrantes)
+    """
+    stripped = segment.rstrip('=')
+    padding = len(segment) - len(stripped)
+
+    if padding > 2 or (padding and len(segment) % 4) or len(stripped) % 4 == 1 \
+            or not _BASE64URL.fullmatch(stripped):
+        raise binascii.Error('Invalid base64url segment')
+
+    decoded = base64.urlsafe_b64decode(stripped + '=' * (-len(stripped) % 4))
+
+    if _b64encode(decoded) != stripped.encode('ascii'):
+        raise binascii.Error('Non-canonical base64url segment')
+
+    return decoded
+
+
+class HS256Codec:
+    """
+    Encoder/decoder HS256 especializado para un secret
+
+    Produce los mismos bytes que jwt.encode(claims, secret, 'HS256') y
+    acepta sus tokens, sin el trabajo genérico de PyJWT en cada llamada:
+    - segmento de header precalculado ({"alg":"HS256","typ":"JWT"})
+    - HMAC con la clave ya procesada (copy() del objeto base)
+    - claims con exp/iat enteros, serializados con un encoder reutilizado
+
+    decode() solo aplica a tokens con ese header exacto (matches()); el
+    resto (kid, otros algoritmos, headers extra) sigue por PyJWT. Valida
+    exp, iat, nbf, sub, jti y aud como jwt.decode (sin audience ni
+    leeway) y lanza las mismas excepciones.
+    """
+
+    HEADER = {'alg': 'HS256', 'typ': 'JWT'}
+
+    def __init__(self, secret: str):
+        self._mac = hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+        self._header = _b64encode(json.dumps(self.HEADER, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+        self.prefix = self._header.decode('ascii') + '.'
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """Firma los claims (exp/iat/nbf ya como epoch enteros)"""
+        signing_input = self._header + b'.' + _b64encode(_claims_encoder.encode(claims).encode('utf-8'))
+        return (signing_input + b'.' + _b64encode(self._sign(signing_input))).decode('ascii')
+
+    def matches(self, token: str) -> bool:
+        """True si el token tiene el header que este codec sabe verificar"""
+        return token.startswith(self.prefix)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verifica firma y claims registrados (llamar solo si matches())
+
+        Raises:
+            jwt.InvalidSignatureError: Firma inválida
+            jwt.ExpiredSignatureError: Token expirado
+            jwt.DecodeError: Token mal formado
+        """
+        signing_input, _, signature = token.rpartition('.')
+
+        if signing_input.count('.') != 1:
+            raise jwt.DecodeError('Not enough segments')
+
+        try:
+            payload_segment = signing_input.split('.', 1)[1]
+            raw_payload = _b64decode(payload_segment)
+            raw_signature = _b64decode(signature)
+            signing_bytes = signing_input.encode('ascii')
+        except (binascii.Error, ValueError, UnicodeEncodeError):
+            raise jwt.DecodeError('Invalid token padding or encoding') from None
+
+        if not hmac.compare_digest(self._sign(signing_bytes), raw_signature):
+            raise jwt.InvalidSignatureError('Signature verification failed')
+
+        try:
+            claims = json.loads(raw_payload)
+        except ValueError as e:
+            raise jwt.DecodeError(f'Invalid payload string: {e}') from None
+
+        if not isinstance(claims, dict):
+            raise jwt.DecodeError('Invalid payload string: must be a json object')
+
+        self._validate_times(claims, time.time())
+        self._validate_registered(claims)
+        return claims
+
+    @staticmethod
+    def _validate_times(claims: Dict[str, Any], now: float) -> None:
+        """Mismas reglas que PyJWT (sin leeway)"""
+        try:
+            iat = int(claims['iat']) if 'iat' in claims else None
+        except (ValueError, TypeError, OverflowError):
+            raise jwt.InvalidIssuedAtError('Issued At claim (iat) must be an integer.') from None
+
+        if iat is not None and iat > now:
+            raise jwt.ImmatureSignatureError('The token is not yet valid (iat)')
+
+        try:
+            nbf = int(claims['nbf']) if 'nbf' in claims else None
+        except (ValueError, TypeError, OverflowError):
+            raise jwt.DecodeError('Not Before claim (nbf) must be an integer.') from None
+
+        if nbf is not None and nbf > now:
+            raise jwt.ImmatureSignatureError('The token is not yet valid (nbf)')
+
+        try:
+            exp = int(claims['exp']) if 'exp' in claims else None
+        except (ValueError, TypeError, OverflowError):
+            raise jwt.DecodeError('Expiration Time claim (exp) must be an integer.') from None
+
+        if exp is not None and exp <= now:
+            raise jwt.ExpiredSignatureError('Signature has expired')
+
+    @staticmethod
+    def _validate_registered(claims: Dict[str, Any]) -> None:
+        if 'sub' in claims and not isinstance(claims['sub'], str):
+            raise jwt.exceptions.InvalidSubjectError('Subject must be a string')
+
+        if 'jti' in claims and not isinstance(claims['jti'], str):
+            raise jwt.exceptions.InvalidJTIError('JWT ID must be a string')
+
+        # Sin audience esperada, un aud no vacío es inválido
+        if claims.get('aud'):
+            raise jwt.InvalidAudienceError('Invalid audience')
 
 
 class JWTUtil:
@@ -25,72 +180,206 @@ class JWTUtil:
     # Algorithm
     ALGORITHM = 'HS256'
     
+    # Con clave activa en el key ring los access tokens se firman con
+    # EdDSA/RS256 (header kid); HS256 sigue aceptándose para los tokens
+    # emitidos antes de migrar hasta que se deshabilite
+    ACCEPT_HS256 = os.getenv('JWT_ACCEPT_HS256', 'true').lower() == 'true'
+    
+    # Codec HS256 especializado (wire-compatible con PyJWT); false vuelve a jwt.encode/decode
+    FAST_CODEC_ENABLED = os.getenv('JWT_FAST_CODEC_ENABLED', 'true').lower() == 'true'
+    _codecs: Dict[str, HS256Codec] = {}
+    
+    # Cache de tokens ya verificados (digest -> payload, hasta su exp)
+    VERIFY_CACHE_ENABLED = os.getenv('JWT_VERIFY_CACHE_ENABLED', 'true').lower() == 'true'
+    VERIFY_CACHE_SIZE = int(os.getenv('JWT_VERIFY_CACHE_SIZE', 10000))
+    _verified_tokens = LocalCache('auth:verified_tokens', maxsize=VERIFY_CACHE_SIZE, persist=False)
+    
+    # Checks de revocación: payload -> True si el token fue revocado
+    _revocation_checks: List[Callable[[Dict[str, Any]], bool]] = []
+    
     @classmethod
     def generate_access_token(cls, user) -> str:
         """
         Genera access token
         Equivalente a generateAccessToken() en Node.js
         """
+        now = int(time.time())
         payload = {
             'id': user.id,
             'email': user.email,
             'role': user.role.value if hasattr(user.role, 'value') else user.role,
-            'exp': datetime.utcnow() + cls.ACCESS_TOKEN_EXPIRY,
-            'iat': datetime.utcnow(),
+            'token_version': getattr(user, 'token_version', None) or 0,
+            'exp': now + int(cls.ACCESS_TOKEN_EXPIRY.total_seconds()),
+            'iat': now,
+            'jti': uuid.uuid4().hex,
             'type': 'access'
         }
         
-        return jwt.encode(payload, cls.ACCESS_SECRET, algorithm=cls.ALGORITHM)
+        signing_key = key_ring.signing_key()
+        
+        if signing_key:
+            kid, algorithm, private_key = signing_key
+            return jwt.encode(payload, private_key, algorithm=algorithm, headers={'kid': kid})
+        
+        return cls._encode_hs256(payload, cls.ACCESS_SECRET)
     
     @classmethod
-    def generate_refresh_token(cls, user) -> str:
+    def generate_refresh_token(cls, user, family_id: Optional[str] = None) -> str:
         """
         Genera refresh token
         Equivalente a generateRefreshToken() en Node.js
+        
+        Args:
+            family_id: Familia de rotación (fid); None inicia una nueva (login)
         """
+        now = int(time.time())
         payload = {
             'id': user.id,
             'email': user.email,
-            'exp': datetime.utcnow() + cls.REFRESH_TOKEN_EXPIRY,
-            'iat': datetime.utcnow(),
+            'token_version': getattr(user, 'token_version', None) or 0,
+            'exp': now + int(cls.REFRESH_TOKEN_EXPIRY.total_seconds()),
+            'iat': now,
+            'jti': uuid.uuid4().hex,
+            'fid': family_id or uuid.uuid4().hex,
             'type': 'refresh'
         }
         
-        return jwt.encode(payload, cls.REFRESH_SECRET, algorithm=cls.ALGORITHM)
+        return cls._encode_hs256(payload, cls.REFRESH_SECRET)
     
     @classmethod
-    def generate_token_pair(cls, user) -> Dict[str, str]:
+    def generate_token_pair(cls, user, family_id: Optional[str] = None) -> Dict[str, str]:
         """
         Genera par de tokens (access + refresh)
         Equivalente a generateTokenPair() en Node.js
         """
         return {
             'access_token': cls.generate_access_token(user),
-            'refresh_token': cls.generate_refresh_token(user)
+            'refresh_token': cls.generate_refresh_token(user, family_id=family_id)
         }
     
+    @classmethod
+    def _codec(cls, secret: str) -> HS256Codec:
+        """Codec HS256 del secret (uno por secret, la clave HMAC se procesa una vez)"""
+        codec = cls._codecs.get(secret)
+        
+        if codec is None:
+            codec = cls._codecs[secret] = HS256Codec(secret)
+        
+        return codec
+    
+    @classmethod
+    def _encode_hs256(cls, payload: Dict[str, Any], secret: str) -> str:
+        if cls.FAST_CODEC_ENABLED:
+            return cls._codec(secret).encode(payload)
+        
+        return jwt.encode(payload, secret, algorithm=cls.ALGORITHM)
+    
+    @classmethod
+    def _decode_hs256(cls, token: str, secret: str) -> Dict[str, Any]:
+        if cls.FAST_CODEC_ENABLED:
+            codec = cls._codec(secret)
+            
+            if codec.matches(token):
+                return codec.decode(token)
+        
+        return jwt.decode(token, secret, algorithms=[cls.ALGORITHM])
+    
     @classmethod
     def verify_access_token(cls, token: str) -> Dict[str, Any]:
         """
         Verifica access token
         Equivalente a verifyAccessToken() en Node.js
         
+        Los tokens ya verificados se cachean por digest hasta su exp; en un
+        hit solo se re-chequea expiración y revocación (sin HMAC ni JSON)
+        
         Raises:
             jwt.ExpiredSignatureError: Token expirado
             jwt.InvalidTokenError: Token inválido
         """
-        try:
-            payload = jwt.decode(token, cls.ACCESS_SECRET, algorithms=[cls.ALGORITHM])
+        digest = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest() if cls.VERIFY_CACHE_ENABLED else None
+        payload = cls._verified_tokens.get(digest) if digest else None
+        
+        if payload is None:
+            key, algorithms = cls._access_verification_key(token)
+            
+            if algorithms == [cls.ALGORITHM]:
+                payload = cls._decode_hs256(token, key)
+            else:
+                payload = jwt.decode(token, key, algorithms=algorithms)
             
             # Verificar que sea access token
             if payload.get('type') != 'access':
                 raise jwt.InvalidTokenError('Not an access token')
             
-            return payload
-        except jwt.ExpiredSignatureError:
-            raise
-        except jwt.InvalidTokenError:
-            raise
+            if digest and 'exp' in payload:
+                cls._verified_tokens.set(digest, payload, ttl=payload['exp'] - time.time())
+        elif payload['exp'] <= time.time():
+            raise jwt.ExpiredSignatureError('Signature has expired')
+        
+        if cls.is_revoked(payload):
+            if digest:
+                cls._verified_tokens.delete(digest)
+            raise jwt.InvalidTokenError('Token revocado')
+        
+        return dict(payload)
+    
+    @classmethod
+    def _access_verification_key(cls, token: str) -> Tuple[Any, List[str]]:
+        """
+        Clave y algoritmo según el header: HS256 usa el secret compartido,
+        el resto la clave pública del kid (nunca se mezclan, así un token
+        HS256 no puede "firmarse" con la clave pública)
+        """
+        if cls.FAST_CODEC_ENABLED and cls._codec(cls.ACCESS_SECRET).matches(token):
+            header = HS256Codec.HEADER
+        else:
+            header = jwt.get_unverified_header(token)
+        
+        if header.get('alg') == cls.ALGORITHM:
+            if not cls.ACCEPT_HS256:
+                raise jwt.InvalidTokenError('Tokens HS256 deshabilitados')
+            return cls.ACCESS_SECRET, [cls.ALGORITHM]
+        
+        verification_key = key_ring.verification_key(header.get('kid'))
+        
+        if verification_key is None:
+            raise jwt.InvalidTokenError('kid desconocido')
+        
+        algorithm, public_key = verification_key
+        return public_key, [algorithm]
+    
+    @staticmethod
+    def is_outdated(payload: Dict[str, Any], token_version: Optional[int]) -> bool:
+        """
+        True si el token se emitió antes del último incremento de
+        token_version del usuario (revocación de todas sus sesiones)
+        """
+        return payload.get('token_version', 0) < (token_version or 0)
+    
+    @classmethod
+    def register_revocation_check(cls, check: Callable[[Dict[str, Any]], bool]) -> None:
+        """
+        Registra un check de revocación (se ejecuta en cada verificación,
+        también en hits de cache)
+        """
+        if check not in cls._revocation_checks:
+            cls._revocation_checks.append(check)
+    
+    @classmethod
+    def is_revoked(cls, payload: Dict[str, Any]) -> bool:
+        """True si algún check de revocación rechaza el token"""
+        return any(check(payload) for check in cls._revocation_checks)
+    
+    @classmethod
+    def clear_verified_tokens(cls) -> None:
+        """Vacía la cache de tokens verificados (p. ej. al rotar secrets)"""
+        cls._verified_tokens.clear()
+    
+    @classmethod
+    def get_verify_cache_stats(cls) -> Dict[str, Any]:
+        """Hit rate de la cache de tokens verificados"""
+        return dict(cls._verified_tokens.get_stats(), enabled=cls.VERIFY_CACHE_ENABLED)
     
     @classmethod
     def verify_refresh_token(cls, token: str) -> Dict[str, Any]:
@@ -103,12 +392,15 @@ class JWTUtil:
             jwt.InvalidTokenError: Token inválido
         """
         try:
-            payload = jwt.decode(token, cls.REFRESH_SECRET, algorithms=[cls.ALGORITHM])
+            payload = cls._decode_hs256(token, cls.REFRESH_SECRET)
             
             # Verificar que sea refresh token
             if payload.get('type') != 'refresh':
                 raise jwt.InvalidTokenError('Not a refresh token')
             
+            if cls.is_revoked(payload):
+                raise jwt.InvalidTokenError('Token revocado')
+            
             return payload
         except jwt.ExpiredSignatureError:
             raise
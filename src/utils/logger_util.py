@@ -8,6 +8,36 @@ from logging.handlers import RotatingFileHandler
 from pythonjsonlogger import jsonlogger
 
 
+class StructuredLogger(logging.LoggerAdapter):
+    """
+    Logger que acepta campos estructurados como kwargs
+    Equivalente a logger.info(msg, { ...meta }) de winston en Node.js
+    
+    Usage:
+        logger.info('User logged in', user_id=user.id)
+    """
+    
+    # kwargs que el logging estándar entiende
+    LOGGING_KWARGS = ('exc_info', 'stack_info', 'stacklevel', 'extra')
+    
+    # Atributos reservados de LogRecord (no se pueden sobrescribir vía extra)
+    RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+    
+    def process(self, msg, kwargs):
+        extra = dict(kwargs.pop('extra', None) or {})
+        
+        for key in list(kwargs):
+            if key not in self.LOGGING_KWARGS:
+                extra[key] = kwargs.pop(key)
+        
+        # Renombrar campos que colisionan con atributos de LogRecord
+        kwargs['extra'] = {
+            (f'ctx_{key}' if key in self.RESERVED_ATTRS else key): value
+            for key, value in extra.items()
+        }
+        return msg, kwargs
+
+
 class LoggerUtil:
     """Logger utility class"""
     
@@ -54,7 +84,7 @@ class LoggerUtil:
 
 
 # Singleton logger instance
-logger = LoggerUtil.setup_logger()
+logger = StructuredLogger(LoggerUtil.setup_logger(), {})
 
 
 def log_info(message: str, **kwargs):
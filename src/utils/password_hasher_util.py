@@ -0,0 +1,200 @@
+"""
+Password Hasher Utility - Hash/verificación de passwords en un pool de procesos
+Saca el costo de CPU de pbkdf2 de los threads del worker y acota cuántos hashes corren a la vez
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.utils.app_error import AppError
+from src.utils.logger_util import logger
+from src.utils.password_schemes_util import PasswordScheme, SCHEMES, get_scheme, verify_any
+from src.utils.redis_metrics_util import LatencyHistogram
+
+
+def _run(fn: Callable, args: Tuple) -> Tuple[Any, float]:
+    """Ejecuta en el proceso hijo; retorna (resultado, instante de inicio)"""
+    started = time.time()
+    return fn(*args), started
+
+
+def _hash(scheme: str, params: Dict[str, int], password: str) -> str:
+    return get_scheme(scheme, params).hash(password)
+
+
+class PasswordHasher:
+    """
+    Executor de hashing acotado
+
+    - Pool de procesos de tamaño fijo (0 = inline, útil en tests/dev)
+    - Límite de trabajos en vuelo (ejecutando + encolados): si se supera,
+      se rechaza de inmediato con 503 en vez de acumular requests
+    - Timeout de espera del resultado
+    - Algoritmo y costos configurables (ver password_schemes_util)
+
+    Los procesos se crean con fork al arrancar la app (start), antes de que
+    existan los threads de warm-up/snapshot; spawn re-ejecutaría run.py en
+    cada hijo.
+    """
+
+    WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    MAX_QUEUE = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', 64))
+    TIMEOUT_MS = int(os.getenv('PASSWORD_HASH_TIMEOUT_MS', 5000))
+    START_METHOD = os.getenv('PASSWORD_HASH_START_METHOD', 'fork')
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        timeout_ms: Optional[int] = None
+    ):
+        self.workers = self.WORKERS if workers is None else workers
+        self.max_queue = self.MAX_QUEUE if max_queue is None else max_queue
+        self.timeout_ms = self.TIMEOUT_MS if timeout_ms is None else timeout_ms
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._in_flight = 0
+        self._stats = {'submitted': 0, 'completed': 0, 'rejected': 0, 'timeouts': 0, 'errors': 0, 'max_in_flight': 0}
+        self._queue_wait = LatencyHistogram()
+        self._duration = LatencyHistogram()
+        self.scheme: PasswordScheme = get_scheme('pbkdf2')
+        self._configure()
+
+    def _configure(self) -> None:
+        self._slots = threading.BoundedSemaphore(max(1, self.max_queue))
+
+    def start(self, app) -> None:
+        """
+        Aplica la configuración de la app y levanta el pool
+        (PASSWORD_HASH_WORKERS = 0 deja el hashing inline)
+        """
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', self.workers)
+        self.max_queue = app.config.get('PASSWORD_HASH_MAX_QUEUE', self.max_queue)
+        self.timeout_ms = app.config.get('PASSWORD_HASH_TIMEOUT_MS', self.timeout_ms)
+        self.scheme = SCHEMES[app.config.get('PASSWORD_HASH_SCHEME', 'pbkdf2')].from_config(app.config)
+        self._configure()
+
+        if self.workers > 0:
+            # Con fork el pool crea todos los procesos en el primer submit
+            self._get_pool().submit(time.time).result()
+
+    def hash_password(self, password: str) -> str:
+        """Hashea un password con el algoritmo y costos configurados"""
+        return self._submit(_hash, (self.scheme.name, self.scheme.params, password))
+
+    def verify_password(self, pwhash: str, password: str) -> bool:
+        """Verifica un password contra su hash (cualquier algoritmo registrado)"""
+        return self._submit(verify_any, (pwhash, password))
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        """True si el hash usa otro algoritmo o costos distintos a los configurados"""
+        return self.scheme.needs_rehash(pwhash)
+
+    def _submit(self, fn: Callable, args: Tuple) -> Any:
+        if self.workers <= 0:
+            return fn(*args)
+
+        slots = self._slots
+
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['rejected'] += 1
+            logger.warning('Password hashing queue full', max_queue=self.max_queue)
+            raise AppError.service_unavailable('Servicio de autenticación saturado, intenta nuevamente')
+
+        submitted_at = time.time()
+
+        try:
+            future = self._get_pool().submit(_run, fn, args)
+        except Exception:
+            slots.release()
+            raise
+
+        with self._lock:
+            self._stats['submitted'] += 1
+            self._in_flight += 1
+            self._stats['max_in_flight'] = max(self._stats['max_in_flight'], self._in_flight)
+
+        # El slot se libera cuando el trabajo termina (aunque el request ya no espere)
+        future.add_done_callback(lambda f: self._on_done(f, submitted_at, slots))
+
+        try:
+            result, _ = future.result(timeout=self.timeout_ms / 1000)
+            return result
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self._stats['timeouts'] += 1
+            logger.warning('Password hashing timed out', timeout_ms=self.timeout_ms)
+            raise AppError.service_unavailable('Servicio de autenticación saturado, intenta nuevamente')
+        except BrokenProcessPool:
+            self._reset_pool()
+            raise
+
+    def _on_done(self, future: Future, submitted_at: float, slots: threading.BoundedSemaphore) -> None:
+        finished_at = time.time()
+
+        with self._lock:
+            self._in_flight -= 1
+
+            if not future.cancelled():
+                if future.exception() is not None:
+                    self._stats['errors'] += 1
+                else:
+                    _, started_at = future.result()
+                    self._stats['completed'] += 1
+                    self._queue_wait.observe(max(0.0, started_at - submitted_at) * 1000)
+                    self._duration.observe((finished_at - submitted_at) * 1000)
+
+        slots.release()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Pool creado bajo demanda (y recreado si el worker hizo fork)"""
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.START_METHOD)
+                )
+                self._pid = os.getpid()
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+
+        logger.error('Password hashing pool broken, recreating')
+
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Detiene el pool (los trabajos en curso terminan)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tamaño del pool, ocupación y tiempos de espera en cola"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'timeout_ms': self.timeout_ms,
+                'scheme': self.scheme.name,
+                'params': self.scheme.params,
+                'in_flight': self._in_flight,
+                **self._stats,
+                'queue_wait': self._queue_wait.to_dict(),
+                'duration': self._duration.to_dict()
+            }
+
+
+# Singleton instance
+password_hasher = PasswordHasher()
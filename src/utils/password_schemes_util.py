@@ -0,0 +1,262 @@
+"""
+Password Schemes Utility - Registro de algoritmos de hashing de passwords
+pbkdf2, scrypt, bcrypt y argon2id con costos configurables y calibración
+"""
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, Optional, Type
+import bcrypt
+from werkzeug.security import check_password_hash, generate_password_hash
+
+try:
+    from argon2 import PasswordHasher as Argon2PasswordHasher, Type as Argon2Type
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # argon2-cffi es opcional
+    Argon2PasswordHasher = None
+
+
+class PasswordScheme(ABC):
+    """
+    Algoritmo de hashing con sus parámetros de costo
+
+    Subclases definen:
+        name: nombre en config (PASSWORD_HASH_SCHEME)
+        CONFIG: parámetro -> key de config
+        DEFAULTS: parámetro -> valor por defecto
+    """
+
+    name = ''
+    CONFIG: Dict[str, str] = {}
+    DEFAULTS: Dict[str, int] = {}
+
+    def __init__(self, **params: int):
+        self.params = {**self.DEFAULTS, **{k: int(v) for k, v in params.items() if v is not None}}
+
+    @classmethod
+    def from_config(cls, config) -> 'PasswordScheme':
+        return cls(**{param: config.get(key) for param, key in cls.CONFIG.items()})
+
+    @classmethod
+    @abstractmethod
+    def identify(cls, pwhash: str) -> bool:
+        """True si el hash fue generado con este algoritmo"""
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """Hash del password con los parámetros actuales"""
+
+    @abstractmethod
+    def verify(self, pwhash: str, password: str) -> bool:
+        """True si el password corresponde al hash"""
+
+    @abstractmethod
+    def needs_rehash(self, pwhash: str) -> bool:
+        """True si el hash no usa este algoritmo con los parámetros actuales"""
+
+    @classmethod
+    @abstractmethod
+    def calibration_candidates(cls) -> Iterator[Dict[str, int]]:
+        """Parámetros de costo creciente para calibrar"""
+
+
+class Pbkdf2Scheme(PasswordScheme):
+    """pbkdf2:sha256 (formato werkzeug)"""
+
+    name = 'pbkdf2'
+    CONFIG = {'iterations': 'PASSWORD_PBKDF2_ITERATIONS'}
+    DEFAULTS = {'iterations': 1000000}
+
+    @classmethod
+    def identify(cls, pwhash: str) -> bool:
+        return pwhash.startswith('pbkdf2:')
+
+    def hash(self, password: str) -> str:
+        return generate_password_hash(password, method=f"pbkdf2:sha256:{self.params['iterations']}")
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        return check_password_hash(pwhash, password)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        return pwhash.split('$', 1)[0] != f"pbkdf2:sha256:{self.params['iterations']}"
+
+    @classmethod
+    def calibration_candidates(cls) -> Iterator[Dict[str, int]]:
+        for step in range(11):
+            yield {'iterations': 50000 * 2 ** step}
+
+
+class ScryptScheme(PasswordScheme):
+    """scrypt (formato werkzeug)"""
+
+    name = 'scrypt'
+    CONFIG = {'n': 'PASSWORD_SCRYPT_N', 'r': 'PASSWORD_SCRYPT_R', 'p': 'PASSWORD_SCRYPT_P'}
+    DEFAULTS = {'n': 2 ** 15, 'r': 8, 'p': 1}
+
+    def _method(self) -> str:
+        return f"scrypt:{self.params['n']}:{self.params['r']}:{self.params['p']}"
+
+    @classmethod
+    def identify(cls, pwhash: str) -> bool:
+        return pwhash.startswith('scrypt:')
+
+    def hash(self, password: str) -> str:
+        return generate_password_hash(password, method=self._method())
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        return check_password_hash(pwhash, password)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        return pwhash.split('$', 1)[0] != self._method()
+
+    @classmethod
+    def calibration_candidates(cls) -> Iterator[Dict[str, int]]:
+        for log_n in range(14, 21):
+            yield {'n': 2 ** log_n, 'r': 8, 'p': 1}
+
+
+class BcryptScheme(PasswordScheme):
+    """
+    bcrypt ($2b$)
+    bcrypt solo usa los primeros 72 bytes del password; se truncan
+    explícitamente (bcrypt>=5 rechaza passwords más largos)
+    """
+
+    name = 'bcrypt'
+    CONFIG = {'rounds': 'PASSWORD_BCRYPT_ROUNDS'}
+    DEFAULTS = {'rounds': 12}
+    MAX_BYTES = 72
+
+    @classmethod
+    def identify(cls, pwhash: str) -> bool:
+        return pwhash.startswith(('$2b$', '$2a$', '$2y$'))
+
+    def _encode(self, password: str) -> bytes:
+        return password.encode('utf-8')[:self.MAX_BYTES]
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(self._encode(password), bcrypt.gensalt(rounds=self.params['rounds'])).decode('ascii')
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        try:
+            return bcrypt.checkpw(self._encode(password), pwhash.encode('ascii'))
+        except ValueError:
+            return False
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        return not pwhash.startswith(f"$2b${self.params['rounds']:02d}$")
+
+    @classmethod
+    def calibration_candidates(cls) -> Iterator[Dict[str, int]]:
+        for rounds in range(8, 17):
+            yield {'rounds': rounds}
+
+
+class Argon2idScheme(PasswordScheme):
+    """argon2id (requiere argon2-cffi)"""
+
+    name = 'argon2id'
+    CONFIG = {
+        'time_cost': 'PASSWORD_ARGON2_TIME_COST',
+        'memory_cost': 'PASSWORD_ARGON2_MEMORY_COST',
+        'parallelism': 'PASSWORD_ARGON2_PARALLELISM'
+    }
+    DEFAULTS = {'time_cost': 3, 'memory_cost': 65536, 'parallelism': 4}
+
+    def __init__(self, **params: int):
+        super().__init__(**params)
+
+        if Argon2PasswordHasher is None:
+            raise RuntimeError('argon2id requiere el paquete argon2-cffi')
+
+        self._hasher = Argon2PasswordHasher(type=Argon2Type.ID, **self.params)
+
+    @classmethod
+    def identify(cls, pwhash: str) -> bool:
+        return pwhash.startswith('$argon2id$')
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        try:
+            return self._hasher.verify(pwhash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        return not self.identify(pwhash) or self._hasher.check_needs_rehash(pwhash)
+
+    @classmethod
+    def calibration_candidates(cls) -> Iterator[Dict[str, int]]:
+        for time_cost in range(1, 11):
+            yield {**cls.DEFAULTS, 'time_cost': time_cost}
+
+
+# Registro de algoritmos por nombre
+SCHEMES: Dict[str, Type[PasswordScheme]] = {
+    scheme.name: scheme
+    for scheme in (Pbkdf2Scheme, ScryptScheme, BcryptScheme, Argon2idScheme)
+}
+
+
+def get_scheme(name: str, params: Optional[Dict[str, Any]] = None) -> PasswordScheme:
+    """Instancia un algoritmo registrado"""
+    if name not in SCHEMES:
+        raise ValueError(f'Algoritmo de hashing desconocido: {name}')
+    return SCHEMES[name](**(params or {}))
+
+
+def identify_scheme(pwhash: str) -> Optional[Type[PasswordScheme]]:
+    """Algoritmo con el que se generó un hash (None si no se reconoce)"""
+    for scheme in SCHEMES.values():
+        if scheme.identify(pwhash):
+            return scheme
+    return None
+
+
+def verify_any(pwhash: str, password: str) -> bool:
+    """Verifica un hash con el algoritmo y parámetros que trae embebidos"""
+    scheme = identify_scheme(pwhash or '')
+
+    if scheme is None:
+        return False
+
+    return scheme().verify(pwhash, password)
+
+
+def calibrate(name: str, target_ms: float, samples: int = 3) -> Dict[str, Any]:
+    """
+    Busca el costo más bajo cuyo verify tarda al menos target_ms en este hardware
+
+    Returns:
+        {'scheme', 'params', 'config', 'verify_ms'}
+    """
+    if name not in SCHEMES:
+        raise ValueError(f'Algoritmo de hashing desconocido: {name}')
+
+    scheme_cls = SCHEMES[name]
+    chosen = None
+
+    for params in scheme_cls.calibration_candidates():
+        scheme = scheme_cls(**params)
+        pwhash = scheme.hash('calibration-password')
+        timings = []
+
+        for _ in range(samples):
+            started = time.perf_counter()
+            scheme.verify(pwhash, 'calibration-password')
+            timings.append((time.perf_counter() - started) * 1000)
+
+        chosen = (scheme.params, sorted(timings)[len(timings) // 2])
+
+        if chosen[1] >= target_ms:
+            break
+
+    params, verify_ms = chosen
+
+    return {
+        'scheme': name,
+        'params': params,
+        'config': {scheme_cls.CONFIG[param]: value for param, value in params.items()},
+        'verify_ms': round(verify_ms, 1)
+    }
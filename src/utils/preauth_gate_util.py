@@ -0,0 +1,383 @@
+"""
+Pre-Auth Gate Utility - Filtro barato delante de la verificación de passwords
+Reputación por IP y subred, presupuesto global de logins fallidos y
+desafíos de proof-of-work / backoff; lo rechazado no llega a la base de
+datos ni al hashing
+"""
+import hashlib
+import hmac
+import ipaddress
+import math
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from src.constants.constants import RedisKeys
+from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import redis_metrics
+from src.utils.redis_util import RedisUtil, redis_util
+
+
+@dataclass
+class GateDecision:
+    """Resultado del gate para un intento de login"""
+    action: str  # allow | challenge | backoff | block
+    reason: Optional[str] = None
+    retry_after: int = 0
+    challenge: Optional[str] = None
+    difficulty: int = 0
+
+    @property
+    def allowed(self) -> bool:
+        return self.action == 'allow'
+
+
+def subnet_of(ip_address: str) -> Optional[str]:
+    """Subred /24 (IPv4) o /64 (IPv6) de la IP, o None si no es una IP"""
+    try:
+        ip = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return None
+
+    prefix = 24 if ip.version == 4 else 64
+    return str(ipaddress.ip_network(f'{ip}/{prefix}', strict=False))
+
+
+def leading_zero_bits(digest: bytes) -> int:
+    """Bits en cero al comienzo del digest"""
+    value = int.from_bytes(digest, 'big')
+    return len(digest) * 8 - value.bit_length()
+
+
+class PreAuthGate:
+    """
+    Gate de pre-autenticación para POST /api/auth/login
+
+    Contadores de logins fallidos en ventana deslizante (aproximada: la
+    ventana anterior ponderada por su solapamiento + la actual):
+        auth:preauth:ip:<ip>:<ventana>
+        auth:preauth:net:<subred>:<ventana>
+        auth:preauth:global:<ventana>
+
+    Decisión (un MGET por intento):
+        - IP o subred sobre el umbral de bloqueo -> block (429)
+        - IP o subred sobre el umbral de desafío, o presupuesto global de
+          fallos agotado (ataque distribuido) -> challenge con proof-of-work
+          (428 con el desafío; se reintenta con X-PoW-Challenge/X-PoW-Nonce)
+          o, con POW deshabilitado, backoff: un intento por IP cada N
+          segundos, N creciente con los fallos
+        - resto -> allow
+
+    Sin Redis los contadores son por worker.
+    """
+
+    ENABLED = os.getenv('PREAUTH_ENABLED', 'true').lower() == 'true'
+    WINDOW_SECONDS = int(os.getenv('PREAUTH_WINDOW_SECONDS', 600))
+    IP_CHALLENGE = int(os.getenv('PREAUTH_IP_CHALLENGE_THRESHOLD', 10))
+    IP_BLOCK = int(os.getenv('PREAUTH_IP_BLOCK_THRESHOLD', 100))
+    SUBNET_CHALLENGE = int(os.getenv('PREAUTH_SUBNET_CHALLENGE_THRESHOLD', 50))
+    SUBNET_BLOCK = int(os.getenv('PREAUTH_SUBNET_BLOCK_THRESHOLD', 500))
+    GLOBAL_BUDGET = int(os.getenv('PREAUTH_GLOBAL_FAILURE_BUDGET', 1000))
+    POW_ENABLED = os.getenv('PREAUTH_POW_ENABLED', 'true').lower() == 'true'
+    POW_DIFFICULTY = int(os.getenv('PREAUTH_POW_DIFFICULTY', 16))
+    POW_MAX_DIFFICULTY = int(os.getenv('PREAUTH_POW_MAX_DIFFICULTY', 22))
+    POW_TTL_SECONDS = int(os.getenv('PREAUTH_POW_TTL_SECONDS', 120))
+    # Tolerancia para desafíos con timestamp en el futuro (relojes desfasados)
+    POW_CLOCK_SKEW_SECONDS = int(os.getenv('PREAUTH_POW_CLOCK_SKEW_SECONDS', 5))
+    DEFAULT_POW_SECRET = 'dev-access-secret-change-me'
+    POW_SECRET = os.getenv('PREAUTH_POW_SECRET') or os.getenv('JWT_ACCESS_SECRET') or DEFAULT_POW_SECRET
+    BACKOFF_MAX_SECONDS = int(os.getenv('PREAUTH_BACKOFF_MAX_SECONDS', 60))
+    LOCAL_MAXSIZE = int(os.getenv('PREAUTH_LOCAL_MAXSIZE', 10000))
+    # Costo estimado de un login rechazado si el hasher todavía no midió ninguno
+    LOGIN_COST_MS = float(os.getenv('PREAUTH_LOGIN_COST_MS', 250))
+
+    def __init__(self, redis: Optional[RedisUtil] = None):
+        self.redis = redis or redis_util
+        self.enabled = self.ENABLED
+        self.pow_enabled = self.POW_ENABLED
+        self._lock = threading.Lock()
+        self._local: 'OrderedDict[str, float]' = OrderedDict()
+        self._stats = {
+            'checks': 0, 'allowed': 0, 'blocked': 0, 'challenged': 0, 'backoff': 0,
+            'pow_solved': 0, 'pow_invalid': 0, 'failures_recorded': 0
+        }
+
+    def init_app(self, app) -> None:
+        """Aplica la configuración de la app"""
+        self.enabled = app.config.get('PREAUTH_ENABLED', self.enabled)
+        self.pow_enabled = app.config.get('PREAUTH_POW_ENABLED', self.pow_enabled)
+
+        # Con el secret por defecto cualquiera puede firmar sus propios desafíos
+        if self.enabled and self.pow_enabled and self.POW_SECRET == self.DEFAULT_POW_SECRET:
+            logger.warning('PREAUTH_POW_SECRET and JWT_ACCESS_SECRET are not set, '
+                           'PoW challenges are signed with the public default secret')
+
+    # ========================================
+    # CONTADORES
+    # ========================================
+
+    def _subjects(self, ip_address: Optional[str]) -> List[str]:
+        """Prefijos de key de los contadores que aplican a la IP"""
+        subjects = []
+        subnet = subnet_of(ip_address) if ip_address else None
+
+        if subnet:
+            subjects.append(f'{RedisKeys.PREAUTH}ip:{ip_address}:')
+            subjects.append(f'{RedisKeys.PREAUTH}net:{subnet}:')
+
+        subjects.append(f'{RedisKeys.PREAUTH}global:')
+        return subjects
+
+    def _window(self, now: float):
+        window = int(now // self.WINDOW_SECONDS)
+        elapsed = (now % self.WINDOW_SECONDS) / self.WINDOW_SECONDS
+        return window, elapsed
+
+    def _estimates(self, subjects: List[str], now: float) -> List[float]:
+        """Fallos estimados en la ventana deslizante de cada contador"""
+        window, elapsed = self._window(now)
+        keys = [f'{prefix}{w}' for prefix in subjects for w in (window, window - 1)]
+        values = self._read(keys)
+
+        return [
+            float(values[i] or 0) + float(values[i + 1] or 0) * (1 - elapsed)
+            for i in range(0, len(values), 2)
+        ]
+
+    def _read(self, keys: List[str]) -> List[Any]:
+        client = self.redis.get_client()
+
+        if client:
+            with redis_metrics.track('preauth_check', keys[0]) as tracked:
+                try:
+                    return client.mget(keys)
+                except Exception as e:
+                    tracked.error = True
+                    logger.warning(f'Pre-auth gate Redis read error, using local counters: {e}')
+
+        with self._lock:
+            return [self._local.get(key) for key in keys]
+
+    def record_failure(self, ip_address: Optional[str]) -> None:
+        """Registra un login fallido (credenciales inválidas) para la IP, su subred y el global"""
+        if not self.enabled:
+            return
+
+        window, _ = self._window(time.time())
+        keys = [f'{prefix}{window}' for prefix in self._subjects(ip_address)]
+        self._stats['failures_recorded'] += 1
+
+        client = self.redis.get_client()
+
+        if client:
+            with redis_metrics.track('preauth_failure', keys[0]) as tracked:
+                try:
+                    pipe = client.pipeline(transaction=False)
+                    for key in keys:
+                        pipe.incr(key)
+                        pipe.expire(key, self.WINDOW_SECONDS * 2)
+                    pipe.execute()
+                    return
+                except Exception as e:
+                    tracked.error = True
+                    logger.warning(f'Pre-auth gate Redis write error, using local counters: {e}')
+
+        with self._lock:
+            for key in keys:
+                self._local[key] = self._local.pop(key, 0) + 1
+
+            while len(self._local) > self.LOCAL_MAXSIZE:
+                self._local.popitem(last=False)
+
+    # ========================================
+    # DECISIÓN
+    # ========================================
+
+    def check(self, ip_address: Optional[str], pow_challenge: Optional[str] = None,
+              pow_nonce: Optional[str] = None) -> GateDecision:
+        """
+        Decide si un intento de login puede seguir hacia AuthService.login
+
+        Args:
+            ip_address: IP del cliente
+            pow_challenge: Desafío recibido antes (header X-PoW-Challenge)
+            pow_nonce: Solución del cliente (header X-PoW-Nonce)
+        """
+        if not self.enabled:
+            return GateDecision('allow')
+
+        self._stats['checks'] += 1
+        subjects = self._subjects(ip_address)
+        estimates = self._estimates(subjects, time.time())
+
+        if len(estimates) == 3:
+            ip_failures, subnet_failures, global_failures = estimates
+        else:
+            ip_failures, subnet_failures, global_failures = 0.0, 0.0, estimates[0]
+
+        if ip_failures >= self.IP_BLOCK or subnet_failures >= self.SUBNET_BLOCK:
+            self._stats['blocked'] += 1
+            return GateDecision('block', 'reputation', retry_after=self.WINDOW_SECONDS)
+
+        # Exceso sobre el umbral (>= 1 si corresponde desafío)
+        pressure = max(
+            ip_failures / self.IP_CHALLENGE,
+            subnet_failures / self.SUBNET_CHALLENGE,
+            global_failures / self.GLOBAL_BUDGET
+        )
+
+        if pressure < 1:
+            self._stats['allowed'] += 1
+            return GateDecision('allow')
+
+        reason = 'global_budget' if global_failures >= self.GLOBAL_BUDGET else 'reputation'
+        steps = int(math.log2(pressure))
+
+        if self.pow_enabled:
+            difficulty = min(self.POW_MAX_DIFFICULTY, self.POW_DIFFICULTY + steps)
+
+            if pow_challenge and pow_nonce:
+                if self.verify_pow(pow_challenge, pow_nonce, ip_address, difficulty):
+                    self._stats['pow_solved'] += 1
+                    return GateDecision('allow', reason)
+                self._stats['pow_invalid'] += 1
+
+            self._stats['challenged'] += 1
+            return GateDecision(
+                'challenge', reason,
+                challenge=self.issue_challenge(ip_address, difficulty),
+                difficulty=difficulty
+            )
+
+        delay = min(self.BACKOFF_MAX_SECONDS, 2 ** steps)
+        retry_after = self._backoff(ip_address, delay)
+
+        if retry_after:
+            self._stats['backoff'] += 1
+            return GateDecision('backoff', reason, retry_after=retry_after)
+
+        self._stats['allowed'] += 1
+        return GateDecision('allow', reason)
+
+    def _backoff(self, ip_address: Optional[str], delay: int) -> int:
+        """
+        Un intento por IP cada `delay` segundos (SET NX PX)
+
+        Returns:
+            Segundos a esperar (0 si el intento puede seguir)
+        """
+        key = f'{RedisKeys.PREAUTH}backoff:{ip_address or "unknown"}'
+        client = self.redis.get_client()
+
+        if client:
+            try:
+                if client.set(key, 1, px=delay * 1000, nx=True):
+                    return 0
+                return max(1, math.ceil(client.pttl(key) / 1000))
+            except Exception as e:
+                logger.warning(f'Pre-auth backoff Redis error: {e}')
+
+        now = time.time()
+        with self._lock:
+            until = self._local.get(key, 0)
+            if until > now:
+                return max(1, math.ceil(until - now))
+            self._local[key] = now + delay
+        return 0
+
+    # ========================================
+    # PROOF OF WORK
+    # ========================================
+
+    def _sign(self, payload: str) -> str:
+        return hmac.new(self.POW_SECRET.encode('utf-8'), payload.encode('utf-8'), hashlib.sha256).hexdigest()[:32]
+
+    def issue_challenge(self, ip_address: Optional[str], difficulty: int) -> str:
+        """
+        Desafío sin estado: <ts>.<difficulty>.<random>.<firma>
+        La firma incluye la IP: no sirve resolverlo desde otra
+        """
+        payload = f'{int(time.time())}.{difficulty}.{secrets.token_hex(8)}'
+        return f'{payload}.{self._sign(f"{payload}.{ip_address}")}'
+
+    def verify_pow(self, challenge: str, nonce: str, ip_address: Optional[str], difficulty: int) -> bool:
+        """
+        Valida firma, vigencia, dificultad y solución:
+        sha256("<challenge>:<nonce>") con `difficulty` bits iniciales en cero
+        Cada desafío se acepta una sola vez
+        """
+        parts = challenge.split('.')
+        if len(parts) != 4 or len(nonce) > 64:
+            return False
+
+        issued_at, challenge_difficulty, _, signature = parts
+        payload = challenge.rsplit('.', 1)[0]
+
+        try:
+            issued_at, challenge_difficulty = int(issued_at), int(challenge_difficulty)
+        except ValueError:
+            return False
+
+        if not hmac.compare_digest(signature, self._sign(f'{payload}.{ip_address}')):
+            return False
+
+        now = time.time()
+        if challenge_difficulty < difficulty or now - issued_at > self.POW_TTL_SECONDS:
+            return False
+
+        # Un timestamp futuro no vencería nunca
+        if issued_at > now + self.POW_CLOCK_SKEW_SECONDS:
+            return False
+
+        digest = hashlib.sha256(f'{challenge}:{nonce}'.encode('utf-8')).digest()
+        if leading_zero_bits(digest) < challenge_difficulty:
+            return False
+
+        return self._consume(signature)
+
+    def _consume(self, signature: str) -> bool:
+        """Marca el desafío como usado (anti-replay)"""
+        key = f'{RedisKeys.PREAUTH}pow:{signature}'
+        client = self.redis.get_client()
+
+        if client:
+            try:
+                return bool(client.set(key, 1, ex=self.POW_TTL_SECONDS, nx=True))
+            except Exception as e:
+                logger.warning(f'Pre-auth PoW replay check error: {e}')
+
+        with self._lock:
+            if key in self._local:
+                return False
+            self._local[key] = time.time() + self.POW_TTL_SECONDS
+        return True
+
+    # ========================================
+    # MÉTRICAS
+    # ========================================
+
+    def get_stats(self, login_cost_ms: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Decisiones del gate y CPU ahorrada
+
+        Args:
+            login_cost_ms: Costo medido de un login (p. ej. promedio del hasher)
+        """
+        rejected = self._stats['blocked'] + self._stats['challenged'] + self._stats['backoff']
+        cost_ms = login_cost_ms or self.LOGIN_COST_MS
+
+        return dict(
+            self._stats,
+            enabled=self.enabled,
+            pow_enabled=self.pow_enabled,
+            rejected=rejected,
+            login_cost_ms=round(cost_ms, 3),
+            cpu_ms_saved=round(rejected * cost_ms, 1)
+        )
+
+
+# Singleton instance
+preauth_gate = PreAuthGate()
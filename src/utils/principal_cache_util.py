@@ -0,0 +1,251 @@
+"""
+Principal Cache Utility - Cache del principal de autenticación (L1 + Redis)
+Evita consultar la base de datos en cada request autenticado
+"""
+import os
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from src.constants.constants import RedisKeys
+from src.utils.cache_util import LocalCache
+from src.utils.logger_util import logger
+from src.utils.redis_util import RedisUtil, redis_util
+
+
+class PrincipalCache:
+    """
+    Cache del principal (id, email, name, role, is_active, token_version)
+
+    - L1 por worker con TTL corto: es la cota máxima de lockout de un
+      usuario desactivado si se pierde un mensaje de invalidación
+    - Redis con TTL largo, compartido entre workers
+    - Invalidación inmediata: borra L1 y Redis, y publica por pub/sub
+      para que el resto de los workers borre su L1
+
+    Al invalidar se deja un tombstone en Redis por unos segundos: un
+    request concurrente que leyó la fila vieja no puede volver a cachearla
+    (se escribe con SET NX).
+    """
+
+    LOCAL_TTL = int(os.getenv('AUTH_PRINCIPAL_CACHE_TTL_SECONDS', 30))
+    REDIS_TTL = int(os.getenv('AUTH_PRINCIPAL_REDIS_TTL_SECONDS', 300))
+    TOMBSTONE_TTL = int(os.getenv('AUTH_PRINCIPAL_TOMBSTONE_SECONDS', 5))
+    MAXSIZE = int(os.getenv('AUTH_PRINCIPAL_CACHE_MAXSIZE', 10000))
+
+    def __init__(self, redis: Optional[RedisUtil] = None, local_ttl: Optional[int] = None):
+        self.redis = redis or redis_util
+        self.enabled = True
+        self.local = LocalCache(
+            'auth:principals',
+            maxsize=self.MAXSIZE,
+            ttl=self.LOCAL_TTL if local_ttl is None else local_ttl,
+            persist=False
+        )
+        self._stop = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+
+    def start(self, app) -> None:
+        """Aplica la configuración y se suscribe a las invalidaciones"""
+        self.enabled = app.config.get('AUTH_PRINCIPAL_CACHE_ENABLED', True)
+        self.local.ttl = app.config.get('AUTH_PRINCIPAL_CACHE_TTL_SECONDS', self.local.ttl)
+
+        if self.enabled and self.redis.get_client() and self._listener is None:
+            self._listener = threading.Thread(target=self._listen, name='principal-invalidation', daemon=True)
+            self._listener.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _key(self, user_id: str) -> str:
+        return f'{RedisKeys.AUTH_PRINCIPAL}{user_id}'
+
+    def get(self, user_id: str, loader: Callable[[str], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene el principal de L1, Redis o loader (base de datos)
+
+        Args:
+            user_id: ID del usuario
+            loader: Función user_id -> principal (dict) o None si no existe
+
+        Returns:
+            Principal (incluye is_active) o None si el usuario no existe
+        """
+        if not self.enabled:
+            return loader(user_id)
+
+        principal = self.local.get(user_id)
+        if principal is not None:
+            return principal
+
+        cached = self.redis.get(self._key(user_id))
+
+        if isinstance(cached, dict) and not cached.get('tombstone'):
+            principal = cached
+        else:
+            principal = loader(user_id)
+
+            if principal is None:
+                return None
+
+            if cached is None:
+                self.redis.set(self._key(user_id), principal, ttl=self.REDIS_TTL, nx=True)
+
+        self.local.set(user_id, principal)
+        return principal
+
+    def get_many(
+        self,
+        user_ids: Iterable[str],
+        loader: Callable[[List[str]], Dict[str, Dict[str, Any]]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Versión batch de get: L1, un MGET a Redis y un solo loader para el resto
+
+        Args:
+            user_ids: IDs de usuario (se ignoran duplicados)
+            loader: Función [user_id] -> {user_id: principal} (una query IN)
+
+        Returns:
+            {user_id: principal} solo de los usuarios que existen
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+
+        if not self.enabled:
+            return loader(user_ids) if user_ids else {}
+
+        principals = {}
+        for user_id in user_ids:
+            principal = self.local.get(user_id)
+            if principal is not None:
+                principals[user_id] = principal
+
+        pending = [user_id for user_id in user_ids if user_id not in principals]
+        cached = dict(zip(pending, self.redis.mget([self._key(user_id) for user_id in pending])))
+
+        missing = [
+            user_id for user_id in pending
+            if not isinstance(cached[user_id], dict) or cached[user_id].get('tombstone')
+        ]
+        loaded = loader(missing) if missing else {}
+
+        for user_id in pending:
+            principal = loaded.get(user_id) if user_id in missing else cached[user_id]
+
+            if principal is None:
+                continue
+
+            if user_id in missing and cached[user_id] is None:
+                self.redis.set(self._key(user_id), principal, ttl=self.REDIS_TTL, nx=True)
+
+            self.local.set(user_id, principal)
+            principals[user_id] = principal
+
+        return principals
+
+    def invalidate(self, user_id: str) -> None:
+        """Invalida el principal en este worker, en Redis y en el resto de workers"""
+        self.local.delete(user_id)
+        self.redis.set(self._key(user_id), {'tombstone': True}, ttl=self.TOMBSTONE_TTL)
+        self.redis.publish(RedisKeys.AUTH_PRINCIPAL_INVALIDATION, user_id)
+
+    def _listen(self) -> None:
+        """Suscriptor de invalidaciones (reconecta con backoff)"""
+        backoff = 1
+
+        while not self._stop.is_set():
+            try:
+                pubsub = self.redis.get_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(RedisKeys.AUTH_PRINCIPAL_INVALIDATION)
+
+                # Mientras no estuvimos suscriptos pudimos perder invalidaciones
+                self.local.clear()
+                backoff = 1
+
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+
+                    if message and message.get('type') == 'message':
+                        self.local.delete(message['data'])
+
+                pubsub.close()
+            except Exception as e:
+                logger.warning(f'Principal invalidation listener error: {e}', retry_in=backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+
+
+def principal_from_user(user) -> Dict[str, Any]:
+    """Principal mínimo a partir del modelo User"""
+    return {
+        'id': user.id,
+        'email': user.email,
+        'name': user.name,
+        'role': user.role.value if hasattr(user.role, 'value') else user.role,
+        'is_active': user.is_active,
+        'token_version': user.token_version or 0
+    }
+
+
+class LazyPrincipal(Mapping):
+    """
+    Principal del request (g.user) que se carga solo si hace falta
+
+    id y email salen de los claims del token ya verificado; el primer
+    acceso a otro campo (role, name, is_active, ...) llama al loader una
+    vez, que valida el estado del usuario (puede lanzar AppError), y desde
+    ahí todos los campos salen del principal cargado. El rol nunca sale
+    de los claims: una degradación tiene que verse sin esperar al
+    vencimiento del token.
+
+    Se usa como el dict de antes: user['id'], user.get('role'), dict(user).
+    """
+
+    CLAIM_FIELDS = ('id', 'email')
+    FIELDS = ('id', 'email', 'name', 'role')
+
+    def __init__(
+        self,
+        claims: Dict[str, Any],
+        loader: Optional[Callable[[], Dict[str, Any]]] = None,
+        principal: Optional[Dict[str, Any]] = None
+    ):
+        self._claims = claims
+        self._loader = loader
+        self._principal = principal
+
+    @classmethod
+    def from_principal(cls, principal: Dict[str, Any]) -> 'LazyPrincipal':
+        """Principal ya cargado y validado (API key, rutas fresh)"""
+        return cls(principal, principal=principal)
+
+    @property
+    def loaded(self) -> bool:
+        return self._principal is not None
+
+    def load(self) -> Dict[str, Any]:
+        """Carga el principal (una vez por request); el loader puede lanzar AppError"""
+        if self._principal is None:
+            self._principal = self._loader()
+        return self._principal
+
+    def __getitem__(self, key: str) -> Any:
+        if self._principal is None and key in self.CLAIM_FIELDS:
+            return self._claims[key]
+        return self.load()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Campos públicos del usuario (carga el principal por name)"""
+        return {field: self[field] for field in self.FIELDS}
+
+    def __repr__(self) -> str:
+        return f'LazyPrincipal(id={self._claims.get("id")!r}, loaded={self.loaded})'
+
+
+# Singleton instance
+principal_cache = PrincipalCache()
@@ -0,0 +1,229 @@
+"""
+Rate Limit Utility - Token bucket distribuido (Redis + Lua)
+Un solo round-trip por chequeo; fallback en memoria si Redis no responde
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from src.constants.constants import RedisKeys
+from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import redis_metrics
+from src.utils.redis_util import RedisUtil, redis_util
+
+
+# Token bucket: recarga según el tiempo transcurrido y descuenta hasta
+# `cost` tokens (lo que haya, mínimo 1: un lease parcial sin otro EVAL).
+# Retorna {tokens concedidos (0 = rechazo), tokens restantes}; la key
+# expira cuando se llenaría
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('hmget', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local granted = math.min(cost, math.floor(tokens))
+if granted >= 1 then
+    tokens = tokens - granted
+else
+    granted = 0
+end
+redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('pexpire', KEYS[1], math.ceil((capacity - tokens) / rate) + 1000)
+return {granted, tostring(tokens)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """
+    Política de rate limit
+
+    Attributes:
+        name: Identificador (parte de la key en Redis)
+        limit: Requests permitidas por período (capacidad del bucket)
+        period: Período en segundos (se recargan limit tokens por período)
+        scope: ip | user | route (key por IP, por usuario autenticado o global)
+        lease: Tokens que un worker toma de Redis de una vez y gasta en
+            memoria (1 = sin pre-agregación); para keys muy calientes
+    """
+    name: str
+    limit: int
+    period: float
+    scope: str = 'ip'
+    lease: int = 1
+
+    @property
+    def rate_per_ms(self) -> float:
+        return self.limit / (self.period * 1000)
+
+
+@dataclass
+class RateLimitResult:
+    """Resultado de un chequeo (alimenta los headers RateLimit-*)"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int
+    policy: str
+
+    @property
+    def retry_after(self) -> int:
+        return 0 if self.allowed else self.reset
+
+
+class RateLimiter:
+    """
+    Rate limiter de token bucket
+
+    - Redis: un EVAL por chequeo, atómico entre workers
+    - Lease (policy.lease > 1): el worker descuenta hasta `lease` tokens
+      en la misma llamada (los que queden, cerca del límite) y responde
+      los siguientes desde memoria hasta agotarlos o que venza
+      LEASE_SECONDS (nunca admite de más; puede sub-admitir)
+    - Sin Redis: bucket en memoria por worker (el límite efectivo se
+      multiplica por la cantidad de workers mientras dure la caída)
+    """
+
+    ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    LEASE_SECONDS = float(os.getenv('RATE_LIMIT_LEASE_SECONDS', 1))
+    LOCAL_MAXSIZE = int(os.getenv('RATE_LIMIT_LOCAL_MAXSIZE', 10000))
+
+    def __init__(self, redis: Optional[RedisUtil] = None):
+        self.redis = redis or redis_util
+        self.enabled = self.ENABLED
+        self._lock = threading.Lock()
+        self._local: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+        self._leases: Dict[str, Tuple[int, float, float]] = {}
+        self._stats = {'checks': 0, 'rejected': 0, 'redis_calls': 0, 'lease_hits': 0, 'local_fallbacks': 0}
+
+    def init_app(self, app) -> None:
+        """Aplica la configuración de la app"""
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', self.enabled)
+
+    def _key(self, policy: RateLimitPolicy, identity: str) -> str:
+        return f'{RedisKeys.RATE_LIMIT}{policy.name}:{identity}'
+
+    def check(self, policy: RateLimitPolicy, identity: str) -> RateLimitResult:
+        """
+        Consume un token del bucket (policy, identity)
+
+        Args:
+            policy: Política a aplicar
+            identity: IP, id de usuario o '*' (scope route)
+        """
+        key = self._key(policy, identity)
+        self._stats['checks'] += 1
+
+        result = self._from_lease(key, policy)
+
+        if result is None:
+            result = self._check_redis(key, policy)
+
+        if result is None:
+            self._stats['local_fallbacks'] += 1
+            result = self._check_local(key, policy)
+
+        if not result.allowed:
+            self._stats['rejected'] += 1
+
+        return result
+
+    def _from_lease(self, key: str, policy: RateLimitPolicy) -> Optional[RateLimitResult]:
+        if policy.lease <= 1:
+            return None
+
+        with self._lock:
+            lease = self._leases.get(key)
+
+            if not lease or lease[0] <= 0 or lease[1] < time.monotonic():
+                return None
+
+            tokens, expires_at, remaining = lease
+            self._leases[key] = (tokens - 1, expires_at, remaining)
+
+        self._stats['lease_hits'] += 1
+        return self._result(True, policy, remaining + tokens - 1)
+
+    def _check_redis(self, key: str, policy: RateLimitPolicy) -> Optional[RateLimitResult]:
+        client = self.redis.get_client()
+        if not client:
+            return None
+
+        now_ms = int(time.time() * 1000)
+        cost = min(policy.lease, policy.limit)
+
+        with redis_metrics.track('rate_limit', key) as tracked:
+            try:
+                self._stats['redis_calls'] += 1
+                granted, tokens = client.eval(TOKEN_BUCKET_SCRIPT, 1, key, policy.limit, policy.rate_per_ms, now_ms, cost)
+            except Exception as e:
+                tracked.error = True
+                logger.warning(f'Rate limit Redis error, using local buckets: {e}', key=key)
+                return None
+
+        granted, tokens = int(granted), float(tokens)
+
+        # Lease (completo o parcial): el resto de lo concedido se gasta en memoria
+        if granted > 1:
+            with self._lock:
+                now = time.monotonic()
+
+                if len(self._leases) >= self.LOCAL_MAXSIZE:
+                    self._leases = {k: v for k, v in self._leases.items() if v[1] >= now}
+
+                self._leases[key] = (granted - 1, now + self.LEASE_SECONDS, tokens)
+
+        return self._result(granted > 0, policy, tokens + max(0, granted - 1))
+
+    def _check_local(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, ts = self._local.pop(key, (float(policy.limit), now))
+            tokens = min(policy.limit, tokens + (now - ts) * policy.limit / policy.period)
+            allowed = tokens >= 1
+
+            if allowed:
+                tokens -= 1
+
+            self._local[key] = (tokens, now)
+
+            while len(self._local) > self.LOCAL_MAXSIZE:
+                self._local.popitem(last=False)
+
+        return self._result(allowed, policy, tokens)
+
+    @staticmethod
+    def _result(allowed: bool, policy: RateLimitPolicy, tokens: float) -> RateLimitResult:
+        # reset: segundos hasta el próximo token (rechazo) o hasta llenar el bucket
+        missing = 1 - tokens if not allowed else policy.limit - tokens
+        reset = math.ceil(max(0.0, missing) * policy.period / policy.limit)
+
+        return RateLimitResult(
+            allowed=allowed,
+            limit=policy.limit,
+            remaining=max(0, int(tokens)),
+            reset=reset,
+            policy=policy.name
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Chequeos, rechazos y round-trips a Redis ahorrados por leases"""
+        return dict(self._stats, leases=len(self._leases), local_buckets=len(self._local))
+
+    def reset(self) -> None:
+        """Vacía buckets locales y leases (tests)"""
+        with self._lock:
+            self._local.clear()
+            self._leases.clear()
+
+
+# Singleton instance
+rate_limiter = RateLimiter()
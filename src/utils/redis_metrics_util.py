@@ -0,0 +1,249 @@
+"""
+Redis Metrics Utility - Latencia, hit/miss por prefijo y hot keys
+Métricas por proceso (cada worker reporta las suyas)
+"""
+import hashlib
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+from src.constants.constants import RedisKeys
+
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets fijos (milisegundos)"""
+
+    BUCKETS_MS = (0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)  # último bucket: +Inf
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float) -> None:
+        self.counts[bisect_left(self.BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Percentil aproximado (límite superior del bucket)"""
+        if not self.count:
+            return None
+
+        target = self.count * p
+        seen = 0
+
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.BUCKETS_MS[i] if i < len(self.BUCKETS_MS) else self.max_ms
+
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {f'le_{bound}': count for bound, count in zip(self.BUCKETS_MS, self.counts)}
+        buckets['le_inf'] = self.counts[-1]
+
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else None,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 3),
+            'buckets': buckets
+        }
+
+
+class CountMinSketch:
+    """
+    Count-min sketch: frecuencia aproximada de keys en memoria acotada
+    (sobreestima, nunca subestima)
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Suma count y retorna la frecuencia estimada"""
+        estimate = None
+
+        for row, index in zip(self.rows, self._indexes(item)):
+            row[index] += count
+            estimate = row[index] if estimate is None else min(estimate, row[index])
+
+        return estimate
+
+    def estimate(self, item: str) -> int:
+        return min(row[index] for row, index in zip(self.rows, self._indexes(item)))
+
+
+class TopKTracker:
+    """Top-K de keys más frecuentes sobre un count-min sketch"""
+
+    def __init__(self, k: int = 20, width: int = 2048, depth: int = 4):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates: Dict[str, int] = {}
+
+    def add(self, item: str) -> None:
+        estimate = self.sketch.add(item)
+
+        if item in self.candidates or len(self.candidates) < self.k:
+            self.candidates[item] = estimate
+            return
+
+        coldest = min(self.candidates, key=self.candidates.get)
+
+        if estimate > self.candidates[coldest]:
+            del self.candidates[coldest]
+            self.candidates[item] = estimate
+
+    def top(self) -> List[Tuple[str, int]]:
+        return sorted(self.candidates.items(), key=lambda item: item[1], reverse=True)
+
+
+class _Operation:
+    """Context manager que mide una operación de RedisUtil"""
+
+    __slots__ = ('metrics', 'op', 'key', 'hit', 'error', 'started')
+
+    def __init__(self, metrics: 'RedisMetrics', op: str, key: str):
+        self.metrics = metrics
+        self.op = op
+        self.key = key
+        self.hit = None
+        self.error = False
+
+    def __enter__(self) -> '_Operation':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None:
+            self.error = True
+
+        self.metrics.record(
+            self.op,
+            self.key,
+            (time.perf_counter() - self.started) * 1000,
+            hit=self.hit,
+            error=self.error
+        )
+        return False
+
+
+class RedisMetrics:
+    """
+    Instrumentación de RedisUtil
+
+    - Histograma de latencia por operación
+    - Hit/miss y errores por prefijo de key (RedisKeys)
+    - Hot keys con count-min sketch + top-K
+    """
+
+    ENABLED = os.getenv('REDIS_METRICS_ENABLED', 'true').lower() == 'true'
+    TOP_K = int(os.getenv('REDIS_METRICS_TOP_K', 20))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._prefixes = sorted(RedisKeys.all(), key=len, reverse=True)
+        self.reset()
+
+    def reset(self) -> None:
+        """Reinicia todas las métricas"""
+        with self._lock:
+            self._started_at = time.time()
+            self._latency: Dict[str, LatencyHistogram] = {}
+            self._by_prefix: Dict[str, Dict[str, int]] = {}
+            self._hot_keys = TopKTracker(self.TOP_K)
+
+    def track(self, op: str, key: str) -> _Operation:
+        """
+        Mide una operación
+
+        Usage:
+            with redis_metrics.track('get', key) as tracked:
+                value = client.get(key)
+                tracked.hit = value is not None
+        """
+        return _Operation(self, op, key)
+
+    def prefix_for(self, key: str) -> str:
+        """Prefijo de RedisKeys más largo que coincide con la key"""
+        for prefix in self._prefixes:
+            if key.startswith(prefix):
+                return prefix
+        return 'other'
+
+    def record(
+        self,
+        op: str,
+        key: str,
+        elapsed_ms: float,
+        hit: Optional[bool] = None,
+        error: bool = False
+    ) -> None:
+        """Registra una operación ya medida"""
+        if not self.ENABLED:
+            return
+
+        prefix = self.prefix_for(key)
+
+        with self._lock:
+            histogram = self._latency.get(op)
+            if histogram is None:
+                histogram = self._latency[op] = LatencyHistogram()
+            histogram.observe(elapsed_ms)
+
+            stats = self._by_prefix.get(prefix)
+            if stats is None:
+                stats = self._by_prefix[prefix] = {'ops': 0, 'hits': 0, 'misses': 0, 'errors': 0}
+
+            stats['ops'] += 1
+            if hit is True:
+                stats['hits'] += 1
+            elif hit is False:
+                stats['misses'] += 1
+            if error:
+                stats['errors'] += 1
+
+            self._hot_keys.add(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot de métricas para el endpoint de admin"""
+        with self._lock:
+            latency = {op: histogram.to_dict() for op, histogram in self._latency.items()}
+            by_prefix = {}
+
+            for prefix, stats in self._by_prefix.items():
+                lookups = stats['hits'] + stats['misses']
+                by_prefix[prefix] = dict(stats, hit_ratio=round(stats['hits'] / lookups, 4) if lookups else None)
+
+            hot_keys = [
+                {'key': key, 'estimated_ops': count, 'prefix': self.prefix_for(key)}
+                for key, count in self._hot_keys.top()
+            ]
+
+        return {
+            'enabled': self.ENABLED,
+            'since': self._started_at,
+            'latency': latency,
+            'by_prefix': by_prefix,
+            'hot_keys': hot_keys
+        }
+
+
+# Singleton instance
+redis_metrics = RedisMetrics()
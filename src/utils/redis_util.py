@@ -4,9 +4,24 @@ Equivalente a src/utils/redis.js
 """
 import redis
 import os
-from typing import Optional, Any
-import json
+import math
+import random
+import time
+import uuid
+from typing import Optional, Any, Callable, Dict
+from src.constants.constants import RedisKeys
+from src.utils import json_util
 from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import redis_metrics
+
+
+# Libera el lock solo si el token coincide (evita borrar el lock de otro worker)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
 
 
 class RedisUtil:
@@ -15,9 +30,22 @@ class RedisUtil:
     Equivalente a RedisClient en Node.js
     """
     
-    def __init__(self):
-        self._client: Optional[redis.Redis] = None
-        self._connect()
+    # Stampede protection (get_or_compute)
+    CACHE_LOCK_TTL_MS = int(os.getenv('CACHE_LOCK_TTL_MS', 10000))
+    CACHE_LOCK_WAIT_MS = int(os.getenv('CACHE_LOCK_WAIT_MS', 2000))
+    CACHE_POLL_INTERVAL_MS = int(os.getenv('CACHE_POLL_INTERVAL_MS', 20))
+    XFETCH_BETA = float(os.getenv('CACHE_XFETCH_BETA', 1.0))
+    
+    def __init__(self, client: Optional[redis.Redis] = None):
+        """
+        Args:
+            client: Cliente ya construido (Redis local o stand-in en memoria
+                como fakeredis). Si no se pasa, se conecta según el entorno.
+        """
+        self._client: Optional[redis.Redis] = client
+        
+        if client is None:
+            self._connect()
     
     def _connect(self):
         """Conecta a Redis"""
@@ -64,32 +92,43 @@ class RedisUtil:
         except:
             return False
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        ttl_ms: Optional[int] = None,
+        nx: bool = False
+    ) -> bool:
         """
         Establece un valor en Redis
         
         Args:
             key: Key
-            value: Valor (se serializa a JSON si no es string)
+            value: Valor (se serializa a JSON si no es string; ver json_util)
             ttl: Time to live en segundos
+            ttl_ms: Time to live en milisegundos (tiene prioridad sobre ttl)
+            nx: Solo si la key no existe (retorna False si ya existía)
         """
         if not self._client:
             return False
         
-        try:
-            # Serializar a JSON si no es string
-            if not isinstance(value, str):
-                value = json.dumps(value)
-            
-            if ttl:
-                self._client.setex(key, ttl, value)
-            else:
-                self._client.set(key, value)
-            
-            return True
-        except Exception as e:
-            logger.error(f'Redis SET error: {e}', key=key)
-            return False
+        with redis_metrics.track('set', key) as tracked:
+            try:
+                # Serializar a JSON si no es string
+                if not isinstance(value, str):
+                    value = json_util.dumps(value)
+                
+                if ttl_ms:
+                    return bool(self._client.set(key, value, px=ttl_ms, nx=nx))
+                elif ttl:
+                    return bool(self._client.set(key, value, ex=ttl, nx=nx))
+                
+                return bool(self._client.set(key, value, nx=nx))
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis SET error: {e}', key=key)
+                return False
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -104,65 +143,351 @@ class RedisUtil:
         if not self._client:
             return None
         
-        try:
-            value = self._client.get(key)
-            
-            if value is None:
+        with redis_metrics.track('get', key) as tracked:
+            try:
+                value = self._client.get(key)
+                tracked.hit = value is not None
+                
+                if value is None:
+                    return None
+                
+                # Intentar deserializar JSON
+                try:
+                    return json_util.loads(value)
+                except:
+                    return value
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis GET error: {e}', key=key)
                 return None
-            
-            # Intentar deserializar JSON
+
+    def mget(self, keys: list) -> list:
+        """
+        Obtiene varias keys en un solo round-trip
+
+        Returns:
+            Valores en el orden de keys (None si falta o si Redis falla)
+        """
+        if not self._client or not keys:
+            return [None] * len(keys)
+
+        with redis_metrics.track('mget', keys[0]) as tracked:
             try:
-                return json.loads(value)
+                values = self._client.mget(keys)
+                tracked.hit = any(value is not None for value in values)
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis MGET error: {e}', keys=len(keys))
+                return [None] * len(keys)
+
+        result = []
+        for value in values:
+            try:
+                result.append(json_util.loads(value) if value is not None else None)
             except:
-                return value
-        except Exception as e:
-            logger.error(f'Redis GET error: {e}', key=key)
-            return None
-    
+                result.append(value)
+
+        return result
+
     def delete(self, key: str) -> bool:
         """Elimina una key de Redis"""
         if not self._client:
             return False
         
-        try:
-            self._client.delete(key)
-            return True
-        except Exception as e:
-            logger.error(f'Redis DELETE error: {e}', key=key)
-            return False
+        with redis_metrics.track('delete', key) as tracked:
+            try:
+                self._client.delete(key)
+                return True
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis DELETE error: {e}', key=key)
+                return False
+    
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        Elimina todas las keys que coinciden con un patrón
+        Usa SCAN (no bloquea Redis como KEYS)
+        
+        Returns:
+            Cantidad de keys eliminadas
+        """
+        if not self._client:
+            return 0
+        
+        with redis_metrics.track('delete_pattern', pattern) as tracked:
+            try:
+                deleted = 0
+                batch = []
+                
+                for key in self._client.scan_iter(match=pattern, count=500):
+                    batch.append(key)
+                    
+                    if len(batch) >= 500:
+                        deleted += self._client.delete(*batch)
+                        batch = []
+                
+                if batch:
+                    deleted += self._client.delete(*batch)
+                
+                return deleted
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis DELETE_PATTERN error: {e}', key=pattern)
+                return 0
     
     def exists(self, key: str) -> bool:
         """Verifica si existe una key"""
         if not self._client:
             return False
         
-        try:
-            return bool(self._client.exists(key))
-        except Exception as e:
-            logger.error(f'Redis EXISTS error: {e}', key=key)
-            return False
+        with redis_metrics.track('exists', key) as tracked:
+            try:
+                tracked.hit = bool(self._client.exists(key))
+                return tracked.hit
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis EXISTS error: {e}', key=key)
+                return False
     
     def incr(self, key: str, amount: int = 1) -> Optional[int]:
         """Incrementa un contador"""
         if not self._client:
             return None
         
-        try:
-            return self._client.incrby(key, amount)
-        except Exception as e:
-            logger.error(f'Redis INCR error: {e}', key=key)
-            return None
+        with redis_metrics.track('incr', key) as tracked:
+            try:
+                return self._client.incrby(key, amount)
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis INCR error: {e}', key=key)
+                return None
     
     def expire(self, key: str, ttl: int) -> bool:
         """Establece TTL en una key existente"""
         if not self._client:
             return False
         
+        with redis_metrics.track('expire', key) as tracked:
+            try:
+                return bool(self._client.expire(key, ttl))
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis EXPIRE error: {e}', key=key)
+                return False
+    
+    def zincrby(self, key: str, member: str, amount: float = 1) -> Optional[float]:
+        """Incrementa el score de un miembro en un sorted set"""
+        if not self._client:
+            return None
+        
+        with redis_metrics.track('zincrby', key) as tracked:
+            try:
+                return self._client.zincrby(key, amount, member)
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis ZINCRBY error: {e}', key=key)
+                return None
+    
+    def zrevrange(self, key: str, start: int, end: int) -> list:
+        """Obtiene miembros de un sorted set ordenados por score descendente"""
+        if not self._client:
+            return []
+        
+        with redis_metrics.track('zrevrange', key) as tracked:
+            try:
+                return self._client.zrevrange(key, start, end)
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis ZREVRANGE error: {e}', key=key)
+                return []
+    
+    def publish(self, channel: str, message: str) -> int:
+        """
+        Publica un mensaje en un canal pub/sub
+        
+        Returns:
+            Cantidad de suscriptores que lo recibieron
+        """
+        if not self._client:
+            return 0
+        
+        with redis_metrics.track('publish', channel) as tracked:
+            try:
+                return self._client.publish(channel, message)
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis PUBLISH error: {e}', key=channel)
+                return 0
+    
+    def acquire_lock(self, key: str, ttl_ms: int) -> Optional[str]:
+        """
+        Adquiere un lock distribuido (SET NX PX)
+        
+        Args:
+            key: Key del lock
+            ttl_ms: Duración máxima del lock en milisegundos
+            
+        Returns:
+            Token del lock (necesario para liberarlo) o None si no se adquirió
+        """
+        if not self._client:
+            return None
+        
+        token = uuid.uuid4().hex
+        
+        with redis_metrics.track('acquire_lock', key) as tracked:
+            try:
+                if self._client.set(key, token, nx=True, px=ttl_ms):
+                    return token
+                return None
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis LOCK error: {e}', key=key)
+                return None
+    
+    def release_lock(self, key: str, token: str) -> bool:
+        """
+        Libera un lock distribuido solo si seguimos siendo sus dueños
+        
+        Args:
+            key: Key del lock
+            token: Token retornado por acquire_lock()
+        """
+        if not self._client:
+            return False
+        
+        with redis_metrics.track('release_lock', key) as tracked:
+            try:
+                return bool(self._client.eval(RELEASE_LOCK_SCRIPT, 1, key, token))
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis UNLOCK error: {e}', key=key)
+                return False
+    
+    def get_or_compute(
+        self,
+        key: str,
+        ttl: int,
+        fn: Callable[[], Any],
+        beta: Optional[float] = None,
+        stale_ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Obtiene un valor cacheado o lo computa con protección anti-stampede
+        
+        - Expiración probabilística anticipada (XFetch): cada lector puede
+          decidir refrescar antes de la expiración, con mayor probabilidad
+          cuanto más cerca está y más caro fue computar el valor
+        - Lock distribuido (SET NX PX): solo un worker recomputa
+        - Stale-while-revalidate: mientras un worker recomputa, el resto
+          sirve el valor anterior (se conserva stale_ttl segundos extra)
+        
+        Args:
+            key: Key
+            ttl: Vida lógica del valor en segundos
+            fn: Función que computa el valor (debe ser serializable a JSON)
+            beta: Agresividad de XFetch (>1 refresca antes, default 1.0)
+            stale_ttl: Segundos extra que se conserva el valor vencido (default ttl)
+        """
+        if not self._client:
+            return fn()
+        
+        beta = self.XFETCH_BETA if beta is None else beta
+        stale_ttl = ttl if stale_ttl is None else stale_ttl
+        
         try:
-            return bool(self._client.expire(key, ttl))
+            entry = self._get_entry(key)
         except Exception as e:
-            logger.error(f'Redis EXPIRE error: {e}', key=key)
-            return False
+            logger.error(f'Redis GET_OR_COMPUTE error: {e}', key=key)
+            return fn()
+        
+        if entry is not None and not self._should_refresh(entry, beta):
+            return entry['value']
+        
+        lock_key = f'{RedisKeys.CACHE_LOCK}{key}'
+        token = self.acquire_lock(lock_key, self.CACHE_LOCK_TTL_MS)
+        
+        if token:
+            try:
+                return self._compute_and_store(key, ttl, stale_ttl, fn)
+            finally:
+                self.release_lock(lock_key, token)
+        
+        # Otro worker está recomputando: servir el valor stale si existe
+        if entry is not None:
+            return entry['value']
+        
+        # Sin valor previo: esperar a que el líder lo publique
+        deadline = time.monotonic() + self.CACHE_LOCK_WAIT_MS / 1000
+        
+        while time.monotonic() < deadline:
+            time.sleep(self.CACHE_POLL_INTERVAL_MS / 1000)
+            
+            try:
+                entry = self._get_entry(key)
+            except Exception:
+                break
+            
+            if entry is not None:
+                return entry['value']
+        
+        logger.warning('Cache lock wait timed out, computing without lock', key=key)
+        return fn()
+    
+    def _get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Lee el envelope {value, delta, expiry} de get_or_compute"""
+        with redis_metrics.track('get', key) as tracked:
+            raw = self._client.get(key)
+            tracked.hit = raw is not None
+        
+        if raw is None:
+            return None
+        
+        try:
+            entry = json_util.loads(raw)
+        except (TypeError, ValueError):
+            return None
+        
+        if not isinstance(entry, dict) or 'expiry' not in entry:
+            return None
+        
+        return entry
+    
+    @staticmethod
+    def _should_refresh(entry: Dict[str, Any], beta: float) -> bool:
+        """
+        XFetch: now - delta * beta * ln(rand) >= expiry
+        (1 - random() está en (0, 1], evita log(0))
+        """
+        jitter = entry.get('delta', 0) * beta * math.log(1.0 - random.random())
+        return time.time() - jitter >= entry['expiry']
+    
+    def _compute_and_store(
+        self,
+        key: str,
+        ttl: int,
+        stale_ttl: int,
+        fn: Callable[[], Any]
+    ) -> Any:
+        """Computa el valor, mide su costo (delta) y lo guarda con margen stale"""
+        started = time.time()
+        value = fn()
+        delta = time.time() - started
+        
+        entry = {
+            'value': value,
+            'delta': delta,
+            'expiry': time.time() + ttl
+        }
+        
+        with redis_metrics.track('set', key) as tracked:
+            try:
+                self._client.set(key, json_util.dumps(entry), ex=max(1, int(ttl + stale_ttl)))
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Redis SET error: {e}', key=key)
+        
+        return value
 
 
 # Singleton instance
@@ -2,7 +2,8 @@
 Response Utility - API response formatter
 Equivalente a src/utils/response.js
 """
-from flask import jsonify
+import json
+from flask import Response, jsonify
 from typing import Any, Optional
 
 
@@ -32,6 +33,19 @@ class ApiResponse:
         
         return jsonify(response), status_code
     
+    @staticmethod
+    def success_raw(
+        message: str,
+        data_json: str,
+        status_code: int = 200
+    ):
+        """
+        Respuesta exitosa con data ya codificada en JSON
+        Arma el envelope concatenando, sin volver a serializar data
+        """
+        body = f'{{"data":{data_json},"message":{json.dumps(message)},"success":true}}'
+        return Response(body, status=status_code, mimetype='application/json')
+    
     @staticmethod
     def error(
         message: str,
@@ -0,0 +1,214 @@
+"""
+Single-flight Utility - Coalescing de computaciones idénticas concurrentes
+Equivalente al patrón singleflight de Go
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.constants.constants import RedisKeys
+from src.utils.logger_util import logger
+from src.utils.redis_util import redis_util
+
+
+class _Call:
+    """Computación en curso compartida por líder y seguidores"""
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Single-flight por proceso
+
+    Mientras una computación para `key` está en curso, las llamadas
+    concurrentes con la misma key esperan y comparten su resultado.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {'leaders': 0, 'coalesced': 0, 'wait_timeouts': 0}
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        wait_timeout: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Ejecuta fn una sola vez por key entre llamadas concurrentes
+
+        Args:
+            key: Identificador de la computación
+            fn: Función a ejecutar por el líder
+            wait_timeout: Segundos máximos que espera un seguidor antes
+                de computar por su cuenta (None = sin límite)
+
+        Returns:
+            Tupla (resultado, compartido) donde compartido indica si el
+            resultado vino de otra llamada
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats['leaders'] += 1
+            else:
+                self._stats['coalesced'] += 1
+
+        if not leader:
+            if not call.event.wait(wait_timeout):
+                with self._lock:
+                    self._stats['wait_timeouts'] += 1
+                return fn(), False
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna contadores de coalescing"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        return stats
+
+
+class RequestCoalescer:
+    """
+    Coalescing de requests de lectura idénticas
+
+    - Por proceso: SingleFlight (threads del mismo worker)
+    - Entre workers: lock corto en Redis; el dueño del lock publica la
+      respuesta serializada y el resto la lee en lugar de recalcularla
+
+    Sin Redis se degrada a coalescing solo por proceso.
+    """
+
+    LOCK_TTL_MS = int(os.getenv('SINGLEFLIGHT_LOCK_TTL_MS', 5000))
+    WAIT_MS = int(os.getenv('SINGLEFLIGHT_WAIT_MS', 3000))
+    RESULT_TTL_MS = int(os.getenv('SINGLEFLIGHT_RESULT_TTL_MS', 1000))
+    POLL_INTERVAL_MS = int(os.getenv('SINGLEFLIGHT_POLL_MS', 20))
+
+    def __init__(self):
+        self._flight = SingleFlight()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'coalesced_remote': 0,
+            'remote_leaders': 0,
+            'remote_wait_timeouts': 0,
+            'remote_unshared': 0
+        }
+
+    def execute(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Ejecuta compute() una sola vez para requests idénticas concurrentes
+
+        Args:
+            key: Key normalizada de la request
+            compute: Función que retorna la respuesta serializada
+                ({'status', 'body', 'headers'})
+        """
+        self._incr('requests')
+        payload, _ = self._flight.do(
+            key,
+            lambda: self._execute_distributed(key, compute),
+            wait_timeout=(self.WAIT_MS + self.LOCK_TTL_MS) / 1000
+        )
+        return payload
+
+    def _execute_distributed(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Coalescing entre workers mediante lock en Redis"""
+        if not redis_util.get_client():
+            return compute()
+
+        lock_key = f'{RedisKeys.SINGLEFLIGHT_LOCK}{key}'
+        result_key = f'{RedisKeys.SINGLEFLIGHT_RESULT}{key}'
+
+        token = redis_util.acquire_lock(lock_key, self.LOCK_TTL_MS)
+
+        if token:
+            self._incr('remote_leaders')
+            try:
+                payload = compute()
+
+                # Solo compartir respuestas exitosas entre workers
+                if 200 <= payload['status'] < 300:
+                    redis_util.set(result_key, payload, ttl_ms=self.RESULT_TTL_MS)
+
+                return payload
+            finally:
+                redis_util.release_lock(lock_key, token)
+
+        # Otro worker es el líder: esperar su respuesta
+        deadline = time.monotonic() + self.WAIT_MS / 1000
+
+        while time.monotonic() < deadline:
+            # Lock antes que resultado: el líder publica y después libera
+            leader_done = not redis_util.exists(lock_key)
+            payload = redis_util.get(result_key)
+
+            if isinstance(payload, dict) and 'headers' in payload:
+                self._incr('coalesced_remote')
+                return payload
+
+            # Terminó sin publicar (respuesta no 2xx o error): nada que esperar
+            if leader_done:
+                self._incr('remote_unshared')
+                return compute()
+
+            time.sleep(self.POLL_INTERVAL_MS / 1000)
+
+        self._incr('remote_wait_timeouts')
+        logger.warning('Single-flight wait timed out, computing locally', key=key)
+        return compute()
+
+    def _incr(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Métricas de coalescing
+
+        Returns:
+            requests, coalesced (total), coalesced_local, coalesced_remote,
+            leaders, in_flight, timeouts y remote_unshared (líder sin respuesta 2xx)
+        """
+        local = self._flight.get_stats()
+
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        stats['coalesced_local'] = local['coalesced']
+        stats['coalesced'] = local['coalesced'] + stats['coalesced_remote']
+        stats['local_leaders'] = local['leaders']
+        stats['local_wait_timeouts'] = local['wait_timeouts']
+        stats['in_flight'] = local['in_flight']
+        return stats
+
+
+# Singleton instance
+request_coalescer = RequestCoalescer()
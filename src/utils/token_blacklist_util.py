@@ -0,0 +1,239 @@
+"""
+Token Blacklist Utility - Revocación de tokens por jti
+Redis es la fuente de verdad; cada worker mantiene un Bloom filter
+sincronizado para responder "no revocado" sin ir a Redis
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from src.constants.constants import RedisKeys
+from src.utils.bloom_util import BloomFilter
+from src.utils.jwt_util import JWTUtil
+from src.utils.logger_util import logger
+from src.utils.redis_metrics_util import redis_metrics
+from src.utils.redis_util import RedisUtil, redis_util
+
+
+# Revocación atómica: la versión nueva es además la secuencia del jti en
+# el log, así los workers leen solo lo revocado desde su última versión.
+# El log se recorta a ARGV[4] entradas (un worker más atrasado reconstruye)
+REVOKE_SCRIPT = """
+local seq = redis.call('incr', KEYS[4])
+redis.call('set', KEYS[1], 1, 'EX', ARGV[1])
+redis.call('zadd', KEYS[2], ARGV[2], ARGV[3])
+redis.call('zadd', KEYS[3], seq, ARGV[3])
+redis.call('zremrangebyrank', KEYS[3], 0, -(tonumber(ARGV[4]) + 1))
+return seq
+"""
+
+
+class TokenBlacklist:
+    """
+    Blacklist de tokens revocados (logout)
+
+    En Redis:
+        token:blacklist:<jti>     marca con TTL = vida restante del token
+        token:blacklist:index     ZSET jti -> exp (para reconstruir filtros)
+        token:blacklist:log       ZSET jti -> versión de su revocación
+                                  (últimas LOG_SIZE, para sync incremental)
+        token:blacklist:version   contador que sube con cada revocación
+
+    En cada worker un Bloom filter con los jti revocados:
+        - jti fuera del filtro (caso común): no revocado, sin Redis
+        - jti en el filtro: se confirma con EXISTS en Redis
+          (si Redis falla se asume revocado)
+
+    Un thread consulta la versión cada SYNC_SECONDS; si cambió agrega al
+    filtro solo los jti del log posteriores a su última versión. Esa es la
+    demora máxima para que un logout hecho en otro worker se aplique en
+    este; el worker que revoca lo aplica en el acto. El filtro se
+    reconstruye desde el índice completo (podando los expirados) cada
+    FULL_SYNC_SECONDS, si el log ya no cubre la diferencia o si se llena.
+    """
+
+    SYNC_SECONDS = float(os.getenv('TOKEN_BLACKLIST_SYNC_SECONDS', 1))
+    BLOOM_CAPACITY = int(os.getenv('TOKEN_BLACKLIST_BLOOM_CAPACITY', 100000))
+    BLOOM_ERROR_RATE = float(os.getenv('TOKEN_BLACKLIST_BLOOM_ERROR_RATE', 0.001))
+    FULL_SYNC_SECONDS = float(os.getenv('TOKEN_BLACKLIST_FULL_SYNC_SECONDS', 300))
+    LOG_SIZE = int(os.getenv('TOKEN_BLACKLIST_LOG_SIZE', 10000))
+
+    def __init__(self, redis: Optional[RedisUtil] = None):
+        self.redis = redis or redis_util
+        self.index_key = f'{RedisKeys.TOKEN_BLACKLIST}index'
+        self.log_key = f'{RedisKeys.TOKEN_BLACKLIST}log'
+        self.version_key = f'{RedisKeys.TOKEN_BLACKLIST}version'
+        self._bloom = BloomFilter(self.BLOOM_CAPACITY, self.BLOOM_ERROR_RATE)
+        self._version: Optional[str] = None
+        self._synced = False
+        self._full_sync_at = 0.0
+        self._stop = threading.Event()
+        self._syncer: Optional[threading.Thread] = None
+        self._stats = {
+            'checks': 0, 'bloom_negatives': 0, 'false_positives': 0, 'revoked': 0,
+            'syncs': 0, 'incremental_syncs': 0
+        }
+
+    def start(self, app) -> None:
+        """Registra el check de revocación en JWTUtil y arranca la sincronización"""
+        JWTUtil.register_revocation_check(self.is_revoked)
+
+        if self.redis.get_client() and self._syncer is None:
+            self.sync()
+            self._syncer = threading.Thread(target=self._run, name='token-blacklist-sync', daemon=True)
+            self._syncer.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _key(self, jti: str) -> str:
+        return f'{RedisKeys.TOKEN_BLACKLIST}{jti}'
+
+    def revoke(self, payload: Dict[str, Any]) -> bool:
+        """
+        Revoca un token hasta su expiración
+
+        Args:
+            payload: Payload verificado del token (jti, exp)
+
+        Returns:
+            True si la revocación quedó registrada en Redis
+        """
+        jti = payload.get('jti')
+        ttl = int(payload.get('exp', 0) - time.time()) + 1
+
+        if not jti or ttl <= 0:
+            return False
+
+        self._bloom.add(jti)
+
+        client = self.redis.get_client()
+        if not client:
+            logger.warning('Token revoked only in this worker: Redis unavailable', jti=jti)
+            return False
+
+        with redis_metrics.track('blacklist_revoke', self.index_key) as tracked:
+            try:
+                client.eval(
+                    REVOKE_SCRIPT, 4, self._key(jti), self.index_key, self.log_key, self.version_key,
+                    ttl, payload['exp'], jti, self.LOG_SIZE
+                )
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Token revoke error: {e}', jti=jti)
+                return False
+
+        return True
+
+    def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        """Check de revocación registrado en JWTUtil (corre en cada request)"""
+        jti = payload.get('jti')
+        if not jti:
+            return False
+
+        self._stats['checks'] += 1
+
+        if jti not in self._bloom:
+            self._stats['bloom_negatives'] += 1
+            return False
+
+        client = self.redis.get_client()
+        if not client:
+            return True
+
+        with redis_metrics.track('exists', self._key(jti)) as tracked:
+            try:
+                revoked = bool(client.exists(self._key(jti)))
+            except Exception as e:
+                tracked.error = True
+                logger.error(f'Token blacklist check error: {e}', jti=jti)
+                return True
+
+            tracked.hit = revoked
+
+        self._stats['revoked' if revoked else 'false_positives'] += 1
+        return revoked
+
+    def sync(self) -> bool:
+        """
+        Trae las revocaciones nuevas si la versión cambió: incremental
+        desde el log, o reconstrucción completa del filtro (de paso poda
+        del índice los tokens ya expirados)
+
+        Returns:
+            True si el filtro cambió
+        """
+        client = self.redis.get_client()
+        if not client:
+            return False
+
+        # La versión se lee antes que el log/índice: una revocación
+        # concurrente cambia la versión y se trae en el próximo sync
+        version = client.get(self.version_key)
+        if self._synced and version == self._version:
+            return False
+
+        if self._synced and time.monotonic() < self._full_sync_at and self._sync_incremental(client, version):
+            return True
+
+        pipe = client.pipeline()
+        pipe.zremrangebyscore(self.index_key, '-inf', time.time())
+        pipe.zrange(self.index_key, 0, -1)
+        _, jtis = pipe.execute()
+
+        bloom = BloomFilter(max(self.BLOOM_CAPACITY, 2 * len(jtis)), self.BLOOM_ERROR_RATE)
+        for jti in jtis:
+            bloom.add(jti)
+
+        self._bloom = bloom
+        self._version = version
+        self._synced = True
+        self._full_sync_at = time.monotonic() + self.FULL_SYNC_SECONDS
+        self._stats['syncs'] += 1
+        return True
+
+    def _sync_incremental(self, client, version: Optional[str]) -> bool:
+        """
+        Agrega al filtro los jti revocados entre la última versión vista y
+        `version`
+
+        Returns:
+            False si hace falta reconstruir: el log ya no cubre la
+            diferencia (recortado, Redis vaciado) o el filtro se llenaría
+        """
+        last, target = int(self._version or 0), int(version or 0)
+
+        if target < last:
+            return False
+
+        jtis = client.zrangebyscore(self.log_key, f'({last}', target)
+
+        if len(jtis) < target - last or len(self._bloom) + len(jtis) > self._bloom.capacity:
+            return False
+
+        for jti in jtis:
+            self._bloom.add(jti)
+
+        self._version = version
+        self._stats['incremental_syncs'] += 1
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.SYNC_SECONDS):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f'Token blacklist sync error: {e}')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Efectividad del Bloom filter (checks resueltos sin Redis)"""
+        checks = self._stats['checks']
+        return dict(
+            self._stats,
+            bloom_entries=len(self._bloom),
+            bloom_negative_ratio=round(self._stats['bloom_negatives'] / checks, 4) if checks else 0.0
+        )
+
+
+# Singleton instance
+token_blacklist = TokenBlacklist()
@@ -5,6 +5,7 @@ Equivalente a src/validators/auth.validator.js
 from functools import wraps
 from flask import request
 from marshmallow import Schema, fields, validate, ValidationError
+from src.constants.constants import VerifyBatch
 from src.utils.response_util import ApiResponse
 
 
@@ -56,6 +57,20 @@ class RefreshTokenSchema(Schema):
     refreshToken = fields.Str(load_default=None)
 
 
+class VerifyBatchSchema(Schema):
+    """Schema para validación de verificación batch de tokens"""
+    tokens = fields.List(
+        fields.Str(validate=validate.Length(min=1, error='Token vacío')),
+        required=True,
+        validate=validate.Length(
+            min=1,
+            max=VerifyBatch.MAX_TOKENS,
+            error=f'Se requieren entre 1 y {VerifyBatch.MAX_TOKENS} tokens'
+        ),
+        error_messages={'required': 'Tokens es requerido'}
+    )
+
+
 # ========================================
 # Decorators de validación
 # ========================================
@@ -119,3 +134,8 @@ def validate_login():
 def validate_refresh_token():
     """Validator para refresh token endpoint"""
     return validate_schema(RefreshTokenSchema)
+
+
+def validate_verify_batch():
+    """Validator para verify-batch endpoint"""
+    return validate_schema(VerifyBatchSchema)
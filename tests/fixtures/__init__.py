@@ -3,6 +3,7 @@ Test fixtures package
 """
 from .fixtures import (
     mock_user,
+    fake_redis,
     sample_register_data,
     sample_login_data,
     sample_product_data,
@@ -13,6 +14,7 @@ from .fixtures import (
 
 __all__ = [
     'mock_user',
+    'fake_redis',
     'sample_register_data',
     'sample_login_data',
     'sample_product_data',
@@ -2,8 +2,10 @@
 Test Fixtures - Reusable test data and helpers
 """
 import pytest
+import fakeredis
 from datetime import datetime
 from src.models import User, Product, LoginAttempt
+from src.utils.redis_util import RedisUtil
 
 
 class MockUser:
@@ -44,6 +46,12 @@ def mock_user():
     return MockUser()
 
 
+@pytest.fixture
+def fake_redis():
+    """RedisUtil respaldado por un Redis en memoria (fakeredis, con Lua)"""
+    return RedisUtil(client=fakeredis.FakeRedis(decode_responses=True))
+
+
 @pytest.fixture
 def sample_register_data():
     """Sample registration data"""
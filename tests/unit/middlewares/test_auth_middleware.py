@@ -0,0 +1,236 @@
+"""
+Unit Tests - Auth Middleware
+"""
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from flask import Flask, g
+from src.middlewares.auth_middleware import authenticate, authorize
+from src.utils.principal_cache_util import principal_cache
+from src.utils.jwt_util import JWTUtil
+
+
+USER = SimpleNamespace(id='u1', email='u1@example.com', name='U1', role='user', token_version=0)
+
+
+@pytest.fixture
+def client():
+    """App mínima con una vista protegida"""
+    app = Flask(__name__)
+
+    @app.route('/protected')
+    @authenticate()
+    def protected():
+        return 'ok'
+
+    @app.route('/session')
+    @authenticate(allow_api_key=False)
+    def session():
+        return 'ok'
+
+    @app.route('/fresh')
+    @authenticate(fresh=True)
+    def fresh():
+        return 'ok'
+
+    @app.route('/admin')
+    @authenticate()
+    @authorize(['admin'])
+    def admin():
+        return g.user['id']
+
+    @app.route('/profile')
+    @authenticate()
+    def profile():
+        return g.user['name']
+
+    @app.route('/owned', methods=['GET', 'POST'])
+    @authenticate()
+    def owned():
+        return g.user['id']
+
+    JWTUtil.clear_verified_tokens()
+    # Sin cache de tokens verificados: sus stats son globales
+    with patch.object(JWTUtil, '_revocation_checks', []), patch.object(JWTUtil, 'VERIFY_CACHE_ENABLED', False):
+        yield app.test_client()
+
+    principal_cache.local.clear()
+
+
+def principal(**overrides) -> dict:
+    return dict({'id': 'u1', 'email': 'u1@example.com', 'name': 'U1', 'role': 'user', 'is_active': True, 'token_version': 0}, **overrides)
+
+
+class TestAuthenticate:
+    """Test authenticate()"""
+
+    def test_current_token_version_is_accepted(self, client):
+        """Test: should accept tokens issued with the current token_version"""
+        # Arrange
+        token = JWTUtil.generate_access_token(USER)
+
+        # Act
+        with patch('src.middlewares.auth_middleware.principal_cache.get', return_value=principal()):
+            response = client.get('/protected', headers={'Authorization': f'Bearer {token}'})
+
+        # Assert
+        assert response.status_code == 200
+
+    def test_bumped_token_version_revokes_token(self, client):
+        """Test: should reject tokens once the user's token_version was bumped"""
+        # Arrange
+        token = JWTUtil.generate_access_token(USER)
+
+        # Act
+        with patch('src.middlewares.auth_middleware._load_principal', return_value=principal(token_version=1)):
+            response = client.get('/fresh', headers={'Authorization': f'Bearer {token}'})
+
+        # Assert
+        assert response.status_code == 401
+        assert response.get_json()['message'] == 'Sesión revocada'
+
+
+class TestRequestPrincipal:
+    """Test g.user en authenticate()"""
+
+    def test_invalidated_admin_is_rejected_on_cached_route(self, client):
+        """Test: should reload the principal after invalidation instead of trusting the token claims"""
+        # Arrange
+        token = JWTUtil.generate_access_token(SimpleNamespace(**dict(vars(USER), role='admin')))
+        admin = principal(role='admin')
+        demoted = principal(role='user', is_active=False, token_version=1)
+        headers = {'Authorization': f'Bearer {token}'}
+
+        with patch('src.middlewares.auth_middleware._load_principal', return_value=admin):
+            assert client.get('/admin', headers=headers).status_code == 200
+
+        # Act
+        principal_cache.invalidate('u1')
+        with patch('src.middlewares.auth_middleware._load_principal', return_value=demoted):
+            response = client.get('/admin', headers=headers)
+
+        # Assert
+        assert response.status_code == 401
+        assert response.get_json()['message'] == 'Usuario no encontrado o inactivo'
+
+    def test_role_comes_from_principal_not_claims(self, client):
+        """Test: should authorize with the cached principal's role"""
+        # Arrange
+        token = JWTUtil.generate_access_token(SimpleNamespace(**dict(vars(USER), role='admin')))
+
+        # Act
+        with patch('src.middlewares.auth_middleware.principal_cache.get', return_value=principal(role='user')):
+            response = client.get('/admin', headers={'Authorization': f'Bearer {token}'})
+
+        # Assert
+        assert response.status_code == 403
+
+    def test_cached_principal_serves_every_field(self, client):
+        """Test: should serve non-claim fields from the principal without another lookup"""
+        # Arrange
+        token = JWTUtil.generate_access_token(USER)
+
+        # Act
+        with patch('src.middlewares.auth_middleware.principal_cache.get', return_value=principal()) as mock_get:
+            response = client.get('/profile', headers={'Authorization': f'Bearer {token}'})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.get_data(as_text=True) == 'U1'
+        mock_get.assert_called_once()
+
+    def test_id_only_read_needs_no_lookup(self, client):
+        """Test: should serve the id from the claims without touching the principal cache"""
+        # Arrange
+        token = JWTUtil.generate_access_token(USER)
+
+        # Act
+        with patch('src.middlewares.auth_middleware.principal_cache.get') as mock_get:
+            response = client.get('/owned', headers={'Authorization': f'Bearer {token}'})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.get_data(as_text=True) == 'u1'
+        mock_get.assert_not_called()
+
+    def test_writes_validate_the_principal_before_the_view(self, client):
+        """Test: should reject a deactivated user on a write even if the view only reads the id"""
+        # Arrange
+        token = JWTUtil.generate_access_token(USER)
+
+        # Act
+        with patch('src.middlewares.auth_middleware.principal_cache.get',
+                   return_value=principal(is_active=False)) as mock_get:
+            response = client.post('/owned', headers={'Authorization': f'Bearer {token}'})
+
+        # Assert
+        assert response.status_code == 401
+        assert response.get_json()['message'] == 'Usuario no encontrado o inactivo'
+        mock_get.assert_called_once()
+
+    def test_fresh_route_reads_the_user_row(self, client):
+        """Test: should bypass the principal cache on fresh routes"""
+        # Arrange
+        token = JWTUtil.generate_access_token(USER)
+
+        # Act
+        with patch('src.middlewares.auth_middleware.principal_cache.get', return_value=principal()) as mock_get, \
+                patch('src.middlewares.auth_middleware._load_principal', return_value=principal(is_active=False)):
+            response = client.get('/fresh', headers={'Authorization': f'Bearer {token}'})
+
+        # Assert
+        assert response.status_code == 401
+        mock_get.assert_not_called()
+
+
+class TestApiKeyAuthentication:
+    """Test authenticate() con X-API-Key"""
+
+    def test_api_key_authenticates_as_owner(self, client):
+        """Test: should load the owner principal without a JWT"""
+        # Arrange
+        entry = {'id': 'k1', 'user_id': 'u1'}
+
+        # Act
+        with patch('src.middlewares.auth_middleware.api_key_index.verify', return_value=entry) as mock_verify, \
+                patch('src.middlewares.auth_middleware.principal_cache.get', return_value=principal(role='admin')):
+            response = client.get('/protected', headers={'X-API-Key': 'sk_abc_secret'})
+
+        # Assert
+        assert response.status_code == 200
+        mock_verify.assert_called_once_with('sk_abc_secret')
+
+    def test_fresh_route_reads_the_owner_row(self, client):
+        """Test: should validate the key owner against the user row on fresh routes"""
+        # Arrange
+        entry = {'id': 'k1', 'user_id': 'u1'}
+
+        # Act
+        with patch('src.middlewares.auth_middleware.api_key_index.verify', return_value=entry), \
+                patch('src.middlewares.auth_middleware.principal_cache.get', return_value=principal()) as mock_get, \
+                patch('src.middlewares.auth_middleware._load_principal', return_value=principal(is_active=False)):
+            response = client.get('/fresh', headers={'X-API-Key': 'sk_abc_secret'})
+
+        # Assert
+        assert response.status_code == 401
+        mock_get.assert_not_called()
+
+    def test_invalid_api_key_is_rejected(self, client):
+        """Test: should return 401 for keys the index does not know"""
+        # Act
+        with patch('src.middlewares.auth_middleware.api_key_index.verify', return_value=None):
+            response = client.get('/protected', headers={'X-API-Key': 'sk_abc_secret'})
+
+        # Assert
+        assert response.status_code == 401
+        assert response.get_json()['message'] == 'API key inválida'
+
+    def test_session_routes_require_jwt(self, client):
+        """Test: should ignore API keys on routes that need a user session"""
+        # Act
+        with patch('src.middlewares.auth_middleware.api_key_index.verify') as mock_verify:
+            response = client.get('/session', headers={'X-API-Key': 'sk_abc_secret'})
+
+        # Assert
+        assert response.status_code == 401
+        mock_verify.assert_not_called()
@@ -0,0 +1,41 @@
+"""
+Unit Tests - Coalesce Middleware
+"""
+import pytest
+from unittest.mock import patch
+from flask import Flask, jsonify
+from src.middlewares.coalesce_middleware import coalesce_requests
+
+
+@pytest.fixture
+def client():
+    """App mínima con una vista coalescida que agrega headers propios"""
+    app = Flask(__name__)
+
+    @app.route('/items')
+    @coalesce_requests()
+    def items():
+        response = jsonify({'items': []})
+        response.headers['Cache-Control'] = 'public, max-age=30'
+        response.headers['ETag'] = '"v1"'
+        return response
+
+    with patch('src.utils.singleflight_util.redis_util') as mock_redis:
+        mock_redis.get_client.return_value = None
+        yield app.test_client()
+
+
+class TestCoalesceRequests:
+    """Test coalesce_requests()"""
+
+    def test_view_headers_survive_coalescing(self, client):
+        """Test: should keep every header the view set, not only the content type"""
+        # Act
+        response = client.get('/items')
+
+        # Assert
+        assert response.status_code == 200
+        assert response.get_json() == {'items': []}
+        assert response.headers['Cache-Control'] == 'public, max-age=30'
+        assert response.headers['ETag'] == '"v1"'
+        assert response.mimetype == 'application/json'
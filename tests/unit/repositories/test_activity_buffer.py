@@ -0,0 +1,151 @@
+"""
+Unit Tests - Activity Buffer (write-behind de last_login / last_seen_at)
+SQLite en memoria; el flush se dispara a mano
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlalchemy import event
+from config.database import db
+from src.models import User
+from src.repositories.activity_buffer import ActivityBuffer
+from src.repositories.user_repository import user_repository
+
+
+@pytest.fixture
+def buffer(app):
+    """Buffer activo (el de UserRepository) sin flush periódico"""
+    activity_buffer = ActivityBuffer()
+
+    with patch.dict(app.config, ACTIVITY_BUFFER_ENABLED=True), \
+            patch.object(ActivityBuffer, 'FLUSH_SECONDS', 3600), \
+            patch('src.repositories.user_repository.activity_buffer', activity_buffer):
+        activity_buffer.start(app)
+        yield activity_buffer
+        activity_buffer.stop()
+
+
+@pytest.fixture
+def users(db):
+    """Tres usuarios sin actividad registrada"""
+    created = [
+        user_repository.create({'email': f'active{i}@example.com', 'password': 'Password123!', 'name': f'User {i}'})
+        for i in range(3)
+    ]
+    yield [user.id for user in created]
+
+    db.session.rollback()
+    User.query.delete()
+    db.session.commit()
+
+
+def reload(user_id: str) -> User:
+    db.session.expire_all()
+    return user_repository.find_by_id(user_id)
+
+
+class TestActivityBuffer:
+    """Test ActivityBuffer"""
+
+    def test_last_login_is_deferred_until_flush(self, buffer, users):
+        """Test: should not write last_login during the request"""
+        # Act
+        updated = user_repository.update_last_login(users[0])
+
+        # Assert
+        assert updated is True
+        assert reload(users[0]).last_login is None
+        assert buffer.flush() == 1
+        assert reload(users[0]).last_login is not None
+
+    def test_repeated_activity_is_coalesced(self, buffer, users):
+        """Test: should keep only the latest timestamp per user"""
+        # Arrange
+        first = datetime(2026, 1, 1, 12, 0, 0)
+
+        # Act
+        buffer.record('last_login', users[0], first)
+        buffer.record('last_login', users[0], first + timedelta(minutes=5))
+        buffer.record('last_login', users[0], first + timedelta(minutes=1))
+        written = buffer.flush()
+
+        # Assert
+        assert written == 1
+        assert reload(users[0]).last_login == first + timedelta(minutes=5)
+        assert buffer.get_stats()['coalesced'] == 2
+
+    def test_flush_is_one_transaction_per_batch(self, buffer, users):
+        """Test: should write every pending user in a single COMMIT"""
+        # Arrange
+        commits = []
+
+        def on_commit(connection):
+            commits.append(connection)
+
+        for user_id in users:
+            buffer.record('last_login', user_id)
+            buffer.record('last_seen_at', user_id)
+
+        # Act
+        event.listen(db.engine, 'commit', on_commit)
+        written = buffer.flush()
+        event.remove(db.engine, 'commit', on_commit)
+
+        # Assert
+        assert written == 6
+        assert len(commits) == 1
+        assert all(reload(user_id).last_seen_at is not None for user_id in users)
+
+    def test_older_timestamp_does_not_overwrite_newer(self, buffer, users):
+        """Test: should keep the newer value when flushes arrive out of order"""
+        # Arrange
+        newer = datetime(2026, 6, 1)
+        buffer.record('last_login', users[0], newer)
+        buffer.flush()
+
+        # Act
+        buffer.record('last_login', users[0], newer - timedelta(days=1))
+        buffer.flush()
+
+        # Assert
+        assert reload(users[0]).last_login == newer
+
+    def test_failed_flush_keeps_rows_for_retry(self, buffer, users):
+        """Test: should put rows back in the buffer when the write fails"""
+        # Arrange
+        buffer.record('last_login', users[0])
+
+        # Act
+        with patch.object(buffer, '_write', side_effect=RuntimeError('db down')):
+            assert buffer.flush() == 0
+        retried = buffer.flush()
+
+        # Assert
+        assert retried == 1
+        assert buffer.get_stats()['errors'] == 1
+        assert reload(users[0]).last_login is not None
+
+    def test_buffered_login_still_commits_rehash(self, buffer, users):
+        """Test: should persist pending session changes (password rehash) without a unit of work"""
+        # Arrange
+        user = user_repository.find_by_id(users[0])
+        user.password = 'rehashed'
+
+        # Act
+        with patch('src.repositories.unit_of_work.unit_of_work.enabled', False):
+            user_repository.update_last_login(users[0])
+        db.session.rollback()
+
+        # Assert
+        assert reload(users[0]).password == 'rehashed'
+        assert reload(users[0]).last_login is None
+
+    def test_disabled_buffer_writes_synchronously(self, users):
+        """Test: should fall back to the synchronous UPDATE when not started"""
+        # Act
+        recorded = ActivityBuffer().record('last_login', users[0])
+        user_repository.update_last_login(users[1])
+
+        # Assert
+        assert recorded is False
+        assert reload(users[1]).last_login is not None
@@ -0,0 +1,193 @@
+"""
+Unit Tests - Email Filter (counting Bloom filter + bitmap compartido)
+Usa fakeredis como stand-in en memoria
+"""
+import fakeredis
+import pytest
+from flask import Flask
+from unittest.mock import Mock, patch
+from src.repositories.email_filter import EmailFilter
+from src.repositories.user_repository import user_repository
+from src.utils.bloom_util import CountingBloomFilter
+from src.utils.redis_util import RedisUtil
+
+
+REGISTERED = [f'user{i}@example.com' for i in range(200)]
+
+
+@pytest.fixture(autouse=True)
+def small_filter():
+    """Filtro chico: los tests no necesitan el tamaño de producción"""
+    with patch.object(EmailFilter, 'CAPACITY', 10000):
+        yield
+
+
+@pytest.fixture
+def redis_server():
+    """Servidor fakeredis compartido (simula varios workers)"""
+    return fakeredis.FakeServer()
+
+
+def make_filter(server=None) -> EmailFilter:
+    if server:
+        redis = RedisUtil(client=fakeredis.FakeRedis(server=server, decode_responses=True))
+    else:
+        redis = Mock(get_client=Mock(return_value=None))
+    email_filter = EmailFilter(redis)
+    email_filter.enabled = True
+    return email_filter
+
+
+def build(email_filter: EmailFilter, emails=REGISTERED) -> int:
+    return email_filter.build(Flask(__name__), lambda: iter(emails))
+
+
+class TestCountingBloomFilter:
+    """Test CountingBloomFilter"""
+
+    def test_remove_keeps_other_items(self):
+        """Test: should forget a removed item without false negatives for the rest"""
+        # Arrange
+        bloom = CountingBloomFilter(1000, 0.01)
+        for email in REGISTERED:
+            bloom.add(email)
+
+        # Act
+        removed = bloom.remove('user7@example.com')
+
+        # Assert
+        assert removed is True
+        assert 'user7@example.com' not in bloom
+        assert all(email in bloom for email in REGISTERED if email != 'user7@example.com')
+        assert bloom.remove('nobody@example.com') is False
+
+    def test_memory_budget_caps_size(self):
+        """Test: should respect max_bytes at the cost of a higher error rate"""
+        # Act
+        bloom = CountingBloomFilter(1000000, 0.01, max_bytes=65536)
+
+        # Assert
+        assert bloom.memory_bytes == 65536
+        assert bloom.hashes >= 1
+
+
+class TestEmailFilter:
+    """Test EmailFilter"""
+
+    def test_unknown_email_is_a_definite_miss(self, redis_server):
+        """Test: should rule out unregistered emails once the filter is built"""
+        # Arrange
+        email_filter = make_filter(redis_server)
+        build(email_filter)
+
+        # Act
+        known = email_filter.might_exist('USER3@example.com')
+        unknown = email_filter.might_exist('typo@example.com')
+
+        # Assert
+        assert known is True
+        assert unknown is False
+        assert email_filter.get_stats()['definite_misses'] == 1
+
+    def test_registration_on_other_worker_is_visible(self, redis_server):
+        """Test: should see emails added by another worker through the Redis bitmap"""
+        # Arrange
+        worker_a, worker_b = make_filter(redis_server), make_filter(redis_server)
+        build(worker_a)
+        build(worker_b)
+
+        # Act
+        worker_a.add('new@example.com')
+
+        # Assert
+        assert worker_b.might_exist('new@example.com') is True
+        assert worker_b.get_stats()['shared_hits'] == 1
+
+    def test_published_bitmap_matches_local_positions(self, redis_server):
+        """Test: should find emails of the published build in the shared bitmap"""
+        # Arrange
+        worker_a, worker_b = make_filter(redis_server), make_filter(redis_server)
+        build(worker_a)
+        build(worker_b, emails=[])
+
+        # Act
+        found = [worker_b.might_exist(email) for email in REGISTERED]
+
+        # Assert
+        assert all(found)
+        assert worker_b.might_exist('typo@example.com') is False
+
+    def test_failed_bit_write_disables_shared_bitmap(self, redis_server):
+        """Test: should drop the ready marker so other workers never rule out the new email"""
+        # Arrange
+        worker_a, worker_b = make_filter(redis_server), make_filter(redis_server)
+        build(worker_a)
+        build(worker_b)
+
+        # Act
+        with patch.object(worker_a.redis.get_client(), 'bitfield', side_effect=ConnectionError('timeout')):
+            worker_a.add('new@example.com')
+
+        # Assert
+        assert worker_b.might_exist('new@example.com') is True
+        assert worker_a.redis.get_client().exists(f'{worker_a.key}:ready') == 0
+
+    def test_failed_bit_write_and_ready_cleanup_aborts_registration(self, redis_server):
+        """Test: should raise when the shared bitmap can be neither updated nor disabled"""
+        # Arrange
+        email_filter = make_filter(redis_server)
+        build(email_filter)
+        client = email_filter.redis.get_client()
+
+        # Act & Assert
+        with patch.object(client, 'bitfield', side_effect=ConnectionError('timeout')), \
+                patch.object(client, 'delete', side_effect=ConnectionError('timeout')):
+            with pytest.raises(ConnectionError):
+                email_filter.add('new@example.com')
+
+    def test_evicted_bitmap_is_not_a_definite_miss(self, redis_server):
+        """Test: should treat a missing bitmap key as might-exist even with the ready marker"""
+        # Arrange
+        worker_a, worker_b = make_filter(redis_server), make_filter(redis_server)
+        build(worker_a)
+        build(worker_b, emails=[])
+
+        # Act
+        worker_a.redis.get_client().delete(worker_a.key)
+
+        # Assert
+        assert worker_b.might_exist('user3@example.com') is True
+
+    def test_without_redis_never_rules_out(self):
+        """Test: should fall back to the database when the bitmap cannot be checked"""
+        # Arrange
+        email_filter = make_filter()
+        build(email_filter)
+
+        # Act & Assert
+        assert email_filter.might_exist('typo@example.com') is True
+        email_filter.local_only = True
+        assert email_filter.might_exist('typo@example.com') is False
+
+    def test_not_built_yet_allows_lookup(self, redis_server):
+        """Test: should not short-circuit before the startup build finishes"""
+        # Arrange
+        email_filter = make_filter(redis_server)
+
+        # Act & Assert
+        assert email_filter.might_exist('typo@example.com') is True
+
+    def test_repository_skips_database_on_miss(self, redis_server):
+        """Test: should not query users for an email the filter rules out"""
+        # Arrange
+        email_filter = make_filter(redis_server)
+        build(email_filter)
+
+        with patch.object(user_repository, 'email_filter', email_filter), \
+                patch.object(user_repository, 'find_one') as mock_find_one:
+            # Act
+            user = user_repository.find_active_by_email('typo@example.com')
+
+        # Assert
+        assert user is None
+        mock_find_one.assert_not_called()
@@ -0,0 +1,92 @@
+"""
+Unit Tests - Login Attempts Store
+Usa fakeredis (con Lua) como stand-in en memoria
+"""
+import fakeredis
+import pytest
+from unittest.mock import patch
+from src.repositories.login_attempts_repository import login_attempts_repository
+from src.repositories.login_attempts_store import LoginAttemptsStore
+from src.utils.redis_util import RedisUtil
+
+
+@pytest.fixture
+def store():
+    """Store sobre fakeredis con límites chicos"""
+    store = LoginAttemptsStore(RedisUtil(client=fakeredis.FakeRedis(decode_responses=True)))
+    store.MAX_PER_EMAIL = 3
+    store.MAX_PER_IP = 5
+    return store
+
+
+class TestLoginAttemptsStore:
+    """Test LoginAttemptsStore"""
+
+    def test_email_is_blocked_at_the_limit(self, store):
+        """Test: should block the email after MAX_PER_EMAIL failures"""
+        # Arrange
+        results = [store.record_failure('victim@example.com', '10.0.0.1') for _ in range(3)]
+
+        # Act
+        remaining = store.remaining_block_time('victim@example.com', '10.0.0.2')
+
+        # Assert
+        assert results == [False, False, True]
+        assert 0 < remaining <= store.BLOCK_SECONDS
+
+    def test_ip_is_blocked_across_many_emails(self, store):
+        """Test: should block a stuffing IP even if each email fails once"""
+        # Arrange
+        for i in range(5):
+            store.record_failure(f'user{i}@example.com', '10.0.0.1')
+
+        # Act & Assert
+        assert store.remaining_block_time('new@example.com', '10.0.0.1') > 0
+        assert store.remaining_block_time('new@example.com', '10.0.0.2') == 0
+
+    def test_success_resets_email_but_not_ip(self, store):
+        """Test: should clear the email counters only"""
+        # Arrange
+        for _ in range(2):
+            store.record_failure('user@example.com', '10.0.0.1')
+
+        # Act
+        store.reset('user@example.com')
+        blocked = store.record_failure('user@example.com', '10.0.0.1')
+
+        # Assert
+        assert blocked is False
+        for i in range(2):
+            store.record_failure(f'other{i}@example.com', '10.0.0.1')
+        assert store.remaining_block_time('x@example.com', '10.0.0.1') > 0
+
+
+class TestLoginAttemptsRepositoryFallback:
+    """Test LoginAttemptsRepository con y sin Redis"""
+
+    def test_uses_redis_without_touching_the_table(self, store):
+        """Test: should answer from Redis when available"""
+        # Arrange
+        with patch.object(login_attempts_repository, 'store', store), \
+                patch.object(login_attempts_repository, 'find_by_email') as mock_find:
+            # Act
+            login_attempts_repository.increment_attempts('user@example.com', '10.0.0.1')
+            blocked = login_attempts_repository.is_blocked('user@example.com', '10.0.0.1')
+
+        # Assert
+        assert blocked is False
+        mock_find.assert_not_called()
+
+    def test_falls_back_to_sql_without_redis(self):
+        """Test: should query the login_attempts table when Redis is down"""
+        # Arrange
+        offline = LoginAttemptsStore(RedisUtil(client=fakeredis.FakeRedis(decode_responses=True)))
+        with patch.object(offline.redis, 'get_client', return_value=None), \
+                patch.object(login_attempts_repository, 'store', offline), \
+                patch.object(login_attempts_repository, 'find_by_email', return_value=None) as mock_find:
+            # Act
+            blocked = login_attempts_repository.is_blocked('user@example.com', '10.0.0.1')
+
+        # Assert
+        assert blocked is False
+        mock_find.assert_called_once_with('user@example.com')
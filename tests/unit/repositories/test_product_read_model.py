@@ -0,0 +1,88 @@
+"""
+Unit Tests - Product Read Model
+Usa fakeredis como stand-in en memoria (incluye soporte Lua)
+"""
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from src.repositories.product_read_model import ProductReadModel
+from src.utils.response_util import ApiResponse
+from tests.fixtures import fake_redis
+
+
+def make_product(index: int, category: str = 'Hogar', is_active: bool = True):
+    """Producto mínimo con los atributos que usa ProductResponseDTO"""
+    created_at = datetime(2024, 1, 1) + timedelta(minutes=index)
+    return SimpleNamespace(
+        id=f'p{index}',
+        name=f'Producto {index}',
+        description=None,
+        price=10 + index,
+        stock=index,
+        category=category,
+        is_active=is_active,
+        created_by='u1',
+        created_at=created_at,
+        updated_at=created_at
+    )
+
+
+@pytest.fixture
+def read_model(fake_redis):
+    """Read model reconstruido con 5 productos"""
+    model = ProductReadModel(fake_redis)
+    model.rebuild([make_product(i, 'Hogar' if i % 2 else 'Libros') for i in range(5)])
+    return model
+
+
+class TestProductReadModel:
+    """Test ProductReadModel"""
+
+    def test_page_assembles_prebuilt_fragments(self, read_model):
+        """Test: should return a page with pagination from stored fragments"""
+        # Act
+        data = json.loads(read_model.page(2, 2))
+
+        # Assert
+        assert [p['id'] for p in data['products']] == ['p2', 'p3']
+        assert data['pagination'] == {'page': 2, 'limit': 2, 'total': 5, 'total_pages': 3}
+
+    def test_page_by_category(self, read_model):
+        """Test: should use the category index"""
+        # Act
+        data = json.loads(read_model.page(1, 10, 'Hogar'))
+
+        # Assert
+        assert [p['id'] for p in data['products']] == ['p1', 'p3']
+
+    def test_upsert_moves_category_and_remove_on_inactive(self, read_model):
+        """Test: should keep indexes consistent on writes"""
+        # Act
+        read_model.upsert(make_product(1, 'Libros'))
+        read_model.upsert(make_product(0, is_active=False))
+
+        # Assert
+        assert [p['id'] for p in json.loads(read_model.page(1, 10, 'Hogar'))['products']] == ['p3']
+        assert [p['id'] for p in json.loads(read_model.page(1, 10, 'Libros'))['products']] == ['p1', 'p2', 'p4']
+        assert json.loads(read_model.page(1, 10))['pagination']['total'] == 4
+
+    def test_page_falls_back_when_not_ready(self, fake_redis):
+        """Test: should return None until the read model is rebuilt"""
+        # Arrange
+        model = ProductReadModel(fake_redis)
+        model.upsert(make_product(1))
+
+        # Act & Assert
+        assert model.page(1, 10) is None
+
+    def test_success_raw_envelope(self, read_model, app):
+        """Test: should wrap the pre-encoded data in the ApiResponse envelope"""
+        # Act
+        response = ApiResponse.success_raw('Productos obtenidos', read_model.page(1, 1))
+
+        # Assert
+        body = response.get_json()
+        assert body['success'] is True
+        assert body['message'] == 'Productos obtenidos'
+        assert body['data']['products'][0]['id'] == 'p0'
@@ -0,0 +1,151 @@
+"""
+Unit Tests - Refresh Token Store
+Usa fakeredis (con Lua) como stand-in en memoria
+"""
+import fakeredis
+import pytest
+from unittest.mock import patch
+from src.dto.auth_dto import RefreshTokenDTO
+from src.repositories.refresh_token_store import RefreshTokenStore
+from src.services.auth_service import auth_service
+from src.utils.app_error import AppError
+from src.utils.jwt_util import JWTUtil
+from src.utils.redis_util import RedisUtil
+
+
+PRINCIPAL = {'id': 'u1', 'email': 'u1@example.com', 'name': 'U1', 'role': 'user', 'is_active': True, 'token_version': 0}
+PROFILE = {'id': 'u1', 'email': 'u1@example.com', 'name': 'U1', 'role': 'user', 'is_active': True}
+
+
+@pytest.fixture
+def store():
+    """Store sobre fakeredis"""
+    return RefreshTokenStore(RedisUtil(client=fakeredis.FakeRedis(decode_responses=True)))
+
+
+def family(fid='f1', jti='j1') -> dict:
+    return {'id': 'u1', 'fid': fid, 'jti': jti}
+
+
+class TestRefreshTokenStore:
+    """Test RefreshTokenStore.rotate"""
+
+    def test_current_token_rotates_once(self, store):
+        """Test: should rotate the current token and reject it afterwards"""
+        # Arrange
+        store.start_family(family())
+
+        # Act
+        first = store.rotate('f1', 'j1', 'j2')
+        second = store.rotate('f1', 'j2', 'j3')
+
+        # Assert
+        assert first == store.ROTATED
+        assert second == store.ROTATED
+
+    def test_reused_token_revokes_family(self, store):
+        """Test: should revoke the whole family when an old token is replayed"""
+        # Arrange
+        store.start_family(family())
+        store.rotate('f1', 'j1', 'j2')
+        store.rotate('f1', 'j2', 'j3')
+
+        # Act
+        reused = store.rotate('f1', 'j1', 'j4')
+
+        # Assert
+        assert reused == store.REUSED
+        assert store.rotate('f1', 'j3', 'j5') == store.REVOKED
+
+    def test_concurrent_retry_within_grace_keeps_family(self, store):
+        """Test: should reject a just-rotated token without revoking the family"""
+        # Arrange
+        store.start_family(family())
+        store.rotate('f1', 'j1', 'j2')
+
+        # Act
+        retry = store.rotate('f1', 'j1', 'j3')
+
+        # Assert
+        assert retry == store.CONCURRENT
+        assert store.rotate('f1', 'j2', 'j4') == store.ROTATED
+
+    def test_revoked_family_is_not_missing(self, store):
+        """Test: should keep rejecting tokens of a family revoked on logout"""
+        # Arrange
+        store.start_family(family())
+
+        # Act
+        store.revoke_family('f1')
+
+        # Assert
+        assert store.rotate('f1', 'j1', 'j2') == store.REVOKED
+        assert store.rotate('f2', 'j1', 'j2') == store.MISSING
+
+
+class TestRefreshFlow:
+    """Test AuthService.refresh_token con rotación"""
+
+    def test_refresh_rotates_without_database(self, store):
+        """Test: should rotate from Redis and cached user state, rejecting the old token"""
+        # Arrange
+        user = type('User', (), {'id': 'u1', 'email': 'u1@example.com', 'role': 'user', 'token_version': 0})()
+        refresh_token = JWTUtil.generate_refresh_token(user)
+        store.start_family(JWTUtil.decode_token(refresh_token))
+
+        with patch.object(auth_service, 'refresh_store', store), \
+                patch.object(auth_service, 'user_repo') as mock_repo, \
+                patch('src.services.auth_service.principal_cache.get', return_value=PRINCIPAL), \
+                patch('src.services.auth_service.user_service.get_user', return_value=PROFILE), \
+                patch.object(JWTUtil, '_revocation_checks', []):
+            # Act
+            result = auth_service.refresh_token(RefreshTokenDTO(refresh_token), {})
+
+            # Assert
+            new_payload = JWTUtil.decode_token(result.tokens.refresh_token)
+            assert new_payload['fid'] == JWTUtil.decode_token(refresh_token)['fid']
+            assert result.user.email == 'u1@example.com'
+            mock_repo.find_by_id.assert_not_called()
+
+            with patch.object(store, 'GRACE_SECONDS', 0), pytest.raises(AppError) as exc_info:
+                auth_service.refresh_token(RefreshTokenDTO(refresh_token), {})
+            assert exc_info.value.status_code == 401
+
+    def test_unknown_family_starts_over_with_single_use(self, store):
+        """Test: should accept a token whose family Redis lost once, then track the new family"""
+        # Arrange
+        user = type('User', (), {'id': 'u1', 'email': 'u1@example.com', 'role': 'user', 'token_version': 0})()
+        refresh_token = JWTUtil.generate_refresh_token(user)
+        revoked = []
+
+        with patch.object(auth_service, 'refresh_store', store), \
+                patch('src.services.auth_service.principal_cache.get', return_value=PRINCIPAL), \
+                patch('src.services.auth_service.user_service.get_user', return_value=PROFILE), \
+                patch('src.services.auth_service.token_blacklist.revoke', side_effect=revoked.append), \
+                patch.object(JWTUtil, '_revocation_checks', []):
+            # Act
+            result = auth_service.refresh_token(RefreshTokenDTO(refresh_token), {})
+
+        # Assert
+        new_payload = JWTUtil.decode_token(result.tokens.refresh_token)
+        assert [payload['jti'] for payload in revoked] == [JWTUtil.decode_token(refresh_token)['jti']]
+        assert store.rotate(new_payload['fid'], new_payload['jti'], 'next') == store.ROTATED
+
+    def test_missing_profile_does_not_consume_token(self, store):
+        """Test: should check the profile before rotating the family"""
+        # Arrange
+        user = type('User', (), {'id': 'u1', 'email': 'u1@example.com', 'role': 'user', 'token_version': 0})()
+        refresh_token = JWTUtil.generate_refresh_token(user)
+        payload = JWTUtil.decode_token(refresh_token)
+        store.start_family(payload)
+
+        with patch.object(auth_service, 'refresh_store', store), \
+                patch('src.services.auth_service.principal_cache.get', return_value=PRINCIPAL), \
+                patch('src.services.auth_service.user_service.get_user', return_value=None), \
+                patch.object(JWTUtil, '_revocation_checks', []):
+            # Act
+            with pytest.raises(AppError):
+                auth_service.refresh_token(RefreshTokenDTO(refresh_token), {})
+
+        # Assert
+        assert store.rotate(payload['fid'], payload['jti'], 'next') == store.ROTATED
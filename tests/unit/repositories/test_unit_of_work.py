@@ -0,0 +1,131 @@
+"""
+Unit Tests - Unit of Work (un COMMIT por operación de servicio)
+SQLite en memoria; los COMMITs se cuentan con eventos del engine
+"""
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy import event
+from src.dto.auth_dto import LoginDTO, RegisterDTO
+from src.models import LoginAttempt, User
+from src.models.user import UserRole
+from src.repositories.login_attempts_repository import login_attempts_repository
+from src.repositories.unit_of_work import unit_of_work
+from src.repositories.user_repository import user_repository
+from src.services.auth_service import auth_service
+from src.utils.app_error import AppError
+
+
+AUDIT = {'ip': '203.0.113.7'}
+
+
+@pytest.fixture
+def commits(db):
+    """Cuenta los COMMIT que llegan al engine; limpia las tablas al final"""
+    counter = {'count': 0}
+
+    def on_commit(connection):
+        counter['count'] += 1
+
+    event.listen(db.engine, 'commit', on_commit)
+    # Sin Redis: intentos de login por la tabla (el caso con más COMMITs)
+    offline_store = Mock(remaining_block_time=Mock(return_value=None),
+                         record_failure=Mock(return_value=None), reset=Mock(return_value=None))
+
+    with patch.object(login_attempts_repository, 'store', offline_store):
+        yield counter
+
+    event.remove(db.engine, 'commit', on_commit)
+    db.session.rollback()
+    LoginAttempt.query.delete()
+    User.query.delete()
+    db.session.commit()
+
+
+def register(email='uow@example.com'):
+    return auth_service.register(
+        RegisterDTO(email=email, password='Password123!', name='Uow User', role=UserRole.USER), AUDIT
+    )
+
+
+class TestUnitOfWork:
+    """Test UnitOfWork"""
+
+    def test_register_commits_once(self, commits):
+        """Test: should create the user in a single COMMIT"""
+        # Act
+        register()
+
+        # Assert
+        assert commits['count'] == 1
+
+    def test_successful_login_commits_once(self, commits):
+        """Test: should reset attempts and update last_login in one COMMIT"""
+        # Arrange
+        register()
+        login_attempts_repository.create({'email': 'uow@example.com', 'ip_address': '203.0.113.7', 'attempts': 2})
+        commits['count'] = 0
+
+        # Act
+        auth_service.login(LoginDTO(email='uow@example.com', password='Password123!'), AUDIT)
+
+        # Assert
+        assert commits['count'] == 1
+        assert login_attempts_repository.find_by_email('uow@example.com').attempts == 0
+        assert user_repository.find_by_email('uow@example.com').last_login is not None
+
+    def test_failed_login_commits_the_attempt_once(self, commits):
+        """Test: should persist the failed attempt in one COMMIT before raising"""
+        # Arrange
+        register()
+        commits['count'] = 0
+
+        # Act
+        with pytest.raises(AppError):
+            auth_service.login(LoginDTO(email='uow@example.com', password='wrong-password'), AUDIT)
+
+        # Assert
+        assert commits['count'] == 1
+        assert login_attempts_repository.find_by_email('uow@example.com').attempts == 1
+
+    def test_exception_rolls_back_and_drops_callbacks(self, commits):
+        """Test: should roll back joined writes and skip after-commit callbacks"""
+        # Arrange
+        callback = Mock()
+
+        # Act
+        with pytest.raises(RuntimeError):
+            with unit_of_work.transaction():
+                user_repository.create({'email': 'ghost@example.com', 'password': 'Password123!', 'name': 'Ghost'})
+                unit_of_work.after_commit(callback)
+                raise RuntimeError('boom')
+
+        # Assert
+        assert commits['count'] == 0
+        callback.assert_not_called()
+        assert user_repository.find_by_email('ghost@example.com') is None
+
+    def test_nested_scopes_join_the_outer_commit(self, commits):
+        """Test: should commit once at the outermost scope and then run callbacks"""
+        # Arrange
+        callback = Mock()
+
+        # Act
+        with unit_of_work.transaction():
+            with unit_of_work.transaction():
+                user_repository.create({'email': 'a@example.com', 'password': 'Password123!', 'name': 'A'})
+                unit_of_work.after_commit(callback)
+            user_repository.create({'email': 'b@example.com', 'password': 'Password123!', 'name': 'B'})
+            callback.assert_not_called()
+
+        # Assert
+        assert commits['count'] == 1
+        callback.assert_called_once()
+
+    def test_read_only_scope_does_not_commit(self, commits):
+        """Test: should not issue a COMMIT when the scope only read"""
+        # Act
+        with unit_of_work.transaction():
+            user_repository.find_by_email('nobody@example.com')
+
+        # Assert
+        assert commits['count'] == 0
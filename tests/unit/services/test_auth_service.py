@@ -2,12 +2,18 @@
 Unit Tests - Auth Service
 Equivalente a tests/unit/services/auth.service.test.js
 """
+import time
+import fakeredis
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 import jwt as pyjwt
 from src.services.auth_service import auth_service
 from src.dto.auth_dto import RegisterDTO, LoginDTO, RefreshTokenDTO
 from src.utils.app_error import AppError
+from src.utils.jwt_util import JWTUtil, jwt_util
+from src.utils.principal_cache_util import PrincipalCache
+from src.utils.redis_util import RedisUtil
 from tests.fixtures import mock_user
 
 
@@ -216,3 +222,71 @@ class TestAuthService:
         # Assert
         assert result['valid'] is False
         assert 'reason' in result
+
+
+class TestVerifyTokens:
+    """Test AuthService.verify_tokens (POST /api/auth/verify-batch)"""
+    
+    @pytest.fixture
+    def principals(self):
+        """Principal cache propio sobre fakeredis"""
+        cache = PrincipalCache(RedisUtil(client=fakeredis.FakeRedis(decode_responses=True)))
+        with patch('src.services.auth_service.principal_cache', cache), \
+                patch.object(JWTUtil, '_revocation_checks', []):
+            yield cache
+    
+    def test_loads_users_with_a_single_query(self, principals):
+        """Test: should resolve every referenced user with one IN query"""
+        # Arrange
+        users = [
+            SimpleNamespace(id=f'u{i}', email=f'u{i}@example.com', name=f'U{i}', role='user', is_active=True, token_version=0)
+            for i in range(3)
+        ]
+        tokens = [jwt_util.generate_access_token(user) for user in users] + [jwt_util.generate_access_token(users[0])]
+        
+        with patch.object(auth_service, 'user_repo') as mock_repo:
+            mock_repo.find_by_ids.return_value = users
+            
+            # Act
+            results = auth_service.verify_tokens(tokens + ['not-a-token'])
+        
+        # Assert
+        assert [result['valid'] for result in results] == [True, True, True, True, False]
+        assert results[1]['user']['id'] == 'u1'
+        assert results[1]['claims']['email'] == 'u1@example.com'
+        mock_repo.find_by_ids.assert_called_once_with(['u0', 'u1', 'u2'])
+        mock_repo.find_by_id.assert_not_called()
+    
+    def test_rejects_inactive_and_revoked_sessions(self, principals):
+        """Test: should flag inactive users and outdated token versions"""
+        # Arrange
+        inactive = SimpleNamespace(id='u1', email='u1@example.com', name='U1', role='user', is_active=False, token_version=0)
+        revoked = SimpleNamespace(id='u2', email='u2@example.com', name='U2', role='user', is_active=True, token_version=0)
+        tokens = [jwt_util.generate_access_token(inactive), jwt_util.generate_access_token(revoked)]
+        revoked.token_version = 1
+        
+        with patch.object(auth_service, 'user_repo') as mock_repo:
+            mock_repo.find_by_ids.return_value = [inactive, revoked]
+            
+            # Act
+            results = auth_service.verify_tokens(tokens)
+        
+        # Assert
+        assert results == [
+            {'valid': False, 'reason': 'User not found or inactive'},
+            {'valid': False, 'reason': 'Session revoked'}
+        ]
+        assert auth_service.verify_cache_seconds(results) == auth_service.VERIFY_BATCH_CACHE_SECONDS
+    
+    def test_cache_seconds_follow_earliest_expiry(self):
+        """Test: should not let results be cached past the first token expiry"""
+        # Arrange
+        now = time.time()
+        results = [
+            {'valid': True, 'claims': {'exp': now + 600}},
+            {'valid': True, 'claims': {'exp': now + 12.5}},
+            {'valid': False, 'reason': 'Token expired'}
+        ]
+        
+        # Act & Assert
+        assert auth_service.verify_cache_seconds(results) == 12
@@ -0,0 +1,129 @@
+"""
+Unit Tests - Warmup Service
+"""
+import pytest
+from unittest.mock import Mock, patch
+from flask import Flask
+from src.services.warmup_service import WarmupService
+
+
+@pytest.fixture
+def warmup_app():
+    """App mínima con la configuración de warm-up"""
+    app = Flask(__name__)
+    app.config.update(
+        CACHE_WARMUP_ENABLED=True,
+        CACHE_WARMUP_TIMEOUT_SECONDS=60,
+        CACHE_WARMUP_TOP_CATEGORIES=2,
+        CACHE_WARMUP_PAGES=2,
+        CACHE_WARMUP_PAGE_LIMIT=10,
+        CACHE_WARMUP_TOP_PRODUCTS=5,
+        CACHE_WARMUP_ADMINS=5
+    )
+    return app
+
+
+class TestWarmupService:
+    """Test WarmupService"""
+
+    @patch('src.services.warmup_service.user_service')
+    @patch('src.services.warmup_service.user_repository')
+    @patch('src.services.warmup_service.product_service')
+    @patch('src.services.warmup_service.product_repository')
+    def test_run_warms_catalog_products_and_admins(
+        self, mock_product_repo, mock_product_service, mock_user_repo, mock_user_service, warmup_app
+    ):
+        """Test: should preload list pages, most viewed products and admins"""
+        # Arrange
+        service = WarmupService()
+        mock_product_repo.read_model.ensure_ready.return_value = 12
+        mock_product_repo.find_top_categories.return_value = ['Electrónica', 'Hogar']
+        mock_product_service.list_products.return_value = {'pagination': {'total_pages': 5}}
+        mock_product_service.get_most_viewed_ids.return_value = ['p1', 'p2']
+        mock_product_service.get_product.return_value = {'id': 'p1'}
+        mock_user_repo.find_active_admins.return_value = [Mock(id='admin-1')]
+
+        # Act
+        status = service.run(warmup_app)
+
+        # Assert
+        assert status['state'] == 'ready'
+        assert status['ready'] is True
+        assert status['warmed'] == {'read_model_products': 12, 'list_pages': 6, 'products': 2, 'users': 1}
+        mock_product_service.list_products.assert_any_call(2, 10, 'Hogar')
+        mock_user_service.get_user.assert_called_once_with('admin-1')
+
+    @patch('src.services.warmup_service.product_repository')
+    def test_failed_warmup_still_reports_ready(self, mock_product_repo, warmup_app):
+        """Test: should not block readiness forever if warm-up fails"""
+        # Arrange
+        service = WarmupService()
+        mock_product_repo.find_top_categories.side_effect = RuntimeError('db down')
+
+        # Act
+        status = service.run(warmup_app)
+
+        # Assert
+        assert status['state'] == 'failed'
+        assert service.is_ready() is True
+
+    def test_not_ready_until_started(self):
+        """Test: should report not ready while pending"""
+        # Arrange
+        service = WarmupService()
+
+        # Act & Assert
+        assert service.is_ready() is False
+
+    def test_disabled_warmup_is_ready_immediately(self, warmup_app):
+        """Test: should be ready at once when warm-up is disabled"""
+        # Arrange
+        service = WarmupService()
+        warmup_app.config['CACHE_WARMUP_ENABLED'] = False
+
+        # Act
+        service.start(warmup_app)
+
+        # Assert
+        assert service.is_ready() is True
+
+    def test_running_warmup_times_out(self):
+        """Test: should become ready once the timeout has elapsed"""
+        # Arrange
+        service = WarmupService()
+        service._state = 'running'
+        service._started_at = 0.0
+        service._timeout = 1
+
+        # Act
+        status = service.get_status()
+
+        # Assert
+        assert status['ready'] is True
+        assert status['state'] == 'timed_out'
+
+
+class TestHealthReadiness:
+    """Test GET /health?mode=ready"""
+
+    def test_health_readiness_not_ready(self, app):
+        """Test: should return 503 while warm-up is running"""
+        # Arrange
+        client = app.test_client()
+
+        # Act
+        with patch('src.routes.warmup_service') as mock_warmup:
+            mock_warmup.get_status.return_value = {'ready': False, 'state': 'running'}
+            response = client.get('/health?mode=ready')
+
+        # Assert
+        assert response.status_code == 503
+        assert response.get_json()['status'] == 'warming_up'
+
+    def test_health_liveness_ignores_warmup(self, app):
+        """Test: should keep plain /health as liveness"""
+        # Act
+        response = app.test_client().get('/health')
+
+        # Assert
+        assert response.status_code == 200
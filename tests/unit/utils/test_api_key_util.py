@@ -0,0 +1,102 @@
+"""
+Unit Tests - API Key Utility (índice en memoria por prefix)
+Usa fakeredis como stand-in en memoria
+"""
+import time
+import fakeredis
+import pytest
+from unittest.mock import Mock
+from src.utils.api_key_util import ApiKeyIndex, generate_api_key, parse_prefix
+from src.utils.redis_util import RedisUtil
+
+
+@pytest.fixture
+def redis_server():
+    """Servidor fakeredis compartido (simula varios workers)"""
+    return fakeredis.FakeServer()
+
+
+class FakeTable:
+    """Tabla api_keys en memoria (loader del índice)"""
+
+    def __init__(self):
+        self.rows = {}
+        self.loads = 0
+
+    def add(self, user_id='u1', expires_at=None) -> str:
+        key, prefix, key_hash = generate_api_key()
+        self.rows[prefix] = {'id': f'k-{prefix}', 'prefix': prefix, 'key_hash': key_hash, 'user_id': user_id, 'expires_at': expires_at}
+        return key
+
+    def load(self):
+        self.loads += 1
+        return list(self.rows.values())
+
+
+def make_index(table, server=None) -> ApiKeyIndex:
+    redis = RedisUtil(client=fakeredis.FakeRedis(server=server, decode_responses=True)) if server else Mock(get_client=Mock(return_value=None))
+    index = ApiKeyIndex(redis)
+    index.enabled = True
+    index._loader = table.load
+    index.sync()
+    return index
+
+
+class TestApiKeyIndex:
+    """Test ApiKeyIndex"""
+
+    def test_valid_key_resolves_to_owner(self):
+        """Test: should verify a key by prefix without touching the table again"""
+        # Arrange
+        table = FakeTable()
+        key = table.add(user_id='svc-1')
+        index = make_index(table)
+
+        # Act
+        entry = index.verify(key)
+
+        # Assert
+        assert entry['user_id'] == 'svc-1'
+        assert table.loads == 1
+
+    def test_wrong_secret_and_garbage_are_rejected(self):
+        """Test: should reject a known prefix with a wrong secret and malformed keys"""
+        # Arrange
+        table = FakeTable()
+        key = table.add()
+        index = make_index(table)
+        forged = f'sk_{parse_prefix(key)}_not-the-secret'
+
+        # Act & Assert
+        assert index.verify(forged) is None
+        assert index.verify('garbage') is None
+        assert index.get_stats()['invalid'] == 1
+        assert index.get_stats()['unknown_prefix'] == 1
+
+    def test_expired_key_is_rejected(self):
+        """Test: should reject keys past expires_at"""
+        # Arrange
+        table = FakeTable()
+        key = table.add(expires_at=time.time() - 1)
+        index = make_index(table)
+
+        # Act & Assert
+        assert index.verify(key) is None
+
+    def test_revocation_reaches_other_workers(self, redis_server):
+        """Test: should reload on every worker after the version bump"""
+        # Arrange
+        table = FakeTable()
+        key = table.add()
+        worker_a, worker_b = make_index(table, redis_server), make_index(table, redis_server)
+        assert worker_b.verify(key) is not None
+
+        # Act
+        del table.rows[parse_prefix(key)]
+        worker_a.invalidate()
+        reloaded = worker_b.sync()
+
+        # Assert
+        assert reloaded is True
+        assert worker_b.verify(key) is None
+        assert worker_b.sync() is False
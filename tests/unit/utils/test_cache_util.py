@@ -0,0 +1,206 @@
+"""
+Unit Tests - Cache Utility
+"""
+import time
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from unittest.mock import patch
+from src.utils.cache_util import LocalCache, TieredCache, CacheSnapshot
+
+
+class TestLocalCache:
+    """Test LocalCache"""
+
+    def test_get_returns_value_until_ttl(self):
+        """Test: should expire entries after their ttl"""
+        # Arrange
+        cache = LocalCache('test', ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2, ttl=-1)
+
+        # Act & Assert
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get_stats()['hits'] == 1
+        assert cache.get_stats()['misses'] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test: should evict the LRU entry when full"""
+        # Arrange
+        cache = LocalCache('test', maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+
+        # Act
+        cache.set('c', 3)
+
+        # Assert
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get_stats()['evictions'] == 1
+
+
+class TestTieredCache:
+    """Test TieredCache"""
+
+    @patch('src.utils.cache_util.redis_util')
+    def test_get_or_load_uses_local_before_redis(self, mock_redis):
+        """Test: should only reach Redis on L1 miss"""
+        # Arrange
+        mock_redis.get_or_compute.side_effect = lambda key, ttl, fn: fn()
+        cache = TieredCache('cache:test:', ttl=60)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {'value': 1}
+
+        # Act
+        first = cache.get_or_load('k', loader)
+        second = cache.get_or_load('k', loader)
+
+        # Assert
+        assert first == second == {'value': 1}
+        assert len(calls) == 1
+        mock_redis.get_or_compute.assert_called_once()
+
+    @patch('src.utils.cache_util.redis_util')
+    def test_loaded_values_have_json_types_in_every_tier(self, mock_redis):
+        """Test: should return the same types from the loader, L1 and Redis"""
+        # Arrange
+        mock_redis.get_or_compute.side_effect = lambda key, ttl, fn: fn()
+        cache = TieredCache('cache:test:', ttl=60)
+        loader = lambda: {'price': Decimal('9.99'), 'created_at': datetime(2026, 1, 2, 3, 4, 5)}
+
+        # Act
+        loaded = cache.get_or_load('k', loader)
+        cached = cache.get_or_load('k', loader)
+
+        # Assert
+        assert loaded == cached == {'price': 9.99, 'created_at': '2026-01-02T03:04:05'}
+
+    @patch('src.utils.cache_util.redis_util')
+    def test_clear_removes_namespace(self, mock_redis):
+        """Test: should clear L1 and the Redis namespace"""
+        # Arrange
+        cache = TieredCache('cache:test:', ttl=60)
+        cache.local.set('k', 1)
+
+        # Act
+        cache.clear()
+
+        # Assert
+        assert len(cache.local) == 0
+        mock_redis.delete_pattern.assert_called_once_with('cache:test:*')
+
+
+class TestCacheSnapshot:
+    """Test CacheSnapshot"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_registry(self):
+        """Aísla el registro global de caches L1"""
+        with patch.dict('src.utils.cache_util._local_caches', clear=True):
+            yield
+
+    def _snapshot(self, path, version='1'):
+        snapshot = CacheSnapshot()
+        snapshot.path = str(path)
+        snapshot.version = version
+        snapshot.max_entries = 10
+        return snapshot
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test: should restore hot entries into a fresh cache"""
+        # Arrange
+        path = tmp_path / 'l1.snapshot'
+        cache = LocalCache('snapshot:test', ttl=60)
+        cache.set('page:1', {'products': [{'id': 'p1', 'price': 9.99}]})
+        cache.set('expired', 'x', ttl=-1)
+        assert self._snapshot(path).save() == 1
+
+        # Act - un worker nuevo registra una cache vacía con el mismo nombre
+        restarted = LocalCache('snapshot:test', ttl=60)
+        loaded = self._snapshot(path).load()
+
+        # Assert
+        assert loaded == 1
+        assert restarted.get('page:1') == {'products': [{'id': 'p1', 'price': 9.99}]}
+        assert restarted.get('expired') is None
+
+    def test_snapshot_is_private_and_skips_non_persistent_caches(self, tmp_path):
+        """Test: should write the file with mode 0600 and leave out persist=False caches"""
+        # Arrange
+        path = tmp_path / 'l1.snapshot'
+        LocalCache('snapshot:public', ttl=60).set('k', 1)
+        TieredCache('snapshot:profiles:', ttl=60, persist=False).local.set('u1', {'email': 'u1@example.com'})
+
+        # Act
+        written = self._snapshot(path).save()
+
+        # Assert
+        assert written == 1
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_load_ignores_other_versions(self, tmp_path):
+        """Test: should discard snapshots written by another version"""
+        # Arrange
+        path = tmp_path / 'l1.snapshot'
+        LocalCache('snapshot:version', ttl=60).set('k', 1)
+        self._snapshot(path, version='1').save()
+        restarted = LocalCache('snapshot:version', ttl=60)
+
+        # Act
+        loaded = self._snapshot(path, version='2').load()
+
+        # Assert
+        assert loaded == 0
+        assert restarted.get('k') is None
+
+    def test_load_skips_snapshots_older_than_max_age(self, tmp_path):
+        """Test: should discard the whole snapshot once it is older than max_age"""
+        # Arrange
+        path = tmp_path / 'l1.snapshot'
+        cache = LocalCache('snapshot:ttl', ttl=60)
+        cache.set('k', 1)
+        self._snapshot(path).save()
+        restarted = LocalCache('snapshot:ttl', ttl=60)
+
+        # Act
+        with patch('src.utils.cache_util.time.time', return_value=time.time() + 120):
+            loaded = self._snapshot(path).load()
+
+        # Assert
+        assert loaded == 0
+        assert len(restarted) == 0
+
+    def test_entries_keep_their_original_expiry(self, tmp_path):
+        """Test: should not restore entries whose L1 ttl passed while the worker was down"""
+        # Arrange
+        path = tmp_path / 'l1.snapshot'
+        LocalCache('snapshot:short', ttl=5).set('k', 1)
+        LocalCache('snapshot:long', ttl=60).set('k', 2)
+        self._snapshot(path).save()
+        short = LocalCache('snapshot:short', ttl=5)
+        long = LocalCache('snapshot:long', ttl=60)
+
+        # Act
+        with patch('src.utils.cache_util.time.time', return_value=time.time() + 10):
+            loaded = self._snapshot(path).load()
+            values = (short.get('k'), long.get('k'))
+
+        # Assert
+        assert loaded == 1
+        assert values == (None, 2)
+
+    def test_load_tolerates_missing_or_corrupt_file(self, tmp_path):
+        """Test: should start cold if the snapshot is unusable"""
+        # Arrange
+        path = tmp_path / 'l1.snapshot'
+        path.write_bytes(b'garbage-data-not-a-snapshot')
+
+        # Act & Assert
+        assert self._snapshot(tmp_path / 'missing').load() == 0
+        assert self._snapshot(path).load() == 0
@@ -0,0 +1,94 @@
+"""
+Unit Tests - JSON Utility (orjson + fallback stdlib)
+"""
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+import pytest
+from flask import Flask, jsonify, request
+from src.utils import json_util
+from src.utils.json_util import FastJSONProvider
+
+
+PAYLOAD = {
+    'price': Decimal('19.99'),
+    'created_at': datetime(2026, 1, 2, 3, 4, 5, 600000),
+    'id': uuid.UUID('3f1c9a52-8d47-4e1b-9c0a-6b2f7e5d4a10'),
+    'name': 'Café',
+    'tags': ['a', 'b']
+}
+
+EXPECTED = {
+    'created_at': '2026-01-02T03:04:05.600000',
+    'id': '3f1c9a52-8d47-4e1b-9c0a-6b2f7e5d4a10',
+    'name': 'Café',
+    'price': 19.99,
+    'tags': ['a', 'b']
+}
+
+
+@pytest.fixture
+def client():
+    """App mínima con el provider instalado"""
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+
+    @app.route('/echo', methods=['POST'])
+    def echo():
+        return jsonify({'received': request.get_json(), 'native': PAYLOAD})
+
+    return app.test_client()
+
+
+class TestJsonUtil:
+    """Test dumps/loads"""
+
+    def test_native_types_match_previous_conversions(self):
+        """Test: should encode datetime, Decimal and UUID like isoformat()/float()/str()"""
+        # Act
+        encoded = json_util.dumps(PAYLOAD, sort_keys=True)
+
+        # Assert
+        assert json.loads(encoded) == EXPECTED
+        assert encoded.index('"created_at"') < encoded.index('"tags"')
+
+    def test_stdlib_fallback_produces_same_document(self):
+        """Test: should encode the same output without orjson"""
+        # Act
+        with patch.object(json_util, 'orjson', None):
+            fallback = json_util.dumps(PAYLOAD, sort_keys=True)
+            decoded = json_util.loads(fallback)
+
+        # Assert
+        assert fallback == json_util.dumps(PAYLOAD, sort_keys=True)
+        assert decoded == EXPECTED
+
+    def test_unknown_types_raise_type_error(self):
+        """Test: should reject objects without a JSON equivalent"""
+        # Act / Assert
+        with pytest.raises(TypeError):
+            json_util.dumps({'value': object()})
+
+
+class TestFastJSONProvider:
+    """Test FastJSONProvider en Flask"""
+
+    def test_request_and_response_round_trip(self, client):
+        """Test: should parse the body and encode native types in jsonify"""
+        # Act
+        response = client.post('/echo', json={'page': 2, 'name': 'Café'})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        assert response.get_json() == {'received': {'page': 2, 'name': 'Café'}, 'native': EXPECTED}
+
+    def test_invalid_body_is_bad_request(self, client):
+        """Test: should return 400 when the body is not valid JSON"""
+        # Act
+        response = client.post('/echo', data='{"page": ', content_type='application/json')
+
+        # Assert
+        assert response.status_code == 400
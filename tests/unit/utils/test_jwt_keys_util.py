@@ -0,0 +1,160 @@
+"""
+Unit Tests - JWT Key Ring (firma asimétrica, rotación y JWKS)
+"""
+import json
+import time
+import jwt as pyjwt
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from flask import Flask
+from src.routes.jwks_routes import jwks_bp
+from src.utils.jwks_client_util import JWKSVerifier
+from src.utils.jwt_keys_util import KeyRing
+from src.utils.jwt_util import JWTUtil
+
+
+USER = SimpleNamespace(id='u1', email='u1@example.com', role='user')
+
+
+@pytest.fixture
+def ring(tmp_path):
+    """Key ring en un directorio temporal, usado por JWTUtil"""
+    key_ring = KeyRing(str(tmp_path))
+    JWTUtil.clear_verified_tokens()
+    with patch('src.utils.jwt_util.key_ring', key_ring), \
+            patch('src.routes.jwks_routes.key_ring', key_ring), \
+            patch.object(JWTUtil, '_revocation_checks', []):
+        yield key_ring
+    JWTUtil.clear_verified_tokens()
+
+
+def published_kids(key_ring):
+    body, _ = key_ring.jwks()
+    return {jwk['kid'] for jwk in json.loads(body)['keys']}
+
+
+class TestKeyRotation:
+    """Test KeyRing.rotate / prune"""
+
+    def test_first_rotate_activates_immediately(self, ring):
+        """Test: should sign with the new key when there was no active key"""
+        # Act
+        result = ring.rotate()
+        token = JWTUtil.generate_access_token(USER)
+
+        # Assert
+        assert result['action'] == 'activated'
+        assert pyjwt.get_unverified_header(token) == {'alg': 'EdDSA', 'kid': result['kid'], 'typ': 'JWT'}
+        assert JWTUtil.verify_access_token(token)['id'] == 'u1'
+
+    def test_next_key_is_published_before_signing(self, ring):
+        """Test: should publish the next key and keep signing with the current one"""
+        # Arrange
+        current = ring.rotate()['kid']
+
+        # Act
+        result = ring.rotate()
+
+        # Assert
+        assert result['action'] == 'generated'
+        assert published_kids(ring) == {current, result['kid']}
+        assert ring.signing_key()[0] == current
+        assert ring.rotate()['action'] == 'waiting'
+
+    def test_retired_key_still_verifies_until_pruned(self, ring):
+        """Test: should keep verifying tokens of the retired key during the overlap"""
+        # Arrange
+        old_kid = ring.rotate()['kid']
+        old_token = JWTUtil.generate_access_token(USER)
+        ring.rotate()
+
+        # Act
+        with patch.object(KeyRing, 'JWKS_MAX_AGE', 0):
+            new_kid = ring.rotate()['kid']
+        JWTUtil.clear_verified_tokens()
+
+        # Assert
+        assert ring.signing_key()[0] == new_kid
+        assert JWTUtil.verify_access_token(old_token)['id'] == 'u1'
+        assert ring.prune(max_token_age=900) == []
+        assert ring.prune(max_token_age=-3600) == [old_kid]
+        assert published_kids(ring) == {new_kid}
+
+    def test_rs256_keys(self, ring):
+        """Test: should sign and verify with RS256 keys"""
+        # Arrange
+        ring.rotate(alg='RS256')
+
+        # Act
+        token = JWTUtil.generate_access_token(USER)
+
+        # Assert
+        assert pyjwt.get_unverified_header(token)['alg'] == 'RS256'
+        assert JWTUtil.verify_access_token(token)['id'] == 'u1'
+
+
+class TestAsymmetricVerification:
+    """Test JWTUtil.verify_access_token con key ring"""
+
+    def test_unknown_kid_is_rejected(self, ring):
+        """Test: should reject tokens signed with keys outside the ring"""
+        # Arrange
+        other = KeyRing(ring.keys_dir + '-other')
+        other.rotate()
+        kid, alg, private_key = other.signing_key()
+        token = pyjwt.encode({'id': 'u1', 'type': 'access', 'exp': int(time.time()) + 60}, private_key, algorithm=alg, headers={'kid': kid})
+
+        # Act & Assert
+        with pytest.raises(pyjwt.InvalidTokenError):
+            JWTUtil.verify_access_token(token)
+
+    def test_hs256_can_be_disabled(self, ring):
+        """Test: should reject legacy HS256 tokens when JWT_ACCEPT_HS256 is off"""
+        # Arrange
+        legacy_token = JWTUtil.generate_access_token(USER)
+        ring.rotate()
+
+        # Act & Assert
+        assert JWTUtil.verify_access_token(legacy_token)['id'] == 'u1'
+        JWTUtil.clear_verified_tokens()
+        with patch.object(JWTUtil, 'ACCEPT_HS256', False), pytest.raises(pyjwt.InvalidTokenError):
+            JWTUtil.verify_access_token(legacy_token)
+
+
+class TestJWKS:
+    """Test /.well-known/jwks.json y JWKSVerifier"""
+
+    def test_endpoint_is_cacheable(self, ring):
+        """Test: should return long cache headers and honor If-None-Match"""
+        # Arrange
+        ring.rotate()
+        app = Flask(__name__)
+        app.register_blueprint(jwks_bp)
+        client = app.test_client()
+
+        # Act
+        response = client.get('/.well-known/jwks.json')
+        revalidation = client.get('/.well-known/jwks.json', headers={'If-None-Match': response.headers['ETag']})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == f'public, max-age={KeyRing.JWKS_MAX_AGE}'
+        assert len(response.get_json()['keys']) == 1
+        assert revalidation.status_code == 304
+
+    def test_verifier_caches_keys_in_process(self, ring):
+        """Test: should verify many tokens with a single JWKS fetch"""
+        # Arrange
+        ring.rotate()
+        jwks = json.loads(ring.jwks()[0])
+        verifier = JWKSVerifier(url='http://auth.internal/.well-known/jwks.json')
+        tokens = [JWTUtil.generate_access_token(USER) for _ in range(3)]
+
+        # Act
+        with patch.object(verifier.client, 'fetch_data', return_value=jwks) as mock_fetch:
+            payloads = [verifier.verify(token) for token in tokens]
+
+        # Assert
+        assert [payload['id'] for payload in payloads] == ['u1'] * 3
+        mock_fetch.assert_called_once()
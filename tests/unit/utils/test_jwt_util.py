@@ -0,0 +1,216 @@
+"""
+Unit Tests - JWT Utility (cache de tokens verificados y codec HS256)
+"""
+import time
+import jwt as pyjwt
+import pytest
+from hypothesis import given, settings, strategies as st
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.utils.jwt_util import HS256Codec, JWTUtil
+
+
+USER = SimpleNamespace(id='u1', email='u1@example.com', role='user')
+SECRET = 'property-test-secret-at-least-32-bytes'
+CODEC = HS256Codec(SECRET)
+
+# Claims JSON arbitrarios; los registrados con validación se generan aparte
+REGISTERED_CLAIMS = {'exp', 'iat', 'nbf', 'sub', 'jti', 'aud', 'iss'}
+json_values = st.recursive(
+    st.none() | st.booleans() | st.integers() | st.floats(allow_nan=False, allow_infinity=False) | st.text(),
+    lambda children: st.lists(children, max_size=4) | st.dictionaries(st.text(max_size=8), children, max_size=4),
+    max_leaves=12
+)
+NOW = int(time.time())
+claims_strategy = st.builds(
+    lambda claims, registered: {**claims, **registered},
+    st.dictionaries(st.text(max_size=12).filter(lambda key: key not in REGISTERED_CLAIMS), json_values, max_size=8),
+    st.fixed_dictionaries(
+        {'exp': st.integers(NOW + 3600, 2 ** 40)},
+        optional={'iat': st.integers(0, NOW - 1), 'jti': st.text(max_size=32)}
+    )
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_token_cache():
+    """Cache y checks de revocación aislados por test"""
+    JWTUtil.clear_verified_tokens()
+    with patch.object(JWTUtil, '_revocation_checks', []):
+        yield
+    JWTUtil.clear_verified_tokens()
+
+
+class TestVerifiedTokenCache:
+    """Test verify_access_token cache"""
+
+    def test_second_verify_skips_decode(self):
+        """Test: should serve a repeated token from the cache"""
+        # Arrange
+        token = JWTUtil.generate_access_token(USER)
+        JWTUtil.verify_access_token(token)
+
+        # Act
+        with patch('src.utils.jwt_util.jwt.decode') as mock_decode:
+            payload = JWTUtil.verify_access_token(token)
+
+        # Assert
+        assert payload['id'] == 'u1'
+        mock_decode.assert_not_called()
+        assert JWTUtil.get_verify_cache_stats()['hits'] == 1
+
+    def test_cached_token_still_expires(self):
+        """Test: should reject a cached token once exp has passed"""
+        # Arrange
+        token = pyjwt.encode(
+            {'id': 'u1', 'type': 'access', 'exp': int(time.time()) + 2},
+            JWTUtil.ACCESS_SECRET,
+            algorithm=JWTUtil.ALGORITHM
+        )
+        JWTUtil.verify_access_token(token)
+
+        # Act
+        time.sleep(2.05)
+
+        # Assert
+        with pytest.raises(pyjwt.ExpiredSignatureError):
+            JWTUtil.verify_access_token(token)
+
+    def test_revocation_is_checked_on_cache_hit(self):
+        """Test: should apply revocation checks to cached tokens"""
+        # Arrange
+        token = JWTUtil.generate_access_token(USER)
+        JWTUtil.verify_access_token(token)
+        JWTUtil.register_revocation_check(lambda payload: payload['id'] == 'u1')
+
+        # Act & Assert
+        with pytest.raises(pyjwt.InvalidTokenError):
+            JWTUtil.verify_access_token(token)
+
+    def test_refresh_token_is_not_accepted(self):
+        """Test: should not cache or accept refresh tokens as access tokens"""
+        # Arrange
+        token = pyjwt.encode(
+            {'id': 'u1', 'type': 'refresh', 'exp': int(time.time()) + 60},
+            JWTUtil.ACCESS_SECRET,
+            algorithm=JWTUtil.ALGORITHM
+        )
+
+        # Act & Assert
+        with pytest.raises(pyjwt.InvalidTokenError):
+            JWTUtil.verify_access_token(token)
+        assert JWTUtil.get_verify_cache_stats()['size'] == 0
+
+
+class TestTokenVersion:
+    """Test token_version claim"""
+
+    def test_tokens_carry_user_token_version(self):
+        """Test: should embed the user's token_version in both tokens"""
+        # Arrange
+        user = SimpleNamespace(id='u1', email='u1@example.com', role='user', token_version=3)
+
+        # Act
+        tokens = JWTUtil.generate_token_pair(user)
+
+        # Assert
+        assert JWTUtil.verify_access_token(tokens['access_token'])['token_version'] == 3
+        assert JWTUtil.verify_refresh_token(tokens['refresh_token'])['token_version'] == 3
+
+    def test_is_outdated_after_bump(self):
+        """Test: should flag tokens issued before the last version bump"""
+        # Arrange
+        payload = JWTUtil.verify_access_token(JWTUtil.generate_access_token(USER))
+
+        # Act & Assert
+        assert JWTUtil.is_outdated(payload, 0) is False
+        assert JWTUtil.is_outdated(payload, 1) is True
+
+
+def _pyjwt_decode(token: str):
+    try:
+        return pyjwt.decode(token, SECRET, algorithms=['HS256'])
+    except pyjwt.InvalidTokenError as e:
+        return type(e)
+
+
+def _codec_decode(token: str):
+    try:
+        return CODEC.decode(token)
+    except pyjwt.InvalidTokenError as e:
+        return type(e)
+
+
+class TestHS256Codec:
+    """Test HS256Codec (wire-compatible con PyJWT)"""
+
+    @settings(max_examples=300)
+    @given(claims_strategy)
+    def test_encode_matches_pyjwt_bytes(self, claims):
+        """Test: should produce exactly the token PyJWT produces"""
+        # Act & Assert
+        assert CODEC.encode(claims) == pyjwt.encode(claims, SECRET, algorithm='HS256')
+
+    @settings(max_examples=300)
+    @given(claims_strategy)
+    def test_round_trips_both_ways(self, claims):
+        """Test: should decode PyJWT tokens and issue tokens PyJWT accepts"""
+        # Act
+        token = CODEC.encode(claims)
+
+        # Assert
+        assert CODEC.decode(pyjwt.encode(claims, SECRET, algorithm='HS256')) == claims
+        assert pyjwt.decode(token, SECRET, algorithms=['HS256']) == claims
+
+    @settings(max_examples=300)
+    @given(claims_strategy, st.integers(min_value=0), st.sampled_from('AQZaz09-_.='))
+    def test_tampered_tokens_agree_with_pyjwt(self, claims, position, char):
+        """Test: should accept or reject a modified token exactly like PyJWT"""
+        # Arrange
+        token = CODEC.encode(claims)
+        position = len(CODEC.prefix) + position % (len(token) - len(CODEC.prefix))
+        tampered = token[:position] + char + token[position + 1:]
+
+        # Act & Assert
+        assert _codec_decode(tampered) == _pyjwt_decode(tampered)
+
+    @given(st.sampled_from([
+        {'exp': NOW - 1},
+        {'exp': 'soon'},
+        {'iat': NOW + 3600},
+        {'nbf': NOW + 3600},
+        {'sub': 42},
+        {'jti': 7},
+        {'aud': 'other-service'}
+    ]))
+    def test_registered_claims_fail_like_pyjwt(self, claims):
+        """Test: should raise the same error as PyJWT for invalid registered claims"""
+        # Arrange
+        token = CODEC.encode(claims)
+
+        # Act & Assert
+        assert _codec_decode(token) == _pyjwt_decode(token)
+        assert isinstance(_codec_decode(token), type)
+
+    def test_wrong_secret_is_rejected(self):
+        """Test: should reject a token signed with another secret"""
+        # Arrange
+        token = pyjwt.encode({'id': 'u1'}, 'another-secret', algorithm='HS256')
+
+        # Act & Assert
+        with pytest.raises(pyjwt.InvalidSignatureError):
+            CODEC.decode(token)
+
+    def test_fast_path_and_pyjwt_issue_equivalent_tokens(self):
+        """Test: should verify tokens issued with the fast codec disabled and vice versa"""
+        # Arrange
+        with patch.object(JWTUtil, 'FAST_CODEC_ENABLED', False):
+            legacy = JWTUtil.generate_token_pair(USER)
+        fast = JWTUtil.generate_token_pair(USER)
+
+        # Act & Assert
+        assert JWTUtil.verify_refresh_token(legacy['refresh_token'])['id'] == 'u1'
+        assert JWTUtil.verify_access_token(legacy['access_token'])['id'] == 'u1'
+        with patch.object(JWTUtil, 'FAST_CODEC_ENABLED', False):
+            assert JWTUtil.verify_access_token(fast['access_token'])['type'] == 'access'
+            assert JWTUtil.verify_refresh_token(fast['refresh_token'])['type'] == 'refresh'
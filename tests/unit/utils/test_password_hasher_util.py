@@ -0,0 +1,57 @@
+"""
+Unit Tests - Password Hasher Utility
+"""
+import threading
+import pytest
+from src.utils.app_error import AppError
+from src.utils.password_hasher_util import PasswordHasher
+
+
+class TestPasswordHasher:
+    """Test PasswordHasher"""
+
+    def test_inline_hash_and_verify(self):
+        """Test: should hash and verify inline when the pool is disabled"""
+        # Arrange
+        hasher = PasswordHasher(workers=0)
+
+        # Act
+        pwhash = hasher.hash_password('Secret123!')
+
+        # Assert
+        assert pwhash.startswith('pbkdf2:sha256')
+        assert hasher.verify_password(pwhash, 'Secret123!') is True
+        assert hasher.verify_password(pwhash, 'wrong') is False
+
+    def test_pool_hash_and_metrics(self):
+        """Test: should hash in the process pool and record queue wait"""
+        # Arrange
+        hasher = PasswordHasher(workers=1, max_queue=4, timeout_ms=30000)
+
+        try:
+            # Act
+            pwhash = hasher.hash_password('Secret123!')
+            valid = hasher.verify_password(pwhash, 'Secret123!')
+        finally:
+            hasher.shutdown()
+
+        # Assert
+        stats = hasher.get_stats()
+        assert valid is True
+        assert stats['completed'] == 2
+        assert stats['in_flight'] == 0
+        assert stats['queue_wait']['count'] == 2
+
+    def test_rejects_when_queue_is_full(self):
+        """Test: should fail fast with 503 when the queue limit is reached"""
+        # Arrange
+        hasher = PasswordHasher(workers=1, max_queue=1)
+        hasher._slots = threading.BoundedSemaphore(1)
+        hasher._slots.acquire()
+
+        # Act & Assert
+        with pytest.raises(AppError) as exc_info:
+            hasher.hash_password('Secret123!')
+
+        assert exc_info.value.status_code == 503
+        assert hasher.get_stats()['rejected'] == 1
@@ -0,0 +1,96 @@
+"""
+Unit Tests - Password Schemes Utility
+"""
+import pytest
+from unittest.mock import patch
+from src.models import User
+from src.utils.password_hasher_util import password_hasher
+from src.utils.password_schemes_util import (
+    Argon2idScheme,
+    BcryptScheme,
+    Pbkdf2Scheme,
+    ScryptScheme,
+    calibrate,
+    verify_any
+)
+
+
+CHEAP_SCHEMES = [
+    Pbkdf2Scheme(iterations=1000),
+    ScryptScheme(n=2 ** 10, r=8, p=1),
+    BcryptScheme(rounds=4),
+    Argon2idScheme(time_cost=1, memory_cost=1024, parallelism=1)
+]
+
+
+class TestPasswordSchemes:
+    """Test hasher registry"""
+
+    @pytest.mark.parametrize('scheme', CHEAP_SCHEMES, ids=lambda s: s.name)
+    def test_hash_and_verify(self, scheme):
+        """Test: should verify with the parameters embedded in the hash"""
+        # Act
+        pwhash = scheme.hash('Secret123!')
+
+        # Assert
+        assert verify_any(pwhash, 'Secret123!') is True
+        assert verify_any(pwhash, 'wrong') is False
+        assert scheme.needs_rehash(pwhash) is False
+
+    def test_needs_rehash_on_outdated_cost(self):
+        """Test: should flag hashes made with other costs or algorithms"""
+        # Arrange
+        old_hash = Pbkdf2Scheme(iterations=1000).hash('Secret123!')
+
+        # Act & Assert
+        assert Pbkdf2Scheme(iterations=2000).needs_rehash(old_hash) is True
+        assert BcryptScheme(rounds=4).needs_rehash(old_hash) is True
+
+    def test_unknown_hash_never_verifies(self):
+        """Test: should reject plain text or unknown hash formats"""
+        # Act & Assert
+        assert verify_any('Secret123!', 'Secret123!') is False
+
+    def test_calibrate_reports_config_keys(self):
+        """Test: should return config keys for the chosen parameters"""
+        # Act
+        result = calibrate('bcrypt', target_ms=0)
+
+        # Assert
+        assert result['params'] == {'rounds': 8}
+        assert result['config'] == {'PASSWORD_BCRYPT_ROUNDS': 8}
+
+
+class TestRehashOnLogin:
+    """Test User.check_password rehash"""
+
+    def test_check_password_upgrades_outdated_hash(self):
+        """Test: should rehash with the configured scheme after a successful check"""
+        # Arrange
+        user = User(email='rehash@example.com', name='Rehash')
+        user.password = Pbkdf2Scheme(iterations=1000).hash('Secret123!')
+
+        # Act
+        with patch.object(password_hasher, 'workers', 0), \
+                patch.object(password_hasher, 'scheme', BcryptScheme(rounds=4)):
+            valid = user.check_password('Secret123!')
+
+        # Assert
+        assert valid is True
+        assert user.password.startswith('$2b$04$')
+        assert verify_any(user.password, 'Secret123!') is True
+
+    def test_check_password_keeps_hash_on_failure(self):
+        """Test: should not touch the hash when the password is wrong"""
+        # Arrange
+        user = User(email='rehash@example.com', name='Rehash')
+        user.password = original = Pbkdf2Scheme(iterations=1000).hash('Secret123!')
+
+        # Act
+        with patch.object(password_hasher, 'workers', 0), \
+                patch.object(password_hasher, 'scheme', BcryptScheme(rounds=4)):
+            valid = user.check_password('wrong')
+
+        # Assert
+        assert valid is False
+        assert user.password == original
@@ -0,0 +1,218 @@
+"""
+Unit Tests - Pre-Auth Gate (reputación IP/subred y proof-of-work)
+Usa fakeredis como stand-in en memoria
+"""
+import hashlib
+import time
+import fakeredis
+import pytest
+from unittest.mock import Mock, patch
+from src.utils.preauth_gate_util import PreAuthGate, leading_zero_bits, subnet_of
+from src.utils.redis_util import RedisUtil
+
+
+@pytest.fixture(autouse=True)
+def small_thresholds():
+    """Umbrales y dificultad chicos para tests rápidos"""
+    with patch.multiple(PreAuthGate, IP_CHALLENGE=3, IP_BLOCK=6, SUBNET_CHALLENGE=5,
+                        SUBNET_BLOCK=50, GLOBAL_BUDGET=100, POW_DIFFICULTY=8, POW_MAX_DIFFICULTY=8):
+        yield
+
+
+def make_gate(redis=True, pow_enabled=True) -> PreAuthGate:
+    if redis:
+        redis_util = RedisUtil(client=fakeredis.FakeRedis(decode_responses=True))
+    else:
+        redis_util = Mock(get_client=Mock(return_value=None))
+    gate = PreAuthGate(redis_util)
+    gate.enabled = True
+    gate.pow_enabled = pow_enabled
+    return gate
+
+
+def solve(challenge: str, difficulty: int) -> str:
+    nonce = 0
+    while leading_zero_bits(hashlib.sha256(f'{challenge}:{nonce}'.encode()).digest()) < difficulty:
+        nonce += 1
+    return str(nonce)
+
+
+class TestPreAuthGate:
+    """Test PreAuthGate"""
+
+    def test_allows_clean_ip(self):
+        """Test: should let through an IP without failed logins"""
+        # Arrange
+        gate = make_gate()
+
+        # Act
+        decision = gate.check('10.0.0.1')
+
+        # Assert
+        assert decision.allowed
+        assert gate.get_stats()['allowed'] == 1
+
+    def test_challenges_then_blocks_failing_ip(self):
+        """Test: should ask for proof-of-work and then block as failures grow"""
+        # Arrange
+        gate = make_gate()
+
+        # Act
+        for _ in range(3):
+            gate.record_failure('10.0.0.1')
+        challenged = gate.check('10.0.0.1')
+        for _ in range(3):
+            gate.record_failure('10.0.0.1')
+        blocked = gate.check('10.0.0.1')
+
+        # Assert
+        assert challenged.action == 'challenge'
+        assert challenged.challenge and challenged.difficulty == 8
+        assert blocked.action == 'block'
+        assert blocked.retry_after > 0
+        assert gate.check('10.0.9.9').allowed
+
+    def test_subnet_reputation_covers_rotating_ips(self):
+        """Test: should challenge new IPs of a subnet with many failures"""
+        # Arrange
+        gate = make_gate()
+        for host in range(5):
+            gate.record_failure(f'10.0.0.{host}')
+
+        # Act
+        decision = gate.check('10.0.0.200')
+
+        # Assert
+        assert decision.action == 'challenge'
+        assert gate.check('10.0.1.1').allowed
+
+    def test_solved_challenge_is_accepted_once(self):
+        """Test: should accept a valid proof-of-work and reject its replay"""
+        # Arrange
+        gate = make_gate()
+        for _ in range(3):
+            gate.record_failure('10.0.0.1')
+        challenge = gate.check('10.0.0.1').challenge
+        nonce = solve(challenge, 8)
+
+        # Act
+        first = gate.check('10.0.0.1', challenge, nonce)
+        replay = gate.check('10.0.0.1', challenge, nonce)
+
+        # Assert
+        assert first.allowed
+        assert replay.action == 'challenge'
+        assert gate.get_stats()['pow_solved'] == 1
+
+    def test_forged_challenge_is_rejected(self):
+        """Test: should reject a challenge whose signature does not match"""
+        # Arrange
+        gate = make_gate()
+        for _ in range(3):
+            gate.record_failure('10.0.0.1')
+        challenge = gate.check('10.0.0.1').challenge
+        forged = challenge.rsplit('.', 1)[0] + '.' + '0' * 32
+
+        # Act
+        decision = gate.check('10.0.0.1', forged, solve(forged, 8))
+
+        # Assert
+        assert decision.action == 'challenge'
+        assert gate.get_stats()['pow_invalid'] == 1
+
+    def test_future_dated_challenge_is_rejected(self):
+        """Test: should reject a validly signed challenge issued in the future"""
+        # Arrange
+        gate = make_gate()
+        with patch('src.utils.preauth_gate_util.time.time', return_value=time.time() + 3600):
+            challenge = gate.issue_challenge('10.0.0.1', 8)
+
+        # Act
+        accepted = gate.verify_pow(challenge, solve(challenge, 8), '10.0.0.1', 8)
+
+        # Assert
+        assert accepted is False
+
+    def test_warns_when_pow_secret_is_default(self):
+        """Test: should log a warning at startup when PoW uses the public default secret"""
+        # Arrange
+        gate = make_gate()
+        app = Mock(config={'PREAUTH_ENABLED': True, 'PREAUTH_POW_ENABLED': True})
+
+        # Act
+        with patch.object(PreAuthGate, 'POW_SECRET', PreAuthGate.DEFAULT_POW_SECRET), \
+                patch('src.utils.preauth_gate_util.logger') as logger:
+            gate.init_app(app)
+
+        # Assert
+        logger.warning.assert_called_once()
+
+    def test_global_budget_challenges_everyone(self):
+        """Test: should challenge clean IPs when the global failure budget is spent"""
+        # Arrange
+        gate = make_gate()
+        with patch.object(PreAuthGate, 'GLOBAL_BUDGET', 4):
+            for host in range(4):
+                gate.record_failure(f'192.168.{host}.1')
+
+            # Act
+            decision = gate.check('172.16.0.1')
+
+        # Assert
+        assert decision.action == 'challenge'
+        assert decision.reason == 'global_budget'
+
+    def test_backoff_without_pow(self):
+        """Test: should allow one attempt per backoff period when proof-of-work is off"""
+        # Arrange
+        gate = make_gate(pow_enabled=False)
+        for _ in range(3):
+            gate.record_failure('10.0.0.1')
+
+        # Act
+        first = gate.check('10.0.0.1')
+        second = gate.check('10.0.0.1')
+
+        # Assert
+        assert first.allowed
+        assert second.action == 'backoff'
+        assert second.retry_after >= 1
+
+    def test_local_counters_without_redis(self):
+        """Test: should keep per-worker counters when Redis is unavailable"""
+        # Arrange
+        gate = make_gate(redis=False)
+        for _ in range(3):
+            gate.record_failure('10.0.0.1')
+
+        # Act
+        decision = gate.check('10.0.0.1')
+
+        # Assert
+        assert decision.action == 'challenge'
+
+    def test_stats_estimate_cpu_saved(self):
+        """Test: should report CPU saved from the measured login cost"""
+        # Arrange
+        gate = make_gate()
+        for _ in range(6):
+            gate.record_failure('10.0.0.1')
+        gate.check('10.0.0.1')
+
+        # Act
+        stats = gate.get_stats(login_cost_ms=120.0)
+
+        # Assert
+        assert stats['rejected'] == 1
+        assert stats['cpu_ms_saved'] == 120.0
+
+
+class TestSubnet:
+    """Test subnet_of"""
+
+    def test_subnet_prefixes(self):
+        """Test: should group IPv4 by /24 and IPv6 by /64"""
+        # Act & Assert
+        assert subnet_of('10.1.2.3') == '10.1.2.0/24'
+        assert subnet_of('2001:db8::1') == '2001:db8::/64'
+        assert subnet_of('unknown') is None
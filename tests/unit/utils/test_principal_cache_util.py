@@ -0,0 +1,141 @@
+"""
+Unit Tests - Principal Cache Utility
+Usa fakeredis como stand-in en memoria (incluye pub/sub)
+"""
+import time
+import fakeredis
+import pytest
+from unittest.mock import Mock
+from src.utils.principal_cache_util import LazyPrincipal, PrincipalCache
+from src.utils.redis_util import RedisUtil
+
+
+PRINCIPAL = {'id': 'u1', 'email': 'u1@example.com', 'name': 'U1', 'role': 'user', 'is_active': True}
+
+
+@pytest.fixture
+def redis_server():
+    """Servidor fakeredis compartido (simula varios workers)"""
+    return fakeredis.FakeServer()
+
+
+def make_cache(server) -> PrincipalCache:
+    return PrincipalCache(RedisUtil(client=fakeredis.FakeRedis(server=server, decode_responses=True)))
+
+
+class TestPrincipalCache:
+    """Test PrincipalCache"""
+
+    def test_loader_runs_once_across_workers(self, redis_server):
+        """Test: should hit the database once and serve the rest from L1/Redis"""
+        # Arrange
+        worker_a, worker_b = make_cache(redis_server), make_cache(redis_server)
+        loader = Mock(return_value=PRINCIPAL)
+
+        # Act
+        worker_a.get('u1', loader)
+        worker_a.get('u1', loader)
+        principal = worker_b.get('u1', loader)
+
+        # Assert
+        assert principal == PRINCIPAL
+        loader.assert_called_once_with('u1')
+
+    def test_invalidation_reaches_other_workers(self, redis_server):
+        """Test: should drop the L1 entry of other workers via pub/sub"""
+        # Arrange
+        worker_a, worker_b = make_cache(redis_server), make_cache(redis_server)
+        worker_b.start(Mock(config={}))
+        worker_b.get('u1', Mock(return_value=PRINCIPAL))
+        time.sleep(0.2)  # suscripción activa
+
+        # Act
+        worker_a.invalidate('u1')
+        deadline = time.monotonic() + 2
+        while worker_b.local.get('u1') is not None and time.monotonic() < deadline:
+            time.sleep(0.02)
+        worker_b.stop()
+
+        # Assert
+        inactive = dict(PRINCIPAL, is_active=False)
+        assert worker_b.local.get('u1') is None
+        assert worker_b.get('u1', Mock(return_value=inactive))['is_active'] is False
+
+    def test_tombstone_blocks_stale_writes(self, redis_server):
+        """Test: should not cache in Redis right after an invalidation"""
+        # Arrange
+        cache = make_cache(redis_server)
+        cache.invalidate('u1')
+        loader = Mock(return_value=PRINCIPAL)
+
+        # Act
+        cache.get('u1', loader)
+        cache.local.clear()
+        cache.get('u1', loader)
+
+        # Assert
+        assert loader.call_count == 2
+
+    def test_get_many_loads_misses_in_one_call(self, redis_server):
+        """Test: should serve L1/Redis hits and load the rest with a single loader call"""
+        # Arrange
+        worker_a, worker_b = make_cache(redis_server), make_cache(redis_server)
+        worker_a.get('u1', Mock(return_value=PRINCIPAL))
+        u2 = dict(PRINCIPAL, id='u2', email='u2@example.com')
+        loader = Mock(return_value={'u2': u2})
+
+        # Act
+        principals = worker_b.get_many(['u1', 'u2', 'u3', 'u1'], loader)
+        again = worker_b.get_many(['u1', 'u2'], loader)
+
+        # Assert
+        assert principals == {'u1': PRINCIPAL, 'u2': u2}
+        assert again == principals
+        loader.assert_called_once_with(['u2', 'u3'])
+
+
+class TestLazyPrincipal:
+    """Test LazyPrincipal"""
+
+    def test_claim_fields_do_not_load(self):
+        """Test: should serve id and email from the claims"""
+        # Arrange
+        loader = Mock(return_value=PRINCIPAL)
+        user = LazyPrincipal({'id': 'u1', 'email': 'u1@example.com', 'role': 'admin'}, loader=loader)
+
+        # Act
+        values = (user['id'], user['email'])
+
+        # Assert
+        assert values == ('u1', 'u1@example.com')
+        assert user.loaded is False
+        loader.assert_not_called()
+
+    def test_role_loads_the_principal(self):
+        """Test: should never serve the role from the claims"""
+        # Arrange
+        loader = Mock(return_value=PRINCIPAL)
+        user = LazyPrincipal({'id': 'u1', 'email': 'u1@example.com', 'role': 'admin'}, loader=loader)
+
+        # Act
+        role = user.get('role')
+
+        # Assert
+        assert role == 'user'
+        assert user.loaded is True
+        loader.assert_called_once_with()
+
+    def test_other_fields_load_once_and_win_over_claims(self):
+        """Test: should load on first non-claim access and then serve every field from the principal"""
+        # Arrange
+        loader = Mock(return_value=PRINCIPAL)
+        user = LazyPrincipal({'id': 'u1', 'email': 'u1@example.com', 'role': 'admin'}, loader=loader)
+
+        # Act
+        name = user['name']
+        as_dict = user.to_dict()
+
+        # Assert
+        assert name == 'U1'
+        assert as_dict == {'id': 'u1', 'email': 'u1@example.com', 'name': 'U1', 'role': 'user'}
+        loader.assert_called_once_with()
@@ -0,0 +1,105 @@
+"""
+Unit Tests - Rate Limit Utility
+Usa fakeredis (con Lua) como stand-in en memoria
+"""
+import fakeredis
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from src.middlewares.rate_limit_middleware import rate_limit, register_rate_limit
+from src.utils.rate_limit_util import RateLimiter, RateLimitPolicy
+from src.utils.redis_util import RedisUtil
+
+
+@pytest.fixture
+def limiter():
+    """Limiter sobre fakeredis"""
+    return RateLimiter(RedisUtil(client=fakeredis.FakeRedis(decode_responses=True)))
+
+
+class TestRateLimiter:
+    """Test RateLimiter.check"""
+
+    def test_bucket_rejects_over_the_limit(self, limiter):
+        """Test: should allow `limit` requests and reject the next one"""
+        # Arrange
+        policy = RateLimitPolicy('test', limit=3, period=60)
+
+        # Act
+        results = [limiter.check(policy, 'ip:1') for _ in range(4)]
+
+        # Assert
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert results[3].retry_after == 20
+        assert limiter.check(policy, 'ip:2').allowed is True
+
+    def test_lease_saves_redis_round_trips(self, limiter):
+        """Test: should answer leased tokens from memory"""
+        # Arrange
+        policy = RateLimitPolicy('test', limit=100, period=60, lease=5)
+
+        # Act
+        results = [limiter.check(policy, 'ip:1') for _ in range(10)]
+
+        # Assert
+        assert all(r.allowed for r in results)
+        assert limiter.get_stats()['redis_calls'] == 2
+        assert results[-1].remaining == 90
+
+    def test_partial_lease_near_the_limit_is_one_round_trip(self, limiter):
+        """Test: should grant the tokens left in a single EVAL when a full lease does not fit"""
+        # Arrange
+        policy = RateLimitPolicy('test', limit=7, period=60, lease=5)
+        first = [limiter.check(policy, 'ip:1') for _ in range(5)]
+
+        # Act
+        partial = [limiter.check(policy, 'ip:1') for _ in range(3)]
+
+        # Assert
+        assert all(r.allowed for r in first)
+        assert [r.allowed for r in partial] == [True, True, False]
+        assert [r.remaining for r in partial[:2]] == [1, 0]
+        assert limiter.get_stats()['redis_calls'] == 3
+
+    def test_local_fallback_without_redis(self, limiter):
+        """Test: should keep limiting in memory when Redis is down"""
+        # Arrange
+        policy = RateLimitPolicy('test', limit=2, period=60)
+
+        # Act
+        with patch.object(limiter.redis, 'get_client', return_value=None):
+            results = [limiter.check(policy, 'ip:1').allowed for _ in range(3)]
+
+        # Assert
+        assert results == [True, True, False]
+        assert limiter.get_stats()['local_fallbacks'] == 3
+
+
+class TestRateLimitMiddleware:
+    """Test rate_limit() y headers RateLimit-*"""
+
+    def test_headers_and_429(self, limiter):
+        """Test: should send RateLimit-* headers and Retry-After when rejected"""
+        # Arrange
+        app = Flask(__name__)
+
+        @app.route('/limited')
+        @rate_limit('test:route', limit=1, period=30)
+        def limited():
+            return 'ok'
+
+        with patch('src.middlewares.rate_limit_middleware.rate_limiter', limiter):
+            register_rate_limit(app)
+            client = app.test_client()
+
+            # Act
+            allowed = client.get('/limited')
+            rejected = client.get('/limited')
+
+        # Assert
+        assert allowed.status_code == 200
+        assert allowed.headers['RateLimit-Limit'] == '1'
+        assert allowed.headers['RateLimit-Remaining'] == '0'
+        assert rejected.status_code == 429
+        assert rejected.headers['Retry-After'] == '30'
@@ -0,0 +1,89 @@
+"""
+Unit Tests - Redis Metrics Utility
+"""
+from unittest.mock import patch
+from src.constants.constants import RedisKeys
+from src.utils.redis_metrics_util import LatencyHistogram, RedisMetrics, TopKTracker
+from tests.fixtures import fake_redis
+
+
+class TestLatencyHistogram:
+    """Test LatencyHistogram"""
+
+    def test_percentiles_use_bucket_bounds(self):
+        """Test: should report percentiles from the bucket upper bounds"""
+        # Arrange
+        histogram = LatencyHistogram()
+
+        # Act
+        for _ in range(99):
+            histogram.observe(0.8)
+        histogram.observe(40)
+
+        # Assert
+        stats = histogram.to_dict()
+        assert stats['count'] == 100
+        assert stats['p50_ms'] == 1
+        assert stats['p99_ms'] == 1
+        assert stats['max_ms'] == 40
+        assert stats['buckets']['le_50'] == 1
+
+
+class TestTopKTracker:
+    """Test TopKTracker"""
+
+    def test_keeps_most_frequent_keys(self):
+        """Test: should keep the hottest keys when there are more than k"""
+        # Arrange
+        tracker = TopKTracker(k=2)
+
+        # Act
+        for i in range(50):
+            tracker.add('hot')
+            if i % 2 == 0:
+                tracker.add('warm')
+            tracker.add(f'cold-{i}')
+
+        # Assert
+        top = tracker.top()
+        assert [key for key, _ in top] == ['hot', 'warm']
+        assert top[0][1] >= 50
+
+
+class TestRedisMetrics:
+    """Test RedisMetrics"""
+
+    def test_hit_ratio_by_longest_prefix(self):
+        """Test: should group hits and misses by the longest RedisKeys prefix"""
+        # Arrange
+        metrics = RedisMetrics()
+
+        # Act
+        metrics.record('get', f'{RedisKeys.PRODUCT_DETAIL}p1', 0.5, hit=True)
+        metrics.record('get', f'{RedisKeys.PRODUCT_DETAIL}p2', 0.5, hit=False)
+        metrics.record('get', 'unknown:key', 0.5, hit=True)
+
+        # Assert
+        by_prefix = metrics.get_stats()['by_prefix']
+        assert by_prefix[RedisKeys.PRODUCT_DETAIL]['hit_ratio'] == 0.5
+        assert by_prefix['other']['hits'] == 1
+
+    def test_redis_util_operations_are_tracked(self, fake_redis):
+        """Test: should record latency and hits for RedisUtil calls"""
+        # Arrange
+        metrics = RedisMetrics()
+        key = f'{RedisKeys.USER_PROFILE}u1'
+
+        # Act
+        with patch('src.utils.redis_util.redis_metrics', metrics):
+            fake_redis.set(key, {'id': 'u1'})
+            fake_redis.get(key)
+            fake_redis.get(f'{RedisKeys.USER_PROFILE}missing')
+
+        # Assert
+        stats = metrics.get_stats()
+        assert stats['latency']['get']['count'] == 2
+        assert stats['latency']['set']['count'] == 1
+        assert stats['by_prefix'][RedisKeys.USER_PROFILE]['hits'] == 1
+        assert stats['by_prefix'][RedisKeys.USER_PROFILE]['misses'] == 1
+        assert stats['hot_keys'][0]['key'] == key
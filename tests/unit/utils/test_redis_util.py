@@ -0,0 +1,123 @@
+"""
+Unit Tests - Redis Utility
+Usa fakeredis como stand-in en memoria (incluye soporte Lua)
+"""
+import json
+import time
+from src.utils.redis_util import RedisUtil
+from tests.fixtures import fake_redis
+
+
+class TestRedisLocks:
+    """Test acquire_lock / release_lock"""
+
+    def test_lock_is_exclusive(self, fake_redis):
+        """Test: should not grant the same lock twice"""
+        # Act
+        token = fake_redis.acquire_lock('lock:a', 1000)
+        second = fake_redis.acquire_lock('lock:a', 1000)
+
+        # Assert
+        assert token is not None
+        assert second is None
+
+    def test_release_requires_owner_token(self, fake_redis):
+        """Test: should only release the lock with the owner token"""
+        # Arrange
+        token = fake_redis.acquire_lock('lock:a', 1000)
+
+        # Act & Assert
+        assert fake_redis.release_lock('lock:a', 'other-token') is False
+        assert fake_redis.exists('lock:a') is True
+        assert fake_redis.release_lock('lock:a', token) is True
+        assert fake_redis.exists('lock:a') is False
+
+    def test_lock_without_client(self):
+        """Test: should not grant locks when Redis is unavailable"""
+        # Arrange
+        util = RedisUtil.__new__(RedisUtil)
+        util._client = None
+
+        # Act & Assert
+        assert util.acquire_lock('lock:a', 1000) is None
+
+
+class TestGetOrCompute:
+    """Test get_or_compute"""
+
+    def test_miss_computes_and_stores(self, fake_redis):
+        """Test: should compute on miss and serve the cached value after"""
+        # Arrange
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {'items': [1, 2, 3]}
+
+        # Act
+        first = fake_redis.get_or_compute('cache:k', 60, compute, beta=0)
+        second = fake_redis.get_or_compute('cache:k', 60, compute, beta=0)
+
+        # Assert
+        assert first == second == {'items': [1, 2, 3]}
+        assert len(calls) == 1
+        assert fake_redis.get_client().ttl('cache:k') > 60  # incluye margen stale
+
+    def test_expired_value_is_recomputed(self, fake_redis):
+        """Test: should recompute once the logical ttl has passed"""
+        # Arrange
+        entry = {'value': 'old', 'delta': 0.0, 'expiry': time.time() - 1}
+        fake_redis.get_client().set('cache:k', json.dumps(entry), ex=60)
+
+        # Act
+        value = fake_redis.get_or_compute('cache:k', 60, lambda: 'new')
+
+        # Assert
+        assert value == 'new'
+
+    def test_xfetch_refreshes_early_for_expensive_values(self, fake_redis):
+        """Test: should refresh before expiry when delta * beta is large"""
+        # Arrange
+        entry = {'value': 'old', 'delta': 1000.0, 'expiry': time.time() + 5}
+        fake_redis.get_client().set('cache:k', json.dumps(entry), ex=60)
+
+        # Act
+        value = fake_redis.get_or_compute('cache:k', 60, lambda: 'new', beta=1000)
+
+        # Assert
+        assert value == 'new'
+
+    def test_serves_stale_while_other_worker_recomputes(self, fake_redis):
+        """Test: should return the stale value if the lock is taken"""
+        # Arrange
+        entry = {'value': 'stale', 'delta': 0.0, 'expiry': time.time() - 1}
+        fake_redis.get_client().set('cache:k', json.dumps(entry), ex=60)
+        fake_redis.acquire_lock('cache:lock:cache:k', 5000)
+
+        # Act
+        value = fake_redis.get_or_compute('cache:k', 60, lambda: 'fresh')
+
+        # Assert
+        assert value == 'stale'
+
+    def test_waits_for_leader_when_no_value(self, fake_redis):
+        """Test: should compute without lock after waiting for a stuck leader"""
+        # Arrange
+        fake_redis.acquire_lock('cache:lock:cache:k', 5000)
+        fake_redis.CACHE_LOCK_WAIT_MS = 50
+        fake_redis.CACHE_POLL_INTERVAL_MS = 5
+
+        # Act
+        value = fake_redis.get_or_compute('cache:k', 60, lambda: 'computed')
+
+        # Assert
+        assert value == 'computed'
+
+    def test_without_client_computes_directly(self):
+        """Test: should call fn when Redis is unavailable"""
+        # Arrange
+        util = RedisUtil.__new__(RedisUtil)
+        util._client = None
+
+        # Act & Assert
+        assert util.get_or_compute('cache:k', 60, lambda: 42) == 42
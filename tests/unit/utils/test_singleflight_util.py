@@ -0,0 +1,164 @@
+"""
+Unit Tests - Single-flight Utility
+"""
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from src.utils.singleflight_util import SingleFlight, RequestCoalescer
+
+
+class TestSingleFlight:
+    """Test SingleFlight"""
+
+    def test_concurrent_calls_share_leader_result(self):
+        """Test: should run fn once for concurrent identical keys"""
+        # Arrange
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+        results = []
+
+        def compute():
+            calls.append(1)
+            release.wait(2)
+            return 'value'
+
+        def worker():
+            results.append(flight.do('key', compute))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+
+        # Act
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join()
+
+        # Assert
+        assert len(calls) == 1
+        assert [value for value, _ in results] == ['value'] * 5
+        assert sum(1 for _, shared in results if shared) == 4
+        assert flight.get_stats()['coalesced'] == 4
+        assert flight.get_stats()['in_flight'] == 0
+
+    def test_different_keys_are_not_coalesced(self):
+        """Test: should compute each key independently"""
+        # Arrange
+        flight = SingleFlight()
+
+        # Act
+        first, first_shared = flight.do('a', lambda: 1)
+        second, second_shared = flight.do('b', lambda: 2)
+
+        # Assert
+        assert (first, second) == (1, 2)
+        assert not first_shared and not second_shared
+
+    def test_leader_error_propagates_to_followers(self):
+        """Test: should raise leader error in followers"""
+        # Arrange
+        flight = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def compute():
+            release.wait(2)
+            raise ValueError('boom')
+
+        def worker():
+            try:
+                flight.do('key', compute)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+
+        # Act
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join()
+
+        # Assert
+        assert len(errors) == 3
+
+
+class TestRequestCoalescer:
+    """Test RequestCoalescer"""
+
+    @patch('src.utils.singleflight_util.redis_util')
+    def test_execute_without_redis_computes_locally(self, mock_redis):
+        """Test: should fall back to per-process coalescing without Redis"""
+        # Arrange
+        mock_redis.get_client.return_value = None
+        coalescer = RequestCoalescer()
+        payload = {'status': 200, 'body': '{}', 'headers': [['Content-Type', 'application/json']]}
+
+        # Act
+        result = coalescer.execute('key', lambda: payload)
+
+        # Assert
+        assert result == payload
+        mock_redis.acquire_lock.assert_not_called()
+        assert coalescer.get_stats()['requests'] == 1
+
+    @patch('src.utils.singleflight_util.redis_util')
+    def test_execute_reads_remote_leader_result(self, mock_redis):
+        """Test: should reuse the response published by another worker"""
+        # Arrange
+        mock_redis.get_client.return_value = object()
+        mock_redis.acquire_lock.return_value = None
+        remote = {'status': 200, 'body': '{"remote": true}', 'headers': [['Content-Type', 'application/json']]}
+        mock_redis.get.side_effect = [None, remote]
+        mock_redis.exists.return_value = True
+        coalescer = RequestCoalescer()
+        coalescer.POLL_INTERVAL_MS = 1
+
+        # Act
+        result = coalescer.execute('key', lambda: pytest.fail('should not compute'))
+
+        # Assert
+        assert result == remote
+        assert coalescer.get_stats()['coalesced_remote'] == 1
+
+    @patch('src.utils.singleflight_util.redis_util')
+    def test_follower_computes_when_leader_finishes_without_publishing(self, mock_redis):
+        """Test: should stop waiting once the leader released the lock without a shared result"""
+        # Arrange
+        mock_redis.get_client.return_value = object()
+        mock_redis.acquire_lock.return_value = None
+        mock_redis.get.return_value = None
+        mock_redis.exists.side_effect = [True, False]
+        payload = {'status': 404, 'body': '{}', 'headers': [['Content-Type', 'application/json']]}
+        coalescer = RequestCoalescer()
+        coalescer.POLL_INTERVAL_MS = 1
+
+        # Act
+        result = coalescer.execute('key', lambda: payload)
+
+        # Assert
+        assert result == payload
+        assert coalescer.get_stats()['remote_unshared'] == 1
+        assert coalescer.get_stats()['remote_wait_timeouts'] == 0
+
+    @patch('src.utils.singleflight_util.redis_util')
+    def test_execute_as_remote_leader_publishes_and_releases(self, mock_redis):
+        """Test: should publish successful responses and release the lock"""
+        # Arrange
+        mock_redis.get_client.return_value = object()
+        mock_redis.acquire_lock.return_value = 'lock-token'
+        payload = {'status': 200, 'body': '{}', 'headers': [['Content-Type', 'application/json']]}
+        coalescer = RequestCoalescer()
+
+        # Act
+        result = coalescer.execute('key', lambda: payload)
+
+        # Assert
+        assert result == payload
+        mock_redis.set.assert_called_once()
+        mock_redis.release_lock.assert_called_once_with('singleflight:lock:key', 'lock-token')
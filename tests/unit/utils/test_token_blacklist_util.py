@@ -0,0 +1,160 @@
+"""
+Unit Tests - Token Blacklist Utility
+Usa fakeredis como stand-in en memoria
+"""
+import time
+import fakeredis
+import pytest
+from unittest.mock import patch
+from src.utils.bloom_util import BloomFilter
+from src.utils.redis_util import RedisUtil
+from src.utils.token_blacklist_util import TokenBlacklist
+
+
+@pytest.fixture
+def redis_server():
+    """Servidor fakeredis compartido (simula varios workers)"""
+    return fakeredis.FakeServer()
+
+
+def make_blacklist(server) -> TokenBlacklist:
+    return TokenBlacklist(RedisUtil(client=fakeredis.FakeRedis(server=server, decode_responses=True)))
+
+
+def payload(jti: str, ttl: int = 60) -> dict:
+    return {'id': 'u1', 'jti': jti, 'exp': int(time.time()) + ttl}
+
+
+class TestBloomFilter:
+    """Test BloomFilter"""
+
+    def test_no_false_negatives(self):
+        """Test: should contain every added item"""
+        # Arrange
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f'jti-{i}' for i in range(1000)]
+
+        # Act
+        for item in items:
+            bloom.add(item)
+
+        # Assert
+        assert all(item in bloom for item in items)
+        assert len(bloom) == 1000
+
+    def test_false_positive_rate_is_bounded(self):
+        """Test: should keep false positives near the configured rate"""
+        # Arrange
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+
+        # Act
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+
+        # Assert
+        assert false_positives < 300
+
+
+class TestTokenBlacklist:
+    """Test TokenBlacklist"""
+
+    def test_revoked_token_is_rejected_by_other_workers(self, redis_server):
+        """Test: should apply a revocation on other workers after a sync"""
+        # Arrange
+        worker_a, worker_b = make_blacklist(redis_server), make_blacklist(redis_server)
+        worker_b.sync()
+
+        # Act
+        worker_a.revoke(payload('jti-1'))
+        synced = worker_b.sync()
+
+        # Assert
+        assert worker_a.is_revoked(payload('jti-1')) is True
+        assert synced is True
+        assert worker_b.is_revoked(payload('jti-1')) is True
+        assert worker_b.sync() is False
+
+    def test_sync_reads_only_new_revocations(self, redis_server):
+        """Test: should add only the jtis revoked since the last sync instead of reading the whole index"""
+        # Arrange
+        worker_a, worker_b = make_blacklist(redis_server), make_blacklist(redis_server)
+        worker_a.revoke(payload('jti-1'))
+        worker_b.sync()
+        worker_a.revoke(payload('jti-2'))
+        client = worker_b.redis.get_client()
+
+        # Act
+        with patch.object(client, 'zrange', wraps=client.zrange) as mock_zrange:
+            synced = worker_b.sync()
+
+        # Assert
+        assert synced is True
+        mock_zrange.assert_not_called()
+        assert worker_b.is_revoked(payload('jti-1')) is True
+        assert worker_b.is_revoked(payload('jti-2')) is True
+        assert worker_b.get_stats()['syncs'] == 1
+        assert worker_b.get_stats()['incremental_syncs'] == 1
+
+    def test_truncated_log_falls_back_to_full_rebuild(self, redis_server):
+        """Test: should rebuild from the index when the log no longer covers the gap"""
+        # Arrange
+        worker_a, worker_b = make_blacklist(redis_server), make_blacklist(redis_server)
+        worker_b.sync()
+        worker_a.LOG_SIZE = 1
+        worker_a.revoke(payload('jti-1'))
+        worker_a.revoke(payload('jti-2'))
+
+        # Act
+        synced = worker_b.sync()
+
+        # Assert
+        assert synced is True
+        assert worker_b.is_revoked(payload('jti-1')) is True
+        assert worker_b.is_revoked(payload('jti-2')) is True
+        assert worker_b.get_stats()['syncs'] == 2
+        assert worker_b.get_stats()['incremental_syncs'] == 0
+
+    def test_not_revoked_token_skips_redis(self, redis_server):
+        """Test: should answer from the Bloom filter without a Redis call"""
+        # Arrange
+        blacklist = make_blacklist(redis_server)
+        blacklist.revoke(payload('jti-1'))
+        client = blacklist.redis.get_client()
+
+        # Act
+        with patch.object(client, 'exists') as mock_exists:
+            revoked = blacklist.is_revoked(payload('jti-2'))
+
+        # Assert
+        assert revoked is False
+        mock_exists.assert_not_called()
+        assert blacklist.get_stats()['bloom_negatives'] == 1
+
+    def test_expired_entries_are_pruned_on_sync(self, redis_server):
+        """Test: should drop tokens past their exp from the index"""
+        # Arrange
+        blacklist = make_blacklist(redis_server)
+        blacklist.revoke(payload('jti-old', ttl=1))
+        blacklist.revoke(payload('jti-new'))
+        time.sleep(1.1)
+
+        # Act
+        blacklist.sync()
+
+        # Assert
+        assert blacklist.redis.get_client().zrange(blacklist.index_key, 0, -1) == ['jti-new']
+        assert len(blacklist._bloom) == 1
+
+    def test_revocation_without_redis_applies_locally(self):
+        """Test: should still reject the token in this worker when Redis is down"""
+        # Arrange
+        blacklist = TokenBlacklist(RedisUtil(client=None))
+
+        # Act
+        stored = blacklist.revoke(payload('jti-1'))
+
+        # Assert
+        assert stored is False
+        assert blacklist.is_revoked(payload('jti-1')) is True
+        assert blacklist.is_revoked(payload('jti-2')) is False